@@ -58,3 +58,54 @@ options:
             C(sort): The sort order of the returned data set."
         required: false
 '''
+
+    FIELDS = '''
+options:
+    fields:
+        description:
+        - List with the names of the fields to return for each resource, e.g. C(name), C(uri) and C(status).
+          Nested fields are selected with dots, e.g. C(processor.count).
+        - The projection is requested to the server when the API supports it, and the resources are trimmed on the
+          client otherwise.
+        required: false
+'''
+
+    RESULTFORMAT = '''
+options:
+    result_format:
+        description:
+        - Format of the resources returned in the facts.
+        - C(full) returns the resources as they are. C(compact) removes the null values and empty lists, and replaces
+          the references holding only an uri by the uri itself. C(file) writes each fact holding resources to a
+          JSON Lines file, one resource per line, and returns the path of the file instead of the resources.
+        default: full
+        choices: ['full', 'compact', 'file']
+        required: false
+    result_dir:
+        description:
+        - Directory of the JSON Lines files written when C(result_format) is C(file). Defaults to the temporary
+          directory of the host running the module.
+        - Each run writes new files, with unique names, that the module does not remove. Remove them once they are
+          read, e.g. with the M(file) module and C(state=absent).
+        required: false
+'''
+
+    MIRROR = '''
+options:
+    source:
+        description:
+        - Source of the list of resources. C(appliance) queries the appliance. C(mirror) reads the resources from
+          the local mirror kept by the M(oneview_resource_mirror) module, without logging in to the appliance. The
+          resources are looked up by name or URI in the mirror too, and the C(options) are not supported.
+        - The mirror supports the params C(start), C(count), C(sort) and C(filter), with comparisons like
+          C(name='value') or C(status<>'OK').
+        default: appliance
+        choices: ['appliance', 'mirror']
+        required: false
+    mirror:
+        description:
+        - Path of the SQLite database of the mirror. Defaults to the C(ONEVIEW_MIRROR_DB) environment variable, or
+          to C(oneview/mirror.db) in the cache directory of the user, C(XDG_CACHE_HOME) or C(~/.cache). The database
+          is created only readable by its owner.
+        required: false
+'''
@@ -26,6 +26,9 @@ module: hpe_icsp_os_deployment
 short_description: Deploy the operating system on a server using HPE ICsp.
 description:
     - Deploy the operating system on a server based on the available ICsp OS build plan.
+    - When C(servers) is provided, the operating system is deployed on all the servers at once. The servers are
+      added to ICsp jobs with several C(serverData) entries, the jobs run in parallel and are monitored together,
+      and the outcome of each server is returned.
 requirements:
     - "python >= 2.7.9"
     - "hpICsp >= 1.0.2"
@@ -73,6 +76,25 @@ options:
       - Personality Data.
     required: false
     default: null
+  servers:
+    description:
+      - List with the servers to deploy at once. Each server has the C(server_ipAddress) or the C(server_id) and
+        optionally its own C(custom_attributes) and C(personality_data), which default to the options of the task.
+      - When provided, C(server_id) and C(server_ipAddress) are ignored.
+    required: false
+    default: null
+  session_cache:
+    description:
+      - Path of the JSON file caching the ICsp sessions by host and user name, and the build plan URIs, so the
+        tasks reuse them instead of logging in again. Defaults to the C(ICSP_SESSION_CACHE) environment variable.
+        When neither is set, the sessions are not cached.
+    required: false
+  job_size:
+    description:
+      - Maximum number of servers added to each ICsp job when C(servers) is provided. The jobs run in parallel.
+        The default, 0, adds all the servers to a single job.
+    required: false
+    default: 0
 '''
 
 EXAMPLES = '''
@@ -87,6 +109,23 @@ EXAMPLES = '''
     custom_attributes: "{{ osbp_custom_attributes }}"
     personality_data: "{{ network_config }}"
   delegate_to: localhost
+
+- name: Deploy OS on all the servers of a rack at once, 16 servers per job
+  hpe_icsp_os_deployment:
+    icsp_host: "{{ icsp }}"
+    username: "{{ icsp_username }}"
+    password: "{{ icsp_password }}"
+    os_build_plan: "{{ os_build_plan }}"
+    custom_attributes: "{{ osbp_custom_attributes }}"
+    servers:
+      - server_ipAddress: "172.16.100.10"
+        personality_data: "{{ network_config_10 }}"
+      - server_ipAddress: "172.16.100.11"
+        personality_data: "{{ network_config_11 }}"
+      - server_id: "VCGYZ33007"
+    session_cache: /path/to/icsp-sessions.json
+    job_size: 16
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -94,6 +133,12 @@ icsp_server:
     description: Has the facts about the server that was provisioned with ICsp.
     returned: When the module runs successfully, but can be null.
     type: dict
+
+icsp_deployments:
+    description: Has the outcome of each server, with its C(status) (deployed, already_deployed, not_found or
+                 failed), the C(msg) of the failures and the facts about the C(server).
+    returned: When servers is provided.
+    type: list
 '''
 
 from future import standard_library
@@ -103,7 +148,11 @@ standard_library.install_aliases()
 import time
 import hpICsp
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.icsp import ICspHelper
+from ansible.module_utils.icsp import ICspHelper, ICspSessionCache
+
+SERVER_LOOKUP_TIMEOUT = 600
+SERVER_LOOKUP_INTERVAL = 30
+JOB_POLL_INTERVAL = 30
 
 
 def deploy_server(module):
@@ -125,11 +174,12 @@ def deploy_server(module):
             msg='No server information provided. Param \"server_id\" or \"server_ipAddress\" must be specified.')
 
     con = hpICsp.connection(icsp_host, icsp_api_version)
-    icsphelper = ICspHelper(con)
+    session_cache = ICspSessionCache(module.params.get('session_cache'))
+    icsphelper = ICspHelper(con, session_cache)
 
     # Create objects for all necessary resources.
     credential = {'userName': username, 'password': password}
-    con.login(credential)
+    session_cache.login(con, credential)
 
     jb = hpICsp.jobs(con)
     sv = hpICsp.servers(con)
@@ -139,7 +189,7 @@ def deploy_server(module):
     if bp is None:
         return module.fail_json(msg='Cannot find OS Build plan: ' + os_build_plan)
 
-    timeout = 600
+    timeout = SERVER_LOOKUP_TIMEOUT
     while True:
         if ilo_address:
             server = icsphelper.get_server_by_ilo_address(ilo_address)
@@ -150,23 +200,15 @@ def deploy_server(module):
         if timeout < 0:
             module.fail_json(msg='Cannot find server in ICSP.')
             return
-        timeout -= 30
-        time.sleep(30)
+        timeout -= SERVER_LOOKUP_INTERVAL
+        time.sleep(SERVER_LOOKUP_INTERVAL)
 
     server = sv.get_server(server['uri'])
     if server['state'] == 'OK':
         return module.exit_json(changed=False, msg="Server already deployed.", ansible_facts={'icsp_server': server})
 
     if custom_attributes:
-        ca_list = []
-
-        for ca in custom_attributes:
-            ca_list.append({
-                'key': list(ca.keys())[0],
-                'values': [{'scope': 'server', 'value': str(list(ca.values())[0])}]})
-
-        ca_list.extend(server['customAttributes'])
-        server['customAttributes'] = ca_list
+        server['customAttributes'] = build_custom_attributes(server, custom_attributes)
         sv.update_server(server)
 
     server_data = {"serverUri": server['uri'], "personalityData": None}
@@ -186,6 +228,190 @@ def deploy_server(module):
     return module.exit_json(changed=True, msg='OS Deployed Successfully.', ansible_facts={'icsp_server': server})
 
 
+def build_custom_attributes(server, custom_attributes):
+    ca_list = []
+
+    for ca in custom_attributes:
+        ca_list.append({
+            'key': list(ca.keys())[0],
+            'values': [{'scope': 'server', 'value': str(list(ca.values())[0])}]})
+
+    ca_list.extend(server['customAttributes'])
+    return ca_list
+
+
+def find_servers(icsphelper, deployments):
+    """
+    Looks up the servers of the deployments, retrying the ones not registered in ICsp yet until the timeout.
+    """
+    icsphelper.index_servers()
+
+    timeout = SERVER_LOOKUP_TIMEOUT
+    while True:
+        for deployment in deployments:
+            if deployment['uri']:
+                continue
+            if deployment['server_ipAddress']:
+                server = icsphelper.get_server_by_ilo_address(deployment['server_ipAddress'])
+            else:
+                server = icsphelper.get_server_by_serial(deployment['server_id'])
+            if server:
+                deployment['uri'] = server['uri']
+
+        if all(deployment['uri'] for deployment in deployments) or timeout < 0:
+            break
+        timeout -= SERVER_LOOKUP_INTERVAL
+        time.sleep(SERVER_LOOKUP_INTERVAL)
+
+    for deployment in deployments:
+        if not deployment['uri']:
+            deployment.update(status='not_found', msg='Cannot find server in ICSP.')
+
+
+def run_jobs(jb, deployments, job_size, build_job_body):
+    """
+    Adds the jobs with the serverData of the deployments, job_size servers per job, and monitors them together
+    until none is running. The deployments that failed in a finished job are marked as failed.
+    """
+    job_size = job_size or len(deployments)
+    jobs = []
+    for index in range(0, len(deployments), job_size):
+        batch = deployments[index:index + job_size]
+        jobs.append((batch, jb.add_job(build_job_body([deployment['server_data'] for deployment in batch]))))
+
+    running = []
+    for batch, job in jobs:
+        if job and 'uri' in job:
+            running.append((batch, job['uri']))
+        else:
+            for deployment in batch:
+                deployment.update(status='failed', msg='Failed to Start Job')
+
+    while running:
+        still_running = []
+        for batch, job_uri in running:
+            status = jb.get_job(job_uri)
+            if status.get('running') == 'true':
+                still_running.append((batch, job_uri))
+            else:
+                mark_failed_servers(status, job_uri, batch)
+
+        running = still_running
+        if running:
+            time.sleep(JOB_POLL_INTERVAL)
+
+
+def mark_failed_servers(status, job_uri, batch):
+    """
+    Marks the deployments that failed in a finished job, from the status of each server in the jobServerInfo of
+    the job and the log of each server in its jobResult. When the job has no information by server, all the
+    deployments of a failed job are marked as failed.
+    """
+    succeeded = ('STATUS_SUCCESS', 'STATUS_PENDING')
+    server_states = dict((info.get('jobServerUri'), info['jobStatus'])
+                         for info in status.get('jobServerInfo') or [] if info.get('jobStatus'))
+    results = status.get('jobResult') or []
+    server_results = dict((result.get('jobServerUri'), result) for result in results if result.get('jobServerUri'))
+
+    for deployment in batch:
+        if server_states:
+            failed = server_states.get(deployment['uri']) not in succeeded
+        else:
+            failed = status.get('state') not in succeeded
+        if not failed:
+            continue
+
+        msg = status.get('name', job_uri) + ' failed to complete'
+        result = server_results.get(deployment['uri']) or (results[0] if results and not server_results else None)
+        if result:
+            msg += '\n' + result.get('jobResultLogDetails', '')
+        deployment.update(status='failed', msg=msg)
+
+
+def deploy_servers(module):
+    icsp_host = module.params['icsp_host']
+    icsp_api_version = module.params['api_version']
+    username = module.params['username']
+    password = module.params['password']
+
+    os_build_plan = module.params['os_build_plan']
+    job_size = module.params.get('job_size')
+
+    deployments = []
+    for target in module.params['servers']:
+        if not target.get('server_ipAddress') and not target.get('server_id'):
+            return module.fail_json(
+                msg='No server information provided. Param \"server_id\" or \"server_ipAddress\" must be '
+                    'specified for each server.')
+        deployments.append(dict(server_id=target.get('server_id'),
+                                server_ipAddress=target.get('server_ipAddress'),
+                                custom_attributes=target.get('custom_attributes', module.params['custom_attributes']),
+                                personality_data=target.get('personality_data', module.params['personality_data']),
+                                uri=None, status=None, msg=None, server=None))
+
+    con = hpICsp.connection(icsp_host, icsp_api_version)
+    session_cache = ICspSessionCache(module.params.get('session_cache'))
+    icsphelper = ICspHelper(con, session_cache)
+
+    credential = {'userName': username, 'password': password}
+    session_cache.login(con, credential)
+
+    jb = hpICsp.jobs(con)
+    sv = hpICsp.servers(con)
+
+    bp = icsphelper.get_build_plan(os_build_plan)
+
+    if bp is None:
+        return module.fail_json(msg='Cannot find OS Build plan: ' + os_build_plan)
+
+    find_servers(icsphelper, deployments)
+
+    to_deploy = []
+    for deployment in deployments:
+        if deployment['status']:
+            continue
+        server = sv.get_server(deployment['uri'])
+        if server['state'] == 'OK':
+            deployment.update(status='already_deployed', server=server)
+            continue
+
+        if deployment['custom_attributes']:
+            server['customAttributes'] = build_custom_attributes(server, deployment['custom_attributes'])
+            sv.update_server(server)
+
+        deployment['server_data'] = {"serverUri": server['uri'], "personalityData": None}
+        to_deploy.append(deployment)
+
+    if to_deploy:
+        run_jobs(jb, to_deploy, job_size,
+                 lambda server_data: {"osbpUris": [bp['uri']], "serverData": server_data, "stepNo": 1})
+
+    to_personalize = [deployment for deployment in to_deploy
+                      if not deployment['status'] and deployment['personality_data']]
+    for deployment in to_personalize:
+        deployment['server_data'] = dict(deployment['server_data'], personalityData=deployment['personality_data'])
+    if to_personalize:
+        run_jobs(jb, to_personalize, job_size, lambda server_data: {"serverData": server_data})
+
+    for deployment in to_deploy:
+        deployment.pop('server_data')
+        if not deployment['status']:
+            deployment.update(status='deployed', server=sv.get_server(deployment['uri']))
+
+    for deployment in deployments:
+        deployment.pop('custom_attributes')
+        deployment.pop('personality_data')
+
+    failed = [deployment for deployment in deployments if deployment['status'] in ('not_found', 'failed')]
+    if failed:
+        return module.fail_json(msg='OS deployment failed on {0} of {1} servers.'.format(len(failed), len(deployments)),
+                                icsp_deployments=deployments)
+
+    changed = any(deployment['status'] == 'deployed' for deployment in deployments)
+    return module.exit_json(changed=changed, msg='OS Deployed Successfully.',
+                            ansible_facts={'icsp_deployments': deployments})
+
+
 def main():
     module = AnsibleModule(
         argument_spec=dict(
@@ -197,10 +423,16 @@ def main():
             server_ipAddress=dict(required=False, type='str'),
             os_build_plan=dict(required=True, type='str'),
             custom_attributes=dict(required=False, type='list', default=None),
-            personality_data=dict(required=False, type='dict', default=None)
+            personality_data=dict(required=False, type='dict', default=None),
+            session_cache=dict(required=False, type='path'),
+            servers=dict(required=False, type='list', default=None),
+            job_size=dict(required=False, type='int', default=0)
         ))
 
-    deploy_server(module)
+    if module.params.get('servers'):
+        deploy_servers(module)
+    else:
+        deploy_server(module)
 
 
 if __name__ == '__main__':
@@ -81,6 +81,12 @@ options:
     description:
       - Additional data to send to ICsp.
     required: false
+  session_cache:
+    description:
+      - Path of the JSON file caching the ICsp sessions by host and user name, and the build plan URIs, so the
+        tasks reuse them instead of logging in again. Defaults to the C(ICSP_SESSION_CACHE) environment variable.
+        When neither is set, the sessions are not cached.
+    required: false
 '''
 
 EXAMPLES = '''
@@ -130,7 +136,7 @@ import json
 import hpICsp
 from hpICsp.exceptions import HPICspException
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.icsp import ICspHelper
+from ansible.module_utils.icsp import ICspHelper, ICspSessionCache
 
 
 class ICspServerModule(object):
@@ -148,6 +154,7 @@ class ICspServerModule(object):
         icsp_host=dict(required=True, type='str'),
         username=dict(required=True, type='str'),
         password=dict(required=True, type='str', no_log=True),
+        session_cache=dict(required=False, type='path'),
         # options
         state=dict(
             required=True,
@@ -163,8 +170,9 @@ class ICspServerModule(object):
 
     def __init__(self):
         self.module = AnsibleModule(argument_spec=self.argument_spec, supports_check_mode=False)
+        self.session_cache = ICspSessionCache(self.module.params.get('session_cache'))
         self.connection = self.__authenticate()
-        self.icsphelper = ICspHelper(self.connection)
+        self.icsphelper = ICspHelper(self.connection, self.session_cache)
 
     def run(self):
 
@@ -191,7 +199,7 @@ class ICspServerModule(object):
         con = hpICsp.connection(icsp_host, icsp_api_version)
 
         credential = {'userName': username, 'password': password}
-        con.login(credential)
+        self.session_cache.login(con, credential)
         return con
 
     def __present(self, target_server):
@@ -45,8 +45,12 @@ options:
           C(backup_create) will create a Backup for the Artifact Bundle.
           C(extract) will extract an Artifact Bundle.
           C(backup_extract) will extract an Artifact Bundle from the Backup.
+          C(multiple_backups_downloaded) will create the Backup of each of several Deployment Groups and download
+          its archive to a directory, one Deployment Group after the other, since the appliance keeps a single
+          Backup bundle at a time.
+          The downloads are skipped when the file is up to date, and resumed when the connection fails.
       choices: ['present', 'absent', 'download', 'archive_download',
-                'backup_upload', 'backup_create', 'extract', 'backup_extract']
+                'backup_upload', 'backup_create', 'extract', 'backup_extract', 'multiple_backups_downloaded']
       required: true
     data:
       description:
@@ -129,6 +133,17 @@ EXAMPLES = '''
       deploymentGroupURI: '/rest/deployment-groups/c5a727ef-71e9-4154-a512-6655b168c2e3'
   delegate_to: localhost
 
+- name: Back up several Deployment Groups and download their archives
+  image_streamer_artifact_bundle:
+    config: "{{ config }}"
+    state: multiple_backups_downloaded
+    data:
+      deploymentGroups:
+        - 'OSS'
+        - '/rest/deployment-groups/c5a727ef-71e9-4154-a512-6655b168c2e3'
+      destinationDirectory: '~/backups'
+  delegate_to: localhost
+
 - name: Update an Artifact Bundle
   image_streamer_artifact_bundle:
     config: "{{ config }}"
@@ -157,9 +172,19 @@ artifact_bundle_deployment_group:
     description: Has the OneView facts about the Deployment Group.
     returned: On state 'backup_extract', 'backup_upload', and 'backup_create'.
     type: dict
+
+artifact_bundle_backups:
+    description: Has, for each Deployment Group, the Backup URI, the path and size of the downloaded archive, the
+                 seconds taken by the download and its throughput in bytes per second.
+    returned: On state 'multiple_backups_downloaded'.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, compare
+import os
+import time
+
+from ansible.module_utils.oneview import (OneViewModule, OneViewModuleResourceNotFound, FileChecksumCache, compare,
+                                          download_file)
 
 
 class ArtifactBundleModule(OneViewModule):
@@ -177,12 +202,14 @@ class ArtifactBundleModule(OneViewModule):
     MSG_BACKUP_EXTRACTED = 'Artifact Bundle extracted successfully.'
     MSG_REQUIRED = "An existing Artifact Bundle is required."
     MSG_BACKUP_REQUIRED = "An existing Backup is required"
+    MSG_DEPLOYMENT_GROUP_NOT_FOUND = 'Deployment Group not found: '
+    MSG_MULTIPLE_BACKUPS_DOWNLOADED = 'Backups of the Deployment Groups created and downloaded successfully.'
 
     argument_spec = dict(
         state=dict(
             required=True,
             choices=['present', 'absent', 'download', 'archive_download', 'backup_create',
-                     'backup_upload', 'extract', 'backup_extract']
+                     'backup_upload', 'extract', 'backup_extract', 'multiple_backups_downloaded']
         ),
         data=dict(required=True, type='dict')
     )
@@ -211,6 +238,8 @@ class ArtifactBundleModule(OneViewModule):
             changed, msg, ansible_facts = self.__extract()
         elif self.state == 'backup_extract':
             changed, msg, ansible_facts = self.__extract_backup()
+        elif self.state == 'multiple_backups_downloaded':
+            changed, msg, ansible_facts = self.__download_multiple_backups()
 
         return dict(msg=msg, changed=changed, ansible_facts=ansible_facts)
 
@@ -249,8 +278,8 @@ class ArtifactBundleModule(OneViewModule):
     def __download(self):
         if not self.current_resource:
             raise OneViewModuleResourceNotFound(self.MSG_REQUIRED)
-        self.current_resource.download(self.data['destinationFilePath'])
-        return False, self.MSG_DOWNLOADED, {}
+        changed = self.__download_file(self.resource_client.DOWNLOAD_PATH, self.current_resource.data['uri'])
+        return changed, self.MSG_DOWNLOADED, {}
 
     def __extract(self):
         if not self.current_resource:
@@ -263,22 +292,76 @@ class ArtifactBundleModule(OneViewModule):
         return True, self.MSG_BACKUP_CREATED, dict(artifact_bundle_deployment_group=self.current_resource.data)
 
     def __download_archive(self):
-        self.allbackups = self.resource_client.get_all_backups()
-        if len(self.allbackups) == 0:
-            raise OneViewModuleResourceNotFound(self.MSG_BACKUP_REQUIRED)
+        self.current_resource = self.__get_backup(self.data.get('deploymentGroupURI'))
+        changed = self.__download_file(self.resource_client.BACKUP_ARCHIVE_PATH, self.current_resource.data['uri'])
+        return changed, self.MSG_ARCHIVE_DOWNLOADED, {}
 
-        self.current_resource = self.resource_client.get_backup(self.allbackups[0]['uri'])
-        self.current_resource.download_archive(self.data['destinationFilePath'])
-        return False, self.MSG_ARCHIVE_DOWNLOADED, {}
+    def __download_file(self, download_path, uri):
+        download_uri = download_path + '/' + uri.split('/')[-1]
+        return download_file(self.i3s_client.connection, download_uri, self.data['destinationFilePath'])[0]
 
     def __extract_backup(self):
+        self.current_resource = self.__get_backup(self.data.get('deploymentGroupURI'))
+        resource = self.current_resource.extract_backup(self.data)
+        return True, self.MSG_BACKUP_EXTRACTED, dict(artifact_bundle_deployment_group=resource)
+
+    def __get_backup(self, deployment_group_uri=None):
         self.allbackups = self.resource_client.get_all_backups()
-        if len(self.allbackups) == 0:
+        backups = self.allbackups
+        if deployment_group_uri:
+            backups = [backup for backup in backups if backup.get('deploymentGroupURI') == deployment_group_uri]
+        if len(backups) == 0:
             raise OneViewModuleResourceNotFound(self.MSG_BACKUP_REQUIRED)
 
-        self.current_resource = self.resource_client.get_backup(self.allbackups[0]['uri'])
-        resource = self.current_resource.extract_backup(self.data)
-        return True, self.MSG_BACKUP_EXTRACTED, dict(artifact_bundle_deployment_group=resource)
+        return self.resource_client.get_backup(backups[0]['uri'])
+
+    def __download_multiple_backups(self):
+        deployment_groups = [self.__get_deployment_group(deployment_group)
+                             for deployment_group in self.data['deploymentGroups']]
+
+        # The appliance keeps a single backup bundle, so each backup is downloaded before the next one is created
+        checksum_cache = FileChecksumCache()
+        try:
+            results = [self.__back_up_deployment_group(deployment_group, checksum_cache)
+                       for deployment_group in deployment_groups]
+        finally:
+            checksum_cache.save()
+
+        return True, self.MSG_MULTIPLE_BACKUPS_DOWNLOADED, dict(artifact_bundle_backups=results)
+
+    def __get_deployment_group(self, name_or_uri):
+        if name_or_uri.startswith('/rest/'):
+            deployment_group = self.i3s_client.deployment_groups.get(name_or_uri)
+        else:
+            deployment_group = self.i3s_client.deployment_groups.get_by_name(name_or_uri)
+        if not deployment_group:
+            raise OneViewModuleResourceNotFound(self.MSG_DEPLOYMENT_GROUP_NOT_FOUND + name_or_uri)
+        return deployment_group
+
+    def __back_up_deployment_group(self, deployment_group, checksum_cache):
+        self.resource_client.create_backup(dict(deploymentGroupURI=deployment_group['uri']))
+
+        backups = [backup for backup in self.resource_client.get_all_backups()
+                   if backup.get('deploymentGroupURI') == deployment_group['uri']]
+        if not backups:
+            raise OneViewModuleResourceNotFound(self.MSG_BACKUP_REQUIRED)
+        backup = backups[0]
+
+        destination = os.path.join(os.path.expanduser(self.data['destinationDirectory']),
+                                   '{0}-backup.zip'.format(deployment_group['name']))
+        download_uri = self.resource_client.BACKUP_ARCHIVE_PATH + '/' + backup['uri'].split('/')[-1]
+
+        started = time.time()
+        changed, result = download_file(self.i3s_client.connection, download_uri, destination, checksum_cache)
+        seconds = max(time.time() - started, 0.001)
+
+        return dict(deploymentGroup=deployment_group['name'],
+                    deploymentGroupURI=deployment_group['uri'],
+                    backupURI=backup['uri'],
+                    path=result['path'],
+                    size=result['size'],
+                    seconds=round(seconds, 3),
+                    bytesPerSecond=int(result['size'] / seconds) if changed else None)
 
     def __upload_backup(self):
         if self.data.get('localBackupArtifactBundleFilePath') and self.data.get('deploymentGroupURI'):
@@ -47,6 +47,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -107,7 +108,7 @@ class ArtifactBundleFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ArtifactBundleFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ArtifactBundleFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['artifact_bundles'])
         self.i3s_client = self.oneview_client.create_image_streamer_client()
         self.resource_client = self.i3s_client.artifact_bundles
 
@@ -119,7 +120,7 @@ class ArtifactBundleFactsModule(OneViewModule):
         elif self.options:
             ansible_facts = self.__gather_optional_facts(self.options)
         else:
-            ansible_facts['artifact_bundles'] = self.resource_client.get_all(**self.facts_params)
+            ansible_facts['artifact_bundles'] = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=ansible_facts)
 
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -96,7 +97,7 @@ class BuildPlanFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(BuildPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(BuildPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['build_plans'])
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -105,7 +106,7 @@ class BuildPlanFactsModule(OneViewModuleBase):
         if name:
             build_plans = self.i3s_client.build_plans.get_by("name", name)
         else:
-            build_plans = self.i3s_client.build_plans.get_all(**self.facts_params)
+            build_plans = self.get_all_resources(self.i3s_client.build_plans)
 
         return dict(changed=False, ansible_facts=dict(build_plans=build_plans))
 
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -118,7 +119,7 @@ class DeploymentPlanFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(DeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['deployment_plans'])
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -136,7 +137,7 @@ class DeploymentPlanFactsModule(OneViewModule):
                 environmental_configuration = self.i3s_client.deployment_plans.get_osdp(deployment_plan['uri'])
                 ansible_facts['deployment_plans'][0]['deployment_plan_osdp'] = environmental_configuration
         else:
-            ansible_facts['deployment_plans'] = self.i3s_client.deployment_plans.get_all(**self.facts_params)
+            ansible_facts['deployment_plans'] = self.get_all_resources(self.i3s_client.deployment_plans)
 
         return dict(changed=False, ansible_facts=ansible_facts)
 
@@ -39,6 +39,7 @@ options:
               C(absent) will remove the resource from Synergy Image Streamer, if it exists.
               C(downloaded) will download the Golden Image to the file path provided.
               C(archive_downloaded) will download the Golden Image archive to the file path provided.
+              The downloads are skipped when the file is up to date, and resumed when the connection fails.
         choices: ['present', 'absent', 'downloaded', 'archive_downloaded']
         required: true
     data:
@@ -135,7 +136,9 @@ golden_image:
     type: dict
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase, OneViewModuleValueError, OneViewModuleResourceNotFound, compare
+from ansible.module_utils.oneview import (OneViewModuleBase, OneViewModuleValueError, OneViewModuleResourceNotFound, compare,
+                                          download_file, upload_file)
+from ansible.module_utils.six.moves.urllib.parse import quote
 
 
 class GoldenImageModule(OneViewModuleBase):
@@ -209,7 +212,9 @@ class GoldenImageModule(OneViewModuleBase):
                 msg = self.MSG_CREATED
                 changed = True
             elif file_path:
-                resource = self.i3s_client.golden_images.upload(file_path, data)
+                resource = upload_file(self.i3s_client.connection,
+                                       self.__upload_uri(data),
+                                       file_path)[0]
                 msg = self.MSG_UPLOADED
                 changed = True
             else:
@@ -227,6 +232,11 @@ class GoldenImageModule(OneViewModuleBase):
 
         return changed, msg, dict(golden_image=resource)
 
+    def __upload_uri(self, data):
+        return '{0}?name={1}&description={2}'.format(self.i3s_client.golden_images.URI,
+                                                     quote(data.get('name', '')),
+                                                     quote(data.get('description', '')))
+
     def __replace_name_by_uris(self, data):
         vol_name = data.pop('osVolumeName', None)
         if vol_name:
@@ -250,12 +260,16 @@ class GoldenImageModule(OneViewModuleBase):
             raise OneViewModuleResourceNotFound(self.MSG_BUILD_PLAN_WAS_NOT_FOUND)
 
     def __download(self, data, resource):
-        self.i3s_client.golden_images.download(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_DOWNLOADED, {}
+        changed = self.__download_file('/download/', resource['uri'], data['destination_file_path'])
+        return changed, self.MSG_DOWNLOADED, {}
 
     def __download_archive(self, data, resource):
-        self.i3s_client.golden_images.download_archive(resource['uri'], data['destination_file_path'])
-        return True, self.MSG_ARCHIVE_DOWNLOADED, {}
+        changed = self.__download_file('/archive/', resource['uri'], data['destination_file_path'])
+        return changed, self.MSG_ARCHIVE_DOWNLOADED, {}
+
+    def __download_file(self, download_path, uri, destination_file_path):
+        download_uri = self.i3s_client.golden_images.URI + download_path + uri.split('/')[-1]
+        return download_file(self.i3s_client.connection, download_uri, destination_file_path)[0]
 
 
 def main():
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -95,7 +96,7 @@ class GoldenImageFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(GoldenImageFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(GoldenImageFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['golden_images'])
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -106,7 +107,7 @@ class GoldenImageFactsModule(OneViewModuleBase):
         if name:
             golden_images = self.i3s_client.golden_images.get_by("name", name)
         else:
-            golden_images = self.i3s_client.golden_images.get_all(**self.facts_params)
+            golden_images = self.get_all_resources(self.i3s_client.golden_images)
 
         ansible_facts['golden_images'] = golden_images
 
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -99,7 +100,7 @@ class PlanScriptFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(PlanScriptFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(PlanScriptFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['plan_scripts'])
         self.i3s_client = self.oneview_client.create_image_streamer_client()
 
     def execute_module(self):
@@ -110,7 +111,7 @@ class PlanScriptFactsModule(OneViewModuleBase):
         if name:
             plan_scripts = self.i3s_client.plan_scripts.get_by("name", name)
         else:
-            plan_scripts = self.i3s_client.plan_scripts.get_all(**self.facts_params)
+            plan_scripts = self.get_all_resources(self.i3s_client.plan_scripts)
 
         ansible_facts['plan_scripts'] = plan_scripts
 
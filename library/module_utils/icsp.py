@@ -21,47 +21,204 @@ from __future__ import (absolute_import,
                         print_function,
                         unicode_literals)
 
+import json
+import os
+import tempfile
+import time
+
 from future import standard_library
 from six.moves.urllib.parse import quote
 
 standard_library.install_aliases()
 
+LOGIN_SESSIONS_URI = '/rest/login-sessions'
+
+
+class ICspSessionCache(object):
+    """
+    Caches the ICsp login sessions and the build plan URIs in a JSON file, so the tasks of a play reuse them
+    instead of logging in and searching the build plans again.
+
+    The sessions are kept by host and user name, and expire after ttl seconds without use. The build plan URIs are
+    kept by host and name for the same time.
+
+    The cache file is read from the C(ICSP_SESSION_CACHE) environment variable when no path is given. Without a
+    path, the cache is kept in memory only.
+    """
+    SESSION_TTL = 20 * 60
+
+    def __init__(self, path=None, ttl=SESSION_TTL):
+        self.path = path or os.environ.get('ICSP_SESSION_CACHE')
+        self.ttl = ttl
+        self.data = dict(sessions={}, build_plans={})
+        if self.path:
+            try:
+                with open(self.path) as cache_file:
+                    self.data.update(json.load(cache_file))
+            except (IOError, OSError, ValueError):
+                pass
+
+    def login(self, connection, credential):
+        """
+        Logs in to ICsp, reusing the cached session of the host and user name when it has not expired. The
+        connection logs in again when a request is answered with 401, as the session may have been closed on ICsp.
+
+        Args:
+            connection (connection): ICsp connection.
+            credential (dict): The userName and password.
+        """
+        key = self.__key(connection.get_host(), credential['userName'])
+        session = self.__get_valid(self.data['sessions'], key)
+        if session:
+            connection._headers['auth'] = session['id']
+            session['used'] = time.time()
+        else:
+            self.__login(connection, key, credential)
+        self.__relogin_when_unauthorized(connection, key, credential)
+        self.save()
+
+    def get_build_plan_uri(self, host, name):
+        build_plan = self.__get_valid(self.data['build_plans'], self.__key(host, name))
+        return build_plan['uri'] if build_plan else None
+
+    def set_build_plan_uri(self, host, name, uri):
+        self.data['build_plans'][self.__key(host, name)] = dict(uri=uri, used=time.time())
+        self.save()
+
+    def save(self):
+        """
+        Writes the cache, replacing the cache file atomically. The file is only readable by its owner, since it
+        holds session IDs. Failures are ignored, since the cache is optional.
+        """
+        if not self.path:
+            return
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            with os.fdopen(file_descriptor, 'w') as cache_file:
+                json.dump(self.data, cache_file)
+            os.rename(temp_path, self.path)
+        except (IOError, OSError):
+            pass
+
+    def __login(self, connection, key, credential):
+        connection.login(credential)
+        self.data['sessions'][key] = dict(id=connection.get_session_id(), used=time.time())
+
+    def __relogin_when_unauthorized(self, connection, key, credential):
+        do_http = connection.do_http
+
+        def do_http_with_relogin(method, path, body):
+            response, response_body = do_http(method, path, body)
+            if response.status == 401 and path != LOGIN_SESSIONS_URI:
+                self.__login(connection, key, credential)
+                self.save()
+                response, response_body = do_http(method, path, body)
+            return response, response_body
+
+        connection.do_http = do_http_with_relogin
+
+    def __get_valid(self, entries, key):
+        entry = entries.get(key)
+        if entry and time.time() - entry['used'] < self.ttl:
+            return entry
+        entries.pop(key, None)
+        return None
+
+    def __key(self, host, name):
+        return '{0}|{1}'.format(host, name)
+
 
 class ICspHelper(object):
+    SERVERS_URI = '/rest/os-deployment-servers/'
+    SERVER_SEARCH_URI = '/rest/index/resources?category=osdserver&'
 
-    def __init__(self, connection):
+    def __init__(self, connection, session_cache=None):
         """
         ICspHelper constructor.
 
         Args:
             connection (connection): ICsp connection.
+            session_cache (ICspSessionCache): Cache of the build plan URIs. Optional.
         """
         self.connection = connection
+        self.session_cache = session_cache
+        self.servers_by_ilo = None
+        self.servers_by_serial = None
 
     def get_build_plan(self, bp_name):
+        if self.session_cache:
+            bp_uri = self.session_cache.get_build_plan_uri(self.connection.get_host(), bp_name)
+            if bp_uri:
+                return {'name': bp_name, 'uri': bp_uri}
+
         search_uri = '/rest/index/resources?filter="name=\'' + quote(bp_name) + '\'"&category=osdbuildplan'
         search_result = self.connection.get(search_uri)
 
         if search_result['count'] > 0 and search_result['members'][0]['name'] == bp_name:
+            if self.session_cache:
+                self.session_cache.set_build_plan_uri(self.connection.get_host(), bp_name,
+                                                      search_result['members'][0]['uri'])
             return search_result['members'][0]
         return None
 
+    def index_servers(self, page_size=500):
+        """
+        Builds the in-memory index of the ICsp servers by iLO address and by serial number, reading the servers
+        page by page. The lookups made afterwards are answered from the index, and only the servers registered
+        after it was built are searched for.
+
+        Args:
+            page_size (int): Number of servers read at once.
+        """
+        self.servers_by_ilo = {}
+        self.servers_by_serial = {}
+
+        start = 0
+        while True:
+            page = self.connection.get(self.SERVERS_URI + '?start={0}&count={1}'.format(start, page_size))
+            members = page.get('members') or []
+            for srv in members:
+                self.__index_server(srv)
+
+            start += len(members)
+            if len(members) < page_size or start >= page.get('total', start + 1):
+                break
+
     def get_server_by_ilo_address(self, ilo):
-        servers = self.connection.get("/rest/os-deployment-servers/?count=-1")
-        for srv in servers['members']:
-            if srv['ilo']:
-                if srv['ilo']['ipAddress'] == ilo:
-                    return srv
+        if self.servers_by_ilo and ilo in self.servers_by_ilo:
+            return self.servers_by_ilo[ilo]
+
+        search_uri = self.SERVER_SEARCH_URI + 'userQuery=' + quote('"' + ilo + '"')
+        search_result = self.connection.get(search_uri)
+        for member in search_result.get('members') or []:
+            server_id = (member.get('attributes') or {}).get('osdServerId')
+            if not server_id:
+                continue
+            srv = self.connection.get(self.SERVERS_URI + server_id)
+            if srv.get('ilo') and srv['ilo'].get('ipAddress') == ilo:
+                self.__index_server(srv)
+                return srv
         return None
 
     def get_server_by_serial(self, serial):
-        search_uri = '/rest/index/resources?category=osdserver&query=\'osdServerSerialNumber:\"' + serial + '\"\''
+        if self.servers_by_serial and serial in self.servers_by_serial:
+            return {'uri': self.servers_by_serial[serial]['uri']}
+
+        search_uri = self.SERVER_SEARCH_URI + 'query=\'osdServerSerialNumber:\"' + serial + '\"\''
         search_result = self.connection.get(search_uri)
         if search_result['count'] > 0:
             same_serial_number = search_result['members'][0]['attributes']['osdServerSerialNumber'] == serial
 
             if same_serial_number:
                 server_id = search_result['members'][0]['attributes']['osdServerId']
-                server = {'uri': '/rest/os-deployment-servers/' + server_id}
+                server = {'uri': self.SERVERS_URI + server_id}
                 return server
         return None
+
+    def __index_server(self, srv):
+        if self.servers_by_ilo is None:
+            return
+        if srv.get('ilo') and srv['ilo'].get('ipAddress'):
+            self.servers_by_ilo[srv['ilo']['ipAddress']] = srv
+        if srv.get('serialNumber'):
+            self.servers_by_serial[srv['serialNumber']] = srv
@@ -19,18 +19,40 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 
 import abc
+import binascii
 import collections
+import hashlib
+import inspect
 import json
 import logging
+import mmap
 import os
+import re
+import socket
+import sqlite3
+import ssl
+import sys
+import tempfile
+import threading
+import time
 import traceback
 
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
 try:
     from hpeOneView.oneview_client import OneViewClient
+    from hpeOneView.resources.task_monitor import TaskMonitor
     HAS_HPE_ONEVIEW = True
 except ImportError:
     HAS_HPE_ONEVIEW = False
 
+try:
+    import amqp
+    HAS_AMQP = True
+except ImportError:
+    HAS_AMQP = False
+
 try:
     from ansible.module_utils import six
     from ansible.module_utils._text import to_native
@@ -38,6 +60,8 @@ except ImportError:
     import six
     to_native = str
 
+http_client = six.moves.http_client
+
 from ansible.module_utils.basic import AnsibleModule
 
 
@@ -71,6 +95,162 @@ def get_logger(mod_name):
     return logger
 
 
+def project_fields(data, fields):
+    """
+    Trims a resource, or a list of resources, to the given fields.
+
+    Nested fields are selected with dots, e.g.: C(powerState) or C(processor.count).
+
+    :arg data: Resource dictionary or list of resources.
+    :arg list fields: Names of the fields to keep.
+    :return: The projected resource or list of resources.
+    """
+    if isinstance(data, list):
+        return [project_fields(item, fields) for item in data]
+    if not isinstance(data, collections.Mapping):
+        return data
+
+    nested_fields = OrderedDict()
+    for field in fields:
+        key, _, nested_field = to_native(field).partition('.')
+        nested_fields.setdefault(key, []).append(nested_field)
+
+    projected = {}
+    for key, nested in nested_fields.items():
+        if key not in data:
+            continue
+        if '' in nested:
+            projected[key] = data[key]
+        else:
+            projected[key] = project_fields(data[key], nested)
+
+    return projected
+
+
+def compact_resource(data, nested=False):
+    """
+    Compacts a resource, or a list of resources, to reduce the size of the result.
+
+    The null values, empty lists and empty dictionaries are removed, and the nested references holding only an uri
+    are replaced by the uri itself.
+
+    :arg data: Resource dictionary or list of resources.
+    :arg bool nested: Whether the data is a value nested in a resource.
+    :return: The compacted resource or list of resources.
+    """
+    if isinstance(data, list):
+        return [compact_resource(item, nested) for item in data]
+    if not isinstance(data, collections.Mapping):
+        return data
+
+    compacted = {}
+    for key, value in data.items():
+        value = compact_resource(value, nested=True)
+        if value is None or value == [] or value == {}:
+            continue
+        compacted[key] = value
+
+    if nested and list(compacted.keys()) == ['uri']:
+        return compacted['uri']
+    return compacted
+
+
+def write_json_lines(records, directory=None, prefix='oneview-'):
+    """
+    Writes the records to a new JSON Lines file, one record per line.
+
+    :arg list records: Records to write.
+    :arg str directory: Directory of the file. Defaults to the temporary directory.
+    :arg str prefix: Prefix of the file name.
+    :return: str: Path of the file.
+    """
+    if not isinstance(records, list):
+        records = [records]
+
+    file_descriptor, path = tempfile.mkstemp(prefix=prefix, suffix='.jsonl', dir=directory)
+    with os.fdopen(file_descriptor, 'w') as json_lines_file:
+        for record in records:
+            json_lines_file.write(json.dumps(record, sort_keys=True) + '\n')
+    return path
+
+
+def _is_resource(value):
+    if isinstance(value, list):
+        return bool(value) and all(_is_resource(item) for item in value)
+    return isinstance(value, collections.Mapping) and 'uri' in value
+
+
+def _accepts_argument(function, name):
+    try:
+        if hasattr(inspect, 'signature'):
+            return name in inspect.signature(function).parameters
+        return name in inspect.getargspec(function).args
+    except (TypeError, ValueError):
+        return False
+
+
+def get_all_resources(resource_client, params, fields=None):
+    """
+    Gets all the resources, asking the server to project the given fields when the API supports it.
+
+    The projection is requested through the C(fields) query param, either directly when the client get_all
+    accepts it, or through the resource helper of the client otherwise. The resources are returned as they are
+    when neither is available, and must be trimmed on the client.
+
+    :arg resource_client: OneView resource client.
+    :arg dict params: Params for get_all, such as start, count, filter, query and sort.
+    :arg list fields: Names of the fields to keep.
+    :return: list: Resources.
+    """
+    if not fields:
+        return resource_client.get_all(**params)
+
+    params = dict(params)
+    params.setdefault('fields', ','.join(OrderedDict((to_native(f).split('.')[0], True) for f in fields)))
+
+    if _accepts_argument(resource_client.get_all, 'fields'):
+        return resource_client.get_all(**params)
+
+    helper = getattr(resource_client, '_helper', None)
+    if helper is not None and _accepts_argument(helper.get_all, 'fields'):
+        return helper.get_all(**params)
+
+    params.pop('fields')
+    return resource_client.get_all(**params)
+
+
+FILTER_CHUNK_SIZE = 50
+
+
+def get_resources_by(resource_client, field, values, params=None, fields=None, chunk_size=FILTER_CHUNK_SIZE):
+    """
+    Gets the resources whose field has one of the values, such as the resources with the given names.
+
+    The values are looked up in chunks, with a query filtered by at most chunk_size values each, to keep the filter
+    of each query short. The filter of the params is kept in every query.
+
+    :arg resource_client: OneView resource client.
+    :arg str field: Name of the field compared, such as name or uri.
+    :arg list values: Values of the field.
+    :arg dict params: Params for get_all, such as filter and sort.
+    :arg list fields: Names of the fields to keep.
+    :arg int chunk_size: Maximum number of values of each query.
+    :return: list: Resources.
+    """
+    values = list(values)
+    params = dict(params or {})
+    base_filter = params.get('filter') or []
+    if not isinstance(base_filter, list):
+        base_filter = [base_filter]
+
+    resources = []
+    for start in range(0, len(values), chunk_size):
+        values_filter = ' OR '.join("{0}='{1}'".format(field, value) for value in values[start:start + chunk_size])
+        params['filter'] = base_filter + [values_filter] if base_filter else values_filter
+        resources.extend(get_all_resources(resource_client, params, fields) or [])
+    return resources
+
+
 def transform_list_to_dict(list_):
     """
     Transforms a list into a dictionary, putting values as keys.
@@ -275,6 +455,417 @@ def compare_list(first_resource, second_resource):
     return True
 
 
+def create_oneview_client(params):
+    """
+    Creates a OneViewClient from the connection params used by the modules.
+
+    The client is configured from the hostname and credentials when the hostname is provided, from the JSON
+    configuration file when the config path is provided, or from the environment variables otherwise.
+
+    :arg dict params: Connection params, such as hostname, username, password, api_version and config.
+    :return: OneViewClient: The authenticated client.
+    """
+    if params.get('hostname'):
+        config = dict(ip=params['hostname'],
+                      credentials=dict(userName=params.get('username'), password=params.get('password'),
+                                       authLoginDomain=params.get('auth_login_domain', '')),
+                      api_version=params.get('api_version'),
+                      image_streamer_ip=params.get('image_streamer_hostname'))
+        return OneViewClient(config)
+    elif not params.get('config'):
+        return OneViewClient.from_environment_variables()
+    else:
+        return OneViewClient.from_json_file(params['config'])
+
+
+def run_concurrently(function, items, max_workers=10):
+    """
+    Calls the function for each item using a pool of threads.
+
+    The calls are made sequentially when there is a single item or a single worker. The first exception raised
+    by a call is raised again once the pool is finished.
+
+    :arg function function: Function called with each item.
+    :arg list items: Items to process.
+    :arg int max_workers: Maximum number of concurrent calls.
+    :return: list: Results in the same order as the items.
+    """
+    items = list(items)
+    if max_workers is None or max_workers < 1:
+        max_workers = 1
+
+    if len(items) <= 1 or max_workers == 1:
+        return [function(item) for item in items]
+
+    pool = ThreadPool(min(max_workers, len(items)))
+    try:
+        return pool.map(function, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_RETRIES = 3
+UPLOAD_BOUNDARY = '----------OneViewAnsibleUploadBoundary'
+
+
+def upload_file(connection, uri, file_path, chunk_size=UPLOAD_CHUNK_SIZE, retries=UPLOAD_RETRIES, timeout=-1):
+    """
+    Uploads a file to OneView or Image Streamer as a multipart request.
+
+    The file is memory mapped and sent in chunks straight from the map, with the multipart envelope written around
+    it, so no encoded copy of the file is written to disk. The SHA-256 checksum of the file is computed while it is
+    sent. The upload is retried from the beginning when the connection fails, since the upload endpoints do not
+    accept partial content.
+
+    :arg connection: Connection of the OneView or Image Streamer client.
+    :arg str uri: Upload URI, with its query params.
+    :arg str file_path: Path of the file.
+    :arg int chunk_size: Number of bytes sent at once.
+    :arg int retries: Number of times the upload is retried after a connection failure.
+    :arg int timeout: Timeout in seconds to wait for the upload task. Waits for its completion by default.
+    :return: tuple: The uploaded resource and the file checksum.
+    """
+    for attempt in range(retries + 1):
+        try:
+            task, body, checksum = _post_file(connection, uri, file_path, chunk_size)
+            break
+        except (socket.error, http_client.HTTPException) as error:
+            if attempt == retries:
+                raise OneViewModuleException('Failed to upload {0}: {1}'.format(file_path, to_native(error)))
+            logger.warning('Upload of %s failed, retrying: %s', file_path, error)
+            time.sleep(2 ** attempt)
+
+    if not task:
+        return body, checksum
+    return TaskMonitor(connection).wait_for_task(task, timeout), checksum
+
+
+def _post_file(connection, uri, file_path, chunk_size):
+    file_name = os.path.basename(file_path)
+    header = ('--{0}\r\nContent-Disposition: form-data; name="file"; filename="{1}"\r\n'
+              'Content-Type: application/octet-stream\r\n\r\n').format(UPLOAD_BOUNDARY, file_name).encode('utf-8')
+    footer = '\r\n--{0}--\r\n\r\n'.format(UPLOAD_BOUNDARY).encode('utf-8')
+    file_size = os.path.getsize(file_path)
+    checksum = hashlib.sha256()
+
+    conn = connection.get_connection()
+    try:
+        conn.putrequest('POST', uri)
+        conn.putheader('uploadfilename', file_name)
+        conn.putheader('auth', connection._headers['auth'])
+        conn.putheader('Content-Type', 'multipart/form-data; boundary={0}'.format(UPLOAD_BOUNDARY))
+        conn.putheader('Content-Length', str(len(header) + file_size + len(footer)))
+        conn.putheader('X-API-Version', str(connection._apiVersion))
+        conn.endheaders()
+
+        conn.send(header)
+        with open(file_path, 'rb') as upload_file:
+            mapped_file = mmap.mmap(upload_file.fileno(), 0, access=mmap.ACCESS_READ) if file_size else None
+            try:
+                for offset in range(0, file_size, chunk_size):
+                    chunk = mapped_file[offset:offset + chunk_size]
+                    checksum.update(chunk)
+                    conn.send(chunk)
+            finally:
+                if mapped_file is not None:
+                    mapped_file.close()
+        conn.send(footer)
+
+        response = conn.getresponse()
+        body = response.read().decode('utf-8')
+    finally:
+        conn.close()
+
+    try:
+        body = json.loads(body) if body else None
+    except ValueError:
+        pass
+
+    if response.status >= 400:
+        raise OneViewModuleException(body)
+
+    task = None
+    if response.status == 202 and response.getheader('Location'):
+        task = connection.get(response.getheader('Location'))
+    elif isinstance(body, dict) and (body.get('category') == 'tasks' or 'taskState' in body):
+        task = body
+
+    return task, body, checksum.hexdigest()
+
+
+def user_cache_path(name):
+    """
+    Gets the path of a file in the OneView cache directory of the user, C(oneview) in C(XDG_CACHE_HOME) or in
+    C(~/.cache).
+
+    :arg str name: Name of the file.
+    :return: str: Path of the file.
+    """
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'oneview', name)
+
+
+class FileChecksumCache(object):
+    """
+    Caches the SHA-256 checksums of local files in a JSON file, so large files are hashed only once.
+
+    The checksum of a file is reused while its path, inode, size, modification and status change times are
+    unchanged. The cache also records the checksum of the file uploaded to each resource URI.
+
+    The cache file is read from the C(ONEVIEW_CHECKSUM_CACHE) environment variable when no path is given, and
+    defaults to C(oneview/checksums.json) in the cache directory of the user, C(XDG_CACHE_HOME) or C(~/.cache).
+    The cache file is only readable by its owner.
+    """
+    BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('ONEVIEW_CHECKSUM_CACHE') or user_cache_path('checksums.json')
+        self.data = dict(files={}, uploads={})
+        try:
+            with open(self.path) as cache_file:
+                self.data.update(json.load(cache_file))
+        except (IOError, OSError, ValueError):
+            pass
+
+    def checksum(self, file_path):
+        """
+        Gets the SHA-256 checksum of a file, hashing it only when it is not cached or was modified.
+        """
+        cached = self.__get_cached(file_path)
+        if cached:
+            return cached['sha256']
+
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as checksum_file:
+            for block in iter(lambda: checksum_file.read(self.BLOCK_SIZE), b''):
+                sha256.update(block)
+        self.store(file_path, sha256.hexdigest())
+        return sha256.hexdigest()
+
+    def store(self, file_path, checksum, etag=None):
+        key, stat = self.__file_key(file_path)
+        self.data['files'][key] = dict(inode=stat.st_ino, size=stat.st_size, mtime=stat.st_mtime, ctime=stat.st_ctime,
+                                       sha256=checksum, etag=etag)
+
+    def get_etag(self, file_path):
+        """
+        Gets the ETag of the remote content a file was downloaded from, while the file is unchanged.
+        """
+        cached = self.__get_cached(file_path)
+        return cached.get('etag') if cached else None
+
+    def get_uploaded(self, uri):
+        return self.data['uploads'].get(uri)
+
+    def set_uploaded(self, uri, checksum):
+        self.data['uploads'][uri] = checksum
+
+    def save(self):
+        """
+        Writes the cache, replacing the cache file atomically. The directory of the cache is created only
+        accessible by its owner when missing. Failures are ignored, since the cache is optional.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(file_descriptor, 'w') as cache_file:
+                json.dump(self.data, cache_file)
+            os.rename(temp_path, self.path)
+        except (IOError, OSError) as error:
+            logger.warning('Unable to save the checksum cache %s: %s', self.path, error)
+
+    def __get_cached(self, file_path):
+        try:
+            key, stat = self.__file_key(file_path)
+        except OSError:
+            return None
+        cached = self.data['files'].get(key)
+        if cached and [cached.get('inode'), cached['size'], cached['mtime'], cached.get('ctime')] == \
+                [stat.st_ino, stat.st_size, stat.st_mtime, stat.st_ctime]:
+            return cached
+        return None
+
+    def __file_key(self, file_path):
+        key = os.path.realpath(file_path)
+        return key, os.stat(key)
+
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_REDIRECTS = 5
+
+
+def download_file(connection, uri, destination, checksum_cache=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                  retries=UPLOAD_RETRIES):
+    """
+    Downloads a file from OneView or Image Streamer, skipping the download when the local file is up to date.
+
+    The local file is up to date when the remote ETag matches the ETag recorded when the file was downloaded, or
+    when the remote size matches the local size if there is no ETag. Otherwise, the content is streamed in chunks
+    to a partial file next to the destination, which is renamed atomically to the destination once the size and
+    the digest sent by the server are verified. When the connection fails, the download is resumed from the end
+    of the partial file with a Range request. The ETag, or the Last-Modified date, of the content is stored next
+    to the partial file and sent in the If-Range header, so the download restarts from the beginning when the
+    remote content changed. Partial files without a validator are downloaded again.
+
+    :arg connection: Connection of the OneView or Image Streamer client.
+    :arg str uri: Download URI.
+    :arg str destination: Path of the local file.
+    :arg FileChecksumCache checksum_cache: Cache recording the ETag of the downloaded files. A given cache is
+        shared by several downloads and saved by the caller, otherwise a new cache is created and saved.
+    :arg int chunk_size: Number of bytes read at once.
+    :arg int retries: Number of times the download is resumed after a connection failure.
+    :return: tuple: Whether the file was downloaded, and a dict with the path, size, ETag and SHA-256 checksum.
+    """
+    save_cache = checksum_cache is None
+    checksum_cache = checksum_cache or FileChecksumCache()
+    destination = os.path.expanduser(destination)
+    partial_path = destination + '.part'
+
+    for attempt in range(retries + 1):
+        try:
+            result = _get_file(connection, uri, destination, partial_path, checksum_cache, chunk_size)
+            break
+        except (socket.error, http_client.HTTPException) as error:
+            if attempt == retries:
+                raise OneViewModuleException('Failed to download {0}: {1}'.format(uri, to_native(error)))
+            logger.warning('Download of %s failed, resuming: %s', uri, error)
+            time.sleep(2 ** attempt)
+
+    if save_cache:
+        checksum_cache.save()
+    return result
+
+
+def _get_file(connection, uri, destination, partial_path, checksum_cache, chunk_size, redirects=0):
+    headers = {'auth': connection._headers['auth'], 'X-API-Version': str(connection._apiVersion)}
+    validator_path = partial_path + '.validator'
+    offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+    validator = _read_validator(validator_path) if offset else None
+    if validator:
+        headers['Range'] = 'bytes={0}-'.format(offset)
+        headers['If-Range'] = validator
+    else:
+        offset = 0
+        if checksum_cache.get_etag(destination):
+            headers['If-None-Match'] = checksum_cache.get_etag(destination)
+
+    conn = connection.get_connection()
+    try:
+        conn.request('GET', uri, None, headers)
+        response = conn.getresponse()
+
+        if response.status in (301, 302, 303, 307) and response.getheader('Location'):
+            if redirects >= DOWNLOAD_REDIRECTS:
+                raise OneViewModuleException('Too many redirects downloading {0}'.format(uri))
+            return _get_file(connection, response.getheader('Location'), destination, partial_path,
+                             checksum_cache, chunk_size, redirects + 1)
+        if response.status >= 400:
+            body = response.read().decode('utf-8', 'replace')
+            try:
+                body = json.loads(body)
+            except ValueError:
+                body = body or 'Error {0}'.format(response.status)
+            raise OneViewModuleException(body)
+
+        etag = response.getheader('ETag')
+        remote_size = _remote_size(response, offset)
+        if os.path.exists(destination) and not offset:
+            local_size = os.path.getsize(destination)
+            if response.status == 304 or (etag and etag == checksum_cache.get_etag(destination)) or \
+                    (not etag and remote_size is not None and remote_size == local_size):
+                etag = etag or checksum_cache.get_etag(destination)
+                return False, dict(path=destination, size=local_size, etag=etag,
+                                   checksum=checksum_cache.checksum(destination))
+
+        checksum = hashlib.sha256()
+        md5 = hashlib.md5()
+        mode = 'wb'
+        if offset and response.status == 206:
+            mode = 'ab'
+            with open(partial_path, 'rb') as partial_file:
+                for block in iter(lambda: partial_file.read(chunk_size), b''):
+                    checksum.update(block)
+                    md5.update(block)
+        else:
+            # The content is downloaded from the beginning, the partial file is truncated
+            _write_validator(validator_path, response)
+
+        with open(partial_path, mode) as partial_file:
+            for chunk in iter(lambda: response.read(chunk_size), b''):
+                checksum.update(chunk)
+                md5.update(chunk)
+                partial_file.write(chunk)
+    finally:
+        conn.close()
+
+    size = os.path.getsize(partial_path)
+    if remote_size is not None and size < remote_size:
+        # The connection was closed before the end of the content, the partial file is resumed
+        raise http_client.IncompleteRead(b'', remote_size - size)
+    _verify_download(response, partial_path, size, remote_size, checksum, md5)
+
+    os.rename(partial_path, destination)
+    if os.path.exists(validator_path):
+        os.remove(validator_path)
+    checksum_cache.store(destination, checksum.hexdigest(), etag)
+    return True, dict(path=destination, size=size, etag=etag, checksum=checksum.hexdigest())
+
+
+def _read_validator(validator_path):
+    try:
+        with open(validator_path) as validator_file:
+            return validator_file.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def _write_validator(validator_path, response):
+    # Weak ETags cannot be used in If-Range, the Last-Modified date is used instead
+    etag = response.getheader('ETag')
+    validator = etag if etag and not etag.startswith('W/') else response.getheader('Last-Modified')
+    if validator:
+        with open(validator_path, 'w') as validator_file:
+            validator_file.write(validator)
+    elif os.path.exists(validator_path):
+        os.remove(validator_path)
+
+
+def _remote_size(response, offset):
+    content_range = response.getheader('Content-Range')
+    if response.status == 206 and content_range and '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else None
+    content_length = response.getheader('Content-Length')
+    if content_length and content_length.isdigit():
+        return int(content_length) + (offset if response.status == 206 else 0)
+    return None
+
+
+def _verify_download(response, partial_path, size, remote_size, checksum, md5):
+    expected_digests = []
+    digest_header = response.getheader('Digest') or ''
+    for digest in digest_header.split(','):
+        algorithm, _, value = digest.strip().partition('=')
+        if algorithm.lower() == 'sha-256':
+            expected_digests.append((value, binascii.b2a_base64(checksum.digest()).decode('ascii').strip()))
+    content_md5 = response.getheader('Content-MD5')
+    if content_md5 and response.status != 206:
+        expected_digests.append((content_md5, binascii.b2a_base64(md5.digest()).decode('ascii').strip()))
+
+    if remote_size is not None and size != remote_size:
+        error = 'Downloaded {0} bytes of {1}'.format(size, remote_size)
+    elif any(expected != actual for expected, actual in expected_digests):
+        error = 'Digest mismatch'
+    else:
+        return
+
+    os.remove(partial_path)
+    raise OneViewModuleException('Failed to verify the download of {0}: {1}'.format(partial_path, error))
+
+
 class OneViewModuleException(Exception):
     """
     OneView base Exception.
@@ -282,11 +873,14 @@ class OneViewModuleException(Exception):
     Attributes:
        msg (str): Exception message.
        oneview_response (dict): OneView rest response.
+       result (dict): Partial result of the module, such as the changes made before the failure, returned along
+           with the failure.
    """
 
-    def __init__(self, data):
+    def __init__(self, data, result=None):
         self.msg = None
         self.oneview_response = None
+        self.result = result
 
         if isinstance(data, six.string_types):
             self.msg = data
@@ -338,6 +932,725 @@ class OneViewModuleResourceNotFound(OneViewModuleException):
     pass
 
 
+class OneViewSpan(object):
+    """
+    A single timed operation recorded by the OneViewTracer.
+
+    Attributes:
+       name (str): Span name.
+       span_id (str): 16 hex digits span identifier.
+       parent_span_id (str): Identifier of the enclosing span, empty for the root span.
+       attributes (dict): Span attributes, such as the resource URI and the task state.
+    """
+
+    KIND_INTERNAL = 1
+    KIND_CLIENT = 3
+
+    STATUS_UNSET = 0
+    STATUS_OK = 1
+    STATUS_ERROR = 2
+
+    def __init__(self, name, span_id, parent_span_id='', kind=KIND_INTERNAL, attributes=None):
+        self.name = name
+        self.span_id = span_id
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time = None
+        self.status_code = self.STATUS_UNSET
+        self.status_message = ''
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message):
+        self.status_code = self.STATUS_ERROR
+        self.status_message = to_native(message)
+
+    def end(self):
+        self.end_time = time.time()
+        if self.status_code == self.STATUS_UNSET:
+            self.status_code = self.STATUS_OK
+
+    def to_otlp(self, trace_id):
+        span = dict(traceId=trace_id,
+                    spanId=self.span_id,
+                    name=self.name,
+                    kind=self.kind,
+                    startTimeUnixNano=str(int(self.start_time * 1e9)),
+                    endTimeUnixNano=str(int((self.end_time or self.start_time) * 1e9)),
+                    attributes=[_otlp_attribute(k, v) for k, v in sorted(self.attributes.items())],
+                    status=dict(code=self.status_code))
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed_value = dict(boolValue=value)
+    elif isinstance(value, six.integer_types):
+        typed_value = dict(intValue=str(value))
+    elif isinstance(value, float):
+        typed_value = dict(doubleValue=value)
+    else:
+        typed_value = dict(stringValue=to_native(value))
+    return dict(key=key, value=typed_value)
+
+
+class OneViewTracer(object):
+    """
+    Records OpenTelemetry-style spans for the module execution, each REST request and each task wait.
+
+    Tracing is disabled unless the environment var ONEVIEW_TRACE_FILE is set. The spans of each module run are
+    appended as one line of OTLP/JSON (an ExportTraceServiceRequest) to that file, or written to the standard error
+    when it is set to 'stderr'. The standard output is reserved for the module result.
+
+    To join the spans of every task of a play into a single trace, set the environment var ONEVIEW_TRACE_ID with
+    the same value (e.g. the play ID) for all of them.
+    e.g.: export ONEVIEW_TRACE_FILE=/tmp/oneview-traces.json
+          export ONEVIEW_TRACE_ID=my-play-id
+    """
+
+    TRACE_FILE_ENV = 'ONEVIEW_TRACE_FILE'
+    TRACE_ID_ENV = 'ONEVIEW_TRACE_ID'
+    STDERR = 'stderr'
+    SERVICE_NAME = 'oneview-ansible'
+
+    def __init__(self, trace_file=None, trace_id=None):
+        """
+        OneViewTracer constructor.
+
+        :arg str trace_file: Destination of the spans. Defaults to the ONEVIEW_TRACE_FILE environment var.
+        :arg str trace_id: Trace identifier shared across module runs. Defaults to the ONEVIEW_TRACE_ID
+            environment var, or a random identifier when it is not set.
+        """
+        self.trace_file = trace_file or os.environ.get(self.TRACE_FILE_ENV)
+        self.enabled = bool(self.trace_file)
+        self.trace_id = self._build_trace_id(trace_id or os.environ.get(self.TRACE_ID_ENV))
+        self.spans = []
+        self.root_span_id = ''
+        self._task_states = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _new_id(size):
+        return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+    def _build_trace_id(self, value):
+        if not value:
+            return self._new_id(16)
+        value = to_native(value)
+        if len(value) == 32 and all(c in '0123456789abcdef' for c in value):
+            return value
+        return hashlib.md5(value.encode('utf-8')).hexdigest()
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, kind=OneViewSpan.KIND_INTERNAL, **attributes):
+        """
+        Context manager that times the enclosed block as a span.
+
+        Spans opened in worker threads are parented to the root span of the module.
+
+        :arg str name: Span name.
+        :arg int kind: OneViewSpan kind.
+        :arg attributes: Initial span attributes.
+        :return: The OneViewSpan being recorded.
+        """
+        stack = self._stack()
+        parent_span_id = stack[-1].span_id if stack else self.root_span_id
+        span = OneViewSpan(name, self._new_id(8) if self.enabled else '', parent_span_id, kind, attributes)
+
+        if not self.enabled:
+            yield span
+            return
+
+        if not self.root_span_id:
+            self.root_span_id = span.span_id
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as exception:
+            if not isinstance(exception, SystemExit):
+                span.set_error('; '.join(to_native(e) for e in exception.args) or type(exception).__name__)
+            raise
+        finally:
+            stack.pop()
+            span.end()
+            with self._lock:
+                self.spans.append(span)
+
+    def instrument(self, oneview_client):
+        """
+        Wraps the client connection and the task monitor to record a span for each REST request and task wait.
+
+        :arg OneViewClient oneview_client: Client to instrument.
+        """
+        if not self.enabled or not oneview_client:
+            return
+
+        connection = oneview_client.connection
+        do_http = connection.do_http
+        tracer = self
+
+        def traced_do_http(method, path, body, custom_headers=None):
+            attributes = {'http.method': method, 'http.target': path, 'oneview.resource_uri': path.split('?')[0]}
+            with tracer.span('HTTP ' + method, kind=OneViewSpan.KIND_CLIENT, **attributes) as span:
+                response, response_body = do_http(method, path, body, custom_headers)
+                span.set_attribute('http.status_code', response.status)
+                if isinstance(response_body, dict) and response_body.get('taskState'):
+                    span.set_attribute('oneview.task_uri', response_body.get('uri'))
+                    span.set_attribute('oneview.task_state', response_body['taskState'])
+                    with tracer._lock:
+                        tracer._task_states[response_body.get('uri')] = response_body['taskState']
+                return response, response_body
+
+        connection.do_http = traced_do_http
+
+        if HAS_HPE_ONEVIEW:
+            if not hasattr(TaskMonitor, '_oneview_tracer'):
+                TaskMonitor.wait_for_task = self._traced_wait(TaskMonitor.wait_for_task)
+                TaskMonitor.get_completed_task = self._traced_wait(TaskMonitor.get_completed_task)
+            TaskMonitor._oneview_tracer = self
+
+    def _traced_wait(self, wait_method):
+        def traced_wait(task_monitor, task, timeout=-1):
+            tracer = TaskMonitor._oneview_tracer
+            task_uri = task.get('uri') if isinstance(task, dict) else None
+            with tracer.span('task wait', **{'oneview.task_uri': task_uri}) as span:
+                try:
+                    result = wait_method(task_monitor, task, timeout)
+                finally:
+                    span.set_attribute('oneview.task_state', tracer._task_states.get(task_uri))
+                if isinstance(result, dict):
+                    span.set_attribute('oneview.resource_uri', result.get('uri'))
+                return result
+        return traced_wait
+
+    def to_otlp(self):
+        """
+        Builds the OTLP/JSON export request with the recorded spans.
+
+        :return: dict: ExportTraceServiceRequest.
+        """
+        resource_attributes = [_otlp_attribute('service.name', self.SERVICE_NAME),
+                               _otlp_attribute('process.pid', os.getpid())]
+        with self._lock:
+            spans = [span.to_otlp(self.trace_id) for span in self.spans]
+        return dict(resourceSpans=[dict(resource=dict(attributes=resource_attributes),
+                                        scopeSpans=[dict(scope=dict(name=self.SERVICE_NAME), spans=spans)])])
+
+    def flush(self):
+        """
+        Writes the recorded spans to the trace destination and clears them.
+        """
+        if not self.enabled or not self.spans:
+            return
+
+        line = json.dumps(self.to_otlp(), sort_keys=True) + '\n'
+        self.spans = []
+        try:
+            if self.trace_file == self.STDERR:
+                sys.stderr.write(line)
+                sys.stderr.flush()
+            else:
+                with open(self.trace_file, 'a') as trace_file:
+                    trace_file.write(line)
+        except (IOError, OSError) as error:
+            logger.warning('Unable to write the trace spans: ' + to_native(error))
+
+
+class ScmbListener(object):
+    """
+    Consumes the resource changes published on the OneView State Change Message Bus (SCMB) in a background thread,
+    calling on_change with each change message.
+
+    The listener is disabled unless the environment var ONEVIEW_SCMB_CERT_DIR is set to a directory with the OneView
+    CA certificate (caroot.pem) and the RabbitMQ client certificate and key (client.pem and key.pem), downloaded
+    from /rest/certificates/ca and /rest/certificates/client/rabbitmq/keypair/default. It requires the amqp
+    library.
+    e.g.: export ONEVIEW_SCMB_CERT_DIR=/etc/oneview/scmb
+    """
+
+    CERT_DIR_ENV = 'ONEVIEW_SCMB_CERT_DIR'
+    PORT = 5671
+    EXCHANGE = 'scmb'
+    DRAIN_TIMEOUT = 1
+
+    def __init__(self, host=None, cert_dir=None, connection_factory=None, routing_keys=None, on_change=None):
+        """
+        ScmbListener constructor.
+
+        :arg str host: OneView hostname.
+        :arg str cert_dir: Directory with the SCMB certificates. Defaults to the ONEVIEW_SCMB_CERT_DIR environment var.
+        :arg connection_factory: Function that returns a connected AMQP connection. Defaults to an amqp connection
+            to the SCMB of the host, authenticated with the client certificate.
+        :arg list routing_keys: Routing keys of the changes to consume, e.g. scmb.server-hardware.#
+        :arg on_change: Function called with each change message, as a dict.
+        """
+        self.host = host
+        self.cert_dir = cert_dir or os.environ.get(self.CERT_DIR_ENV)
+        self.routing_keys = routing_keys or []
+        self.on_change = on_change
+        self.failed = False
+        self._has_connection_factory = bool(connection_factory)
+        self._connection_factory = connection_factory or self._connect
+        self._connection = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.host and self.cert_dir and (self._has_connection_factory or HAS_AMQP))
+
+    def _connect(self):
+        ssl_options = dict(ca_certs=os.path.join(self.cert_dir, 'caroot.pem'),
+                           certfile=os.path.join(self.cert_dir, 'client.pem'),
+                           keyfile=os.path.join(self.cert_dir, 'key.pem'),
+                           cert_reqs=ssl.CERT_REQUIRED)
+        connection = amqp.Connection(host='{0}:{1}'.format(self.host, self.PORT), login_method='EXTERNAL',
+                                     ssl=ssl_options)
+        connection.connect()
+        return connection
+
+    def start(self):
+        """
+        Connects to the SCMB and consumes the changes in a background thread.
+
+        :return: bool: Whether the listener is consuming the changes.
+        """
+        if not self.enabled or self.failed:
+            return False
+        with self._lock:
+            if self._thread:
+                return True
+            try:
+                connection = self._connection_factory()
+                channel = connection.channel()
+                queue = channel.queue_declare(exclusive=True, auto_delete=True)[0]
+                for routing_key in self.routing_keys:
+                    channel.queue_bind(queue, exchange=self.EXCHANGE, routing_key=routing_key)
+                channel.basic_consume(queue, callback=self._on_message, no_ack=True)
+            except Exception as error:
+                logger.warning('Unable to listen to the SCMB: ' + to_native(error))
+                self.failed = True
+                return False
+
+            self._connection = connection
+            self._thread = threading.Thread(target=self._consume)
+            self._thread.daemon = True
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """
+        Stops consuming the changes and closes the SCMB connection.
+        """
+        self._stopped.set()
+        self._thread = None
+        if self._connection:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _consume(self):
+        while not self._stopped.is_set():
+            try:
+                self._connection.drain_events(timeout=self.DRAIN_TIMEOUT)
+            except socket.timeout:
+                continue
+            except Exception as error:
+                if not self._stopped.is_set():
+                    logger.warning('Lost the SCMB connection: ' + to_native(error))
+                    self.failed = True
+                    self._on_failure()
+                return
+
+    def _on_message(self, message):
+        body = message.body
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        try:
+            change = json.loads(body)
+        except ValueError:
+            return
+        if isinstance(change, dict) and self.on_change:
+            self.on_change(change)
+
+    def _on_failure(self):
+        pass
+
+
+class ScmbTaskListener(ScmbListener):
+    """
+    Listens to the task changes published on the SCMB, so the task waits wake up as soon as the completion message
+    arrives instead of polling the task.
+
+    The task waits fall back to polling when the listener is disabled or the connection fails, and the task is also
+    checked every FALLBACK_INTERVAL seconds in case a message is lost.
+    """
+
+    ROUTING_KEY = 'scmb.tasks.#'
+    TASK_COMPLETED_STATES = ['Error', 'Warning', 'Completed', 'Terminated', 'Killed']
+    FALLBACK_INTERVAL = 60
+
+    def __init__(self, host=None, cert_dir=None, connection_factory=None):
+        """
+        ScmbTaskListener constructor.
+
+        :arg str host: OneView hostname. Defaults to the host of the instrumented client.
+        :arg str cert_dir: Directory with the SCMB certificates. Defaults to the ONEVIEW_SCMB_CERT_DIR environment var.
+        :arg connection_factory: Function that returns a connected AMQP connection.
+        """
+        super(ScmbTaskListener, self).__init__(host, cert_dir, connection_factory, [self.ROUTING_KEY],
+                                               self._on_task_change)
+        self._waiters = {}
+
+    def instrument(self, oneview_client):
+        """
+        Wraps the task monitor, so the task waits of the client wait for the completion messages of the SCMB.
+
+        :arg OneViewClient oneview_client: Client whose appliance publishes the task changes.
+        """
+        if not oneview_client or not HAS_HPE_ONEVIEW:
+            return
+        if not self.host:
+            self.host = oneview_client.connection.get_host()
+        if not self.enabled:
+            return
+
+        if not hasattr(TaskMonitor, '_oneview_scmb_listener'):
+            TaskMonitor.wait_for_task = self._listening_wait(TaskMonitor.wait_for_task)
+            TaskMonitor.get_completed_task = self._listening_wait(TaskMonitor.get_completed_task)
+        TaskMonitor._oneview_scmb_listener = self
+
+    def _listening_wait(self, wait_method):
+        def listening_wait(task_monitor, task, timeout=-1):
+            listener = TaskMonitor._oneview_scmb_listener
+            if listener and isinstance(task, dict) and task.get('uri'):
+                started = time.time()
+                connection_failure_control = dict(last_success=task_monitor.get_current_seconds())
+                listener.wait(task['uri'], lambda: task_monitor.is_task_running(task, connection_failure_control), timeout)
+                if timeout is not None and timeout >= 0:
+                    timeout = max(1, int(timeout - (time.time() - started)))
+            return wait_method(task_monitor, task, timeout)
+        return listening_wait
+
+    def wait(self, task_uri, is_task_running, timeout=-1):
+        """
+        Blocks until the completion message of the task arrives, the task is found completed or the timeout expires.
+
+        The task is checked right after subscribing, since it may complete before, and then every
+        FALLBACK_INTERVAL seconds.
+
+        :arg str task_uri: URI of the task.
+        :arg is_task_running: Function that checks whether the task is still running.
+        :arg int timeout: Timeout in seconds, or -1 to wait without timeout.
+        :return: bool: Whether the listener was used. When False, the caller must poll the task.
+        """
+        if not self.start():
+            return False
+
+        event = threading.Event()
+        with self._lock:
+            self._waiters.setdefault(task_uri, []).append(event)
+        try:
+            deadline = None if timeout is None or timeout < 0 else time.time() + timeout
+            while is_task_running():
+                if self.failed:
+                    return False
+                wait_time = self.FALLBACK_INTERVAL
+                if deadline is not None:
+                    wait_time = min(wait_time, deadline - time.time())
+                    if wait_time <= 0:
+                        break
+                if event.wait(wait_time):
+                    break
+            return not self.failed
+        finally:
+            with self._lock:
+                self._waiters[task_uri].remove(event)
+                if not self._waiters[task_uri]:
+                    del self._waiters[task_uri]
+
+    def _on_task_change(self, change):
+        task = change.get('resource') or {}
+        task_uri = task.get('uri') or change.get('resourceUri')
+        if task.get('taskState') in self.TASK_COMPLETED_STATES:
+            with self._lock:
+                events = list(self._waiters.get(task_uri, []))
+            for event in events:
+                event.set()
+
+    def _on_failure(self):
+        with self._lock:
+            events = [event for events in self._waiters.values() for event in events]
+        for event in events:
+            event.set()
+
+
+class OneViewMirror(object):
+    """
+    Local mirror of OneView resource collections in a SQLite database, so the facts can be read without querying
+    the appliance.
+
+    Each collection is loaded with a paged snapshot and then kept current by applying the change messages of the
+    SCMB. The database is read from the C(ONEVIEW_MIRROR_DB) environment variable when no path is given, and
+    defaults to C(oneview/mirror.db) in the cache directory of the user, C(XDG_CACHE_HOME) or C(~/.cache). The
+    database is created only readable by its owner, in a directory only accessible by its owner when missing.
+    """
+
+    DATABASE_ENV = 'ONEVIEW_MIRROR_DB'
+    MSG_NOT_MIRRORED = 'The resources {0} are not mirrored in {1}.'
+    MSG_FILTER_NOT_SUPPORTED = "Filter not supported by the mirror: {0}. Use filters like \"field='value'\"."
+    MSG_PARAM_NOT_SUPPORTED = 'Param not supported by the mirror: {0}'
+    FILTER_PATTERN = re.compile(r"""^\s*"?([\w.]+)\s*(=|<>|!=)\s*'?([^']*?)'?"?\s*$""")
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(self.DATABASE_ENV) or user_cache_path('mirror.db')
+        self.__create_private_file()
+        self._lock = threading.Lock()
+        self._buffers = {}
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS collections (uri TEXT PRIMARY KEY, synced REAL)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS resources '
+                             '(uri TEXT PRIMARY KEY, collection TEXT, data TEXT)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS resources_collection ON resources (collection)')
+
+    def __create_private_file(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+
+    @staticmethod
+    def collection_of(resource_uri):
+        return resource_uri.split('?')[0].rsplit('/', 1)[0]
+
+    def buffer_changes(self, collection):
+        """
+        Buffers the changes of a collection until its next snapshot is committed, so the changes received while the
+        snapshot reads the collection are replayed over it instead of being lost or overwritten.
+
+        :arg str collection: URI of the collection, such as /rest/server-hardware.
+        """
+        with self._lock:
+            self._buffers.setdefault(collection, [])
+
+    def snapshot(self, resource_client, page_size=500):
+        """
+        Replaces the mirrored resources of a collection with the resources read page by page from the appliance.
+
+        The changes received while the pages are read are buffered and replayed once the snapshot is committed.
+
+        :arg resource_client: OneView resource client, such as server_hardware.
+        :arg int page_size: Number of resources read at once.
+        :return: int: Number of resources mirrored.
+        """
+        collection = resource_client.URI
+        self.buffer_changes(collection)
+        rows = []
+        start = 0
+        try:
+            while True:
+                page = get_all_resources(resource_client, dict(start=start, count=page_size))
+                rows.extend((resource['uri'], collection, json.dumps(resource)) for resource in page)
+                start += len(page)
+                if len(page) < page_size:
+                    break
+        except Exception:
+            with self._lock, self._db:
+                self.__replay(collection)
+            raise
+
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM resources WHERE collection = ?', (collection,))
+            self._db.executemany('INSERT OR REPLACE INTO resources VALUES (?, ?, ?)', rows)
+            self._db.execute('INSERT OR REPLACE INTO collections VALUES (?, ?)', (collection, time.time()))
+            self.__replay(collection)
+        return len(rows)
+
+    def apply_change(self, change):
+        """
+        Applies a change message of the SCMB to the mirrored collection of the resource.
+
+        The change is buffered while a snapshot of the collection is taken. An update older than the mirrored
+        resource, by its modified date, is ignored.
+
+        :arg dict change: Change message, with the changeType, the resourceUri and the resource.
+        """
+        resource = change.get('resource')
+        resource_uri = change.get('resourceUri') or (resource or {}).get('uri')
+        if not resource_uri:
+            return
+        collection = self.collection_of(resource_uri)
+
+        with self._lock, self._db:
+            if collection in self._buffers:
+                self._buffers[collection].append((change, resource_uri))
+            else:
+                self.__apply(change, resource_uri, collection)
+
+    def synced(self, collection):
+        with self._lock:
+            row = self._db.execute('SELECT synced FROM collections WHERE uri = ?', (collection,)).fetchone()
+        return row[0] if row else None
+
+    def get_all(self, collection, params=None, fields=None):
+        """
+        Gets the mirrored resources of a collection, applying the params of the facts modules.
+
+        The params supported are C(start), C(count), C(sort), such as name:descending, and C(filter), with one or a
+        list of comparisons like name='value' or status<>'OK'.
+
+        :arg str collection: URI of the collection, such as /rest/server-hardware.
+        :arg dict params: Facts params.
+        :arg list fields: Fields to project.
+        :return: list: Resources.
+        """
+        params = dict(params or {})
+        unsupported = set(params) - set(['start', 'count', 'sort', 'filter'])
+        if unsupported:
+            raise OneViewModuleValueError(self.MSG_PARAM_NOT_SUPPORTED.format(', '.join(sorted(unsupported))))
+        if self.synced(collection) is None:
+            raise OneViewModuleResourceNotFound(self.MSG_NOT_MIRRORED.format(collection, self.path))
+
+        with self._lock:
+            rows = self._db.execute('SELECT data FROM resources WHERE collection = ? ORDER BY uri',
+                                    (collection,)).fetchall()
+        resources = [json.loads(row[0]) for row in rows]
+
+        for predicate in self.__filter_predicates(params.get('filter')):
+            resources = [resource for resource in resources if predicate(resource)]
+
+        if params.get('sort'):
+            field, _, order = params['sort'].partition(':')
+            resources.sort(key=lambda resource: self.__sort_key(self.__field_value(resource, field)),
+                           reverse=order.lower().startswith('desc'))
+
+        start = int(params.get('start') or 0)
+        count = int(params.get('count', -1))
+        resources = resources[start:] if count < 0 else resources[start:start + count]
+
+        if fields:
+            resources = [project_fields(resource, fields) for resource in resources]
+        return resources
+
+    def close(self):
+        self._db.close()
+
+    def __replay(self, collection):
+        for change, resource_uri in self._buffers.pop(collection, []):
+            self.__apply(change, resource_uri, collection)
+
+    def __apply(self, change, resource_uri, collection):
+        if not self._db.execute('SELECT 1 FROM collections WHERE uri = ?', (collection,)).fetchone():
+            return
+        resource = change.get('resource')
+        if change.get('changeType') == 'Deleted':
+            self._db.execute('DELETE FROM resources WHERE uri = ?', (resource_uri,))
+        elif isinstance(resource, dict):
+            row = self._db.execute('SELECT data FROM resources WHERE uri = ?', (resource_uri,)).fetchone()
+            modified = json.loads(row[0]).get('modified') if row else None
+            if modified and resource.get('modified') and resource['modified'] < modified:
+                return
+            self._db.execute('INSERT OR REPLACE INTO resources VALUES (?, ?, ?)',
+                             (resource_uri, collection, json.dumps(resource)))
+
+    def __filter_predicates(self, filters):
+        if not filters:
+            return []
+        if not isinstance(filters, list):
+            filters = [filters]
+
+        predicates = []
+        for filter_expression in filters:
+            match = self.FILTER_PATTERN.match(filter_expression)
+            if not match:
+                raise OneViewModuleValueError(self.MSG_FILTER_NOT_SUPPORTED.format(filter_expression))
+            field, operator, value = match.groups()
+            predicates.append(self.__predicate(field, operator == '=', value))
+        return predicates
+
+    def __predicate(self, field, equal, value):
+        return lambda resource: (to_native(self.__field_value(resource, field)) == value) == equal
+
+    def __sort_key(self, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, value, '')
+        return (1, 0, _str_sorted(value))
+
+    def __field_value(self, resource, field):
+        value = resource
+        for key in field.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        return value
+
+
+class OneViewMirrorClient(object):
+    """
+    Stands in for the OneViewClient of the facts modules that read the local mirror, so they do not log in to the
+    appliance. Has the resource clients of the collections the facts modules can read from the mirror.
+    """
+
+    RESOURCE_URIS = dict(alerts='/rest/alerts',
+                         server_hardware='/rest/server-hardware',
+                         server_profiles='/rest/server-profiles')
+
+    def __init__(self, path=None):
+        self.path = path
+        self.connection = None
+
+    def __getattr__(self, name):
+        if name not in self.RESOURCE_URIS:
+            raise AttributeError(name)
+        return OneViewMirrorResourceClient(self.path, self.RESOURCE_URIS[name])
+
+
+class OneViewMirrorResourceClient(object):
+    """
+    Resource client of a mirrored collection, which looks up the resources by name or URI in the local mirror.
+    As in the resource clients of the SDK, the resources found are new clients holding their data, and None is
+    returned when the resource is not found, or the collection is not mirrored.
+    """
+
+    def __init__(self, path, uri, data=None):
+        self.path = path
+        self.URI = uri
+        self.data = data
+
+    def get_by_name(self, name):
+        return self.__get_by('name', name)
+
+    def get_by_uri(self, uri):
+        return self.__get_by('uri', uri)
+
+    def __get_by(self, field, value):
+        mirror = OneViewMirror(self.path)
+        try:
+            if mirror.synced(self.URI) is None:
+                return None
+            resources = mirror.get_all(self.URI, dict(filter="{0}='{1}'".format(field, value)))
+        finally:
+            mirror.close()
+        return OneViewMirrorResourceClient(self.path, self.URI, resources[0]) if resources else None
+
+
 # @six.add_metaclass(abc.ABCMeta)
 class OneViewModule(object):
     MSG_CREATED = 'Resource created successfully.'
@@ -348,6 +1661,7 @@ class OneViewModule(object):
     MSG_DIFF_AT_KEY = 'Difference found at key \'{0}\'. '
     MSG_MANDATORY_FIELD_MISSING = 'Missing mandatory field: name'
     HPE_ONEVIEW_SDK_REQUIRED = 'HPE OneView Python SDK is required for this module.'
+    MSG_MIRROR_OPTIONS_NOT_SUPPORTED = 'The options are not supported when reading the facts from the mirror.'
 
     ONEVIEW_COMMON_ARGS = dict(
         api_version=dict(type='int'),
@@ -361,25 +1675,60 @@ class OneViewModule(object):
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
 
-    def __init__(self, additional_arg_spec=None, validate_etag_support=False):
+    ONEVIEW_FIELDS_ARGS = dict(fields=dict(type='list'))
+
+    RESULT_FORMAT_FULL = 'full'
+    RESULT_FORMAT_COMPACT = 'compact'
+    RESULT_FORMAT_FILE = 'file'
+
+    ONEVIEW_RESULT_FORMAT_ARGS = dict(
+        result_format=dict(type='str', default=RESULT_FORMAT_FULL,
+                           choices=[RESULT_FORMAT_FULL, RESULT_FORMAT_COMPACT, RESULT_FORMAT_FILE]),
+        result_dir=dict(type='path')
+    )
+
+    SOURCE_APPLIANCE = 'appliance'
+    SOURCE_MIRROR = 'mirror'
+
+    ONEVIEW_MIRROR_ARGS = dict(
+        source=dict(type='str', default=SOURCE_APPLIANCE, choices=[SOURCE_APPLIANCE, SOURCE_MIRROR]),
+        mirror=dict(type='path')
+    )
+
+    def __init__(self, additional_arg_spec=None, validate_etag_support=False, fields_support=False,
+                 result_format_support=False, mirror_support=False):
         """
         OneViewModuleBase constructor.
 
         :arg dict additional_arg_spec: Additional argument spec definition.
         :arg bool validate_etag_support: Enables support to eTag validation.
+        :arg list fields_support: Names of the facts holding the resources of the module, which are projected to the
+            requested fields. Enables support to the projection of the facts when provided.
+        :arg bool result_format_support: Enables support to the compact and file formats of the facts.
+        :arg bool mirror_support: Enables support to read the facts from the local mirror of the resources.
         """
-        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support)
+        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support, fields_support,
+                                                  result_format_support, mirror_support)
 
         self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
+        # Preload the source of the facts - used by facts, which do not log in to the appliance to read the mirror
+        self.source = self.module.params.get('source') if mirror_support else None
+
         self.resource_client = None
         self.current_resource = None
 
         self.state = self.module.params.get('state')
         self.data = self.module.params.get('data')
 
+        self.tracer = OneViewTracer()
+        self.scmb_listener = ScmbTaskListener()
+
         self._check_hpe_oneview_sdk()
         self._create_oneview_client()
+        if self.source != self.SOURCE_MIRROR:
+            self.tracer.instrument(self.oneview_client)
+            self.scmb_listener.instrument(self.oneview_client)
 
         # Preload params for get_all - used by facts
         self.facts_params = self.module.params.get('params') or {}
@@ -387,9 +1736,17 @@ class OneViewModule(object):
         # Preload options as dict - used by facts
         self.options = transform_list_to_dict(self.module.params.get('options'))
 
+        # Preload fields to project the facts - used by facts
+        self.fields = self.module.params.get('fields') if fields_support else None
+        self.resource_facts = fields_support or []
+
+        # Preload the format of the facts - used by facts
+        self.result_format = self.module.params.get('result_format') if result_format_support else None
+
         self.validate_etag_support = validate_etag_support
 
-    def _build_argument_spec(self, additional_arg_spec, validate_etag_support):
+    def _build_argument_spec(self, additional_arg_spec, validate_etag_support, fields_support=False,
+                             result_format_support=False, mirror_support=False):
 
         merged_arg_spec = dict()
         merged_arg_spec.update(self.ONEVIEW_COMMON_ARGS)
@@ -397,6 +1754,15 @@ class OneViewModule(object):
         if validate_etag_support:
             merged_arg_spec.update(self.ONEVIEW_VALIDATE_ETAG_ARGS)
 
+        if fields_support:
+            merged_arg_spec.update(self.ONEVIEW_FIELDS_ARGS)
+
+        if result_format_support:
+            merged_arg_spec.update(self.ONEVIEW_RESULT_FORMAT_ARGS)
+
+        if mirror_support:
+            merged_arg_spec.update(self.ONEVIEW_MIRROR_ARGS)
+
         if additional_arg_spec:
             merged_arg_spec.update(additional_arg_spec)
 
@@ -407,17 +1773,10 @@ class OneViewModule(object):
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
     def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
+        if self.source == self.SOURCE_MIRROR:
+            self.oneview_client = OneViewMirrorClient(self.module.params.get('mirror'))
         else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+            self.oneview_client = create_oneview_client(self.module.params)
 
     def set_resource_object(self, resource_client, name=None):
         self.resource_client = resource_client
@@ -460,25 +1819,43 @@ class OneViewModule(object):
 
         It handles any OneViewModuleException in order to signal a failure to Ansible, with a descriptive error message.
 
+        The execution is recorded as the root span of the OneViewTracer, which is flushed at the end.
+
         """
         try:
-            if self.validate_etag_support:
-                if not self.module.params.get('validate_etag'):
-                    self.oneview_client.connection.disable_etag_validation()
+            with self.tracer.span(type(self).__name__, **{'ansible.module.state': self.state}) as span:
+                if self.source == self.SOURCE_MIRROR and self.options:
+                    raise OneViewModuleValueError(self.MSG_MIRROR_OPTIONS_NOT_SUPPORTED)
+
+                if self.validate_etag_support:
+                    if not self.module.params.get('validate_etag'):
+                        self.oneview_client.connection.disable_etag_validation()
+
+                result = self.execute_module()
+
+                if not result:
+                    result = {}
+
+                if "changed" not in result:
+                    result['changed'] = False
 
-            result = self.execute_module()
+                if self.fields and result.get('ansible_facts'):
+                    result['ansible_facts'] = self.project_facts(result['ansible_facts'])
 
-            if not result:
-                result = {}
+                if self.result_format and result.get('ansible_facts'):
+                    result['ansible_facts'] = self.format_facts(result['ansible_facts'])
 
-            if "changed" not in result:
-                result['changed'] = False
+                span.set_attribute('ansible.module.changed', result['changed'])
 
             self.module.exit_json(**result)
 
         except OneViewModuleException as exception:
             error_msg = '; '.join(to_native(e) for e in exception.args)
-            self.module.fail_json(msg=error_msg, exception=traceback.format_exc())
+            self.module.fail_json(msg=error_msg, exception=traceback.format_exc(), **(exception.result or {}))
+
+        finally:
+            self.scmb_listener.stop()
+            self.tracer.flush()
 
     def resource_absent(self, method='delete'):
         """
@@ -497,6 +1874,61 @@ class OneViewModule(object):
         else:
             return {"changed": False, "msg": self.MSG_ALREADY_ABSENT}
 
+    def get_all_resources(self, resource_client):
+        """
+        Generic get all implementation for the facts modules.
+
+        It applies the facts params and asks the server to project the requested fields when the API supports it.
+
+        When the source is the mirror, the resources are read from the local mirror instead.
+
+        :arg resource_client: OneView resource client.
+        :return: list: Resources.
+        """
+        if self.source == self.SOURCE_MIRROR:
+            mirror = OneViewMirror(self.module.params.get('mirror'))
+            try:
+                return mirror.get_all(resource_client.URI, self.facts_params, self.fields)
+            finally:
+                mirror.close()
+        return get_all_resources(resource_client, self.facts_params, self.fields)
+
+    def project_facts(self, ansible_facts):
+        """
+        Trims the resources of the facts to the requested fields.
+
+        Only the resource facts declared by the module are projected, so the other facts, such as the ones
+        gathered from the options, are kept whole.
+
+        :arg dict ansible_facts: Facts returned by the module.
+        :return: dict: The projected facts.
+        """
+        return dict((name, project_fields(value, self.fields) if name in self.resource_facts else value)
+                    for name, value in ansible_facts.items())
+
+    def format_facts(self, ansible_facts):
+        """
+        Formats the resources of the facts according to the result_format param.
+
+        With C(compact), the resources are compacted. With C(file), each fact holding resources is written to a
+        JSON Lines file in the result_dir, and the fact is replaced by the path of the file, even when there are
+        no resources. The facts formatted are the resource facts declared by the module, or the facts holding
+        resources when none is declared.
+
+        :arg dict ansible_facts: Facts returned by the module.
+        :return: dict: The formatted facts.
+        """
+        formatted_facts = {}
+        for name, value in ansible_facts.items():
+            is_resource = name in self.resource_facts if self.resource_facts else _is_resource(value)
+            if not is_resource or self.result_format == self.RESULT_FORMAT_FULL:
+                formatted_facts[name] = value
+            elif self.result_format == self.RESULT_FORMAT_COMPACT:
+                formatted_facts[name] = compact_resource(value)
+            else:
+                formatted_facts[name] = write_json_lines(value, self.module.params.get('result_dir'), name + '-')
+        return formatted_facts
+
     def get_by_name(self, name):
         """
         Generic get by name implementation.
@@ -667,6 +2099,7 @@ class OneViewModuleBase(object):
     MSG_ALREADY_ABSENT = 'Resource is already absent.'
     MSG_DIFF_AT_KEY = 'Difference found at key \'{0}\'. '
     HPE_ONEVIEW_SDK_REQUIRED = 'HPE OneView Python SDK is required for this module.'
+    MSG_MIRROR_OPTIONS_NOT_SUPPORTED = 'The options are not supported when reading the facts from the mirror.'
 
     ONEVIEW_COMMON_ARGS = dict(
         api_version=dict(type='int'),
@@ -682,19 +2115,54 @@ class OneViewModuleBase(object):
 
     ONEVIEW_VALIDATE_ETAG_ARGS = dict(validate_etag=dict(type='bool', default=True))
 
-    def __init__(self, additional_arg_spec=None, validate_etag_support=False):
+    ONEVIEW_FIELDS_ARGS = dict(fields=dict(type='list'))
+
+    RESULT_FORMAT_FULL = 'full'
+    RESULT_FORMAT_COMPACT = 'compact'
+    RESULT_FORMAT_FILE = 'file'
+
+    ONEVIEW_RESULT_FORMAT_ARGS = dict(
+        result_format=dict(type='str', default=RESULT_FORMAT_FULL,
+                           choices=[RESULT_FORMAT_FULL, RESULT_FORMAT_COMPACT, RESULT_FORMAT_FILE]),
+        result_dir=dict(type='path')
+    )
+
+    SOURCE_APPLIANCE = 'appliance'
+    SOURCE_MIRROR = 'mirror'
+
+    ONEVIEW_MIRROR_ARGS = dict(
+        source=dict(type='str', default=SOURCE_APPLIANCE, choices=[SOURCE_APPLIANCE, SOURCE_MIRROR]),
+        mirror=dict(type='path')
+    )
+
+    def __init__(self, additional_arg_spec=None, validate_etag_support=False, fields_support=False,
+                 result_format_support=False, mirror_support=False):
         """
         OneViewModuleBase constructor.
 
         :arg dict additional_arg_spec: Additional argument spec definition.
         :arg bool validate_etag_support: Enables support to eTag validation.
+        :arg list fields_support: Names of the facts holding the resources of the module, which are projected to the
+            requested fields. Enables support to the projection of the facts when provided.
+        :arg bool result_format_support: Enables support to the compact and file formats of the facts.
+        :arg bool mirror_support: Enables support to read the facts from the local mirror of the resources.
         """
-        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support)
+        argument_spec = self._build_argument_spec(additional_arg_spec, validate_etag_support, fields_support,
+                                                  result_format_support, mirror_support)
 
         self.module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
 
+        # Preload the source of the facts - used by facts, which do not log in to the appliance to read the mirror
+        self.source = self.module.params.get('source') if mirror_support else None
+
+        self.tracer = OneViewTracer()
+        self.scmb_listener = ScmbTaskListener()
+
         self._check_hpe_oneview_sdk()
         self._create_oneview_client()
+        if self.source != self.SOURCE_MIRROR:
+            self.tracer.instrument(self.oneview_client)
+            self.scmb_listener.instrument(self.oneview_client)
 
         self.state = self.module.params.get('state')
         self.data = self.module.params.get('data')
@@ -705,9 +2173,17 @@ class OneViewModuleBase(object):
         # Preload options as dict - used by facts
         self.options = transform_list_to_dict(self.module.params.get('options'))
 
+        # Preload fields to project the facts - used by facts
+        self.fields = self.module.params.get('fields') if fields_support else None
+        self.resource_facts = fields_support or []
+
+        # Preload the format of the facts - used by facts
+        self.result_format = self.module.params.get('result_format') if result_format_support else None
+
         self.validate_etag_support = validate_etag_support
 
-    def _build_argument_spec(self, additional_arg_spec, validate_etag_support):
+    def _build_argument_spec(self, additional_arg_spec, validate_etag_support, fields_support=False,
+                             result_format_support=False, mirror_support=False):
 
         merged_arg_spec = dict()
         merged_arg_spec.update(self.ONEVIEW_COMMON_ARGS)
@@ -715,6 +2191,15 @@ class OneViewModuleBase(object):
         if validate_etag_support:
             merged_arg_spec.update(self.ONEVIEW_VALIDATE_ETAG_ARGS)
 
+        if fields_support:
+            merged_arg_spec.update(self.ONEVIEW_FIELDS_ARGS)
+
+        if result_format_support:
+            merged_arg_spec.update(self.ONEVIEW_RESULT_FORMAT_ARGS)
+
+        if mirror_support:
+            merged_arg_spec.update(self.ONEVIEW_MIRROR_ARGS)
+
         if additional_arg_spec:
             merged_arg_spec.update(additional_arg_spec)
 
@@ -725,17 +2210,10 @@ class OneViewModuleBase(object):
             self.module.fail_json(msg=self.HPE_ONEVIEW_SDK_REQUIRED)
 
     def _create_oneview_client(self):
-        if self.module.params.get('hostname'):
-            config = dict(ip=self.module.params['hostname'],
-                          credentials=dict(userName=self.module.params['username'], password=self.module.params['password'],
-                                           authLoginDomain=self.module.params.get('auth_login_domain', '')),
-                          api_version=self.module.params['api_version'],
-                          image_streamer_ip=self.module.params['image_streamer_hostname'])
-            self.oneview_client = OneViewClient(config)
-        elif not self.module.params['config']:
-            self.oneview_client = OneViewClient.from_environment_variables()
+        if self.source == self.SOURCE_MIRROR:
+            self.oneview_client = OneViewMirrorClient(self.module.params.get('mirror'))
         else:
-            self.oneview_client = OneViewClient.from_json_file(self.module.params['config'])
+            self.oneview_client = create_oneview_client(self.module.params)
 
     @abc.abstractmethod
     def execute_module(self):
@@ -757,25 +2235,43 @@ class OneViewModuleBase(object):
 
         It handles any OneViewModuleException in order to signal a failure to Ansible, with a descriptive error message.
 
+        The execution is recorded as the root span of the OneViewTracer, which is flushed at the end.
+
         """
         try:
-            if self.validate_etag_support:
-                if not self.module.params.get('validate_etag'):
-                    self.oneview_client.connection.disable_etag_validation()
+            with self.tracer.span(type(self).__name__, **{'ansible.module.state': self.state}) as span:
+                if self.source == self.SOURCE_MIRROR and self.options:
+                    raise OneViewModuleValueError(self.MSG_MIRROR_OPTIONS_NOT_SUPPORTED)
+
+                if self.validate_etag_support:
+                    if not self.module.params.get('validate_etag'):
+                        self.oneview_client.connection.disable_etag_validation()
+
+                result = self.execute_module()
+
+                if not result:
+                    result = {}
+
+                if "changed" not in result:
+                    result['changed'] = False
 
-            result = self.execute_module()
+                if self.fields and result.get('ansible_facts'):
+                    result['ansible_facts'] = self.project_facts(result['ansible_facts'])
 
-            if not result:
-                result = {}
+                if self.result_format and result.get('ansible_facts'):
+                    result['ansible_facts'] = self.format_facts(result['ansible_facts'])
 
-            if "changed" not in result:
-                result['changed'] = False
+                span.set_attribute('ansible.module.changed', result['changed'])
 
             self.module.exit_json(**result)
 
         except OneViewModuleException as exception:
             error_msg = '; '.join(to_native(e) for e in exception.args)
-            self.module.fail_json(msg=error_msg, exception=traceback.format_exc())
+            self.module.fail_json(msg=error_msg, exception=traceback.format_exc(), **(exception.result or {}))
+
+        finally:
+            self.scmb_listener.stop()
+            self.tracer.flush()
 
     def resource_absent(self, resource, method='delete'):
         """
@@ -795,6 +2291,61 @@ class OneViewModuleBase(object):
         else:
             return {"changed": False, "msg": self.MSG_ALREADY_ABSENT}
 
+    def get_all_resources(self, resource_client):
+        """
+        Generic get all implementation for the facts modules.
+
+        It applies the facts params and asks the server to project the requested fields when the API supports it.
+
+        When the source is the mirror, the resources are read from the local mirror instead.
+
+        :arg resource_client: OneView resource client.
+        :return: list: Resources.
+        """
+        if self.source == self.SOURCE_MIRROR:
+            mirror = OneViewMirror(self.module.params.get('mirror'))
+            try:
+                return mirror.get_all(resource_client.URI, self.facts_params, self.fields)
+            finally:
+                mirror.close()
+        return get_all_resources(resource_client, self.facts_params, self.fields)
+
+    def project_facts(self, ansible_facts):
+        """
+        Trims the resources of the facts to the requested fields.
+
+        Only the resource facts declared by the module are projected, so the other facts, such as the ones
+        gathered from the options, are kept whole.
+
+        :arg dict ansible_facts: Facts returned by the module.
+        :return: dict: The projected facts.
+        """
+        return dict((name, project_fields(value, self.fields) if name in self.resource_facts else value)
+                    for name, value in ansible_facts.items())
+
+    def format_facts(self, ansible_facts):
+        """
+        Formats the resources of the facts according to the result_format param.
+
+        With C(compact), the resources are compacted. With C(file), each fact holding resources is written to a
+        JSON Lines file in the result_dir, and the fact is replaced by the path of the file, even when there are
+        no resources. The facts formatted are the resource facts declared by the module, or the facts holding
+        resources when none is declared.
+
+        :arg dict ansible_facts: Facts returned by the module.
+        :return: dict: The formatted facts.
+        """
+        formatted_facts = {}
+        for name, value in ansible_facts.items():
+            is_resource = name in self.resource_facts if self.resource_facts else _is_resource(value)
+            if not is_resource or self.result_format == self.RESULT_FORMAT_FULL:
+                formatted_facts[name] = value
+            elif self.result_format == self.RESULT_FORMAT_COMPACT:
+                formatted_facts[name] = compact_resource(value)
+            else:
+                formatted_facts[name] = write_json_lines(value, self.module.params.get('result_dir'), name + '-')
+        return formatted_facts
+
     def get_by_name(self, name):
         """
         Generic get by name implementation.
@@ -1089,6 +2640,132 @@ class ServerProfileMerger(object):
         return merged_data
 
 
+class ServerProfileDrift(object):
+    """
+    Computes the drift of Server Profiles from their Server Profile Template on the client, without the compliance
+    preview of the appliance.
+
+    The attributes and the managed sections of the template are merged into each profile with the
+    ServerProfileMerger rules, which keep the values owned by the profile, such as the MAC addresses of its
+    connections. The fields where the merged profile differs from the profile are its drift.
+    """
+    TEMPLATE_ATTRIBUTES = ['serverHardwareTypeUri', 'enclosureGroupUri', 'affinity', 'hideUnusedFlexNics',
+                           SPKeys.MAC_TYPE, 'wwnType', SPKeys.SERIAL_NUMBER_TYPE, 'iscsiInitiatorNameType']
+    TEMPLATE_SECTIONS = OrderedDict([(SPKeys.BIOS, 'manageBios'),
+                                     (SPKeys.BOOT, 'manageBoot'),
+                                     (SPKeys.BOOT_MODE, 'manageMode'),
+                                     ('firmware', 'manageFirmware'),
+                                     (SPKeys.CONNECTION_SETTINGS, 'manageConnections'),
+                                     (SPKeys.SAN, 'manageSanStorage'),
+                                     (SPKeys.LOCAL_STORAGE, None),
+                                     (SPKeys.OS_DEPLOYMENT, None)])
+    COMPLIANCE_CONTROL = 'complianceControl'
+    CHECKED_MINIMUM = 'CheckedMinimum'
+    LIST_ITEM_KEYS = [SPKeys.ID, SPKeys.DEVICE_SLOT, SPKeys.CONN_ID, SPKeys.NAME]
+
+    # Template values that each profile resolves to its own value, such as the port of its connections
+    RESOLVED_VALUES = dict(portId=['Auto'])
+    # Template fields that are applied once to each profile, and are not kept in the profile
+    RESOLVED_FIELDS = ['localStorage.controllers.initialize']
+
+    def __init__(self, template):
+        self.minimum_sections = set()
+        self.template_data = self._managed_data(template)
+        self.merger = ServerProfileMerger()
+
+    @property
+    def fields(self):
+        """
+        Names of the profile fields compared with the template.
+        """
+        return list(self.template_data)
+
+    def drift(self, profile):
+        """
+        Computes the fields of the profile that differ from the template.
+
+        :arg dict profile: Server Profile.
+        :return: list: Changes, each with the C(path) of the field and its C(template) and C(profile) values.
+        """
+        profile_data = dict((key, deepcopy(profile[key])) for key in self.template_data if key in profile)
+
+        resource = deepcopy(profile_data)
+        if SPKeys.CONNECTION_SETTINGS in self.template_data:
+            connection_settings = resource.get(SPKeys.CONNECTION_SETTINGS) or {}
+            connection_settings.setdefault(SPKeys.CONNECTIONS, [])
+            resource[SPKeys.CONNECTION_SETTINGS] = connection_settings
+
+        merged_data = self.merger.merge_data(resource, deepcopy(self.template_data))
+        changes = []
+        for key in merged_data:
+            changes.extend(self._diff(merged_data[key], profile_data.get(key), key, key in self.minimum_sections))
+        return changes
+
+    def _managed_data(self, template):
+        data = OrderedDict((key, template[key]) for key in self.TEMPLATE_ATTRIBUTES if template.get(key) is not None)
+        for key, manage_flag in self.TEMPLATE_SECTIONS.items():
+            section = template.get(key)
+            if not section or (manage_flag and not section.get(manage_flag)):
+                continue
+            if section.get(self.COMPLIANCE_CONTROL) == 'Unchecked':
+                continue
+            if section.get(self.COMPLIANCE_CONTROL) == self.CHECKED_MINIMUM:
+                self.minimum_sections.add(key)
+            data[key] = dict((name, value) for name, value in section.items() if name != self.COMPLIANCE_CONTROL)
+        return data
+
+    def _diff(self, expected, actual, path, minimum=False):
+        if isinstance(expected, collections.Mapping) and isinstance(actual, collections.Mapping):
+            changes = []
+            for key in expected:
+                if not self._is_resolved(path, key, expected[key]):
+                    changes.extend(self._diff(expected[key], actual.get(key), self._join(path, key), minimum))
+            return changes
+
+        if isinstance(expected, list) and isinstance(actual, list):
+            item_key = self._list_item_key(expected + actual)
+            if item_key:
+                return self._diff_by_key(expected, actual, item_key, path, minimum)
+            if compare_list(expected, actual) or (not expected and not actual):
+                return []
+            return [dict(path=path, template=expected, profile=actual)]
+
+        if not expected and not actual:
+            return []
+        if isinstance(expected, (list, collections.Mapping)) or isinstance(actual, (list, collections.Mapping)) or \
+                _standardize_value(expected) != _standardize_value(actual):
+            return [dict(path=path, template=expected, profile=actual)]
+        return []
+
+    def _diff_by_key(self, expected, actual, item_key, path, minimum):
+        actual_items = OrderedDict((item[item_key], item) for item in actual)
+        changes = []
+        for item in expected:
+            changes.extend(self._diff(item, actual_items.pop(item[item_key], None),
+                                      '{0}[{1}={2}]'.format(path, item_key, item[item_key]), minimum))
+        # The sections with a CheckedMinimum compliance control allow the profile to have more items than the template
+        if not minimum:
+            for key, item in actual_items.items():
+                changes.append(dict(path='{0}[{1}={2}]'.format(path, item_key, key), template=None, profile=item))
+        return changes
+
+    def _is_resolved(self, path, key, value):
+        if value in self.RESOLVED_VALUES.get(key, []):
+            return True
+        return re.sub(r'\[[^\]]*\]', '', self._join(path, key)) in self.RESOLVED_FIELDS
+
+    def _list_item_key(self, items):
+        if not items or not all(isinstance(item, collections.Mapping) for item in items):
+            return None
+        for key in self.LIST_ITEM_KEYS:
+            if all(item.get(key) is not None for item in items):
+                return key
+        return None
+
+    def _join(self, path, key):
+        return '{0}.{1}'.format(path, key) if path else key
+
+
 class ServerProfileReplaceNamesByUris(object):
     SCOPE_NOT_FOUND = 'Scope not found: '
     SERVER_PROFILE_OS_DEPLOYMENT_NOT_FOUND = 'OS Deployment Plan not found: '
@@ -39,6 +39,8 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
+    - oneview.mirror
 '''
 
 EXAMPLES = '''
@@ -75,6 +77,20 @@ EXAMPLES = '''
       count: 5
       filter: "urgency='High'"
 
+- debug: var=alerts
+
+- name: Gather facts about the active critical alerts, from the local mirror
+  oneview_alert_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    source: mirror
+    params:
+      filter:
+        - "alertState='Active'"
+        - "severity='Critical'"
+
 - debug: var=alerts
 '''
 
@@ -93,10 +109,11 @@ class AlertFactsModule(OneViewModuleBase):
         argument_spec = dict(
             params=dict(required=False, type='dict')
         )
-        super(AlertFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(AlertFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['alerts'],
+                                               mirror_support=True)
 
     def execute_module(self):
-        facts = self.oneview_client.alerts.get_all(**self.facts_params)
+        facts = self.get_all_resources(self.oneview_client.alerts)
 
         return dict(changed=False, ansible_facts=dict(alerts=facts))
 
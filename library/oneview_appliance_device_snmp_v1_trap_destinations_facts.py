@@ -43,6 +43,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -103,7 +104,8 @@ class ApplianceDeviceSnmpV1TrapDestinationsFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(ApplianceDeviceSnmpV1TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ApplianceDeviceSnmpV1TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec,
+                                                                               fields_support=['appliance_device_snmp_v1_trap_destinations'])
 
     def execute_module(self):
         client = self.oneview_client.appliance_device_snmp_v1_trap_destinations
@@ -112,7 +114,7 @@ class ApplianceDeviceSnmpV1TrapDestinationsFactsModule(OneViewModuleBase):
         if self.module.params.get('destination'):
             ansible_facts['appliance_device_snmp_v1_trap_destinations'] = self._get_by('destination', self.module.params['destination'])
         else:
-            ansible_facts['appliance_device_snmp_v1_trap_destinations'] = client.get_all(**self.facts_params)
+            ansible_facts['appliance_device_snmp_v1_trap_destinations'] = self.get_all_resources(client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
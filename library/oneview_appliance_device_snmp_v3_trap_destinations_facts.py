@@ -36,6 +36,7 @@ author:
     "Gianluca Zecchi (@gzecchi)"
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -96,7 +97,8 @@ class ApplianceDeviceSnmpV3TrapDestinationsFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(ApplianceDeviceSnmpV3TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ApplianceDeviceSnmpV3TrapDestinationsFactsModule, self).__init__(additional_arg_spec=self.argument_spec,
+                                                                               fields_support=['appliance_device_snmp_v3_trap_destinations'])
 
     def execute_module(self):
         client = self.oneview_client.appliance_device_snmp_v3_trap_destinations
@@ -105,7 +107,7 @@ class ApplianceDeviceSnmpV3TrapDestinationsFactsModule(OneViewModuleBase):
         if self.module.params.get('id'):
             ansible_facts['appliance_device_snmp_v3_trap_destinations'] = self._get_by_id(self.module.params['id'])
         else:
-            ansible_facts['appliance_device_snmp_v3_trap_destinations'] = client.get_all(**self.facts_params)
+            ansible_facts['appliance_device_snmp_v3_trap_destinations'] = self.get_all_resources(client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
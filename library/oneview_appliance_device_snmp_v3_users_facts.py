@@ -36,6 +36,7 @@ author:
     "Gianluca Zecchi (@gzecchi)"
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -95,7 +96,7 @@ class ApplianceDeviceSnmpV3UsersFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(ApplianceDeviceSnmpV3UsersFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ApplianceDeviceSnmpV3UsersFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['appliance_device_snmp_v3_users'])
 
     def execute_module(self):
         client = self.oneview_client.appliance_device_snmp_v3_users
@@ -104,7 +105,7 @@ class ApplianceDeviceSnmpV3UsersFactsModule(OneViewModuleBase):
         if self.module.params.get('id'):
             ansible_facts['appliance_device_snmp_v3_users'] = self._get_by_id(self.module.params['id'])
         else:
-            ansible_facts['appliance_device_snmp_v3_users'] = client.get_all(**self.facts_params)
+            ansible_facts['appliance_device_snmp_v3_users'] = self.get_all_resources(client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
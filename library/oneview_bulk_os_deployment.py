@@ -0,0 +1,271 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_bulk_os_deployment
+short_description: Deploy OS volumes to many servers from one Image Streamer Deployment Plan.
+description:
+    - Deploy an OS volume to each target server by creating its Server Profile with the OS Deployment Settings of
+      a single Deployment Plan.
+    - The Deployment Plan, the Server Profile Template, the server hardware and the existing Server Profiles are
+      resolved once for all the targets. The Server Profiles are then created in waves of concurrent requests, so the
+      number of OS volumes created at once stays within the Image Streamer limits.
+    - The targets whose Server Profile already exists are skipped.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    deployment_plan:
+      description:
+        - Name of the OS Deployment Plan.
+      required: true
+    server_profile_template:
+      description:
+        - Name of the Server Profile Template the Server Profiles are created from.
+      required: false
+    data:
+      description:
+        - Server Profile attributes common to all the targets, such as C(connectionSettings) or C(boot), and
+          the C(osCustomAttributes) common to all the targets.
+      required: false
+    targets:
+      description:
+        - List with the targets. Each target has the C(name) of its Server Profile, the C(serverHardwareName) or
+          C(serverHardwareUri) of its server hardware and, optionally, its C(osCustomAttributes), such as the
+          hostname or the IP address of the OS. The custom attributes of the target override the common ones,
+          which override the defaults of the Deployment Plan.
+      required: true
+    wave_size:
+      description:
+        - Maximum number of Server Profiles, and therefore of OS volumes, created at once.
+      default: 8
+      required: false
+    power_off:
+      description:
+        - Whether the server hardware is powered off before its Server Profile is created.
+      type: bool
+      default: true
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Deploy ESXi to the servers of a rack, 8 OS volumes at a time
+  oneview_bulk_os_deployment:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    deployment_plan: 'ESXi 6.7 Deployment Plan'
+    server_profile_template: 'ESXi Host Template'
+    data:
+      osCustomAttributes:
+        - name: DomainName
+          value: 'example.com'
+    targets:
+      - name: 'esxi-01'
+        serverHardwareName: 'Rack1-Encl1, bay 1'
+        osCustomAttributes:
+          - name: HostName
+            value: 'esxi-01'
+      - name: 'esxi-02'
+        serverHardwareName: 'Rack1-Encl1, bay 2'
+        osCustomAttributes:
+          - name: HostName
+            value: 'esxi-02'
+    wave_size: 8
+  delegate_to: localhost
+
+- debug: var=bulk_deployment
+'''
+
+RETURN = '''
+bulk_deployment:
+    description: Has the names of the Server Profiles created, of the targets skipped because their Server Profile
+                 already exists, and the number of waves submitted. When a wave fails, it also has the names of
+                 the Server Profiles that failed, and the Server Profiles created by the previous waves are
+                 reported along with the failure.
+    returned: Always.
+    type: dict
+'''
+
+from copy import deepcopy
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError,
+                                          get_resources_by,
+                                          run_concurrently)
+
+
+class BulkOsDeploymentModule(OneViewModule):
+    MSG_DEPLOYED = 'OS volumes deployed successfully.'
+    MSG_ALREADY_DEPLOYED = 'OS volumes are already deployed.'
+    MSG_DEPLOYMENT_PLAN_NOT_FOUND = 'OS Deployment Plan not found: '
+    MSG_TEMPLATE_NOT_FOUND = 'Server Profile Template not found: '
+    MSG_SERVER_HARDWARE_NOT_FOUND = 'Server Hardware not found: '
+    MSG_TARGET_INVALID = 'Each target requires a name and a serverHardwareName or serverHardwareUri.'
+    MSG_DEPLOYMENT_FAILED = 'Failed to deploy the OS volumes of {0}: {1}'
+
+    def __init__(self):
+        argument_spec = dict(
+            deployment_plan=dict(required=True, type='str'),
+            server_profile_template=dict(required=False, type='str'),
+            data=dict(required=False, type='dict'),
+            targets=dict(required=True, type='list'),
+            wave_size=dict(required=False, type='int', default=8),
+            power_off=dict(required=False, type='bool', default=True)
+        )
+        super(BulkOsDeploymentModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        targets = self.module.params['targets']
+        for target in targets:
+            if not target.get('name') or not (target.get('serverHardwareName') or target.get('serverHardwareUri')):
+                raise OneViewModuleValueError(self.MSG_TARGET_INVALID)
+
+        existing_names = set(profile['name'] for profile in get_resources_by(
+            self.oneview_client.server_profiles, 'name', [target['name'] for target in targets], fields=['name']))
+        existing = [target['name'] for target in targets if target['name'] in existing_names]
+        pending = [target for target in targets if target['name'] not in existing_names]
+
+        if not pending:
+            return dict(changed=False,
+                        msg=self.MSG_ALREADY_DEPLOYED,
+                        ansible_facts=dict(bulk_deployment=dict(created=[], existing=existing, waves=0)))
+
+        payloads = self.__build_payloads(pending)
+        wave_size = max(self.module.params['wave_size'], 1)
+        created = []
+        waves = 0
+        for start in range(0, len(payloads), wave_size):
+            wave = payloads[start:start + wave_size]
+            waves += 1
+            self.module.log('Deploying wave {0}: {1}'.format(waves, ', '.join(p['name'] for p in wave)))
+
+            results = run_concurrently(self.__create_profile, wave, wave_size)
+            failures = [(payload['name'], result) for payload, result in zip(wave, results)
+                        if isinstance(result, Exception)]
+            created.extend(payload['name'] for payload, result in zip(wave, results) if not isinstance(result, Exception))
+
+            if failures:
+                failed = [name for name, error in failures]
+                messages = '; '.join('{0}: {1}'.format(name, error) for name, error in failures)
+                bulk_deployment = dict(created=created, existing=existing, failed=failed, waves=waves)
+                raise OneViewModuleException(self.MSG_DEPLOYMENT_FAILED.format(', '.join(failed), messages),
+                                             result=dict(changed=bool(created),
+                                                         ansible_facts=dict(bulk_deployment=bulk_deployment)))
+
+        return dict(changed=True,
+                    msg=self.MSG_DEPLOYED,
+                    ansible_facts=dict(bulk_deployment=dict(created=created, existing=existing, waves=waves)))
+
+    def __build_payloads(self, targets):
+        deployment_plan = self.__get_deployment_plan()
+        template_profile = self.__get_new_profile_from_template()
+        server_hardware_uris = self.__get_server_hardware_uris(targets)
+
+        common_data = deepcopy(self.module.params.get('data') or {})
+        common_attributes = common_data.pop('osCustomAttributes', None) or []
+        default_attributes = [dict(name=parameter['name'], value=parameter.get('value'))
+                              for parameter in deployment_plan.get('additionalParameters') or []
+                              if parameter.get('value') is not None]
+
+        payloads = []
+        for target in targets:
+            payload = deepcopy(template_profile)
+            payload.update(deepcopy(common_data))
+            payload['name'] = target['name']
+            payload['serverHardwareUri'] = target.get('serverHardwareUri') or \
+                server_hardware_uris[target['serverHardwareName']]
+            payload['osDeploymentSettings'] = dict(
+                osDeploymentPlanUri=deployment_plan['uri'],
+                osCustomAttributes=self.__merge_attributes(default_attributes, common_attributes,
+                                                           target.get('osCustomAttributes') or []))
+            payloads.append(payload)
+        return payloads
+
+    def __get_deployment_plan(self):
+        name = self.module.params['deployment_plan']
+        deployment_plan = self.oneview_client.os_deployment_plans.get_by_name(name)
+        if not deployment_plan:
+            raise OneViewModuleResourceNotFound(self.MSG_DEPLOYMENT_PLAN_NOT_FOUND + name)
+        return deployment_plan.data
+
+    def __get_new_profile_from_template(self):
+        name = self.module.params.get('server_profile_template')
+        if not name:
+            return {}
+        template = self.oneview_client.server_profile_templates.get_by_name(name)
+        if not template:
+            raise OneViewModuleResourceNotFound(self.MSG_TEMPLATE_NOT_FOUND + name)
+        new_profile = template.get_new_profile()
+        new_profile['serverProfileTemplateUri'] = template.data['uri']
+        return new_profile
+
+    def __get_server_hardware_uris(self, targets):
+        names = [target['serverHardwareName'] for target in targets if not target.get('serverHardwareUri')]
+        if not names:
+            return {}
+
+        uris = dict((server_hardware['name'], server_hardware['uri']) for server_hardware in
+                    get_resources_by(self.oneview_client.server_hardware, 'name', names, fields=['name', 'uri']))
+        missing = sorted(set(names) - set(uris))
+        if missing:
+            raise OneViewModuleResourceNotFound(self.MSG_SERVER_HARDWARE_NOT_FOUND + ', '.join(missing))
+        return uris
+
+    def __merge_attributes(self, *attribute_lists):
+        merged = {}
+        order = []
+        for attributes in attribute_lists:
+            for attribute in attributes:
+                if attribute['name'] not in merged:
+                    order.append(attribute['name'])
+                value = attribute.get('value')
+                if isinstance(value, bool):
+                    value = 'true' if value else 'false'
+                merged[attribute['name']] = value
+        return [dict(name=name, value=merged[name]) for name in order]
+
+    def __create_profile(self, payload):
+        try:
+            if self.module.params.get('power_off'):
+                server_hardware = self.oneview_client.server_hardware.get_by_uri(payload['serverHardwareUri'])
+                if server_hardware.data.get('powerState') != 'Off':
+                    server_hardware.update_power_state(dict(powerState='Off', powerControl='PressAndHold'))
+            return self.oneview_client.server_profiles.create(payload).data
+        except Exception as exception:
+            return exception
+
+
+def main():
+    BulkOsDeploymentModule().run()
+
+
+if __name__ == '__main__':
+    main()
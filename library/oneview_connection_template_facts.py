@@ -44,6 +44,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -115,7 +116,7 @@ class ConnectionTemplateFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict')
         )
-        super(ConnectionTemplateFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(ConnectionTemplateFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['connection_templates'])
         self.set_resource_object(self.oneview_client.connection_templates)
 
     def execute_module(self):
@@ -126,7 +127,7 @@ class ConnectionTemplateFactsModule(OneViewModule):
         elif self.module.params.get('name'):
             ansible_facts['connection_templates'] = self.get_by_name(self.module.params['name'])
         else:
-            ansible_facts['connection_templates'] = self.resource_client.get_all(**self.facts_params)
+            ansible_facts['connection_templates'] = self.get_all_resources(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
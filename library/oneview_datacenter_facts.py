@@ -44,6 +44,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -104,7 +105,7 @@ class DatacenterFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(DatacenterFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(DatacenterFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['datacenters'])
 
     def execute_module(self):
 
@@ -122,7 +123,7 @@ class DatacenterFactsModule(OneViewModuleBase):
 
             ansible_facts['datacenters'] = datacenters
         else:
-            ansible_facts['datacenters'] = client.get_all(**self.facts_params)
+            ansible_facts['datacenters'] = self.get_all_resources(client)
 
         return dict(changed=False,
                     ansible_facts=ansible_facts)
@@ -37,6 +37,7 @@ options:
         - Indicates the desired state for the Enclosure resource.
           C(present) will ensure data properties are compliant with OneView. You can rename the enclosure providing an
           attribute C(newName). You can also rename the rack providing an attribute C(rackName).
+          The changes of name, rack name and scopes are sent in a single PATCH request.
           C(absent) will remove the resource from OneView, if it exists.
           C(reconfigured) will reapply the appliance's configuration on the enclosure. This includes
           running the same configuration steps that were performed as part of the enclosure add.
@@ -75,6 +76,8 @@ options:
     data:
       description:
         - List with the Enclosure properties.
+        - For the bay states, C(bayNumber) chooses one bay, C(bayNumbers) a list of bays and C(bays=all) all the
+          populated bays. The bays that need changes are updated at once with a single PATCH request.
       required: true
 notes:
     - "These states are only available on HPE Synergy: C(appliance_bays_powered_on), C(uid_on), C(uid_off),
@@ -272,6 +275,28 @@ EXAMPLES = '''
       name: 'Test-Enclosure'
       bayNumber: 1
 
+- name: Reset the device bays 1 to 6 in a single request
+  oneview_enclosure:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    state: device_bays_power_state_reset
+    data:
+      name: 'Test-Enclosure'
+      bayNumbers: [1, 2, 3, 4, 5, 6]
+
+- name: Set the UID state off for all the Synergy Frame Link Modules
+  oneview_enclosure:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    state: manager_bays_uid_off
+    data:
+      name: 'Test-Enclosure'
+      bays: all
+
 - name: E-Fuse the appliance bay 1
   oneview_enclosure:
     hostname: 172.16.101.48
@@ -383,7 +408,8 @@ enclosure:
 
 from ansible.module_utils.oneview import (OneViewModule,
                                           OneViewModuleResourceNotFound,
-                                          OneViewModuleValueError)
+                                          OneViewModuleValueError,
+                                          run_concurrently)
 
 
 class EnclosureModule(OneViewModule):
@@ -404,6 +430,9 @@ class EnclosureModule(OneViewModule):
     MSG_MANAGER_BAY_UID_ON = 'UID for the Synergy Frame Link Module set to On successfully.'
     MSG_MANAGER_BAY_UID_ALREADY_ON = 'The UID for the Synergy Frame Link Module is already On.'
     MSG_BAY_NOT_FOUND = 'Bay not found.'
+    MSG_BAYS_ALREADY_SET = 'The bays are already in the desired state.'
+    MSG_BAYS_NOT_SUPPORTED = 'The state {0} does not apply to bays.'
+    MSG_BAYS_INVALID = "The bays option only accepts 'all'. Use bayNumbers to choose the bays."
     MSG_MANAGER_BAY_UID_ALREADY_OFF = 'The UID for the Synergy Frame Link Module is already Off.'
     MSG_MANAGER_BAY_UID_OFF = 'UID for the Synergy Frame Link Module set to Off successfully.'
     MSG_MANAGER_BAY_POWER_STATE_E_FUSED = 'E-Fuse the Synergy Frame Link Module bay in the path.'
@@ -540,7 +569,7 @@ class EnclosureModule(OneViewModule):
         scope_uris = configuration_data.pop('scopeUris', None)
 
         if 'hostname' in self.data:
-            resource_by_hostname = self.resource_client.get_by_hostname(self.data['hostname'])
+            resource_by_hostname = self.__get_by_hostname(self.data['hostname'])
             if not resource_by_hostname:
                 self.current_resource = self.resource_client.add(configuration_data)
                 message = self.MSG_CREATED
@@ -551,32 +580,41 @@ class EnclosureModule(OneViewModule):
         if not self.current_resource:
             raise OneViewModuleValueError(self.MSG_ENCLOSURE_REQUIRED_FIELDS)
 
-        if self.__name_has_changes(name):
-            self.__replace_enclosure_name(name)
-            changed = True
-            message = self.MSG_UPDATED
+        # The attributes are replaced with a single PATCH, sent alongside the environmental configuration update
+        updates = []
+        operations = self.__attribute_operations(name, rack_name, scope_uris)
+        if operations:
+            updates.append(lambda: self.__patch_attributes(operations))
+        if calibrated_max_power:
+            updates.append(lambda: self.__set_calibrated_max_power(calibrated_max_power))
 
-        if self.__rack_name_has_changes(rack_name):
-            self.__replace_enclosure_rack_name(rack_name)
+        if updates:
+            run_concurrently(lambda update: update(), updates, max_workers=len(updates))
             changed = True
             message = self.MSG_UPDATED
 
-        if calibrated_max_power:
-            self.__set_calibrated_max_power(calibrated_max_power)
-            changed = True
-            message = self.MSG_UPDATED
+        return changed, message, self.current_resource.data
 
-        resource = self.current_resource.data
+    def __get_by_hostname(self, hostname):
+        filter_ = "activeOaPreferredIP='{0}' OR standbyOaPreferredIP='{0}'".format(hostname)
+        enclosures = self.resource_client.get_all(filter=filter_)
+        if not enclosures:
+            return None
+        return self.resource_client.new(self.oneview_client.connection, enclosures[0])
 
-        if scope_uris is not None:
-            state = {'ansible_facts': {'enclosure': self.current_resource.data},
-                     'changed': changed, 'msg': message}
-            result = self.resource_scopes_set(state, 'enclosure', scope_uris)
-            resource = result['ansible_facts']['enclosure']
-            changed = result['changed']
-            message = result['msg']
+    def __attribute_operations(self, name, rack_name, scope_uris):
+        operations = []
+        if self.__name_has_changes(name):
+            operations.append(dict(op='replace', path='/name', value=name))
+        if self.__rack_name_has_changes(rack_name):
+            operations.append(dict(op='replace', path='/rackName', value=rack_name))
+        if self.__scopes_have_changes(scope_uris):
+            operations.append(dict(op='replace', path='/scopeUris', value=scope_uris))
+        return operations
 
-        return changed, message, resource
+    def __patch_attributes(self, operations):
+        self.current_resource.data = self.current_resource.patch_request(self.current_resource.data['uri'],
+                                                                         body=operations)
 
     def __reconfigure(self):
         reconfigured_enclosure = self.current_resource.update_configuration()
@@ -606,6 +644,9 @@ class EnclosureModule(OneViewModule):
     def __patch(self):
         changed = False
         state_name = self.module.params['state']
+        if 'bayNumbers' in self.data or 'bays' in self.data:
+            return self.__patch_bays(state_name)
+
         state = self.patch_params[state_name].copy()
         property_current_value = self.__get_current_property_value(state_name, state)
 
@@ -620,6 +661,50 @@ class EnclosureModule(OneViewModule):
 
         return changed, msg, resource
 
+    def __patch_bays(self, state_name):
+        state = self.patch_params[state_name]
+        if '{bayNumber}' not in state['path']:
+            raise OneViewModuleValueError(self.MSG_BAYS_NOT_SUPPORTED.format(state_name))
+
+        property_name = state['path'].split('/')[1]
+        sub_property_name = state['path'].split('/')[-1]
+        if state_name == 'appliance_bays_powered_on':
+            sub_property_name = 'poweredOn'
+
+        operations = []
+        for bay in self.__get_bays(property_name):
+            property_current_value = bay.get(sub_property_name)
+            if state['operation'] == 'remove' and not property_current_value:
+                continue
+            if self.__is_update_needed(state_name, state, property_current_value):
+                operations.append(dict(op=state['operation'],
+                                       path=state['path'].format(bayNumber=bay['bayNumber']),
+                                       value=state['value']))
+
+        if not operations:
+            msg = self.patch_messages[state_name].get('not_changed', self.MSG_BAYS_ALREADY_SET)
+            return False, msg, self.current_resource.data
+
+        resource = self.current_resource.patch_request(self.current_resource.data['uri'], body=operations)
+        return True, self.patch_messages[state_name]['changed'], resource
+
+    def __get_bays(self, property_name):
+        bays = self.current_resource.data.get(property_name) or []
+
+        if 'bays' in self.data:
+            if self.data['bays'] != 'all':
+                raise OneViewModuleValueError(self.MSG_BAYS_INVALID)
+            return [bay for bay in bays if bay.get('devicePresence') != 'Absent']
+
+        bays_by_number = dict((str(bay.get('bayNumber')), bay) for bay in bays)
+        bay_numbers = []
+        for bay_number in self.data['bayNumbers'] or []:
+            if str(bay_number) not in bays_by_number:
+                raise OneViewModuleResourceNotFound(self.MSG_BAY_NOT_FOUND)
+            if str(bay_number) not in bay_numbers:
+                bay_numbers.append(str(bay_number))
+        return [bays_by_number[bay_number] for bay_number in bay_numbers]
+
     def __is_update_needed(self, state_name, state, property_current_value):
         need_request_update = False
         if state['value'] in ['E-Fuse', 'Reset', 'active']:
@@ -675,11 +760,9 @@ class EnclosureModule(OneViewModule):
     def __rack_name_has_changes(self, rack_name):
         return rack_name and self.current_resource.data.get('rackName', None) != rack_name
 
-    def __replace_enclosure_name(self, name):
-        self.current_resource.patch('replace', '/name', name)
-
-    def __replace_enclosure_rack_name(self, rack_name):
-        self.current_resource.patch('replace', '/rackName', rack_name)
+    def __scopes_have_changes(self, scope_uris):
+        current_scope_uris = self.current_resource.data.get('scopeUris')
+        return scope_uris is not None and (current_scope_uris is None or set(current_scope_uris) != set(scope_uris))
 
     def __set_calibrated_max_power(self, calibrated_max_power):
         body = {"calibratedMaxPower": calibrated_max_power}
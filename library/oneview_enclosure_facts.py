@@ -49,6 +49,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -157,7 +158,7 @@ class EnclosureFactsModule(OneViewModule):
     argument_spec = dict(name=dict(type='str'), options=dict(type='list'), params=dict(type='dict'))
 
     def __init__(self):
-        super(EnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(EnclosureFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['enclosures'])
         self.set_resource_object(self.oneview_client.enclosures)
 
     def execute_module(self):
@@ -169,7 +170,7 @@ class EnclosureFactsModule(OneViewModule):
             if self.options:
                 ansible_facts = self._gather_optional_facts(self.options)
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            enclosures = self.resource_client.get_all(**self.facts_params)
+            enclosures = self.get_all_resources(self.resource_client)
         else:
             enclosures = []
 
@@ -48,6 +48,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -114,7 +115,7 @@ class EnclosureGroupFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(EnclosureGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(EnclosureGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['enclosure_groups'])
         self.set_resource_object(self.oneview_client.enclosure_groups)
 
     def execute_module(self):
@@ -128,7 +129,7 @@ class EnclosureGroupFactsModule(OneViewModule):
                 if "configuration_script" in self.options:
                     facts["enclosure_group_script"] = self.current_resource.get_script()
         else:
-            enclosure_groups = self.resource_client.get_all(**self.facts_params)
+            enclosure_groups = self.get_all_resources(self.resource_client)
 
         facts["enclosure_groups"] = enclosure_groups
         return dict(changed=False, ansible_facts=facts)
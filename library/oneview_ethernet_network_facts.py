@@ -46,6 +46,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -126,7 +127,7 @@ class EthernetNetworkFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(EthernetNetworkFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(EthernetNetworkFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['ethernet_networks'])
         self.set_resource_object(self.oneview_client.ethernet_networks)
 
     def execute_module(self):
@@ -139,7 +140,7 @@ class EthernetNetworkFactsModule(OneViewModule):
                 if self.module.params.get('options'):
                     ansible_facts = self.__gather_optional_facts()
         else:
-            ethernet_networks = self.resource_client.get_all(**self.facts_params)
+            ethernet_networks = self.get_all_resources(self.resource_client)
 
         ansible_facts['ethernet_networks'] = ethernet_networks
 
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -80,11 +81,11 @@ class EventFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict')
         )
 
-        super(EventFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(EventFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['events'])
 
     def execute_module(self):
 
-        events = self.oneview_client.events.get_all(**self.facts_params)
+        events = self.get_all_resources(self.oneview_client.events)
 
         return dict(changed=False, ansible_facts=dict(events=events))
 
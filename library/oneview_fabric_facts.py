@@ -44,6 +44,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -103,7 +104,7 @@ class FabricFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(FabricFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(FabricFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['fabrics'])
         self.resource_client = self.oneview_client.fabrics
 
     def execute_module(self):
@@ -115,7 +116,7 @@ class FabricFactsModule(OneViewModuleBase):
             if self.options and fabrics:
                 ansible_facts = self.__gather_optional_facts(fabrics[0])
         else:
-            fabrics = self.oneview_client.fabrics.get_all(**self.facts_params)
+            fabrics = self.get_all_resources(self.oneview_client.fabrics)
 
         ansible_facts['fabrics'] = fabrics
 
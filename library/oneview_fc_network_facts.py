@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -98,7 +99,7 @@ class FcNetworkFactsModule(OneViewModule):
             params=dict(required=False, type='dict')
         )
 
-        super(FcNetworkFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(FcNetworkFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['fc_networks'])
 
         self.resource_client = self.oneview_client.fc_networks
 
@@ -107,7 +108,7 @@ class FcNetworkFactsModule(OneViewModule):
         if self.module.params['name']:
             fc_networks = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            fc_networks = self.resource_client.get_all(**self.facts_params)
+            fc_networks = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(fc_networks=fc_networks))
 
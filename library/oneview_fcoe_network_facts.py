@@ -43,6 +43,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -100,7 +101,7 @@ class FcoeNetworkFactsModule(OneViewModule):
             params=dict(type='dict'),
         )
 
-        super(FcoeNetworkFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(FcoeNetworkFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['fcoe_networks'])
         self.set_resource_object(self.oneview_client.fcoe_networks)
 
     def execute_module(self):
@@ -108,7 +109,7 @@ class FcoeNetworkFactsModule(OneViewModule):
         if self.module.params['name']:
             fcoe_networks = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            fcoe_networks = self.resource_client.get_all(**self.facts_params)
+            fcoe_networks = self.get_all_resources(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(fcoe_networks=fcoe_networks))
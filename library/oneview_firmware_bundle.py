@@ -26,8 +26,12 @@ module: oneview_firmware_bundle
 short_description: Upload OneView Firmware Bundle resources.
 description:
     - Upload an SPP ISO image file or a hotfix file to the appliance.
+    - The file is sent in chunks straight from a memory map of the local file, without an encoded copy on disk,
+      and the upload is retried when the connection fails.
 notes:
-   - "This module is non-idempotent"
+   - "The upload is skipped when the firmware driver inventory already has a bundle with the same file name and
+     content. The content is matched by the SHA-256 checksum recorded when the bundle was uploaded by this module,
+     or by the bundle size otherwise, since the appliance does not report the checksum of the bundles."
 version_added: "2.3"
 requirements:
     - "python >= 2.7.9"
@@ -43,6 +47,13 @@ options:
       description:
         - The full path of a local file to be loaded.
       required: true
+    checksum_cache:
+      description:
+        - Path of the JSON file caching the checksums of the local files by path, inode, size, modification and
+          status change times, so large files are hashed only once. Defaults to the C(ONEVIEW_CHECKSUM_CACHE)
+          environment variable, or to C(oneview/checksums.json) in the cache directory of the user,
+          C(XDG_CACHE_HOME) or C(~/.cache). The cache file is only readable by its owner.
+      required: false
 
 extends_documentation_fragment:
     - oneview
@@ -55,6 +66,12 @@ EXAMPLES = '''
     state: present
     file_path: "/home/user/Downloads/hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm"
 
+- name: Ensure that the Service Pack for ProLiant is present, caching the checksum of the ISO
+  oneview_firmware_bundle:
+    config: "{{ config_file_path }}"
+    state: present
+    file_path: "/home/user/Downloads/SPP2020020.2020_0203.84.iso"
+    checksum_cache: "/home/user/.oneview-checksums.json"
 '''
 
 RETURN = '''
@@ -62,17 +79,26 @@ firmware_bundle:
     description: Has the facts about the OneView Firmware Bundle.
     returned: Always. Can be null.
     type: dict
+
+checksum:
+    description: SHA-256 checksum of the uploaded file.
+    returned: Always.
+    type: str
 '''
 
-from ansible.module_utils.oneview import OneViewModuleBase
+import os
+
+from ansible.module_utils.oneview import OneViewModuleBase, FileChecksumCache, upload_file
 
 
 class FirmwareBundleModule(OneViewModuleBase):
     MSG_FIRMWARE_BUNDLE_UPLOADED = 'Firmware Bundle uploaded sucessfully.'
+    MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT = 'Firmware Bundle is already present.'
 
     argument_spec = dict(
         state=dict(required=True, choices=['present']),
-        file_path=dict(required=True, type='str')
+        file_path=dict(required=True, type='str'),
+        checksum_cache=dict(required=False, type='path')
     )
 
     def __init__(self):
@@ -80,12 +106,54 @@ class FirmwareBundleModule(OneViewModuleBase):
 
     def execute_module(self):
         file_path = self.module.params['file_path']
+        checksum_cache = FileChecksumCache(self.module.params.get('checksum_cache'))
+
+        firmware, checksum = self.__get_uploaded_firmware(file_path, checksum_cache)
+        if firmware:
+            checksum_cache.save()
+            return dict(changed=False,
+                        msg=self.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+                        checksum=checksum,
+                        ansible_facts=dict(firmware_bundle=firmware))
+
+        new_firmware, checksum = upload_file(self.oneview_client.connection,
+                                             self.oneview_client.firmware_bundles.URI,
+                                             file_path)
+        checksum_cache.store(file_path, checksum)
+        if new_firmware and new_firmware.get('uri'):
+            checksum_cache.set_uploaded(new_firmware['uri'], checksum)
+        checksum_cache.save()
 
-        new_firmware = self.oneview_client.firmware_bundles.upload(file_path)
         return dict(changed=True,
                     msg=self.MSG_FIRMWARE_BUNDLE_UPLOADED,
+                    checksum=checksum,
                     ansible_facts=dict(firmware_bundle=new_firmware))
 
+    def __get_uploaded_firmware(self, file_path, checksum_cache):
+        file_name = os.path.basename(file_path)
+        candidates = [firmware for firmware in self.oneview_client.firmware_drivers.get_all()
+                      if file_name in self.__file_names(firmware)]
+        if not candidates:
+            # The file is hashed while it is uploaded
+            return None, None
+
+        checksum = checksum_cache.checksum(file_path)
+        file_size = os.path.getsize(file_path)
+        for firmware in candidates:
+            uploaded_checksum = checksum_cache.get_uploaded(firmware.get('uri'))
+            if uploaded_checksum:
+                if uploaded_checksum == checksum:
+                    return firmware, checksum
+            elif str(firmware.get('bundleSize')) == str(file_size):
+                return firmware, checksum
+
+        return None, checksum
+
+    def __file_names(self, firmware):
+        file_names = [firmware.get('isoFileName')]
+        file_names += [component.get('fileName') for component in firmware.get('fwComponents') or []]
+        return file_names
+
 
 def main():
     FirmwareBundleModule().run()
@@ -46,6 +46,7 @@ options:
       required: false
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -91,7 +92,7 @@ class FirmwareDriverFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict')
 
         )
-        super(FirmwareDriverFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(FirmwareDriverFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['firmware_drivers'])
 
         self.resource_client = self.oneview_client.firmware_drivers
 
@@ -101,7 +102,7 @@ class FirmwareDriverFactsModule(OneViewModuleBase):
         if name:
             result = self.resource_client.get_by('name', name)
         else:
-            result = self.resource_client.get_all(**self.facts_params)
+            result = self.get_all_resources(self.resource_client)
 
         return dict(
             changed=False,
@@ -0,0 +1,385 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_firmware_rollout
+short_description: Roll out a firmware bundle to many Logical Interconnects and Logical Enclosures.
+description:
+    - Roll out a firmware bundle (SPP) to many Logical Interconnects and Logical Enclosures in two phases.
+    - The firmware is first staged on all the Logical Interconnects concurrently, which uploads it to the
+      interconnects without disrupting the traffic.
+    - The firmware is then activated in waves. Each wave activates at most C(max_per_domain) targets of the same
+      enclosure group and redundancy domain at once, so the redundant interconnects are never activated together.
+      The tasks of a wave are tracked together, and the rollout stops after a wave with failures.
+    - The Logical Enclosures have no stage operation, their firmware is updated in the activation waves. Since the
+      update of a Logical Enclosure also updates its Logical Interconnects, they cannot be targeted together.
+    - The Logical Interconnects that already run the bundle and the Logical Enclosures that already have it as
+      baseline are skipped.
+    - When C(state_file) is set, the status of each target is saved in it as the rollout progresses. Running the
+      module again with the same bundle resumes the rollout, skipping the targets already staged or activated and
+      retrying the failed ones.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    spp:
+      description:
+        - Name or URI of the firmware bundle, e.g. C(SPPGen10Snap3_2020_0221_71) or
+          C(/rest/firmware-drivers/SPPGen10Snap3_2020_0221_71).
+      required: true
+    logical_interconnects:
+      description:
+        - List with the Logical Interconnects. Each item is the name of a Logical Interconnect or a dictionary with
+          its C(name) and C(redundancyDomain).
+      required: false
+    logical_enclosures:
+      description:
+        - List with the Logical Enclosures. Each item is the name of a Logical Enclosure or a dictionary with its
+          C(name) and C(redundancyDomain).
+      required: false
+    interconnect_firmware:
+      description:
+        - Additional options of the Logical Interconnect firmware install, such as C(force),
+          C(ethernetActivationType) and C(ethernetActivationDelay).
+      required: false
+    enclosure_firmware:
+      description:
+        - Additional options of the Logical Enclosure firmware update, such as C(firmwareUpdateOn),
+          C(forceInstallFirmware) and C(logicalInterconnectUpdateMode).
+      required: false
+    max_per_domain:
+      description:
+        - Maximum number of targets of the same enclosure group and redundancy domain activated at once.
+      default: 1
+      required: false
+    max_workers:
+      description:
+        - Maximum number of concurrent firmware operations.
+      default: 10
+      required: false
+    state_file:
+      description:
+        - Path of the JSON file with the status of each target, used to resume an interrupted rollout.
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Roll out an SPP to the Logical Interconnects of two redundant fabrics and to a Logical Enclosure
+  oneview_firmware_rollout:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    spp: SPPGen10Snap3_2020_0221_71
+    logical_interconnects:
+      - name: LE-1-LIG-A
+        redundancyDomain: A
+      - name: LE-1-LIG-B
+        redundancyDomain: B
+      - name: LE-2-LIG-A
+        redundancyDomain: A
+      - name: LE-2-LIG-B
+        redundancyDomain: B
+    logical_enclosures:
+      - LE-3
+    interconnect_firmware:
+      force: false
+      ethernetActivationType: OddEven
+    enclosure_firmware:
+      firmwareUpdateOn: SharedInfrastructureOnly
+      forceInstallFirmware: false
+      logicalInterconnectUpdateMode: Orchestrated
+    max_per_domain: 1
+    state_file: /var/lib/oneview/spp-rollout.json
+  delegate_to: localhost
+
+- debug: var=firmware_rollout
+'''
+
+RETURN = '''
+firmware_rollout:
+    description: Has the status of each target, C(current), C(staged), C(activated) or C(failed), along with the
+                 error of the failed targets, and the number of activation waves run.
+    returned: Always.
+    type: dict
+'''
+
+import json
+import os
+import tempfile
+import threading
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError,
+                                          run_concurrently)
+
+STATUS_PENDING = 'pending'
+STATUS_CURRENT = 'current'
+STATUS_STAGED = 'staged'
+STATUS_ACTIVATED = 'activated'
+STATUS_FAILED = 'failed'
+
+TYPE_LOGICAL_INTERCONNECT = 'logical_interconnect'
+TYPE_LOGICAL_ENCLOSURE = 'logical_enclosure'
+
+
+class RolloutState(object):
+    """
+    Keeps the status of each target of a rollout in a JSON file, so an interrupted rollout can be resumed.
+    The status saved for another firmware bundle is discarded.
+    """
+
+    def __init__(self, path, spp_uri):
+        self.path = path
+        self.spp_uri = spp_uri
+        self.targets = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path) as state_file:
+                data = json.load(state_file)
+            if data.get('sppUri') == spp_uri:
+                self.targets = data.get('targets') or {}
+
+    def get(self, key):
+        return (self.targets.get(key) or {}).get('status', STATUS_PENDING)
+
+    def set(self, key, status, error=None):
+        with self._lock:
+            self.targets[key] = dict(status=status, error=error) if error else dict(status=status)
+            self.__save()
+
+    def __save(self):
+        if not self.path:
+            return
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        with os.fdopen(file_descriptor, 'w') as state_file:
+            json.dump(dict(sppUri=self.spp_uri, targets=self.targets), state_file, indent=2)
+        os.rename(temp_path, self.path)
+
+
+class FirmwareRolloutModule(OneViewModule):
+    MSG_COMPLETED = 'Firmware rollout completed.'
+    MSG_ALREADY_COMPLETED = 'Firmware rollout is already completed.'
+    MSG_NO_TARGETS = 'No logical_interconnects or logical_enclosures provided.'
+    MSG_TARGET_INVALID = 'Each target requires a name.'
+    MSG_LOGICAL_INTERCONNECT_NOT_FOUND = 'Logical Interconnect not found: '
+    MSG_LOGICAL_ENCLOSURE_NOT_FOUND = 'Logical Enclosure not found: '
+    MSG_OVERLAPPING_TARGETS = 'The Logical Enclosure {0} contains the Logical Interconnects also targeted: {1}. ' \
+                              'Target either the Logical Enclosure or its Logical Interconnects.'
+    MSG_ROLLOUT_FAILED = 'Firmware rollout stopped after the wave {0}, which failed on {1}'
+    MSG_STAGE_FAILED = 'Firmware rollout failed to stage the firmware on {0}'
+
+    def __init__(self):
+        argument_spec = dict(
+            spp=dict(required=True, type='str'),
+            logical_interconnects=dict(required=False, type='list'),
+            logical_enclosures=dict(required=False, type='list'),
+            interconnect_firmware=dict(required=False, type='dict'),
+            enclosure_firmware=dict(required=False, type='dict'),
+            max_per_domain=dict(required=False, type='int', default=1),
+            max_workers=dict(required=False, type='int', default=10),
+            state_file=dict(required=False, type='path')
+        )
+        super(FirmwareRolloutModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        spp = self.module.params['spp']
+        self.spp_uri = spp if spp.startswith('/rest/') else '/rest/firmware-drivers/' + spp
+        self.max_workers = self.module.params['max_workers']
+        self.rollout_state = RolloutState(self.module.params.get('state_file'), self.spp_uri)
+
+        targets = self.__get_targets()
+        self.__skip_current(targets)
+
+        changed = False
+        staging = [target for target in targets
+                   if target['type'] == TYPE_LOGICAL_INTERCONNECT and self.rollout_state.get(target['key']) in
+                   (STATUS_PENDING, STATUS_FAILED)]
+        if staging:
+            run_concurrently(self.__stage, staging, self.max_workers)
+            changed = True
+
+        activating = [target for target in targets if self.__ready_to_activate(target)]
+        waves = self.__plan_waves(activating)
+        for index, wave in enumerate(waves, 1):
+            self.module.log('Activating wave {0}: {1}'.format(index, ', '.join(target['name'] for target in wave)))
+            run_concurrently(self.__activate, wave, self.max_workers)
+            changed = True
+
+            failures = self.__failures(wave)
+            if failures:
+                raise OneViewModuleException(self.MSG_ROLLOUT_FAILED.format(index, failures))
+
+        failures = self.__failures(staging)
+        if failures:
+            raise OneViewModuleException(self.MSG_STAGE_FAILED.format(failures))
+
+        return dict(changed=changed,
+                    msg=self.MSG_COMPLETED if changed else self.MSG_ALREADY_COMPLETED,
+                    ansible_facts=dict(firmware_rollout=self.__rollout_facts(targets, len(waves))))
+
+    def __get_targets(self):
+        targets = [self.__target(TYPE_LOGICAL_INTERCONNECT, item)
+                   for item in self.module.params.get('logical_interconnects') or []]
+        targets += [self.__target(TYPE_LOGICAL_ENCLOSURE, item)
+                    for item in self.module.params.get('logical_enclosures') or []]
+        if not targets:
+            raise OneViewModuleValueError(self.MSG_NO_TARGETS)
+
+        resources = run_concurrently(self.__get_resource, targets, self.max_workers)
+        for target, resource in zip(targets, resources):
+            target['resource'] = resource
+        self.__validate_overlapping(targets)
+
+        enclosure_groups = {}
+        if any(target['type'] == TYPE_LOGICAL_INTERCONNECT for target in targets):
+            for logical_enclosure in self.oneview_client.logical_enclosures.get_all():
+                for uri in logical_enclosure.get('logicalInterconnectUris') or []:
+                    enclosure_groups[uri] = logical_enclosure.get('enclosureGroupUri')
+        for target in targets:
+            data = target['resource'].data
+            enclosure_group_uri = data.get('enclosureGroupUri') if target['type'] == TYPE_LOGICAL_ENCLOSURE \
+                else enclosure_groups.get(data['uri'])
+            target['domain'] = (enclosure_group_uri, target['redundancyDomain'])
+        return targets
+
+    def __validate_overlapping(self, targets):
+        logical_interconnects = dict((target['resource'].data['uri'], target['name']) for target in targets
+                                     if target['type'] == TYPE_LOGICAL_INTERCONNECT)
+        for target in targets:
+            if target['type'] == TYPE_LOGICAL_ENCLOSURE:
+                overlapping = [logical_interconnects[uri] for uri in
+                               target['resource'].data.get('logicalInterconnectUris') or []
+                               if uri in logical_interconnects]
+                if overlapping:
+                    message = self.MSG_OVERLAPPING_TARGETS.format(target['name'], ', '.join(overlapping))
+                    raise OneViewModuleValueError(message)
+
+    def __target(self, target_type, item):
+        if not isinstance(item, dict):
+            item = dict(name=item)
+        if not item.get('name'):
+            raise OneViewModuleValueError(self.MSG_TARGET_INVALID)
+        return dict(type=target_type, name=item['name'], redundancyDomain=item.get('redundancyDomain'),
+                    key='{0}/{1}'.format(target_type, item['name']))
+
+    def __get_resource(self, target):
+        if target['type'] == TYPE_LOGICAL_INTERCONNECT:
+            resource = self.oneview_client.logical_interconnects.get_by_name(target['name'])
+            message = self.MSG_LOGICAL_INTERCONNECT_NOT_FOUND
+        else:
+            resource = self.oneview_client.logical_enclosures.get_by_name(target['name'])
+            message = self.MSG_LOGICAL_ENCLOSURE_NOT_FOUND
+        if not resource:
+            raise OneViewModuleResourceNotFound(message + target['name'])
+        return resource
+
+    def __skip_current(self, targets):
+        unknown = [target for target in targets if self.rollout_state.get(target['key']) == STATUS_PENDING]
+        for target, current in zip(unknown, run_concurrently(self.__is_current, unknown, self.max_workers)):
+            if current:
+                self.rollout_state.set(target['key'], STATUS_CURRENT)
+
+    def __is_current(self, target):
+        if target['type'] == TYPE_LOGICAL_ENCLOSURE:
+            firmware = target['resource'].data.get('firmware') or {}
+            return firmware.get('firmwareBaselineUri') == self.spp_uri
+        firmware = target['resource'].get_firmware() or {}
+        return firmware.get('sppUri') == self.spp_uri and firmware.get('state') == 'Activated'
+
+    def __ready_to_activate(self, target):
+        status = self.rollout_state.get(target['key'])
+        if target['type'] == TYPE_LOGICAL_INTERCONNECT:
+            return status == STATUS_STAGED
+        return status in (STATUS_PENDING, STATUS_FAILED)
+
+    def __plan_waves(self, targets):
+        max_per_domain = max(self.module.params['max_per_domain'], 1)
+        domains = []
+        targets_by_domain = {}
+        for target in targets:
+            if target['domain'] not in targets_by_domain:
+                domains.append(target['domain'])
+                targets_by_domain[target['domain']] = []
+            targets_by_domain[target['domain']].append(target)
+
+        waves = []
+        start = 0
+        while any(len(targets_by_domain[domain]) > start for domain in domains):
+            waves.append([target for domain in domains
+                          for target in targets_by_domain[domain][start:start + max_per_domain]])
+            start += max_per_domain
+        return waves
+
+    def __stage(self, target):
+        options = dict(self.module.params.get('interconnect_firmware') or {})
+        options.update(command='Stage', sppUri=self.spp_uri)
+        self.__run(target, lambda: target['resource'].install_firmware(options), STATUS_STAGED)
+
+    def __activate(self, target):
+        if target['type'] == TYPE_LOGICAL_INTERCONNECT:
+            options = dict(self.module.params.get('interconnect_firmware') or {})
+            options.update(command='Activate', sppUri=self.spp_uri)
+            self.__run(target, lambda: target['resource'].install_firmware(options), STATUS_ACTIVATED)
+        else:
+            firmware = dict(self.module.params.get('enclosure_firmware') or {})
+            firmware['firmwareBaselineUri'] = self.spp_uri
+            self.__run(target, lambda: target['resource'].patch(operation='replace', path='/firmware',
+                                                                value=firmware), STATUS_ACTIVATED)
+
+    def __run(self, target, operation, status):
+        try:
+            operation()
+        except Exception as exception:
+            self.rollout_state.set(target['key'], STATUS_FAILED, str(exception))
+        else:
+            self.rollout_state.set(target['key'], status)
+
+    def __failures(self, targets):
+        return '; '.join('{0}: {1}'.format(target['name'], self.rollout_state.targets[target['key']].get('error'))
+                         for target in targets if self.rollout_state.get(target['key']) == STATUS_FAILED)
+
+    def __rollout_facts(self, targets, waves):
+        results = []
+        for target in targets:
+            result = dict(name=target['name'], type=target['type'], status=self.rollout_state.get(target['key']))
+            error = self.rollout_state.targets.get(target['key'], {}).get('error')
+            if error:
+                result['error'] = error
+            results.append(result)
+        return dict(sppUri=self.spp_uri, targets=results, waves=waves)
+
+
+def main():
+    FirmwareRolloutModule().run()
+
+
+if __name__ == '__main__':
+    main()
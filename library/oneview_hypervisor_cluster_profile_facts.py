@@ -48,6 +48,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -142,7 +143,7 @@ class HypervisorClusterProfileFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(HypervisorClusterProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(HypervisorClusterProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['hypervisor_cluster_profiles'])
         self.set_resource_object(self.oneview_client.hypervisor_cluster_profiles)
 
     def execute_module(self):
@@ -152,7 +153,7 @@ class HypervisorClusterProfileFactsModule(OneViewModule):
         if self.current_resource:
             hypervisor_cluster_profiles = [self.current_resource.data]
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            hypervisor_cluster_profiles = self.resource_client.get_all(**self.facts_params)
+            hypervisor_cluster_profiles = self.get_all_resources(self.resource_client)
 
         if self.options:
             ansible_facts = self.__gather_option_facts()
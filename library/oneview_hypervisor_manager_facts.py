@@ -39,6 +39,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -97,7 +98,7 @@ class HypervisorManagerFactsModule(OneViewModule):
             params=dict(required=False, type='dict')
         )
 
-        super(HypervisorManagerFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(HypervisorManagerFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['hypervisor_managers'])
         self.resource_client = self.oneview_client.hypervisor_managers
 
     def execute_module(self):
@@ -105,7 +106,7 @@ class HypervisorManagerFactsModule(OneViewModule):
         if self.module.params['name']:
             hypervisor_managers = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            hypervisor_managers = self.resource_client.get_all(**self.facts_params)
+            hypervisor_managers = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(hypervisor_managers=hypervisor_managers))
 
@@ -45,6 +45,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -88,7 +89,7 @@ class IdPoolsIpv4SubnetFactsModule(OneViewModuleBase):
             uri=dict(required=False, type='str'),
             params=dict(required=False, type='dict')
         )
-        super(IdPoolsIpv4SubnetFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(IdPoolsIpv4SubnetFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['id_pools_ipv4_subnets'])
         self.resource_client = self.oneview_client.id_pools_ipv4_subnets
 
     def execute_module(self):
@@ -98,7 +99,7 @@ class IdPoolsIpv4SubnetFactsModule(OneViewModuleBase):
         elif self.module.params.get('uri'):
             id_pools_ipv4_subnets = [self.resource_client.get(self.module.params['uri'])]
         else:
-            id_pools_ipv4_subnets = self.oneview_client.id_pools_ipv4_subnets.get_all(**self.facts_params)
+            id_pools_ipv4_subnets = self.get_all_resources(self.oneview_client.id_pools_ipv4_subnets)
 
         return dict(changed=False, ansible_facts=dict(id_pools_ipv4_subnets=id_pools_ipv4_subnets))
 
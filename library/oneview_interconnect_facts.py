@@ -53,6 +53,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -240,7 +241,7 @@ class InterconnectFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
         )
-        super(InterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(InterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['interconnects'])
         self.set_resource_object(self.oneview_client.interconnects)
 
     def execute_module(self):
@@ -252,7 +253,7 @@ class InterconnectFactsModule(OneViewModule):
             if self.module.params.get('options'):
                 self.__get_options(facts)
         else:
-            facts['interconnects'] = self.resource_client.get_all(**self.facts_params)
+            facts['interconnects'] = self.get_all_resources(self.resource_client)
 
         return dict(
             changed=False,
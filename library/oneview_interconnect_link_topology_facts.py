@@ -40,6 +40,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -84,14 +85,14 @@ class InterconnectLinkTopologyFactsModule(OneViewModuleBase):
             name=dict(required=False, type='str'),
             params=dict(required=False, type='dict'),
         )
-        super(InterconnectLinkTopologyFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(InterconnectLinkTopologyFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['interconnect_link_topologies'])
 
     def execute_module(self):
         name = self.module.params.get('name')
         if name:
             interconnect_link_topologies = self.oneview_client.interconnect_link_topologies.get_by('name', name)
         else:
-            interconnect_link_topologies = self.oneview_client.interconnect_link_topologies.get_all(**self.facts_params)
+            interconnect_link_topologies = self.get_all_resources(self.oneview_client.interconnect_link_topologies)
 
         return dict(changed=False,
                     ansible_facts=dict(interconnect_link_topologies=interconnect_link_topologies))
@@ -39,6 +39,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -93,7 +94,7 @@ class InterconnectTypeFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(InterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(InterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['interconnect_types'])
         self.resource_client = self.oneview_client.interconnect_types
 
     def execute_module(self):
@@ -101,7 +102,7 @@ class InterconnectTypeFactsModule(OneViewModule):
         if self.module.params.get('name'):
             interconnect_types = self.resource_client.get_by("name", self.module.params['name'])
         else:
-            interconnect_types = self.resource_client.get_all(**self.facts_params)
+            interconnect_types = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(interconnect_types=interconnect_types))
 
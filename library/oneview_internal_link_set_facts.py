@@ -54,6 +54,7 @@ notes:
     - This resource is available for API version 300 or later
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -108,7 +109,7 @@ class InternalLinkSetFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(InternalLinkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(InternalLinkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['internal_link_sets'])
         self.resource_client = self.oneview_client.internal_link_sets
 
     def execute_module(self):
@@ -116,7 +117,7 @@ class InternalLinkSetFactsModule(OneViewModule):
         if name:
             internal_links = self.resource_client.get_by('name', name)
         else:
-            internal_links = self.resource_client.get_all(**self.facts_params)
+            internal_links = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(internal_link_sets=internal_links))
 
@@ -54,10 +54,14 @@ options:
               non-idempotent.
               C(telemetry_configuration_updated) updates the telemetry configuration of a logical interconnect.
               C(scopes_updated) updates the scopes associated with the logical interconnect.
+              C(configured) ensures the C(ethernetSettings), C(qosConfiguration), C(snmpConfiguration),
+              C(portMonitor), C(telemetryConfiguration) and C(scopeUris) provided at once. The current
+              configurations are read concurrently and only the sections that differ are updated, one at a time.
+              When a section fails, the sections already updated are reported in C(logical_interconnect_configured).
         choices: ['compliant', 'ethernet_settings_updated', 'internal_networks_updated', 'settings_updated',
                   'forwarding_information_base_generated', 'qos_aggregated_configuration_updated',
                   'snmp_configuration_updated', 'port_monitor_updated', 'configuration_updated', 'firmware_installed',
-                  'telemetry_configuration_updated']
+                  'telemetry_configuration_updated', 'scopes_updated', 'configured']
     data:
         description:
             - List with the options.
@@ -221,6 +225,34 @@ EXAMPLES = '''
         - '/rest/scopes/01SC123456'
 
 - debug: var=scope_uris
+
+- name: Ensure the Ethernet settings, QoS, SNMP and port monitor configurations of a logical interconnect
+  oneview_logical_interconnect:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    state: configured
+    data:
+      name: "Name of the Logical Interconnect"
+      ethernetSettings:
+        macRefreshInterval: 10
+      qosConfiguration:
+        activeQosConfig:
+          category: 'qos-aggregated-configuration'
+          configType: 'Passthrough'
+          downlinkClassificationType: ~
+          uplinkClassificationType: ~
+          qosTrafficClassifiers: []
+          type: 'QosConfiguration'
+      snmpConfiguration:
+        enabled: True
+      portMonitor:
+        enablePortMonitor: False
+      scopeUris:
+        - '/rest/scopes/00SC123456'
+
+- debug: var=logical_interconnect
 '''
 
 RETURN = '''
@@ -264,9 +296,20 @@ scope_uris:
     description: Has the scope URIs the specified logical interconnect is inserted into.
     returned: On 'scopes_updated' state, but can be null.
     type: dict
+
+logical_interconnect_configured:
+    description: Has the sections updated by the 'configured' state. The configuration of each section provided is
+                 returned in the fact of its own state, such as qos_configuration and snmp_configuration.
+    returned: On 'configured' state, also when a section fails to update.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError, compare
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError,
+                                          compare,
+                                          run_concurrently)
 
 
 class LogicalInterconnectModule(OneViewModule):
@@ -285,6 +328,14 @@ class LogicalInterconnectModule(OneViewModule):
     MSG_ETH_NETWORK_NOT_FOUND = 'Ethernet network not found: '
     MSG_NO_CHANGES_PROVIDED = 'Nothing to do.'
     MSG_NO_OPTIONS_PROVIDED = 'No options provided.'
+    MSG_CONFIGURED = 'Logical Interconnect configured successfully. Sections updated: {0}.'
+    MSG_CONFIGURE_FAILED = 'Failed to update the section {0} of the Logical Interconnect. Sections updated: {1}. {2}'
+
+    CONFIGURED_SECTIONS = ['ethernetSettings', 'qosConfiguration', 'snmpConfiguration', 'portMonitor',
+                           'telemetryConfiguration', 'scopeUris']
+    CONFIGURED_FACTS = dict(qosConfiguration='qos_configuration', snmpConfiguration='snmp_configuration',
+                            portMonitor='port_monitor', telemetryConfiguration='telemetry_configuration',
+                            scopeUris='scope_uris')
 
     argument_spec = dict(
         state=dict(
@@ -292,7 +343,7 @@ class LogicalInterconnectModule(OneViewModule):
             choices=['compliant', 'ethernet_settings_updated', 'internal_networks_updated', 'settings_updated',
                      'forwarding_information_base_generated', 'qos_aggregated_configuration_updated',
                      'snmp_configuration_updated', 'port_monitor_updated', 'configuration_updated',
-                     'firmware_installed', 'telemetry_configuration_updated', 'scopes_updated']
+                     'firmware_installed', 'telemetry_configuration_updated', 'scopes_updated', 'configured']
         ),
         data=dict(required=True, type='dict')
     )
@@ -333,6 +384,8 @@ class LogicalInterconnectModule(OneViewModule):
             changed, msg, ansible_facts = self.__update_telemetry_configuration()
         elif self.state == 'scopes_updated':
             changed, msg, ansible_facts = self.__update_scopes()
+        elif self.state == 'configured':
+            changed, msg, ansible_facts = self.__configure()
 
         if ansible_facts:
             result = dict(changed=changed, msg=msg, ansible_facts=ansible_facts)
@@ -483,6 +536,85 @@ class LogicalInterconnectModule(OneViewModule):
 
         return result['changed'], result['msg'], result['ansible_facts']
 
+    def __configure(self):
+        sections = [section for section in self.CONFIGURED_SECTIONS if section in self.data]
+        if not sections:
+            raise OneViewModuleValueError(self.MSG_NO_OPTIONS_PROVIDED)
+
+        getters = dict(qosConfiguration=self.__get_qos_aggregated_configuration,
+                       snmpConfiguration=self.__get_snmp_configuration,
+                       portMonitor=self.__get_port_monitor_configuration)
+        fetched_sections = [section for section in sections if section in getters]
+        current = dict(zip(fetched_sections,
+                           run_concurrently(lambda section: getters[section](), fetched_sections,
+                                            len(fetched_sections))))
+        current['ethernetSettings'] = self.current_resource.data.get('ethernetSettings') or {}
+        current['telemetryConfiguration'] = self.current_resource.data.get('telemetryConfiguration') or {}
+
+        desired = {}
+        for section in sections:
+            if section == 'scopeUris':
+                scope_uris = self.current_resource.data.get('scopeUris')
+                if scope_uris is None or set(scope_uris) != set(self.data['scopeUris'] or []):
+                    desired[section] = self.data['scopeUris'] or []
+            else:
+                merged = self.__merge_options(self.data[section], current[section])
+                if not compare(merged, current[section]):
+                    desired[section] = merged
+
+        current['scopeUris'] = self.current_resource.data.get('scopeUris')
+        ansible_facts = dict((self.CONFIGURED_FACTS[section], current[section])
+                             for section in sections if section in self.CONFIGURED_FACTS)
+        ansible_facts['logical_interconnect'] = self.current_resource.data
+        ansible_facts['logical_interconnect_configured'] = []
+
+        if not desired:
+            return False, self.MSG_NO_CHANGES_PROVIDED, ansible_facts
+
+        # The sections are updated in sequence, since the sub-resources of the logical interconnect are not updated
+        # safely in parallel with its own updates
+        updaters = dict(ethernetSettings=self.__configure_ethernet_settings,
+                        qosConfiguration=self.__configure_qos,
+                        snmpConfiguration=self.__configure_snmp,
+                        portMonitor=self.__configure_port_monitor,
+                        telemetryConfiguration=self.__configure_telemetry,
+                        scopeUris=self.__configure_scopes)
+        for section in sections:
+            if section not in desired:
+                continue
+            try:
+                updaters[section](desired[section], ansible_facts)
+            except Exception as exception:
+                configured = ansible_facts['logical_interconnect_configured']
+                raise OneViewModuleException(
+                    self.MSG_CONFIGURE_FAILED.format(section, ', '.join(configured) or 'none', exception),
+                    result=dict(changed=bool(configured), ansible_facts=ansible_facts))
+            ansible_facts['logical_interconnect_configured'].append(section)
+
+        msg = self.MSG_CONFIGURED.format(', '.join(ansible_facts['logical_interconnect_configured']))
+        return True, msg, ansible_facts
+
+    def __configure_ethernet_settings(self, ethernet_settings, ansible_facts):
+        ansible_facts['logical_interconnect'] = self.current_resource.update_ethernet_settings(ethernet_settings)
+
+    def __configure_scopes(self, scope_uris, ansible_facts):
+        updated_resource = self.current_resource.patch(operation='replace', path='/scopeUris', value=scope_uris)
+        ansible_facts['logical_interconnect'] = updated_resource.data
+        ansible_facts['scope_uris'] = updated_resource.data.get('scopeUris')
+
+    def __configure_qos(self, qos_config, ansible_facts):
+        ansible_facts['qos_configuration'] = self.current_resource.update_qos_aggregated_configuration(qos_config)
+
+    def __configure_snmp(self, snmp_config, ansible_facts):
+        ansible_facts['snmp_configuration'] = self.current_resource.update_snmp_configuration(snmp_config)
+
+    def __configure_port_monitor(self, monitor_config, ansible_facts):
+        ansible_facts['port_monitor'] = self.current_resource.update_port_monitor(monitor_config)
+
+    def __configure_telemetry(self, telemetry_config, ansible_facts):
+        result = self.current_resource.update_telemetry_configurations(telemetry_config)
+        ansible_facts['telemetry_configuration'] = result.get('telemetryConfiguration')
+
     def __get_ethernet_network_by_name(self, name):
         result = self.oneview_client.ethernet_networks.get_by('name', name)
         return result[0] if result else None
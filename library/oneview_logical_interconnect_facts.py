@@ -61,6 +61,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -203,7 +204,7 @@ class LogicalInterconnectFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(LogicalInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(LogicalInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['logical_interconnects'])
 
         self.set_resource_object(self.oneview_client.logical_interconnects)
 
@@ -213,7 +214,7 @@ class LogicalInterconnectFactsModule(OneViewModule):
         if name:
             facts = self.__get_by_options(name)
         else:
-            logical_interconnects = self.resource_client.get_all(**self.facts_params)
+            logical_interconnects = self.get_all_resources(self.resource_client)
             facts = dict(logical_interconnects=logical_interconnects)
 
         return dict(changed=False, ansible_facts=facts)
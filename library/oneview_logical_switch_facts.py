@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -96,14 +97,14 @@ class LogicalSwitchFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict'),
         )
 
-        super(LogicalSwitchFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(LogicalSwitchFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['logical_switches'])
 
     def execute_module(self):
         name = self.module.params.get('name')
         if name:
             logical_switches = self.oneview_client.logical_switches.get_by('name', name)
         else:
-            logical_switches = self.oneview_client.logical_switches.get_all(**self.facts_params)
+            logical_switches = self.get_all_resources(self.oneview_client.logical_switches)
 
         return dict(changed=False, ansible_facts=dict(logical_switches=logical_switches))
 
@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -98,7 +99,7 @@ class LogicalSwitchGroupFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(LogicalSwitchGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(LogicalSwitchGroupFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['logical_switch_groups'])
         self.resource_client = self.oneview_client.logical_switch_groups
 
     def execute_module(self):
@@ -106,7 +107,7 @@ class LogicalSwitchGroupFactsModule(OneViewModule):
         if self.module.params.get('name'):
             logical_switch_groups = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            logical_switch_groups = self.resource_client.get_all(**self.facts_params)
+            logical_switch_groups = self.get_all_resources(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(logical_switch_groups=logical_switch_groups))
@@ -56,6 +56,7 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -151,7 +152,7 @@ class ManagedSanFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ManagedSanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ManagedSanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['managed_sans'])
 
         self.set_resource_object(self.oneview_client.managed_sans)
 
@@ -171,7 +172,7 @@ class ManagedSanFactsModule(OneViewModule):
                     facts['managed_san_endpoints'] = environmental_configuration
 
         else:
-            facts['managed_sans'] = self.resource_client.get_all(**self.facts_params)
+            facts['managed_sans'] = self.get_all_resources(self.resource_client)
 
         if self.options:
             if self.options.get('wwn'):
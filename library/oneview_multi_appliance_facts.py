@@ -0,0 +1,222 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_multi_appliance_facts
+short_description: Retrieve facts about resources from several OneView appliances at once.
+description:
+    - Retrieve facts about resources from several OneView appliances. The appliances are logged into concurrently
+      and the queries run in parallel, so the total time is bounded by the slowest appliance.
+    - Each record is tagged with the appliance it was retrieved from and the records of all appliances are merged.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    appliances:
+      description:
+        - List with the appliances to query. Each appliance accepts the same connection options as the other
+          modules, C(hostname), C(username), C(password), C(api_version) and C(auth_login_domain),
+          or the path of a JSON configuration file in C(config).
+        - The optional C(name) is used to tag the records. It defaults to the hostname or to the config path.
+        - The passwords of the appliances are not logged.
+      required: true
+    resources:
+      description:
+        - "List with the resources to retrieve. Each item is the name of a OneView client resource, such as
+          C(server_hardware), C(server_profiles) or C(alerts), or a dictionary with the resource C(name) and the
+          C(params) used to filter and sort it. Params allowed: C(start), C(count), C(filter), C(query) and C(sort)."
+      required: true
+    max_workers:
+      description:
+        - Maximum number of concurrent logins and queries.
+      required: false
+      default: 10
+    ignore_unreachable:
+      description:
+        - When true, the appliances that fail are reported in C(multi_appliance_failures) instead of failing the
+          module.
+      required: false
+      default: false
+'''
+
+EXAMPLES = '''
+- name: Gather facts about server hardware, server profiles and critical alerts of all the appliances
+  oneview_multi_appliance_facts:
+    appliances:
+      - name: datacenter-1
+        hostname: 172.16.101.48
+        username: administrator
+        password: my_password
+        api_version: 1200
+      - name: datacenter-2
+        config: "/path/to/datacenter-2.json"
+    resources:
+      - server_hardware
+      - server_profiles
+      - name: alerts
+        params:
+          filter: "severity='Critical'"
+    max_workers: 12
+  delegate_to: localhost
+
+- debug: var=multi_appliance_facts.server_hardware
+
+- debug: msg="{{ multi_appliance_facts.server_profiles | selectattr('appliance', 'equalto', 'datacenter-1') | list }}"
+'''
+
+RETURN = '''
+multi_appliance_facts:
+    description: Has the records of each requested resource, merged from all the appliances. Each record has the
+                 C(appliance) key with the name of the appliance it was retrieved from.
+    returned: Always.
+    type: dict
+
+multi_appliance_failures:
+    description: Has the error message of each appliance that could not be queried.
+    returned: When ignore_unreachable is true.
+    type: dict
+'''
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleValueError,
+                                          create_oneview_client,
+                                          run_concurrently)
+
+
+class MultiApplianceFactsModule(OneViewModule):
+    MSG_APPLIANCE_CONNECTION_MISSING = 'Missing hostname or config for the appliance: '
+    MSG_RESOURCE_NOT_SUPPORTED = 'Resource not supported: '
+    MSG_APPLIANCE_FAILED = 'Failed to gather facts from the appliance {0}: {1}'
+
+    def __init__(self):
+        argument_spec = dict(
+            appliances=dict(required=True, type='list', elements='dict', options=dict(
+                name=dict(type='str'),
+                hostname=dict(type='str'),
+                username=dict(type='str'),
+                password=dict(type='str', no_log=True),
+                api_version=dict(type='int'),
+                auth_login_domain=dict(type='str'),
+                config=dict(type='path')
+            )),
+            resources=dict(required=True, type='list'),
+            max_workers=dict(required=False, type='int', default=10),
+            ignore_unreachable=dict(required=False, type='bool', default=False)
+        )
+        super(MultiApplianceFactsModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def _create_oneview_client(self):
+        # The clients are created for each appliance, concurrently, by execute_module
+        self.oneview_client = None
+
+    def execute_module(self):
+        appliances = [self.__appliance_name(appliance) for appliance in self.module.params['appliances']]
+        resources = [self.__resource_query(resource) for resource in self.module.params['resources']]
+        max_workers = self.module.params.get('max_workers')
+
+        failures = {}
+        clients = run_concurrently(self.__login, self.module.params['appliances'], max_workers)
+        for name, client in zip(appliances, clients):
+            if isinstance(client, Exception):
+                failures[name] = str(client)
+
+        queries = [(name, client, resource_name, params)
+                   for name, client in zip(appliances, clients) if name not in failures
+                   for resource_name, params in resources]
+        results = run_concurrently(self.__get_all, queries, max_workers)
+
+        facts = dict((resource_name, []) for resource_name, params in resources)
+        for (name, client, resource_name, params), records in zip(queries, results):
+            if isinstance(records, Exception):
+                failures[name] = str(records)
+            elif name not in failures:
+                facts[resource_name].extend(records)
+
+        if failures:
+            self.__drop_failed_appliances(facts, failures)
+
+        ansible_facts = dict(multi_appliance_facts=facts)
+        if self.module.params.get('ignore_unreachable'):
+            ansible_facts['multi_appliance_failures'] = failures
+
+        return dict(changed=False, ansible_facts=ansible_facts)
+
+    def __drop_failed_appliances(self, facts, failures):
+        if not self.module.params.get('ignore_unreachable'):
+            name = sorted(failures)[0]
+            raise OneViewModuleException(self.MSG_APPLIANCE_FAILED.format(name, failures[name]))
+
+        for resource_name in facts:
+            facts[resource_name] = [record for record in facts[resource_name] if record['appliance'] not in failures]
+
+    def __appliance_name(self, appliance):
+        if not appliance.get('hostname') and not appliance.get('config'):
+            raise OneViewModuleValueError(self.MSG_APPLIANCE_CONNECTION_MISSING + str(appliance.get('name')))
+        return appliance.get('name') or appliance.get('hostname') or appliance['config']
+
+    def __resource_query(self, resource):
+        if isinstance(resource, dict):
+            resource_name, params = resource.get('name'), resource.get('params') or {}
+        else:
+            resource_name, params = resource, {}
+
+        if not resource_name or resource_name.startswith('_'):
+            raise OneViewModuleValueError(self.MSG_RESOURCE_NOT_SUPPORTED + str(resource_name))
+        return resource_name, params
+
+    def __login(self, appliance):
+        try:
+            client = create_oneview_client(appliance)
+            self.tracer.instrument(client)
+            return client
+        except Exception as exception:
+            return exception
+
+    def __get_all(self, query):
+        name, client, resource_name, params = query
+        resource_client = getattr(client, resource_name, None)
+        if not hasattr(resource_client, 'get_all'):
+            raise OneViewModuleValueError(self.MSG_RESOURCE_NOT_SUPPORTED + resource_name)
+
+        try:
+            records = resource_client.get_all(**params)
+        except Exception as exception:
+            return exception
+
+        tagged_records = []
+        for record in records or []:
+            tagged_record = dict(record)
+            tagged_record['appliance'] = name
+            tagged_records.append(tagged_record)
+        return tagged_records
+
+
+def main():
+    MultiApplianceFactsModule().run()
+
+
+if __name__ == '__main__':
+    main()
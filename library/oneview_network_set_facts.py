@@ -50,6 +50,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -140,7 +141,7 @@ class NetworkSetFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(NetworkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(NetworkSetFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['network_sets'])
         self.set_resource_object(self.oneview_client.network_sets)
 
     def execute_module(self):
@@ -153,7 +154,7 @@ class NetworkSetFactsModule(OneViewModule):
         elif name:
             network_sets = self.resource_client.get_by('name', name)
         else:
-            network_sets = self.resource_client.get_all(**self.facts_params)
+            network_sets = self.get_all_resources(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(network_sets=network_sets))
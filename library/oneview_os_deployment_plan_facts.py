@@ -49,6 +49,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -124,7 +125,7 @@ class OsDeploymentPlanFactsModule(OneViewModuleBase):
     }
 
     def __init__(self):
-        super(OsDeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(OsDeploymentPlanFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['os_deployment_plans'])
 
     def execute_module(self):
         ansible_facts = {}
@@ -136,7 +137,7 @@ class OsDeploymentPlanFactsModule(OneViewModuleBase):
                 ansible_facts.update(option_facts)
 
         else:
-            os_deployment_plans = self.oneview_client.os_deployment_plans.get_all(**self.facts_params)
+            os_deployment_plans = self.get_all_resources(self.oneview_client.os_deployment_plans)
 
         ansible_facts['os_deployment_plans'] = os_deployment_plans
 
@@ -59,6 +59,7 @@ notes:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -125,7 +126,7 @@ class OsDeploymentServerFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(OsDeploymentServerFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(OsDeploymentServerFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['os_deployment_servers'])
 
     def execute_module(self):
         ansible_facts = {}
@@ -134,7 +135,7 @@ class OsDeploymentServerFactsModule(OneViewModuleBase):
             os_deployment_servers = self.oneview_client.os_deployment_servers.get_by('name',
                                                                                      self.module.params['name'])
         else:
-            os_deployment_servers = self.oneview_client.os_deployment_servers.get_all(**self.facts_params)
+            os_deployment_servers = self.get_all_resources(self.oneview_client.os_deployment_servers)
 
         if self.options:
             ansible_facts = self.__gather_optional_facts(self.options)
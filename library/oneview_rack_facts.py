@@ -45,6 +45,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -104,7 +105,7 @@ class RackFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(RackFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(RackFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['racks'])
 
     def execute_module(self):
 
@@ -119,8 +120,7 @@ class RackFactsModule(OneViewModuleBase):
             if options and 'deviceTopology' in options and len(storage_volume_template) > 0:
                 facts['rack_device_topology'] = client.get_device_topology(storage_volume_template[0]['uri'])
         else:
-            params = self.module.params.get('params') or {}
-            storage_volume_template = client.get_all(**params)
+            storage_volume_template = self.get_all_resources(client)
 
         facts['racks'] = storage_volume_template
 
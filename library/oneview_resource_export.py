@@ -0,0 +1,351 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_resource_export
+short_description: Export OneView resources to a columnar file.
+description:
+    - Export OneView resources, such as server hardware, firmware or utilization, to a columnar file for analytics.
+    - The resources are read page by page and each page is written straight to the file, so the memory used is
+      bounded by the page size instead of the number of resources.
+    - The nested fields are flattened into columns named with dots, e.g. C(processor.count), following a fixed
+      schema. Lists and dictionaries that are not flattened are written as JSON strings.
+    - The file is written in the Parquet format when pyarrow is installed. Otherwise, it is written as CSV along
+      with a C(.schema.json) file holding the column types.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+    - "pyarrow, for the Parquet format"
+author: "HPE OneView Ansible Team"
+options:
+    resource:
+      description:
+        - Name of the OneView client resource to export, such as C(server_hardware), C(server_profiles) or
+          C(enclosures).
+      required: true
+    dest:
+      description:
+        - Path of the file to write.
+      required: true
+    format:
+      description:
+        - Format of the file. C(auto) uses Parquet when pyarrow is installed, and CSV otherwise.
+      default: auto
+      choices: ['auto', 'parquet', 'csv']
+      required: false
+    columns:
+      description:
+        - List with the columns of the schema, named with dots for the nested fields, e.g. C(name),
+          C(processor.count) or C(powerState). Each column is typed from the first page of resources.
+        - When not provided, the columns are all the fields found in the first page of resources.
+      required: false
+    page_size:
+      description:
+        - Number of resources read and written at once.
+      default: 500
+      required: false
+extends_documentation_fragment:
+    - oneview
+    - oneview.factsparams
+'''
+
+EXAMPLES = '''
+- name: Export the firmware and power state of all the server hardware to Parquet
+  oneview_resource_export:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    resource: server_hardware
+    dest: /tmp/server_hardware.parquet
+    columns:
+      - name
+      - uri
+      - model
+      - powerState
+      - romVersion
+      - mpFirmwareVersion
+      - processorCount
+      - memoryMb
+    page_size: 1000
+  delegate_to: localhost
+
+- debug: var=resource_export
+
+- name: Export the Server Profiles of an Enclosure Group to CSV
+  oneview_resource_export:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    resource: server_profiles
+    dest: /tmp/server_profiles.csv
+    format: csv
+    params:
+      filter: "enclosureGroupUri='/rest/enclosure-groups/ad5e9e88-b858-4935-ba58-017d60a17c89'"
+  delegate_to: localhost
+
+- debug: var=resource_export
+'''
+
+RETURN = '''
+resource_export:
+    description: Has the path and format of the file, the number of resources exported and the columns of the schema.
+    returned: Always.
+    type: dict
+'''
+
+import csv
+import json
+import os
+import tempfile
+
+from ansible.module_utils.oneview import OneViewModule, OneViewModuleValueError, get_all_resources
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COLUMN_BOOL = 'bool'
+COLUMN_INT = 'int'
+COLUMN_DOUBLE = 'double'
+COLUMN_STRING = 'string'
+
+
+def flatten_resource(resource, prefix=''):
+    """
+    Flattens the nested dictionaries of a resource into a single dictionary with the keys joined by dots.
+    """
+    flattened = {}
+    for key, value in resource.items():
+        name = prefix + key
+        if isinstance(value, dict) and value:
+            flattened.update(flatten_resource(value, name + '.'))
+        else:
+            flattened[name] = value
+    return flattened
+
+
+def column_type(value):
+    if isinstance(value, bool):
+        return COLUMN_BOOL
+    if isinstance(value, int):
+        return COLUMN_INT
+    if isinstance(value, float):
+        return COLUMN_DOUBLE
+    return COLUMN_STRING
+
+
+def coerce_value(value, type_name):
+    """
+    Converts a value to the type of its column. The values that cannot be converted are exported as null.
+    """
+    if value is None:
+        return None
+    if type_name == COLUMN_STRING:
+        return json.dumps(value, sort_keys=True) if isinstance(value, (list, dict)) else str(value)
+    try:
+        if type_name == COLUMN_BOOL:
+            return value if isinstance(value, bool) else None
+        if type_name == COLUMN_INT:
+            return int(value)
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def create_temp_file(path):
+    """
+    Creates an empty file in the directory of the path, to be renamed to the path once it is written.
+    """
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    os.close(file_descriptor)
+    return temp_path
+
+
+def replace_file(temp_path, path, complete):
+    """
+    Renames the written file to the path, replacing it atomically, or removes it when the export is not complete.
+    """
+    if complete:
+        os.rename(temp_path, path)
+    elif os.path.exists(temp_path):
+        os.remove(temp_path)
+
+
+class CsvColumnarWriter(object):
+    """
+    Writes the rows to a CSV file, with the column types in a .schema.json file alongside it.
+
+    Both files are written to temporary files, which replace them when the writer is closed on success.
+    """
+    FORMAT = 'csv'
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self._temp_path = create_temp_file(path)
+        self._schema_temp_path = create_temp_file(path)
+        self._file = open(self._temp_path, 'w')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, type_name in columns])
+
+        with open(self._schema_temp_path, 'w') as schema_file:
+            json.dump([dict(name=name, type=type_name) for name, type_name in columns], schema_file, indent=2)
+
+    def write(self, rows):
+        self._writer.writerows([['' if value is None else value for value in row] for row in rows])
+
+    def close(self, complete=True):
+        self._file.close()
+        replace_file(self._schema_temp_path, self.path + '.schema.json', complete)
+        replace_file(self._temp_path, self.path, complete)
+
+
+class ParquetColumnarWriter(object):
+    """
+    Writes the rows to a Parquet file, one row group per page.
+
+    The rows are written to a temporary file, which replaces the file when the writer is closed on success.
+    """
+    FORMAT = 'parquet'
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+        self._temp_path = create_temp_file(path)
+        types = {COLUMN_BOOL: pyarrow.bool_(), COLUMN_INT: pyarrow.int64(),
+                 COLUMN_DOUBLE: pyarrow.float64(), COLUMN_STRING: pyarrow.string()}
+        self._schema = pyarrow.schema([(name, types[type_name]) for name, type_name in columns])
+        self._writer = pyarrow.parquet.ParquetWriter(self._temp_path, self._schema)
+
+    def write(self, rows):
+        arrays = [pyarrow.array([row[index] for row in rows], type=field.type)
+                  for index, field in enumerate(self._schema)]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self, complete=True):
+        self._writer.close()
+        replace_file(self._temp_path, self.path, complete)
+
+
+class ResourceExportModule(OneViewModule):
+    MSG_RESOURCE_NOT_SUPPORTED = 'Resource not supported: '
+    MSG_PYARROW_REQUIRED = 'pyarrow is required to export to the Parquet format.'
+    MSG_EXPORTED = 'Resources exported successfully.'
+
+    def __init__(self):
+        argument_spec = dict(
+            resource=dict(required=True, type='str'),
+            dest=dict(required=True, type='path'),
+            format=dict(required=False, type='str', default='auto', choices=['auto', 'parquet', 'csv']),
+            columns=dict(required=False, type='list'),
+            page_size=dict(required=False, type='int', default=500),
+            params=dict(required=False, type='dict')
+        )
+        super(ResourceExportModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        resource_client = self.__get_resource_client()
+        page_size = self.module.params['page_size']
+        columns = self.module.params.get('columns')
+
+        writer = None
+        count = 0
+        complete = False
+        try:
+            for page in self.__pages(resource_client, columns, page_size):
+                records = [flatten_resource(resource) for resource in page]
+                if writer is None:
+                    writer = self.__create_writer(self.__build_schema(records, columns))
+                writer.write([[coerce_value(record.get(name), type_name) for name, type_name in writer.columns]
+                              for record in records])
+                count += len(records)
+
+            if writer is None:
+                writer = self.__create_writer(self.__build_schema([], columns))
+            complete = True
+        finally:
+            if writer is not None:
+                writer.close(complete)
+
+        resource_export = dict(path=writer.path,
+                               format=writer.FORMAT,
+                               count=count,
+                               columns=[dict(name=name, type=type_name) for name, type_name in writer.columns])
+
+        return dict(changed=True, msg=self.MSG_EXPORTED, ansible_facts=dict(resource_export=resource_export))
+
+    def __get_resource_client(self):
+        resource_name = self.module.params['resource']
+        resource_client = None
+        if not resource_name.startswith('_'):
+            resource_client = getattr(self.oneview_client, resource_name, None)
+        if not hasattr(resource_client, 'get_all'):
+            raise OneViewModuleValueError(self.MSG_RESOURCE_NOT_SUPPORTED + resource_name)
+        return resource_client
+
+    def __pages(self, resource_client, columns, page_size):
+        params = dict(self.facts_params)
+        start = params.pop('start', 0)
+        limit = params.pop('count', -1)
+
+        while limit < 0 or start < limit:
+            count = page_size if limit < 0 else min(page_size, limit - start)
+            page = get_all_resources(resource_client, dict(params, start=start, count=count), columns)
+            if page:
+                yield page
+            if not page or len(page) < count:
+                break
+            start += len(page)
+
+    def __build_schema(self, records, columns):
+        if not columns:
+            columns = sorted(set(name for record in records for name in record))
+
+        schema = []
+        for name in columns:
+            values = [record.get(name) for record in records if record.get(name) is not None]
+            schema.append((name, column_type(values[0]) if values else COLUMN_STRING))
+        return schema
+
+    def __create_writer(self, columns):
+        file_format = self.module.params['format']
+        if file_format == 'parquet' and not HAS_PYARROW:
+            raise OneViewModuleValueError(self.MSG_PYARROW_REQUIRED)
+
+        if file_format == 'parquet' or (file_format == 'auto' and HAS_PYARROW):
+            return ParquetColumnarWriter(self.module.params['dest'], columns)
+        return CsvColumnarWriter(self.module.params['dest'], columns)
+
+
+def main():
+    ResourceExportModule().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_resource_mirror
+short_description: Keep a local mirror of OneView resources.
+description:
+    - Keep a local mirror of OneView resource collections, such as server hardware, server profiles and alerts, in a
+      SQLite database. The facts modules read the mirror with C(source=mirror) instead of querying the appliance.
+    - Each collection is loaded with a paged snapshot. When C(follow) is set, the module then applies the changes
+      published on the State Change Message Bus (SCMB) of the appliance to keep the mirror current, and takes a new
+      snapshot every C(resync_interval) seconds and whenever the SCMB connection is lost. The changes received while
+      a snapshot is taken are applied once it is stored.
+    - The session of the appliance is renewed before each new snapshot, so the module can follow the changes for
+      longer than the session lasts. The SCMB connection is retried with an exponential backoff, up to
+      C(max_reconnect_interval) seconds between attempts.
+    - To keep the mirror current in the background, run the module with C(follow=-1) as an asynchronous task.
+    - Following the changes requires the SCMB certificates in the directory set by the C(ONEVIEW_SCMB_CERT_DIR)
+      environment variable and the amqp library.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+    - "amqp, to follow the changes"
+author: "HPE OneView Ansible Team"
+options:
+    resources:
+      description:
+        - List with the names of the OneView client resources to mirror, such as C(server_hardware),
+          C(server_profiles) and C(alerts).
+      required: true
+    mirror:
+      description:
+        - Path of the SQLite database of the mirror. Defaults to the C(ONEVIEW_MIRROR_DB) environment variable, or
+          to C(oneview/mirror.db) in the cache directory of the user, C(XDG_CACHE_HOME) or C(~/.cache). The database
+          is created only readable by its owner.
+      required: false
+    page_size:
+      description:
+        - Number of resources read at once by the snapshots.
+      default: 500
+      required: false
+    follow:
+      description:
+        - Number of seconds to apply the changes of the SCMB after the snapshot. The default, 0, only takes the
+          snapshot. -1 follows the changes until the task is stopped.
+      default: 0
+      required: false
+    resync_interval:
+      description:
+        - Number of seconds between the snapshots taken while following the changes.
+      default: 3600
+      required: false
+    max_reconnect_interval:
+      description:
+        - Maximum number of seconds between the attempts to reconnect to the SCMB.
+      default: 300
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Keep a mirror of the server hardware, server profiles and alerts in the background
+  oneview_resource_mirror:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    resources:
+      - server_hardware
+      - server_profiles
+      - alerts
+    mirror: /var/lib/oneview/mirror.db
+    follow: -1
+  environment:
+    ONEVIEW_SCMB_CERT_DIR: /etc/oneview/scmb
+  async: 31536000
+  poll: 0
+  delegate_to: localhost
+
+- name: Take a snapshot of the server hardware
+  oneview_resource_mirror:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    resources:
+      - server_hardware
+    mirror: /var/lib/oneview/mirror.db
+  delegate_to: localhost
+
+- debug: var=resource_mirror
+'''
+
+RETURN = '''
+resource_mirror:
+    description: Has the path of the mirror, the number of resources of each mirrored resource in the last snapshot,
+                 the number of snapshots taken and the number of changes applied.
+    returned: Always.
+    type: dict
+'''
+
+import time
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleValueError,
+                                          OneViewMirror,
+                                          ScmbListener)
+
+
+class ResourceMirrorModule(OneViewModule):
+    MSG_RESOURCE_NOT_SUPPORTED = 'Resource not supported: '
+    MSG_SCMB_UNAVAILABLE = 'Unable to follow the changes: the SCMB of the appliance is not available. ' \
+                           'Set ONEVIEW_SCMB_CERT_DIR and install the amqp library.'
+    MSG_MIRRORED = 'Resources mirrored successfully.'
+    POLL_INTERVAL = 1
+
+    def __init__(self):
+        argument_spec = dict(
+            resources=dict(required=True, type='list'),
+            mirror=dict(required=False, type='path'),
+            page_size=dict(required=False, type='int', default=500),
+            follow=dict(required=False, type='int', default=0),
+            resync_interval=dict(required=False, type='int', default=3600),
+            max_reconnect_interval=dict(required=False, type='int', default=300)
+        )
+        super(ResourceMirrorModule, self).__init__(additional_arg_spec=argument_spec)
+        self.listener = None
+        self.counts = {}
+        self.snapshots = 0
+        self.changes = 0
+
+    def execute_module(self):
+        resource_clients = dict((name, self.__get_resource_client(name)) for name in self.module.params['resources'])
+        follow = self.module.params['follow']
+
+        mirror = OneViewMirror(self.module.params.get('mirror'))
+        try:
+            if follow and not self.__listen(mirror, resource_clients):
+                raise OneViewModuleException(self.MSG_SCMB_UNAVAILABLE)
+
+            self.__snapshot(mirror, resource_clients)
+            if follow:
+                self.__follow(mirror, resource_clients, follow)
+        finally:
+            if self.listener:
+                self.listener.stop()
+            mirror.close()
+
+        resource_mirror = dict(path=mirror.path, resources=self.counts, snapshots=self.snapshots, changes=self.changes)
+        return dict(changed=True, msg=self.MSG_MIRRORED, ansible_facts=dict(resource_mirror=resource_mirror))
+
+    def __get_resource_client(self, resource_name):
+        resource_client = None
+        if not resource_name.startswith('_'):
+            resource_client = getattr(self.oneview_client, resource_name, None)
+        if not hasattr(resource_client, 'get_all') or not getattr(resource_client, 'URI', None):
+            raise OneViewModuleValueError(self.MSG_RESOURCE_NOT_SUPPORTED + resource_name)
+        return resource_client
+
+    def __listen(self, mirror, resource_clients):
+        routing_keys = ['scmb.{0}.#'.format(resource_client.URI.rsplit('/', 1)[-1])
+                        for resource_client in resource_clients.values()]
+
+        def apply_change(change):
+            mirror.apply_change(change)
+            self.changes += 1
+
+        if self.listener:
+            self.listener.stop()
+        for resource_client in resource_clients.values():
+            mirror.buffer_changes(resource_client.URI)
+        self.listener = ScmbListener(self.oneview_client.connection.get_host(), routing_keys=routing_keys,
+                                     on_change=apply_change)
+        return self.listener.start()
+
+    def __snapshot(self, mirror, resource_clients):
+        for name, resource_client in resource_clients.items():
+            self.counts[name] = mirror.snapshot(resource_client, self.module.params['page_size'])
+        self.snapshots += 1
+
+    def __resync(self, mirror, resource_clients):
+        self.__refresh_session(resource_clients)
+        self.__snapshot(mirror, resource_clients)
+
+    def __refresh_session(self, resource_clients):
+        connection = self.oneview_client.connection
+        self._create_oneview_client()
+        self.tracer.instrument(self.oneview_client)
+        for name in resource_clients:
+            resource_clients[name] = self.__get_resource_client(name)
+        try:
+            connection.logout()
+        except Exception as exception:
+            self.module.log('Unable to log out of the previous session: {0}'.format(exception))
+
+    def __follow(self, mirror, resource_clients, follow):
+        resync_interval = self.module.params['resync_interval']
+        max_reconnect_interval = max(self.module.params['max_reconnect_interval'], self.POLL_INTERVAL)
+        deadline = None if follow < 0 else time.time() + follow
+        next_snapshot = time.time() + resync_interval
+        reconnect_interval = self.POLL_INTERVAL
+        next_reconnect = 0
+
+        while deadline is None or time.time() < deadline:
+            time.sleep(self.POLL_INTERVAL if deadline is None else
+                       max(0, min(self.POLL_INTERVAL, deadline - time.time())))
+
+            if self.listener.failed and time.time() < next_reconnect:
+                continue
+            if self.listener.failed or time.time() >= next_snapshot:
+                if (not self.listener.failed or self.__listen(mirror, resource_clients)) and \
+                        self.__try_resync(mirror, resource_clients):
+                    next_snapshot = time.time() + resync_interval
+                    reconnect_interval = self.POLL_INTERVAL
+                else:
+                    reconnect_interval = min(reconnect_interval * 2, max_reconnect_interval)
+                    next_reconnect = next_snapshot = time.time() + reconnect_interval
+
+    def __try_resync(self, mirror, resource_clients):
+        try:
+            self.__resync(mirror, resource_clients)
+            return True
+        except Exception as exception:
+            self.module.log('Unable to resync the mirror, retrying: {0}'.format(exception))
+            return False
+
+
+def main():
+    ResourceMirrorModule().run()
+
+
+if __name__ == '__main__':
+    main()
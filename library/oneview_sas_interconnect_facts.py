@@ -40,6 +40,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -88,7 +89,7 @@ class SasInterconnectFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(SasInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(SasInterconnectFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['sas_interconnects'])
         self.resource_client = self.oneview_client.sas_interconnects
 
     def execute_module(self):
@@ -98,7 +99,7 @@ class SasInterconnectFactsModule(OneViewModule):
         if name:
             facts['sas_interconnects'] = self.resource_client.get_by('name', name)
         else:
-            facts['sas_interconnects'] = self.resource_client.get_all(**self.facts_params)
+            facts['sas_interconnects'] = self.get_all_resources(self.resource_client)
 
         return dict(ansible_facts=facts)
 
@@ -42,6 +42,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -93,14 +94,14 @@ class SasInterconnectTypeFactsModule(OneViewModuleBase):
     )
 
     def __init__(self):
-        super(SasInterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(SasInterconnectTypeFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['sas_interconnect_types'])
         self.resource_client = self.oneview_client.sas_interconnect_types
 
     def execute_module(self):
         if self.module.params.get('name'):
             types = self.resource_client.get_by('name', self.module.params.get('name'))
         else:
-            types = self.resource_client.get_all(**self.facts_params)
+            types = self.get_all_resources(self.resource_client)
 
         return dict(changed=False,
                     ansible_facts=dict(sas_interconnect_types=types))
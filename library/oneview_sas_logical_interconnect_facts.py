@@ -51,6 +51,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -122,7 +123,7 @@ class SasLogicalInterconnectFactsModule(OneViewModule):
             params=dict(required=False, type='dict')
         )
 
-        super(SasLogicalInterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SasLogicalInterconnectFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['sas_logical_interconnects'])
 
         self.set_resource_object(self.oneview_client.sas_logical_interconnects)
 
@@ -137,7 +138,7 @@ class SasLogicalInterconnectFactsModule(OneViewModule):
                     options_facts = self.__gather_option_facts()
                     ansible_facts.update(options_facts)
         else:
-            sas_logical_interconnects = self.resource_client.get_all(**self.facts_params)
+            sas_logical_interconnects = self.get_all_resources(self.resource_client)
 
         ansible_facts['sas_logical_interconnects'] = sas_logical_interconnects
 
@@ -41,6 +41,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -87,14 +88,14 @@ class SasLogicalJbodAttachmentFactsModule(OneViewModuleBase):
             name=dict(required=False, type='str'),
             params=dict(required=False, type='dict'),
         )
-        super(SasLogicalJbodAttachmentFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SasLogicalJbodAttachmentFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['sas_logical_jbod_attachments'])
 
     def execute_module(self):
         if self.module.params['name']:
             name = self.module.params['name']
             resources = self.oneview_client.sas_logical_jbod_attachments.get_by('name', name)
         else:
-            resources = self.oneview_client.sas_logical_jbod_attachments.get_all(**self.facts_params)
+            resources = self.get_all_resources(self.oneview_client.sas_logical_jbod_attachments)
 
         return dict(changed=False,
                     ansible_facts=dict(sas_logical_jbod_attachments=resources))
@@ -46,6 +46,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -107,7 +108,7 @@ class SasLogicalJbodFactsModule(OneViewModuleBase):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict'),
         )
-        super(SasLogicalJbodFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SasLogicalJbodFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['sas_logical_jbods'])
 
     def execute_module(self):
         ansible_facts = {}
@@ -119,7 +120,7 @@ class SasLogicalJbodFactsModule(OneViewModuleBase):
             if self.module.params.get('options') and sas_logical_jbods:
                 ansible_facts = self.__gather_optional_facts(self.module.params['options'], sas_logical_jbods[0])
         else:
-            sas_logical_jbods = self.oneview_client.sas_logical_jbods.get_all(**self.facts_params)
+            sas_logical_jbods = self.get_all_resources(self.oneview_client.sas_logical_jbods)
 
         ansible_facts['sas_logical_jbods'] = sas_logical_jbods
 
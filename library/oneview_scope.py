@@ -39,14 +39,31 @@ options:
               C(present) ensures data properties are compliant with OneView.
               C(absent) removes the resource from OneView, if it exists.
               C(resource_assignments_updated) modifies scope membership by adding or removing resource assignments.
-              This operation is non-idempotent.
+              This operation is non-idempotent for API version 300.
         choices: ['present', 'absent', 'resource_assignments_updated']
     data:
         description:
             - List with the Scopes properties.
         required: true
+    chunk_size:
+        description:
+            - Maximum number of resource URIs added and removed in each PATCH request of the scope.
+        default: 100
+        required: false
+    membership_chunk_size:
+        description:
+            - Maximum number of resource URIs checked in each membership query. Each URI adds a comparison to the
+              filter of the query, so the default is smaller than C(chunk_size).
+        default: 50
+        required: false
 notes:
     - This resource is available for API version 300 or later.
+    - "The C(addedResourceUris) and C(removedResourceUris) of the C(present) state, and the resource assignments of the
+       C(resource_assignments_updated) state for API version 500 or later, are checked against the scope membership
+       with queries filtered by C(scopeUris), so only the resources that are not in the scope are added and only the
+       resources that are in it are removed. The membership is checked in chunks of C(membership_chunk_size)
+       resources, and the assignments are sent in chunks of C(chunk_size) resources, each chunk as a single PATCH
+       request of the scope. The scope returned is read again after the assignments."
 extends_documentation_fragment:
     - oneview
     - oneview.validateetag
@@ -110,6 +127,9 @@ scope:
 
 from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, compare, dict_merge
 
+ASSIGNMENT_CHUNK_SIZE = 100
+MEMBERSHIP_CHUNK_SIZE = 50
+
 
 class ScopeModule(OneViewModule):
     MSG_CREATED = 'Scope created successfully.'
@@ -127,6 +147,8 @@ class ScopeModule(OneViewModule):
             choices=['present', 'absent', 'resource_assignments_updated']
         ),
         data=dict(required=True, type='dict'),
+        chunk_size=dict(required=False, type='int', default=ASSIGNMENT_CHUNK_SIZE),
+        membership_chunk_size=dict(required=False, type='int', default=MEMBERSHIP_CHUNK_SIZE)
     )
 
     def __init__(self):
@@ -149,11 +171,17 @@ class ScopeModule(OneViewModule):
         if "newName" in self.data:
             self.data["name"] = self.data.pop("newName")
 
+        added_uris = self.data.pop('addedResourceUris', None)
+        removed_uris = self.data.pop('removedResourceUris', None)
+
         if self.current_resource:
             changed, msg = self.__update()
         else:
             changed, msg = self.__create(self.data)
 
+        if self.__assign_resources(added_uris, removed_uris) and not changed:
+            changed, msg = True, self.MSG_UPDATED
+
         return dict(
             msg=msg,
             changed=changed,
@@ -164,34 +192,12 @@ class ScopeModule(OneViewModule):
         self.current_resource = self.resource_client.create(data)
         return True, self.MSG_CREATED
 
-    def __compare_resource_assignments(self, current_dict, updated_dict):
-        changed = False
-        if updated_dict.get('removedResourceUris'):
-            common_elements = set(current_dict['addedResourceUris']).intersection(set(updated_dict['removedResourceUris']))
-            if len(common_elements) > 0:
-                changed = True
-            else:
-                updated_dict.pop('removedResourceUris')
-        if changed is True:
-            return changed, updated_dict
-
-        if current_dict.get('addedResourceUris') and updated_dict.get('addedResourceUris'):
-            all_add_elements = set(current_dict['addedResourceUris']).union(set(updated_dict['addedResourceUris']))
-            new_elements = all_add_elements - set(current_dict['addedResourceUris'])
-            if len(new_elements) > 0:
-                changed = True
-            else:
-                updated_dict['addedResourceUris'] = list(all_add_elements)
-        return changed, updated_dict
-
     def __update(self):
         changed = False
         existing_data = self.current_resource.data.copy()
         updated_data = dict_merge(existing_data, self.data)
 
-        state_change, updated_data = self.__compare_resource_assignments(existing_data, updated_data)
-
-        if compare(self.current_resource.data, updated_data) and state_change is False:
+        if compare(self.current_resource.data, updated_data):
             msg = self.MSG_ALREADY_PRESENT
         else:
             self.current_resource.update(updated_data)
@@ -200,14 +206,13 @@ class ScopeModule(OneViewModule):
 
         return changed, msg
 
-    # This method is available only for API300
     def __update_resource_assignments(self):
-        if self.oneview_client.api_version == 300:
-            # returns None if scope doesn't exist
-            if not self.current_resource:
-                return dict(failed=True,
-                            msg=self.MSG_RESOURCE_NOT_FOUND)
+        # returns None if scope doesn't exist
+        if not self.current_resource:
+            return dict(failed=True,
+                        msg=self.MSG_RESOURCE_NOT_FOUND)
 
+        if self.oneview_client.api_version == 300:
             add_resources = self.data.get('resourceAssignments').get('addedResourceUris') is not None
             remove_resources = self.data.get('resourceAssignments').get('removedResourceUris') is not None
             updated_name = self.data.get('resourceAssignments').get('name') is not None
@@ -237,6 +242,62 @@ class ScopeModule(OneViewModule):
                         msg=self.MSG_RESOURCE_ASSIGNMENTS_UPDATED,
                         ansible_facts=dict(scope=self.current_resource.data))
 
+        resource_assignments = self.data.get('resourceAssignments') or {}
+        changed = self.__assign_resources(resource_assignments.get('addedResourceUris'),
+                                          resource_assignments.get('removedResourceUris'))
+        return dict(changed=changed,
+                    msg=self.MSG_RESOURCE_ASSIGNMENTS_UPDATED if changed else self.MSG_RESOURCE_ASSIGNMENTS_NOT_UPDATED,
+                    ansible_facts=dict(scope=self.current_resource.data))
+
+    def __assign_resources(self, added_uris, removed_uris):
+        removed_uris = self.__unique(removed_uris)
+        removed_set = set(removed_uris)
+        added_uris = [uri for uri in self.__unique(added_uris) if uri not in removed_set]
+
+        added_members = self.__get_members(added_uris)
+        removed_members = self.__get_members(removed_uris)
+        added_uris = [uri for uri in added_uris if uri not in added_members]
+        removed_uris = [uri for uri in removed_uris if uri in removed_members]
+
+        # Each chunk is sent as a single PATCH of the scope, since /resource-assignments is only available on API300
+        chunk_size = self.__chunk_size('chunk_size', ASSIGNMENT_CHUNK_SIZE)
+        for start in range(0, max(len(added_uris), len(removed_uris)), chunk_size):
+            operations = []
+            if added_uris[start:start + chunk_size]:
+                operations.append(dict(op='add', path='/addedResourceUris/-', value=added_uris[start:start + chunk_size]))
+            if removed_uris[start:start + chunk_size]:
+                operations.append(dict(op='replace', path='/removedResourceUris',
+                                       value=removed_uris[start:start + chunk_size]))
+            self.current_resource.patch_request(self.current_resource.data['uri'], body=operations)
+
+        if added_uris or removed_uris:
+            self.current_resource.refresh()
+            return True
+        return False
+
+    def __get_members(self, uris):
+        # The membership is checked on the server, in chunks, instead of reading all the resources of the scope
+        chunk_size = self.__chunk_size('membership_chunk_size', MEMBERSHIP_CHUNK_SIZE)
+        members = set()
+        for start in range(0, len(uris), chunk_size):
+            uri_filter = ' OR '.join("uri='{0}'".format(uri) for uri in uris[start:start + chunk_size])
+            resources = self.oneview_client.index_resources.get_all(
+                filter=["scopeUris='{0}'".format(self.current_resource.data['uri']), uri_filter], fields='uri')
+            members.update(resource['uri'] for resource in resources or [])
+        return members
+
+    def __chunk_size(self, name, default):
+        return max(self.module.params.get(name) or default, 1)
+
+    def __unique(self, uris):
+        seen = set()
+        unique_uris = []
+        for uri in uris or []:
+            if uri not in seen:
+                seen.add(uri)
+                unique_uris.append(uri)
+        return unique_uris
+
 
 def main():
     ScopeModule().run()
@@ -44,7 +44,10 @@ options:
               C(uid_state_on) will set on the UID state, if necessary.
               C(uid_state_off) will set off the UID state, if necessary.
               C(environmental_configuration_set) will set the environmental configuration of the Server Hardware.
-              C(multiple_servers_added) will add multiple rack-mount servers.
+              C(multiple_servers_added) will add multiple rack-mount servers. The iLO addresses and ranges, such as
+              C(172.18.6.15-172.18.6.20), of C(mpHostsAndRanges) that are already managed are skipped, the others are
+              added in chunks of C(chunk_size) concurrently, and the chunks that fail are retried. A range must be
+              written with both full addresses, the first one not greater than the last one.
         choices: ['present', 'absent', 'power_state_set', 'refresh_state_set', 'ilo_firmware_version_updated',
                   'ilo_state_reset','uid_state_on', 'uid_state_off', 'environmental_configuration_set',
                   'multiple_servers_added']
@@ -53,6 +56,21 @@ options:
         description:
             - List with Server Hardware properties and its associated states.
         required: true
+    chunk_size:
+        description:
+            - Number of iLOs added by each request of the C(multiple_servers_added) state.
+        default: 16
+        required: false
+    max_workers:
+        description:
+            - Maximum number of concurrent requests of the C(multiple_servers_added) state.
+        default: 4
+        required: false
+    retries:
+        description:
+            - Number of times the iLOs that failed to be added are retried by the C(multiple_servers_added) state.
+        default: 1
+        required: false
 
 extends_documentation_fragment:
     - oneview
@@ -108,6 +126,28 @@ EXAMPLES = '''
         configurationState: "Managed"
   delegate_to: localhost
 
+- name: Add hundreds of rack-mount servers, 32 iLOs per request and 8 requests at once
+  oneview_server_hardware:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    state: multiple_servers_added
+    data:
+        mpHostsAndRanges :
+          - '172.18.6.10-172.18.6.250'
+          - '172.18.7.10-172.18.7.250'
+        username : 'username'
+        password : 'password'
+        licensingIntent: "OneView"
+        configurationState: "Managed"
+    chunk_size: 32
+    max_workers: 8
+    retries: 2
+  delegate_to: localhost
+
+- debug: var=server_hardware_added
+
 - name: Power Off the server hardware
   oneview_server_hardware:
     hostname: 172.16.101.48
@@ -188,9 +228,23 @@ server_hardware:
     returned: On states 'present', 'power_state_set', 'refresh_state_set', and 'ilo_firmware_version_updated'.
               Can be null.
     type: dict
+
+server_hardware_added:
+    description: Has the result of each iLO of the 'multiple_servers_added' state, with its C(host) and C(status),
+                 C(added), C(already_managed) or C(failed), along with the C(error) of the failed ones.
+    returned: On state 'multiple_servers_added', also when some iLOs fail to be added.
+    type: list
 '''
 
-from ansible.module_utils.oneview import OneViewModule, OneViewModuleResourceNotFound, OneViewModuleValueError
+import socket
+import struct
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError,
+                                          get_all_resources,
+                                          run_concurrently)
 
 
 class ServerHardwareModule(OneViewModule):
@@ -208,6 +262,9 @@ class ServerHardwareModule(OneViewModule):
     MSG_ALREADY_ABSENT = 'Server Hardware is already absent.'
     MSG_MANDATORY_FIELD_MISSING = "Mandatory field was not informed: {0}"
     MSG_MULTIPLE_RACK_MOUNT_SERVERS_ADDED = "Servers added successfully."
+    MSG_MULTIPLE_RACK_MOUNT_SERVERS_ALREADY_PRESENT = "Servers are already managed."
+    MSG_MULTIPLE_RACK_MOUNT_SERVERS_FAILED = "Failed to add the servers {0}"
+    MSG_INVALID_RANGE = "Invalid range of hosts: {0}. Use a range like 172.18.6.15-172.18.6.20."
 
     patch_success_message = dict(
         ilo_state_reset=MSG_ILO_STATE_RESET,
@@ -237,7 +294,10 @@ class ServerHardwareModule(OneViewModule):
                 'multiple_servers_added'
             ]
         ),
-        data=dict(required=True, type='dict')
+        data=dict(required=True, type='dict'),
+        chunk_size=dict(required=False, type='int', default=16),
+        max_workers=dict(required=False, type='int', default=4),
+        retries=dict(required=False, type='int', default=1)
     )
 
     def __init__(self):
@@ -340,8 +400,88 @@ class ServerHardwareModule(OneViewModule):
         return changed, message, dict(server_hardware=self.current_resource.data)
 
     def __add_multiple_rack_mount_servers(self):
-        resource = self.resource_client.add_multiple_servers(self.data)
-        return True, self.MSG_MULTIPLE_RACK_MOUNT_SERVERS_ADDED, {"server_hardware": resource.data}
+        data = self.data.copy()
+        hosts = self.__expand_hosts(data.pop('mpHostsAndRanges', None) or [])
+        chunk_size = max(self.module.params.get('chunk_size') or 1, 1)
+
+        results = {}
+        pending = hosts
+        resource = None
+        attempts = (self.module.params.get('retries') or 0) + 1
+        for attempt in range(attempts):
+            # A failed request may have added some of its servers, so they are looked up again before a retry
+            managed_hosts = self.__get_managed_hosts()
+            for host in pending:
+                if host in managed_hosts:
+                    results[host] = dict(host=host, status='added' if attempt else 'already_managed')
+            pending = [host for host in pending if host not in managed_hosts]
+            if not pending:
+                break
+
+            chunks = [pending[index:index + chunk_size] for index in range(0, len(pending), chunk_size)]
+            outcomes = run_concurrently(lambda chunk: self.__add_servers(data, chunk), chunks,
+                                        self.module.params.get('max_workers'))
+
+            pending = []
+            for chunk, outcome in zip(chunks, outcomes):
+                if isinstance(outcome, Exception):
+                    pending.extend(chunk)
+                    results.update((host, dict(host=host, status='failed', error=str(outcome))) for host in chunk)
+                else:
+                    resource = outcome
+                    results.update((host, dict(host=host, status='added')) for host in chunk)
+            if not pending:
+                break
+
+        added = [results[host] for host in hosts]
+        if pending:
+            raise OneViewModuleException(self.MSG_MULTIPLE_RACK_MOUNT_SERVERS_FAILED.format(
+                '; '.join('{0}: {1}'.format(host, results[host]['error']) for host in pending)),
+                result=dict(changed=any(result['status'] == 'added' for result in added),
+                            ansible_facts=dict(server_hardware_added=added)))
+
+        if not any(result['status'] == 'added' for result in added):
+            return False, self.MSG_MULTIPLE_RACK_MOUNT_SERVERS_ALREADY_PRESENT, dict(server_hardware_added=added)
+
+        return True, self.MSG_MULTIPLE_RACK_MOUNT_SERVERS_ADDED, dict(server_hardware=resource.data if resource else None,
+                                                                      server_hardware_added=added)
+
+    def __add_servers(self, data, hosts):
+        try:
+            return self.resource_client.add_multiple_servers(dict(data, mpHostsAndRanges=hosts))
+        except Exception as exception:
+            return exception
+
+    def __get_managed_hosts(self):
+        managed_hosts = set()
+        for server_hardware in get_all_resources(self.resource_client, {}, ['name', 'mpHostInfo']) or []:
+            managed_hosts.add(server_hardware.get('name'))
+            mp_host_info = server_hardware.get('mpHostInfo') or {}
+            managed_hosts.add(mp_host_info.get('mpHostName'))
+            managed_hosts.update(address.get('address') for address in mp_host_info.get('mpIpAddresses') or [])
+        managed_hosts.discard(None)
+        return managed_hosts
+
+    def __expand_hosts(self, hosts_and_ranges):
+        hosts = []
+        expanded = set()
+        for host_or_range in hosts_and_ranges:
+            for host in self.__expand_range(host_or_range.strip()):
+                if host not in expanded:
+                    expanded.add(host)
+                    hosts.append(host)
+        return hosts
+
+    def __expand_range(self, host_or_range):
+        first, _, last = host_or_range.partition('-')
+        try:
+            start = struct.unpack('!I', socket.inet_aton(first.strip()))[0]
+            end = struct.unpack('!I', socket.inet_aton(last.strip()))[0] if last else start
+        except (socket.error, struct.error):
+            return [host_or_range]
+        if end < start:
+            raise OneViewModuleValueError(self.MSG_INVALID_RANGE.format(host_or_range))
+        return [socket.inet_ntoa(struct.pack('!I', address)) for address in range(start, end + 1)]
 
 
 def main():
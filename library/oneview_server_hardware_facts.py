@@ -48,6 +48,9 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
+    - oneview.resultformat
+    - oneview.mirror
 '''
 
 EXAMPLES = '''
@@ -78,6 +81,32 @@ EXAMPLES = '''
 - debug: msg="{{server_hardwares | map(attribute='name') | list }}"
 
 
+- name: Gather the name, uri and status of all Server Hardwares
+  oneview_server_hardware_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    fields:
+      - name
+      - uri
+      - status
+  delegate_to: localhost
+
+- debug: var=server_hardwares
+
+- name: Write the facts about all Server Hardwares to a JSON Lines file
+  oneview_server_hardware_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    result_format: file
+  delegate_to: localhost
+
+- debug: msg="The Server Hardwares were written to {{ server_hardwares }}"
+
+
 - name: Gather facts about a Server Hardware by name
   oneview_server_hardware_facts:
     hostname: 172.16.101.48
@@ -158,6 +187,21 @@ EXAMPLES = '''
   delegate_to: localhost
 
 - debug: var=server_hardware_firmware
+
+- name: Gather facts about the Server Hardware powered on, from the local mirror
+  oneview_server_hardware_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    source: mirror
+    mirror: /var/lib/oneview/mirror.db
+    params:
+      filter: "powerState='On'"
+      sort: 'name:ascending'
+  delegate_to: localhost
+
+- debug: var=server_hardwares
 '''
 
 RETURN = '''
@@ -223,7 +267,8 @@ class ServerHardwareFactsModule(OneViewModule):
             options=dict(required=False, type='list'),
             params=dict(required=False, type='dict')
         )
-        super(ServerHardwareFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(ServerHardwareFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['server_hardwares'],
+                                                        result_format_support=True, mirror_support=True)
         self.set_resource_object(self.oneview_client.server_hardware)
 
     def execute_module(self):
@@ -236,7 +281,7 @@ class ServerHardwareFactsModule(OneViewModule):
                 if self.options:
                     ansible_facts = self.gather_option_facts()
         else:
-            server_hardwares = self.resource_client.get_all(**self.facts_params)
+            server_hardwares = self.get_all_resources(self.resource_client)
 
         if self.options and self.options.get('firmwares'):
             ansible_facts['server_hardware_firmwares'] = self.get_all_firmwares()
@@ -0,0 +1,302 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_server_hardware_power
+short_description: Set the power state of many Server Hardware at once.
+description:
+    - Set the power state of many Server Hardware at once.
+    - The current power state of the targets is read with filtered queries of at most 50 Server Hardware each, and
+      only the Server Hardware that are not in the requested state are powered on or off.
+    - The power transitions are sent in waves. Each wave has at most C(max_per_group) Server Hardware of the same
+      enclosure or rack, to avoid the inrush current of powering many servers of the same rack at once. The
+      requests of a wave are sent concurrently and their tasks are waited on together.
+    - The Server Hardware that fail to change their power state do not stop the other waves, and are reported once
+      all the waves are finished.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    server_hardware:
+      description:
+        - List with the names or URIs of the Server Hardware.
+        - When not provided, the targets are all the Server Hardware matching C(params).
+      required: false
+    params:
+      description:
+        - Params used to select the Server Hardware, such as C(filter) and C(query), when C(server_hardware) is not
+          provided.
+      required: false
+    power_state:
+      description:
+        - Requested power state.
+      required: true
+      choices: ['On', 'Off']
+    power_control:
+      description:
+        - Power control used for the transitions. C(MomentaryPress) powers on, or powers off gracefully,
+          C(PressAndHold) powers off immediately.
+        - C(Reset) and C(ColdBoot) restart the Server Hardware, so they are sent to all the targets that are on, and
+          require the C(power_state) C(On).
+      default: MomentaryPress
+      choices: ['MomentaryPress', 'PressAndHold', 'Reset', 'ColdBoot']
+      required: false
+    group_by:
+      description:
+        - How the Server Hardware are grouped to limit the transitions of each wave. C(enclosure) groups the
+          blades by the enclosure they are in, C(rack) groups the blades and the rack servers by the rack they are
+          mounted in, which is looked up from the racks.
+        - The Server Hardware without an enclosure, or not mounted in any rack, share a single group.
+      default: enclosure
+      choices: ['enclosure', 'rack']
+      required: false
+    max_per_group:
+      description:
+        - Maximum number of Server Hardware of the same group powered on or off at once.
+      default: 4
+      required: false
+    max_workers:
+      description:
+        - Maximum number of concurrent power requests and task waits.
+      default: 10
+      required: false
+    timeout:
+      description:
+        - Timeout in seconds to wait for the tasks of a wave. Waits for their completion by default.
+      default: -1
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Power off the blades of two enclosures gracefully, at most two per enclosure at once
+  oneview_server_hardware_power:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    params:
+      filter: "locationUri='/rest/enclosures/09SGH100X6J1' OR locationUri='/rest/enclosures/09SGH102X6J1'"
+    power_state: 'Off'
+    power_control: MomentaryPress
+    max_per_group: 2
+  delegate_to: localhost
+
+- debug: var=server_hardware_power
+
+- name: Power on rack servers, at most four per rack at once
+  oneview_server_hardware_power:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    server_hardware:
+      - "172.18.6.15"
+      - "172.18.6.16"
+      - "/rest/server-hardware/37333036-3831-584D-5131-303030323037"
+    power_state: 'On'
+    group_by: rack
+    max_per_group: 4
+  delegate_to: localhost
+
+- debug: var=server_hardware_power
+'''
+
+RETURN = '''
+server_hardware_power:
+    description: Has the power state of each Server Hardware before the module ran and its status, C(unchanged),
+                 C(changed) or C(failed), along with the error of the failed ones, and the number of waves run.
+    returned: Always.
+    type: dict
+'''
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          OneViewModuleValueError,
+                                          TaskMonitor,
+                                          get_all_resources,
+                                          run_concurrently)
+
+STATUS_UNCHANGED = 'unchanged'
+STATUS_CHANGED = 'changed'
+STATUS_FAILED = 'failed'
+
+RESTART_POWER_CONTROLS = ['Reset', 'ColdBoot']
+
+FILTER_CHUNK_SIZE = 50
+
+
+class ServerHardwarePowerModule(OneViewModule):
+    MSG_POWER_STATE_UPDATED = 'Server Hardware power state changed successfully.'
+    MSG_ALREADY_IN_POWER_STATE = 'Server Hardware are already in the requested power state.'
+    MSG_NO_TARGETS = 'No server_hardware or params provided.'
+    MSG_SERVER_HARDWARE_NOT_FOUND = 'Server Hardware not found: '
+    MSG_POWER_STATE_FAILED = 'Failed to change the power state of the Server Hardware: {0}'
+    MSG_RESTART_REQUIRES_ON = 'The power_control {0} restarts the Server Hardware and requires the power_state On.'
+
+    def __init__(self):
+        argument_spec = dict(
+            server_hardware=dict(required=False, type='list'),
+            params=dict(required=False, type='dict'),
+            power_state=dict(required=True, type='str', choices=['On', 'Off']),
+            power_control=dict(required=False, type='str', default='MomentaryPress',
+                               choices=['MomentaryPress', 'PressAndHold', 'Reset', 'ColdBoot']),
+            group_by=dict(required=False, type='str', default='enclosure', choices=['enclosure', 'rack']),
+            max_per_group=dict(required=False, type='int', default=4),
+            max_workers=dict(required=False, type='int', default=10),
+            timeout=dict(required=False, type='int', default=-1)
+        )
+        super(ServerHardwarePowerModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        self.max_workers = self.module.params['max_workers']
+        if self.module.params['power_control'] in RESTART_POWER_CONTROLS and self.module.params['power_state'] != 'On':
+            raise OneViewModuleValueError(self.MSG_RESTART_REQUIRES_ON.format(self.module.params['power_control']))
+
+        servers = self.__get_servers()
+        transitions = [server for server in servers if self.__needs_transition(server)]
+
+        waves = self.__plan_waves(transitions)
+        for index, wave in enumerate(waves, 1):
+            self.module.log('Setting the power state of wave {0}: {1}'.format(
+                index, ', '.join(server['name'] for server in wave)))
+            tasks = run_concurrently(self.__request_power_state, wave, self.max_workers)
+            run_concurrently(self.__wait, list(zip(wave, tasks)), self.max_workers)
+
+        results = [dict(name=server['name'], uri=server['uri'], powerState=server.get('powerState'),
+                        status=server['status']) for server in servers]
+        ansible_facts = dict(server_hardware_power=dict(server_hardware=results, waves=len(waves)))
+
+        failures = '; '.join('{0}: {1}'.format(server['name'], server['error'])
+                             for server in transitions if server['status'] == STATUS_FAILED)
+        if failures:
+            changed = any(server['status'] == STATUS_CHANGED for server in transitions)
+            raise OneViewModuleException(self.MSG_POWER_STATE_FAILED.format(failures),
+                                         result=dict(changed=changed, ansible_facts=ansible_facts))
+
+        return dict(changed=bool(transitions),
+                    msg=self.MSG_POWER_STATE_UPDATED if transitions else self.MSG_ALREADY_IN_POWER_STATE,
+                    ansible_facts=ansible_facts)
+
+    def __get_servers(self):
+        targets = self.module.params.get('server_hardware') or []
+        params = dict(self.module.params.get('params') or {})
+        if not targets and not params:
+            raise OneViewModuleValueError(self.MSG_NO_TARGETS)
+
+        fields = ['name', 'uri', 'powerState', 'locationUri']
+        if targets:
+            # The targets are looked up in chunks, to keep the filter of each query short
+            chunks = [targets[start:start + FILTER_CHUNK_SIZE] for start in range(0, len(targets), FILTER_CHUNK_SIZE)]
+            pages = run_concurrently(lambda chunk: self.__get_targets(params, chunk, fields), chunks, self.max_workers)
+        else:
+            pages = [get_all_resources(self.oneview_client.server_hardware, params, fields) or []]
+
+        servers = []
+        uris = set()
+        for server in (server for page in pages for server in page):
+            if server['uri'] not in uris:
+                uris.add(server['uri'])
+                servers.append(dict(server, status=STATUS_UNCHANGED))
+
+        found = set(server['name'] for server in servers) | set(server['uri'] for server in servers)
+        missing = [target for target in targets if target not in found]
+        if missing:
+            raise OneViewModuleResourceNotFound(self.MSG_SERVER_HARDWARE_NOT_FOUND + ', '.join(missing))
+        return servers
+
+    def __get_targets(self, params, targets, fields):
+        target_filter = ' OR '.join("{0}='{1}'".format('uri' if target.startswith('/rest/') else 'name', target)
+                                    for target in targets)
+        params = dict(params, filter=target_filter)
+        return get_all_resources(self.oneview_client.server_hardware, params, fields) or []
+
+    def __needs_transition(self, server):
+        if self.module.params['power_control'] in RESTART_POWER_CONTROLS:
+            return server.get('powerState') == 'On'
+        return server.get('powerState') != self.module.params['power_state']
+
+    def __plan_waves(self, servers):
+        max_per_group = max(self.module.params['max_per_group'], 1)
+        racks = self.__get_racks() if self.module.params['group_by'] == 'rack' else {}
+
+        groups = []
+        servers_by_group = {}
+        for server in servers:
+            if self.module.params['group_by'] == 'rack':
+                group = racks.get(server['uri']) or racks.get(server.get('locationUri'))
+            else:
+                group = server.get('locationUri')
+            if group not in servers_by_group:
+                groups.append(group)
+                servers_by_group[group] = []
+            servers_by_group[group].append(server)
+
+        waves = []
+        start = 0
+        while any(len(servers_by_group[group]) > start for group in groups):
+            waves.append([server for group in groups for server in servers_by_group[group][start:start + max_per_group]])
+            start += max_per_group
+        return waves
+
+    def __get_racks(self):
+        racks = {}
+        for rack in self.oneview_client.racks.get_all():
+            for rack_mount in rack.get('rackMounts') or []:
+                racks[rack_mount.get('mountUri')] = rack['uri']
+        return racks
+
+    def __request_power_state(self, server):
+        configuration = dict(powerState=self.module.params['power_state'],
+                             powerControl=self.module.params['power_control'])
+        try:
+            task, body = self.oneview_client.connection.put(server['uri'] + '/powerState', configuration)
+            return task
+        except Exception as exception:
+            server['status'] = STATUS_FAILED
+            server['error'] = str(exception)
+
+    def __wait(self, server_task):
+        server, task = server_task
+        if 'error' in server:
+            return
+        try:
+            if task:
+                TaskMonitor(self.oneview_client.connection).wait_for_task(task, self.module.params['timeout'])
+        except Exception as exception:
+            server['status'] = STATUS_FAILED
+            server['error'] = str(exception)
+        else:
+            server['status'] = STATUS_CHANGED
+
+
+def main():
+    ServerHardwarePowerModule().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -40,6 +40,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -93,7 +94,7 @@ class ServerHardwareTypeFactsModule(OneViewModule):
             name=dict(required=False, type='str'),
             params=dict(required=False, type='dict')
         )
-        super(ServerHardwareTypeFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(ServerHardwareTypeFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['server_hardware_types'])
 
         self.resource_client = self.oneview_client.server_hardware_types
 
@@ -104,7 +105,7 @@ class ServerHardwareTypeFactsModule(OneViewModule):
         if name:
             server_hardware_types = self.resource_client.get_by('name', name)
         else:
-            server_hardware_types = self.resource_client.get_all(**self.facts_params)
+            server_hardware_types = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(server_hardware_types=server_hardware_types))
 
@@ -61,6 +61,12 @@ options:
         the Server Profile will have its Server Hardware unassigned.
     default: True
     choices: [True, False]
+  gather_facts:
+    description:
+      - List with the additional facts to gather on the states C(present) and C(compliant). The facts not listed are
+        not requested from OneView and are returned as null. When both are listed, they are requested concurrently.
+    default: ['server_hardware', 'compliance_preview']
+    choices: ['server_hardware', 'compliance_preview']
   params:
     description:
       - Dict with query parameters.
@@ -186,6 +192,19 @@ EXAMPLES = '''
         name: Web-Server-L2
   delegate_to: localhost
 
+- name : Ensure the server profile is present, gathering only the facts about its server hardware
+  oneview_server_profile:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    state: present
+    gather_facts:
+      - server_hardware
+    data:
+        name: Web-Server-L2
+  delegate_to: localhost
+
 - name : Remove the server profile
   oneview_server_profile:
     hostname: 172.16.101.48
@@ -209,13 +228,13 @@ serial_number:
     type: dict
 server_hardware:
     description: Has the OneView facts about the Server Hardware.
-    returned: On states 'present' and 'compliant'.
+    returned: On states 'present' and 'compliant', when listed in gather_facts.
     type: dict
 compliance_preview:
     description:
         Has the OneView facts about the manual and automatic updates required to make the server profile
         consistent with its template.
-    returned: On states 'present' and 'compliant'.
+    returned: On states 'present' and 'compliant', when listed in gather_facts.
     type: dict
 created:
     description: Indicates if the Server Profile was created.
@@ -234,7 +253,8 @@ from ansible.module_utils.oneview import (OneViewModule,
                                           OneViewModuleTaskError,
                                           SPKeys,
                                           OneViewModuleException,
-                                          compare)
+                                          compare,
+                                          run_concurrently)
 
 
 class ServerProfileModule(OneViewModule):
@@ -258,11 +278,14 @@ class ServerProfileModule(OneViewModule):
 
     CONCURRENCY_FAILOVER_RETRIES = 25
 
+    GATHER_FACTS = ['server_hardware', 'compliance_preview']
+
     argument_spec = dict(
         state=dict(choices=['present', 'absent', 'compliant'], default='present'),
         data=dict(type='dict', required=True),
         params=dict(type='dict', required=False),
-        auto_assign_server_hardware=dict(type='bool', default=True)
+        auto_assign_server_hardware=dict(type='bool', default=True),
+        gather_facts=dict(type='list', default=list(GATHER_FACTS), choices=GATHER_FACTS)
     )
 
     def __init__(self):
@@ -619,28 +642,39 @@ class ServerProfileModule(OneViewModule):
         return changed, msg, self.current_resource.data
 
     def __gather_facts(self):
+        gather_facts = self.module.params.get('gather_facts')
+        if gather_facts is None:
+            gather_facts = self.GATHER_FACTS
 
-        server_hardware = None
-        if self.current_resource.data.get('serverHardwareUri'):
-            server_hardware_by_uri = self.server_hardware.get_by_uri(
-                self.current_resource.data['serverHardwareUri'])
-            if server_hardware_by_uri:
-                server_hardware = server_hardware_by_uri.data
-
-        compliance_preview = None
-        if self.current_resource.data.get('serverProfileTemplateUri'):
-            compliance_preview = self.current_resource.get_compliance_preview()
+        # The additional facts are only requested when listed, and concurrently when both are listed
+        loaders = dict(server_hardware=self.__get_server_hardware, compliance_preview=self.__get_compliance_preview)
+        names = [name for name in self.GATHER_FACTS if name in gather_facts]
+        values = run_concurrently(lambda name: loaders[name](), names, len(names))
 
         facts = {
             'serial_number': self.current_resource.data.get('serialNumber'),
             'server_profile': self.current_resource.data,
-            'server_hardware': server_hardware,
-            'compliance_preview': compliance_preview,
+            'server_hardware': None,
+            'compliance_preview': None,
             'created': False
         }
+        facts.update(zip(names, values))
 
         return facts
 
+    def __get_server_hardware(self):
+        if self.current_resource.data.get('serverHardwareUri'):
+            server_hardware_by_uri = self.server_hardware.get_by_uri(
+                self.current_resource.data['serverHardwareUri'])
+            if server_hardware_by_uri:
+                return server_hardware_by_uri.data
+        return None
+
+    def __get_compliance_preview(self):
+        if self.current_resource.data.get('serverProfileTemplateUri'):
+            return self.current_resource.get_compliance_preview()
+        return None
+
     def __get_server_hardware_by_name(self, server_hardware_name):
         server_hardwares = self.server_hardware.get_by('name', server_hardware_name)
         return server_hardwares[0] if server_hardwares else None
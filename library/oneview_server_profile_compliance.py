@@ -0,0 +1,257 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_server_profile_compliance
+short_description: Make the Server Profiles of a Server Profile Template compliant with it.
+description:
+    - Update from template all the Server Profiles of a Server Profile Template that are not compliant with it.
+    - The non-compliant Server Profiles are found with filtered queries, and their compliance previews are
+      retrieved concurrently to split them into online and offline updates.
+    - The online updates are applied concurrently, with the servers running. The offline updates only start once
+      all the online updates succeeded.
+    - The offline updates are applied in rolling waves of at most C(max_offline) Server Profiles. In each wave,
+      the server hardware that are on are powered off, the Server Profiles are updated from the template and the
+      server hardware are powered back on. The remediation stops after a wave with failures, so a faulty template
+      does not take down more servers.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    template:
+      description:
+        - Name of the Server Profile Template.
+      required: true
+    server_profiles:
+      description:
+        - List with the names of the Server Profiles to remediate. When not provided, all the non-compliant Server
+          Profiles of the template are remediated.
+      required: false
+    max_offline:
+      description:
+        - Maximum number of Server Profiles updated offline at once.
+      default: 4
+      required: false
+    max_workers:
+      description:
+        - Maximum number of concurrent compliance previews and online updates.
+      default: 10
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Make all the Server Profiles of a template compliant, updating at most five servers offline at once
+  oneview_server_profile_compliance:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    template: "ProfileTemplate101"
+    max_offline: 5
+  delegate_to: localhost
+
+- debug: var=server_profile_compliance
+
+- name: Make two Server Profiles of a template compliant
+  oneview_server_profile_compliance:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    template: "ProfileTemplate101"
+    server_profiles:
+      - "Web-Server-L1"
+      - "Web-Server-L2"
+  delegate_to: localhost
+
+- debug: var=server_profile_compliance
+'''
+
+RETURN = '''
+server_profile_compliance:
+    description: Has the update of each non-compliant Server Profile, C(online) or C(offline), its status,
+                 C(pending), C(remediated) or C(failed), and the number of offline waves run.
+    returned: Always, also on failure.
+    type: dict
+'''
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleResourceNotFound,
+                                          get_all_resources,
+                                          get_resources_by,
+                                          run_concurrently)
+
+UPDATE_ONLINE = 'online'
+UPDATE_OFFLINE = 'offline'
+
+STATUS_PENDING = 'pending'
+STATUS_REMEDIATED = 'remediated'
+STATUS_FAILED = 'failed'
+
+
+class ServerProfileComplianceModule(OneViewModule):
+    MSG_REMEDIATED_COMPLIANCE = 'Remediated the compliance issues of the Server Profiles.'
+    MSG_ALREADY_COMPLIANT = 'Server Profiles are already compliant.'
+    MSG_TEMPLATE_NOT_FOUND = 'Server Profile Template not found: '
+    MSG_PREVIEW_FAILED = 'Failed to get the compliance preview of the Server Profiles: {0}'
+    MSG_ONLINE_FAILED = 'Failed to update the Server Profiles from template: {0}'
+    MSG_OFFLINE_FAILED = 'Remediation stopped after the offline wave {0}, which failed on {1}'
+
+    def __init__(self):
+        argument_spec = dict(
+            template=dict(required=True, type='str'),
+            server_profiles=dict(required=False, type='list'),
+            max_offline=dict(required=False, type='int', default=4),
+            max_workers=dict(required=False, type='int', default=10)
+        )
+        super(ServerProfileComplianceModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        self.max_workers = self.module.params['max_workers']
+
+        profiles = self.__get_non_compliant_profiles()
+        if not profiles:
+            return dict(changed=False, msg=self.MSG_ALREADY_COMPLIANT,
+                        ansible_facts=dict(server_profile_compliance=dict(server_profiles=[], waves=0)))
+
+        run_concurrently(self.__get_compliance_preview, profiles, self.max_workers)
+        failures = self.__failures(profiles)
+        if failures:
+            raise OneViewModuleException(self.MSG_PREVIEW_FAILED.format(failures), result=self.__result(profiles, 0))
+
+        online = [profile for profile in profiles if profile['update'] == UPDATE_ONLINE]
+        offline = [profile for profile in profiles if profile['update'] == UPDATE_OFFLINE]
+
+        # The offline waves power off the servers, so they only start once the online updates succeeded
+        run_concurrently(self.__update_from_template, online, self.max_workers)
+        failures = self.__failures(online)
+        if failures:
+            raise OneViewModuleException(self.MSG_ONLINE_FAILED.format(failures), result=self.__result(profiles, 0))
+
+        self.__get_power_states(offline)
+        max_offline = max(self.module.params['max_offline'], 1)
+        waves = [offline[start:start + max_offline] for start in range(0, len(offline), max_offline)]
+        for index, wave in enumerate(waves, 1):
+            self.module.log('Updating offline wave {0}: {1}'.format(
+                index, ', '.join(profile['name'] for profile in wave)))
+            run_concurrently(self.__update_offline, wave, self.max_workers)
+
+            failures = self.__failures(wave)
+            if failures:
+                raise OneViewModuleException(self.MSG_OFFLINE_FAILED.format(index, failures),
+                                             result=self.__result(profiles, index))
+
+        return dict(self.__result(profiles, len(waves)), msg=self.MSG_REMEDIATED_COMPLIANCE)
+
+    def __result(self, profiles, waves):
+        results = [dict(name=profile['name'], uri=profile['uri'], update=profile.get('update'),
+                        status=profile['status']) for profile in profiles]
+        return dict(changed=any(profile['status'] == STATUS_REMEDIATED for profile in profiles),
+                    ansible_facts=dict(server_profile_compliance=dict(server_profiles=results, waves=waves)))
+
+    def __get_non_compliant_profiles(self):
+        template_name = self.module.params['template']
+        template = self.oneview_client.server_profile_templates.get_by_name(template_name)
+        if not template:
+            raise OneViewModuleResourceNotFound(self.MSG_TEMPLATE_NOT_FOUND + template_name)
+
+        params = dict(filter=["serverProfileTemplateUri='{0}'".format(template.data['uri']),
+                              "templateCompliance='NonCompliant'"])
+        names = self.module.params.get('server_profiles')
+        fields = ['name', 'uri', 'serverHardwareUri', 'templateCompliance']
+        if names:
+            found = get_resources_by(self.oneview_client.server_profiles, 'name', names, params, fields)
+        else:
+            found = get_all_resources(self.oneview_client.server_profiles, params, fields) or []
+
+        profiles = []
+        for data in found:
+            resource = self.oneview_client.server_profiles.new(self.oneview_client.connection, data)
+            profiles.append(dict(name=data['name'], uri=data['uri'], serverHardwareUri=data.get('serverHardwareUri'),
+                                 resource=resource, status=STATUS_PENDING))
+        return profiles
+
+    def __get_compliance_preview(self, profile):
+        try:
+            compliance_preview = profile['resource'].get_compliance_preview()
+        except Exception as exception:
+            profile['status'] = STATUS_FAILED
+            profile['error'] = str(exception)
+        else:
+            is_offline_update = compliance_preview.get('isOnlineUpdate') is False
+            profile['update'] = UPDATE_OFFLINE if is_offline_update else UPDATE_ONLINE
+
+    def __get_power_states(self, profiles):
+        server_hardware_uris = [profile['serverHardwareUri'] for profile in profiles if profile['serverHardwareUri']]
+        power_states = {}
+        for data in get_resources_by(self.oneview_client.server_hardware, 'uri', server_hardware_uris,
+                                     fields=['uri', 'powerState']):
+            power_states[data['uri']] = data.get('powerState')
+
+        for profile in profiles:
+            profile['powered_on'] = power_states.get(profile['serverHardwareUri']) == 'On'
+
+    def __update_offline(self, profile):
+        server_hardware = None
+        if profile['powered_on']:
+            server_hardware = self.oneview_client.server_hardware.new(self.oneview_client.connection,
+                                                                      dict(uri=profile['serverHardwareUri']))
+            if not self.__run(profile, lambda: server_hardware.update_power_state(
+                    dict(powerState='Off', powerControl='PressAndHold'))):
+                return
+
+        if self.__update_from_template(profile) and server_hardware:
+            self.__run(profile, lambda: server_hardware.update_power_state(
+                dict(powerState='On', powerControl='MomentaryPress')))
+
+    def __update_from_template(self, profile):
+        if self.__run(profile, lambda: profile['resource'].patch('replace', '/templateCompliance', 'Compliant')):
+            profile['status'] = STATUS_REMEDIATED
+            return True
+        return False
+
+    def __run(self, profile, operation):
+        try:
+            operation()
+        except Exception as exception:
+            profile['status'] = STATUS_FAILED
+            profile['error'] = str(exception)
+            return False
+        return True
+
+    def __failures(self, profiles):
+        return '; '.join('{0}: {1}'.format(profile['name'], profile['error'])
+                         for profile in profiles if profile['status'] == STATUS_FAILED)
+
+
+def main():
+    ServerProfileComplianceModule().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_server_profile_drift_facts
+short_description: Retrieve the drift of the Server Profiles from their Server Profile Template.
+description:
+    - Retrieve the fields of each Server Profile of a Server Profile Template that differ from the template.
+    - The template and all its Server Profiles are read with two requests, and the drift is computed locally by
+      merging the attributes and the managed sections of the template into each profile, with the same rules used
+      to update the Server Profiles. The sections the template does not manage, or with an C(Unchecked) compliance
+      control, are not compared. In the sections with a C(CheckedMinimum) compliance control, only the items of the
+      template that are missing or changed in the profile are reported, not the additional items of the profile.
+    - The values each Server Profile resolves on its own, such as the C(Auto) port of the connections and the
+      C(initialize) flag of the local storage controllers, are not compared.
+    - The compliance preview of the appliance is not requested by default. When C(compliance_preview) is true, it
+      is requested concurrently for the drifted Server Profiles only.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+author: "HPE OneView Ansible Team"
+options:
+    template:
+      description:
+        - Name of the Server Profile Template.
+      required: true
+    server_profiles:
+      description:
+        - List with the names of the Server Profiles to check. When not provided, all the Server Profiles of the
+          template are checked.
+      required: false
+    compliance_preview:
+      description:
+        - When true, the compliance preview of each drifted Server Profile is requested from the appliance.
+      default: false
+      required: false
+    max_workers:
+      description:
+        - Maximum number of concurrent compliance preview requests.
+      default: 10
+      required: false
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Gather the drift of all the Server Profiles of a template
+  oneview_server_profile_drift_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    template: "ProfileTemplate101"
+  delegate_to: localhost
+
+- debug: msg="{{ server_profile_drift.server_profiles | selectattr('drifted') | map(attribute='name') | list }}"
+
+- name: Gather the drift of two Server Profiles, along with the compliance preview of the drifted ones
+  oneview_server_profile_drift_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    template: "ProfileTemplate101"
+    server_profiles:
+      - "Web-Server-L1"
+      - "Web-Server-L2"
+    compliance_preview: true
+  delegate_to: localhost
+
+- debug: var=server_profile_drift
+'''
+
+RETURN = '''
+server_profile_drift:
+    description: Has the number of drifted Server Profiles and, for each Server Profile, its template compliance
+                 reported by the appliance, whether it drifted and the changes, each with the C(path) of the field
+                 and its C(template) and C(profile) values. Has the C(compliance_preview) of the drifted Server
+                 Profiles when requested.
+    returned: Always.
+    type: dict
+'''
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleResourceNotFound,
+                                          ServerProfileDrift,
+                                          get_all_resources,
+                                          get_resources_by,
+                                          run_concurrently)
+
+
+class ServerProfileDriftFactsModule(OneViewModule):
+    MSG_TEMPLATE_NOT_FOUND = 'Server Profile Template not found: '
+
+    def __init__(self):
+        argument_spec = dict(
+            template=dict(required=True, type='str'),
+            server_profiles=dict(required=False, type='list'),
+            compliance_preview=dict(required=False, type='bool', default=False),
+            max_workers=dict(required=False, type='int', default=10)
+        )
+        super(ServerProfileDriftFactsModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        template_name = self.module.params['template']
+        template = self.oneview_client.server_profile_templates.get_by_name(template_name)
+        if not template:
+            raise OneViewModuleResourceNotFound(self.MSG_TEMPLATE_NOT_FOUND + template_name)
+
+        drift = ServerProfileDrift(template.data)
+        results = []
+        for profile in self.__get_profiles(template.data['uri'], drift.fields):
+            changes = drift.drift(profile)
+            results.append(dict(name=profile['name'], uri=profile['uri'],
+                                templateCompliance=profile.get('templateCompliance'),
+                                drifted=bool(changes), changes=changes))
+
+        drifted = [result for result in results if result['drifted']]
+        if self.module.params['compliance_preview']:
+            previews = run_concurrently(self.__get_compliance_preview, drifted, self.module.params['max_workers'])
+            for result, compliance_preview in zip(drifted, previews):
+                result['compliance_preview'] = compliance_preview
+
+        return dict(changed=False,
+                    ansible_facts=dict(server_profile_drift=dict(template=template_name, drifted=len(drifted),
+                                                                 server_profiles=results)))
+
+    def __get_profiles(self, template_uri, fields):
+        params = dict(filter=["serverProfileTemplateUri='{0}'".format(template_uri)])
+        names = self.module.params.get('server_profiles')
+        fields = ['name', 'uri', 'templateCompliance'] + fields
+        if names:
+            return get_resources_by(self.oneview_client.server_profiles, 'name', names, params, fields)
+        return get_all_resources(self.oneview_client.server_profiles, params, fields) or []
+
+    def __get_compliance_preview(self, result):
+        profile = self.oneview_client.server_profiles.new(self.oneview_client.connection, dict(uri=result['uri']))
+        return profile.get_compliance_preview()
+
+
+def main():
+    ServerProfileDriftFactsModule().run()
+
+
+if __name__ == '__main__':
+    main()
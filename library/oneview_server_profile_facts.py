@@ -52,6 +52,9 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
+    - oneview.resultformat
+    - oneview.mirror
 '''
 
 EXAMPLES = '''
@@ -65,6 +68,35 @@ EXAMPLES = '''
 
 - debug: var=server_profiles
 
+- name: Gather compact facts about all Server Profiles
+  oneview_server_profile_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    result_format: compact
+  delegate_to: localhost
+
+- debug: var=server_profiles
+
+- name: Write the facts about all Server Profiles to a JSON Lines file
+  oneview_server_profile_facts:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1600
+    result_format: file
+    result_dir: /tmp
+  delegate_to: localhost
+
+- debug: msg="The Server Profiles were written to {{ server_profiles }}"
+
+- name: Remove the JSON Lines file once it is read
+  file:
+    path: "{{ server_profiles }}"
+    state: absent
+  delegate_to: localhost
+
 - name: Gather paginated, filtered and sorted facts about Server Profiles
   oneview_server_profile_facts:
     hostname: 172.16.101.48
@@ -253,7 +285,8 @@ class ServerProfileFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ServerProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ServerProfileFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['server_profiles'],
+                                                       result_format_support=True, mirror_support=True)
         self.set_resource_object(self.oneview_client.server_profiles)
 
     def execute_module(self):
@@ -263,7 +296,7 @@ class ServerProfileFactsModule(OneViewModule):
         if self.current_resource:
             server_profiles = [self.current_resource.data]
         elif not self.module.params.get("name") and not self.module.params.get('uri'):
-            server_profiles = self.resource_client.get_all(**self.facts_params)
+            server_profiles = self.get_all_resources(self.resource_client)
 
         if self.options:
             ansible_facts = self.__gather_option_facts()
@@ -48,6 +48,7 @@ notes:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -144,7 +145,7 @@ class ServerProfileTemplateFactsModule(OneViewModule):
     )
 
     def __init__(self):
-        super(ServerProfileTemplateFactsModule, self).__init__(additional_arg_spec=self.argument_spec)
+        super(ServerProfileTemplateFactsModule, self).__init__(additional_arg_spec=self.argument_spec, fields_support=['server_profile_templates'])
 
         self.set_resource_object(self.oneview_client.server_profile_templates)
 
@@ -179,7 +180,7 @@ class ServerProfileTemplateFactsModule(OneViewModule):
         return facts
 
     def __get_all(self):
-        templates = self.resource_client.get_all(**self.facts_params)
+        templates = self.get_all_resources(self.resource_client)
         return dict(server_profile_templates=templates)
 
 
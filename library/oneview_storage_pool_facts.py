@@ -47,6 +47,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -121,7 +122,7 @@ class StoragePoolFactsModule(OneViewModule):
             params=dict(required=False, type='dict'),
             options=dict(required=False, type='list')
         )
-        super(StoragePoolFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(StoragePoolFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['storage_pools'])
         self.set_resource_object(self.oneview_client.storage_pools)
 
     def execute_module(self):
@@ -130,7 +131,7 @@ class StoragePoolFactsModule(OneViewModule):
         if self.module.params['name']:
             pools = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            pools = self.resource_client.get_all(**self.facts_params)
+            pools = self.get_all_resources(self.resource_client)
 
         facts['storage_pools'] = pools
         self.__get_options(facts)
@@ -40,6 +40,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -93,7 +94,7 @@ class SwitchTypeFactsModule(OneViewModule):
             name=dict(required=False, type='str'),
             params=dict(required=False, type='dict'),
         )
-        super(SwitchTypeFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(SwitchTypeFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['switch_types'])
 
         self.resource_client = self.oneview_client.switch_types
 
@@ -101,7 +102,7 @@ class SwitchTypeFactsModule(OneViewModule):
         if self.module.params['name']:
             switch_types = self.resource_client.get_by('name', self.module.params['name'])
         else:
-            switch_types = self.resource_client.get_all(**self.facts_params)
+            switch_types = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(switch_types=switch_types))
 
@@ -38,6 +38,7 @@ options:
 
 extends_documentation_fragment:
     - oneview
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -80,12 +81,12 @@ class TaskFactsModule(OneViewModule):
         argument_spec = dict(
             params=dict(required=False, type='dict')
         )
-        super(TaskFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(TaskFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['tasks'])
 
         self.set_resource_object(self.oneview_client.tasks)
 
     def execute_module(self):
-        facts = self.resource_client.get_all(**self.facts_params)
+        facts = self.get_all_resources(self.resource_client)
 
         return dict(changed=False, ansible_facts=dict(tasks=facts))
 
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.1'}
+
+DOCUMENTATION = '''
+---
+module: oneview_task_wait
+short_description: Wait for the completion of OneView Tasks.
+description:
+    - Wait for the completion of several OneView Tasks at once, such as the tasks started asynchronously by
+      previous plays, and return their final state.
+    - When the environment variable C(ONEVIEW_SCMB_CERT_DIR) is set, the tasks are awaited on the State Change
+      Message Bus (SCMB) of the appliance and the module returns as soon as the completion messages arrive.
+      Otherwise, the tasks are polled.
+version_added: "2.9"
+requirements:
+    - "python >= 2.7.9"
+    - "hpeOneView >= 5.4.0"
+    - "amqp, to wait on the SCMB"
+author: "HPE OneView Ansible Team"
+options:
+    task_uris:
+      description:
+        - List with the URIs of the tasks to wait for.
+      required: true
+    timeout:
+      description:
+        - Maximum number of seconds to wait for each task. The default, -1, waits without timeout.
+      required: false
+      default: -1
+    max_workers:
+      description:
+        - Maximum number of tasks awaited concurrently.
+      required: false
+      default: 10
+    fail_on_error:
+      description:
+        - When true, the module fails if any task ends in the Error, Terminated or Killed state.
+      required: false
+      default: true
+extends_documentation_fragment:
+    - oneview
+'''
+
+EXAMPLES = '''
+- name: Wait for the tasks of the firmware updates
+  oneview_task_wait:
+    hostname: 172.16.101.48
+    username: administrator
+    password: my_password
+    api_version: 1200
+    task_uris:
+      - /rest/tasks/D2B856D2-5939-421B-BDCA-FBF7D8961A89
+      - /rest/tasks/6C7D8E3F-1C0D-4B5A-9E2F-3A4B5C6D7E8F
+    timeout: 3600
+  environment:
+    ONEVIEW_SCMB_CERT_DIR: /etc/oneview/scmb
+  delegate_to: localhost
+
+- debug: var=tasks
+'''
+
+RETURN = '''
+tasks:
+    description: The tasks in their final state, in the order of task_uris.
+    returned: Always.
+    type: list
+'''
+
+from ansible.module_utils.oneview import (OneViewModule,
+                                          OneViewModuleException,
+                                          OneViewModuleTaskError,
+                                          TaskMonitor,
+                                          run_concurrently)
+
+
+class TaskWaitModule(OneViewModule):
+    MSG_COMPLETED = 'Tasks completed.'
+    MSG_TASKS_FAILED = 'Tasks failed: {0}'
+    TASK_FAILED_STATES = ['Error', 'Terminated', 'Killed']
+
+    def __init__(self):
+        argument_spec = dict(
+            task_uris=dict(required=True, type='list'),
+            timeout=dict(required=False, type='int', default=-1),
+            max_workers=dict(required=False, type='int', default=10),
+            fail_on_error=dict(required=False, type='bool', default=True)
+        )
+        super(TaskWaitModule, self).__init__(additional_arg_spec=argument_spec)
+
+    def execute_module(self):
+        task_uris = self.module.params['task_uris']
+        tasks = run_concurrently(self.__wait, task_uris, self.module.params['max_workers'])
+
+        for task_uri, task in zip(task_uris, tasks):
+            if isinstance(task, Exception):
+                raise OneViewModuleException('{0}: {1}'.format(task_uri, task))
+
+        failed = [task['uri'] for task in tasks if task.get('taskState') in self.TASK_FAILED_STATES]
+        if failed and self.module.params['fail_on_error']:
+            raise OneViewModuleTaskError(self.MSG_TASKS_FAILED.format(', '.join(failed)))
+
+        return dict(changed=False, msg=self.MSG_COMPLETED, ansible_facts=dict(tasks=tasks))
+
+    def __wait(self, task_uri):
+        try:
+            task_monitor = TaskMonitor(self.oneview_client.connection)
+            return task_monitor.get_completed_task({'uri': task_uri}, self.module.params['timeout'])
+        except Exception as exception:
+            return exception
+
+
+def main():
+    TaskWaitModule().run()
+
+
+if __name__ == '__main__':
+    main()
@@ -41,6 +41,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -87,14 +88,14 @@ class UserFactsModule(OneViewModuleBase):
             params=dict(required=False, type='dict')
         )
 
-        super(UserFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(UserFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['users'])
 
     def execute_module(self):
 
         if self.module.params['name']:
             users = self.oneview_client.users.get_by('name', self.module.params['name'])
         else:
-            users = self.oneview_client.users.get_all(**self.facts_params)
+            users = self.get_all_resources(self.oneview_client.users)
 
         return dict(changed=False, ansible_facts=dict(users=users))
 
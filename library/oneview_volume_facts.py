@@ -47,6 +47,7 @@ options:
 extends_documentation_fragment:
     - oneview
     - oneview.factsparams
+    - oneview.fields
 '''
 
 EXAMPLES = '''
@@ -136,7 +137,7 @@ from ansible.module_utils.oneview import OneViewModule
 class VolumeFactsModule(OneViewModule):
     def __init__(self):
         argument_spec = dict(name=dict(type='str'), options=dict(type='list'), params=dict(type='dict'))
-        super(VolumeFactsModule, self).__init__(additional_arg_spec=argument_spec)
+        super(VolumeFactsModule, self).__init__(additional_arg_spec=argument_spec, fields_support=['storage_volumes'])
         self.set_resource_object(self.oneview_client.volumes)
 
     def execute_module(self):
@@ -146,7 +147,7 @@ class VolumeFactsModule(OneViewModule):
             ansible_facts['storage_volumes'] = self.resource_client.get_by('name', self.module.params['name'])
             ansible_facts.update(self._gather_facts_about_one_volume(ansible_facts['storage_volumes']))
         else:
-            ansible_facts['storage_volumes'] = self.resource_client.get_all(**self.facts_params)
+            ansible_facts['storage_volumes'] = self.get_all_resources(self.resource_client)
 
         if networks:
             self.facts_params['networks'] = networks
@@ -30,8 +30,10 @@ ONEVIEW_MODULE_UTILS_PATH = 'module_utils.oneview'
 sys.modules['ansible.module_utils.oneview'] = oneview
 sys.modules['ansible.module_utils.icsp'] = icsp
 
-from module_utils.oneview import (OneViewModuleBase,
+from module_utils.oneview import (FileChecksumCache,
+                                  OneViewModuleBase,
                                   OneViewClient,
+                                  OneViewMirror,
                                   OneViewModuleException,
                                   OneViewModuleTaskError,
                                   OneViewModuleValueError,
@@ -44,7 +46,7 @@ from module_utils.oneview import (OneViewModuleBase,
                                   transform_list_to_dict,
                                   compare,
                                   get_logger)
-from module_utils.icsp import ICspHelper
+from module_utils.icsp import ICspHelper, ICspSessionCache
 from image_streamer_artifact_bundle import ArtifactBundleModule
 from image_streamer_artifact_bundle_facts import ArtifactBundleFactsModule
 from image_streamer_build_plan import BuildPlanModule
@@ -68,6 +70,7 @@ from oneview_appliance_device_snmp_v3_users import ApplianceDeviceSnmpV3UsersMod
 from oneview_appliance_device_snmp_v3_users_facts import ApplianceDeviceSnmpV3UsersFactsModule
 from oneview_appliance_time_and_locale_configuration_facts import ApplianceTimeAndLocaleConfigurationFactsModule
 from oneview_appliance_time_and_locale_configuration import ApplianceTimeAndLocaleConfigurationModule
+from oneview_bulk_os_deployment import BulkOsDeploymentModule
 from oneview_certificates_server import CertificatesServerModule
 from oneview_certificates_server_facts import CertificatesServerFactsModule
 from oneview_connection_template import ConnectionTemplateModule
@@ -93,6 +96,7 @@ from oneview_fcoe_network_facts import FcoeNetworkFactsModule
 from oneview_firmware_bundle import FirmwareBundleModule
 from oneview_firmware_driver import FirmwareDriverModule
 from oneview_firmware_driver_facts import FirmwareDriverFactsModule
+from oneview_firmware_rollout import FirmwareRolloutModule
 from oneview_hypervisor_cluster_profile import HypervisorClusterProfileModule
 from oneview_hypervisor_cluster_profile_facts import HypervisorClusterProfileFactsModule
 from oneview_hypervisor_manager import HypervisorManagerModule
@@ -120,6 +124,7 @@ from oneview_logical_switch_group_facts import LogicalSwitchGroupFactsModule
 from oneview_login_detail_facts import LoginDetailFactsModule
 from oneview_managed_san import ManagedSanModule
 from oneview_managed_san_facts import ManagedSanFactsModule
+from oneview_multi_appliance_facts import MultiApplianceFactsModule
 from oneview_network_set import NetworkSetModule
 from oneview_network_set_facts import NetworkSetFactsModule
 from oneview_os_deployment_plan_facts import OsDeploymentPlanFactsModule
@@ -129,6 +134,8 @@ from oneview_power_device import PowerDeviceModule
 from oneview_power_device_facts import PowerDeviceFactsModule
 from oneview_rack import RackModule
 from oneview_rack_facts import RackFactsModule
+from oneview_resource_export import ResourceExportModule
+from oneview_resource_mirror import ResourceMirrorModule
 from oneview_san_manager import SanManagerModule
 from oneview_san_manager_facts import SanManagerFactsModule
 from oneview_sas_interconnect import SasInterconnectModule
@@ -144,9 +151,12 @@ from oneview_scope import ScopeModule
 from oneview_scope_facts import ScopeFactsModule
 from oneview_server_hardware import ServerHardwareModule
 from oneview_server_hardware_facts import ServerHardwareFactsModule
+from oneview_server_hardware_power import ServerHardwarePowerModule
 from oneview_server_hardware_type import ServerHardwareTypeModule
 from oneview_server_hardware_type_facts import ServerHardwareTypeFactsModule
 from oneview_server_profile import ServerProfileModule
+from oneview_server_profile_compliance import ServerProfileComplianceModule
+from oneview_server_profile_drift_facts import ServerProfileDriftFactsModule
 from oneview_server_profile_facts import ServerProfileFactsModule
 from oneview_server_profile_template import ServerProfileTemplateModule
 from oneview_server_profile_template_facts import ServerProfileTemplateFactsModule
@@ -162,6 +172,7 @@ from oneview_switch import SwitchModule
 from oneview_switch_facts import SwitchFactsModule
 from oneview_switch_type_facts import SwitchTypeFactsModule
 from oneview_task_facts import TaskFactsModule
+from oneview_task_wait import TaskWaitModule
 from oneview_unmanaged_device import UnmanagedDeviceModule
 from oneview_unmanaged_device_facts import UnmanagedDeviceFactsModule
 from oneview_uplink_set import UplinkSetModule
@@ -57,6 +57,20 @@ DEFAULT_SERVER_UPDATED = {"name": "SP-01",
 
 DEFAULT_BUILD_PLAN = {"name": "RHEL 7.2 x64", "uri": "/rest/os-deployment-build-plans/222"}
 
+RACK_SERVERS = [
+    {"name": "SP-10", "uri": "/rest/os-deployment-servers/10", "ilo": {"ipAddress": "172.16.100.10"},
+     "serialNumber": "VCGYZ33010", "state": "", "customAttributes": []},
+    {"name": "SP-11", "uri": "/rest/os-deployment-servers/11", "ilo": {"ipAddress": "172.16.100.11"},
+     "serialNumber": "VCGYZ33011", "state": "", "customAttributes": []}
+]
+
+TASK_MULTIPLE_OS_DEPLOYMENT = dict(TASK_OS_DEPLOYMENT,
+                                   server_id=None,
+                                   servers=[{"server_ipAddress": "172.16.100.10"}, {"server_id": "VCGYZ33011"}],
+                                   job_size=0)
+
+JOB_SUCCESS = {"name": "Deploy", "running": "false", "state": "STATUS_SUCCESS"}
+
 
 class TestIcspOsDeployment():
     @pytest.fixture(autouse=True)
@@ -173,7 +187,8 @@ class TestIcspOsDeployment():
         task_os_deployment = dict(TASK_OS_DEPLOYMENT, server_id=None, server_ipAddress="16.124.135.239")
 
         self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
-                                                self.get_as_rest_collection([DEFAULT_SERVER])]
+                                                self.get_as_rest_collection([DEFAULT_SERVER]),
+                                                DEFAULT_SERVER]
 
         self.mock_server_service.get_server.side_effect = [DEFAULT_SERVER, DEFAULT_SERVER_UPDATED]
 
@@ -289,6 +304,142 @@ class TestIcspOsDeployment():
         self.mock_ansible_instance.fail_json.assert_called_once_with(
             msg='No server information provided. Param \"server_id\" or \"server_ipAddress\" must be specified.')
 
+    def get_rack_server(self, uri):
+        return [server for server in RACK_SERVERS if server['uri'] == uri][0]
+
+    def test_should_deploy_multiple_servers_in_a_single_job(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
+                                                self.get_as_rest_collection(RACK_SERVERS)]
+        self.mock_server_service.get_server.side_effect = self.get_rack_server
+        self.mock_icsp_jobs.add_job.return_value = {"uri": "/rest/os-deployment-jobs/1"}
+        self.mock_icsp_jobs.get_job.return_value = JOB_SUCCESS
+
+        self.mock_ansible_instance.params = deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT)
+
+        hpe_icsp_os_deployment.main()
+
+        self.mock_icsp_jobs.add_job.assert_called_once_with({
+            "osbpUris": [DEFAULT_BUILD_PLAN['uri']],
+            "serverData": [{"serverUri": "/rest/os-deployment-servers/10", "personalityData": None},
+                           {"serverUri": "/rest/os-deployment-servers/11", "personalityData": None}],
+            "stepNo": 1})
+        self.mock_icsp.common.monitor_execution.assert_not_called()
+        self.mock_time_sleep.assert_not_called()
+
+        self.mock_ansible_instance.exit_json.assert_called_once_with(
+            changed=True, msg='OS Deployed Successfully.',
+            ansible_facts={'icsp_deployments': [
+                dict(server_id=None, server_ipAddress="172.16.100.10", uri="/rest/os-deployment-servers/10",
+                     status='deployed', msg=None, server=RACK_SERVERS[0]),
+                dict(server_id="VCGYZ33011", server_ipAddress=None, uri="/rest/os-deployment-servers/11",
+                     status='deployed', msg=None, server=RACK_SERVERS[1])]})
+
+    def test_should_monitor_the_jobs_of_multiple_servers_together(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
+                                                self.get_as_rest_collection(RACK_SERVERS)]
+        self.mock_server_service.get_server.side_effect = self.get_rack_server
+        self.mock_icsp_jobs.add_job.side_effect = [{"uri": "/rest/os-deployment-jobs/1"},
+                                                   {"uri": "/rest/os-deployment-jobs/2"}]
+        running = dict(JOB_SUCCESS, running="true")
+        self.mock_icsp_jobs.get_job.side_effect = [running, running, JOB_SUCCESS, JOB_SUCCESS]
+
+        self.mock_ansible_instance.params = dict(deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT), job_size=1)
+
+        hpe_icsp_os_deployment.main()
+
+        assert self.mock_icsp_jobs.add_job.call_count == 2
+        self.mock_time_sleep.assert_called_once_with(hpe_icsp_os_deployment.JOB_POLL_INTERVAL)
+        assert self.mock_ansible_instance.exit_json.call_args[1]['changed']
+
+    def test_should_personalize_the_network_of_multiple_servers_in_a_single_job(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
+                                                self.get_as_rest_collection(RACK_SERVERS)]
+        self.mock_server_service.get_server.side_effect = self.get_rack_server
+        self.mock_icsp_jobs.add_job.return_value = {"uri": "/rest/os-deployment-jobs/1"}
+        self.mock_icsp_jobs.get_job.return_value = JOB_SUCCESS
+
+        network_config = {"network_config": {"hostname": "test-web.io.fc.hpe.com", "domain": "demo.com"}}
+        task = deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT)
+        task['servers'][0]['personality_data'] = network_config
+        self.mock_ansible_instance.params = task
+
+        hpe_icsp_os_deployment.main()
+
+        self.mock_icsp_jobs.add_job.assert_called_with({
+            "serverData": [{"serverUri": "/rest/os-deployment-servers/10", "personalityData": network_config}]})
+        assert self.mock_icsp_jobs.add_job.call_count == 2
+
+    def test_should_not_deploy_multiple_servers_already_deployed(self):
+        deployed = [dict(server, state="OK") for server in RACK_SERVERS]
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
+                                                self.get_as_rest_collection(deployed)]
+        self.mock_server_service.get_server.side_effect = [deployed[0], deployed[1]]
+
+        self.mock_ansible_instance.params = deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT)
+
+        hpe_icsp_os_deployment.main()
+
+        self.mock_icsp_jobs.add_job.assert_not_called()
+        exit_args = self.mock_ansible_instance.exit_json.call_args[1]
+        assert not exit_args['changed']
+        assert [d['status'] for d in exit_args['ansible_facts']['icsp_deployments']] == ['already_deployed'] * 2
+
+    def test_should_report_the_outcome_of_each_server_when_multiple_deployment_fails(self):
+        def icsp_get(uri):
+            if 'osdbuildplan' in uri:
+                return self.get_as_rest_collection([DEFAULT_BUILD_PLAN])
+            if uri.startswith('/rest/os-deployment-servers/?'):
+                return self.get_as_rest_collection(RACK_SERVERS[:1])
+            return self.get_as_rest_collection([])
+
+        self.mock_connection.get.side_effect = icsp_get
+        self.mock_server_service.get_server.side_effect = self.get_rack_server
+        self.mock_icsp_jobs.add_job.return_value = {"uri": "/rest/os-deployment-jobs/1"}
+        self.mock_icsp_jobs.get_job.return_value = dict(
+            JOB_SUCCESS, state="STATUS_FAILURE", jobResult=[{"jobResultLogDetails": "Failed to boot"}])
+
+        self.mock_ansible_instance.params = deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT)
+
+        hpe_icsp_os_deployment.main()
+
+        fail_args = self.mock_ansible_instance.fail_json.call_args[1]
+        assert fail_args['msg'] == 'OS deployment failed on 2 of 2 servers.'
+        deployments = fail_args['icsp_deployments']
+        assert deployments[0]['status'] == 'failed'
+        assert deployments[0]['msg'] == 'Deploy failed to complete\nFailed to boot'
+        assert deployments[1]['status'] == 'not_found'
+
+    def test_should_mark_only_the_failed_servers_of_a_multiple_server_job(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_BUILD_PLAN]),
+                                                self.get_as_rest_collection(RACK_SERVERS)]
+        self.mock_server_service.get_server.side_effect = self.get_rack_server
+        self.mock_icsp_jobs.add_job.return_value = {"uri": "/rest/os-deployment-jobs/1"}
+        self.mock_icsp_jobs.get_job.return_value = dict(
+            JOB_SUCCESS, state="STATUS_FAILURE",
+            jobServerInfo=[{"jobServerUri": "/rest/os-deployment-servers/10", "jobStatus": "STATUS_SUCCESS"},
+                           {"jobServerUri": "/rest/os-deployment-servers/11", "jobStatus": "STATUS_FAILURE"}],
+            jobResult=[{"jobServerUri": "/rest/os-deployment-servers/10", "jobResultLogDetails": "Deployed"},
+                       {"jobServerUri": "/rest/os-deployment-servers/11", "jobResultLogDetails": "Failed to boot"}])
+
+        self.mock_ansible_instance.params = deepcopy(TASK_MULTIPLE_OS_DEPLOYMENT)
+
+        hpe_icsp_os_deployment.main()
+
+        fail_args = self.mock_ansible_instance.fail_json.call_args[1]
+        assert fail_args['msg'] == 'OS deployment failed on 1 of 2 servers.'
+        deployments = fail_args['icsp_deployments']
+        assert deployments[0]['status'] == 'deployed'
+        assert deployments[1]['status'] == 'failed'
+        assert deployments[1]['msg'] == 'Deploy failed to complete\nFailed to boot'
+
+    def test_should_fail_when_a_server_of_multiple_deployment_has_no_information(self):
+        self.mock_ansible_instance.params = dict(TASK_MULTIPLE_OS_DEPLOYMENT, servers=[{"server_id": None}])
+
+        hpe_icsp_os_deployment.main()
+
+        self.mock_icsp.connection.assert_not_called()
+        assert self.mock_ansible_instance.fail_json.called
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
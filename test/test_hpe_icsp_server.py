@@ -97,6 +97,23 @@ ICSP_JOBS = {}
 JOB_RESOURCE = {"uri": "/rest/os-deployment-jobs/123456"}
 
 
+def icsp_get(*searches):
+    """
+    Answers the ICsp searches with each collection of servers in turn and the servers by their URI.
+    """
+    results = iter(searches)
+    servers = dict(('/rest/os-deployment-servers/' + srv['uri'].split('/')[-1], srv)
+                   for search in searches for srv in search['members'])
+
+    def get(uri):
+        if uri.startswith('/rest/index/resources'):
+            members = next(results)['members']
+            return {'count': len(members),
+                    'members': [{'attributes': {'osdServerId': srv['uri'].split('/')[-1]}} for srv in members]}
+        return servers[uri]
+    return get
+
+
 class TestIcspServer():
     @pytest.fixture(autouse=True)
     def setUp(self):
@@ -121,7 +138,7 @@ class TestIcspServer():
         self.patcher_icsp_service.stop()
 
     def test_should_not_add_server_when_already_present(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         self.mock_ansible_instance.params = yaml.load(YAML_SERVER_PRESENT)
 
         ICspServerModule().run()
@@ -133,7 +150,7 @@ class TestIcspServer():
         )
 
     def test_should_add_server(self):
-        self.mock_connection.get.side_effect = [{'members': []}, SERVERS]
+        self.mock_connection.get.side_effect = icsp_get({'members': []}, SERVERS)
         self.mock_server_service.add_server.return_value = JOB_RESOURCE
         self.mock_icsp.jobs.return_value = ICSP_JOBS
 
@@ -158,7 +175,7 @@ class TestIcspServer():
         )
 
     def test_expect_exception_not_caught_when_create_server_raise_exception(self):
-        self.mock_connection.get.side_effect = [{'members': []}, SERVERS]
+        self.mock_connection.get.side_effect = icsp_get({'members': []}, SERVERS)
         self.mock_server_service.add_server.side_effect = Exception("message")
 
         self.mock_ansible_instance.params = yaml.load(YAML_SERVER_PRESENT)
@@ -171,7 +188,7 @@ class TestIcspServer():
             pytest.fail("Expected Exception was not raised")
 
     def test_should_not_try_delete_server_when_it_is_already_absent(self):
-        self.mock_connection.get.return_value = {'members': []}
+        self.mock_connection.get.side_effect = icsp_get({'members': []})
         self.mock_server_service.delete_server.return_value = {}
         self.mock_ansible_instance.params = yaml.load(YAML_SERVER_ABSENT)
 
@@ -185,7 +202,7 @@ class TestIcspServer():
         )
 
     def test_should_delete_server(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
 
         self.mock_server_service.delete_server.return_value = {}
 
@@ -201,7 +218,7 @@ class TestIcspServer():
         )
 
     def test_should_fail_with_all_exe_attr_when_HPICspException_raised_on_delete(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         exeption_value = {"message": "Fake Message", "details": "Details", "errorCode": "INVALID_RESOURCE"}
         self.mock_server_service.delete_server.side_effect = HPICspInvalidResource(exeption_value)
 
@@ -215,7 +232,7 @@ class TestIcspServer():
         assert error_raised == exeption_value
 
     def test_should_fail_with_args_joined_when_common_exception_raised_on_delete(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         self.mock_server_service.delete_server.side_effect = Exception("Fake Message", "INVALID_RESOURCE")
 
         self.mock_ansible_instance.params = yaml.load(YAML_SERVER_ABSENT)
@@ -225,7 +242,7 @@ class TestIcspServer():
         self.mock_ansible_instance.fail_json.assert_called_once_with(msg='Fake Message; INVALID_RESOURCE')
 
     def test_should_configure_network(self):
-        self.mock_connection.get.side_effect = [SERVERS, SERVERS]
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         self.mock_connection.post.return_value = JOB_RESOURCE
         self.mock_server_service.get_server.return_value = DEFAULT_SERVER
 
@@ -254,7 +271,7 @@ class TestIcspServer():
         )
 
     def test_should_fail_when_try_configure_network_without_inform_personality_data(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         self.mock_server_service.get_server.return_value = DEFAULT_SERVER
 
         params_config_network = yaml.load(YAML_NETWORK_CONFIGURED)
@@ -267,7 +284,7 @@ class TestIcspServer():
         self.mock_ansible_instance.fail_json.assert_called_once_with(msg=ICspServerModule.SERVER_PERSONALITY_DATA_REQUIRED)
 
     def test_should_fail_when_try_configure_network_for_not_found_server(self):
-        self.mock_connection.get.return_value = {'members': []}
+        self.mock_connection.get.side_effect = icsp_get({'members': []})
 
         self.mock_ansible_instance.params = yaml.load(YAML_NETWORK_CONFIGURED)
 
@@ -277,7 +294,7 @@ class TestIcspServer():
                                                                      msg=ICspServerModule.SERVER_NOT_FOUND)
 
     def test_expect_exception_not_caught_when_configure_network_raise_exception(self):
-        self.mock_connection.get.return_value = SERVERS
+        self.mock_connection.get.side_effect = icsp_get(SERVERS)
         self.mock_connection.post.side_effect = Exception("message")
 
         self.mock_ansible_instance.params = yaml.load(YAML_NETWORK_CONFIGURED)
@@ -16,10 +16,12 @@
 # limitations under the License.
 ###
 
+import itertools
+import json
 import mock
 import pytest
 
-from oneview_module_loader import ICspHelper
+from oneview_module_loader import ICspHelper, ICspSessionCache
 
 DEFAULT_SERVER = {
     "name": "SP-01",
@@ -39,8 +41,53 @@ DEFAULT_SERVER_NO_ILO = {
     "customAttributes": []
 }
 
+INDEXED_SERVER = {
+    "name": "SP-02",
+    "uri": "/rest/os-deployment-servers/654321",
+    "ilo": {"ipAddress": "16.124.135.240"},
+    "serialNumber": "VCGYZ33008",
+    "state": "",
+    "customAttributes": []
+}
+
 DEFAULT_BUILD_PLAN = {"name": "RHEL 7.2 x64", "uri": "/rest/os-deployment-build-plans/222"}
 
+CREDENTIAL = {'userName': 'Administrator', 'password': 'admin'}
+
+
+class StandInICspConnection(object):
+    """
+    Stands in for the hpICsp connection, answering 401 to the sessions it does not know.
+    """
+    session_ids = itertools.count(1)
+
+    def __init__(self, host='16.124.133.251'):
+        self.host = host
+        self._headers = {}
+        self.valid_sessions = set()
+        self.logins = 0
+        self.requests = []
+
+    def get_host(self):
+        return self.host
+
+    def get_session_id(self):
+        return self._headers['auth']
+
+    def login(self, credential):
+        self.logins += 1
+        session_id = 'session-{0}'.format(next(self.session_ids))
+        self.valid_sessions.add(session_id)
+        self._headers['auth'] = session_id
+
+    def do_http(self, method, path, body):
+        self.requests.append((path, self._headers.get('auth')))
+        status = 200 if self._headers.get('auth') in self.valid_sessions else 401
+        return mock.Mock(status=status), {}
+
+    def get(self, uri):
+        return self.do_http('GET', uri, '')
+
 
 class TestICspHelper():
     """
@@ -93,36 +140,33 @@ class TestICspHelper():
         assert plan is None
 
     def test_get_server_by_ilo_address_with_matching_result(self):
-        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER])]
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER]), DEFAULT_SERVER]
 
         icsphelper = ICspHelper(self.mock_connection)
         server = icsphelper.get_server_by_ilo_address('16.124.135.239')
 
-        self.mock_connection.get.assert_called_once_with(
-            '/rest/os-deployment-servers/?count=-1')
+        assert self.mock_connection.get.call_args_list == [
+            mock.call('/rest/index/resources?category=osdserver&userQuery=%2216.124.135.239%22'),
+            mock.call('/rest/os-deployment-servers/123456')]
 
         assert server == DEFAULT_SERVER
 
     def test_get_server_by_ilo_address_with_non_matching_result(self):
-        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER])]
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER]), DEFAULT_SERVER]
 
         icsphelper = ICspHelper(self.mock_connection)
         server = icsphelper.get_server_by_ilo_address('16.124.135.255')
 
-        self.mock_connection.get.assert_called_once_with(
-            '/rest/os-deployment-servers/?count=-1')
-
+        assert self.mock_connection.get.call_count == 2
         assert server is None
 
     def test_get_server_by_ilo_address_with_servers_with_no_ilo(self):
-        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER_NO_ILO])]
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER_NO_ILO]),
+                                                DEFAULT_SERVER_NO_ILO]
 
         icsphelper = ICspHelper(self.mock_connection)
         server = icsphelper.get_server_by_ilo_address('16.124.135.239')
 
-        self.mock_connection.get.assert_called_once_with(
-            '/rest/os-deployment-servers/?count=-1')
-
         assert server is None
 
     def test_get_server_by_ilo_address_with_no_registered_servers(self):
@@ -132,10 +176,53 @@ class TestICspHelper():
         server = icsphelper.get_server_by_ilo_address('16.124.135.239')
 
         self.mock_connection.get.assert_called_once_with(
-            '/rest/os-deployment-servers/?count=-1')
+            '/rest/index/resources?category=osdserver&userQuery=%2216.124.135.239%22')
 
         assert server is None
 
+    def test_index_servers_should_read_the_servers_page_by_page(self):
+        self.mock_connection.get.side_effect = [
+            dict(self.get_as_rest_collection([INDEXED_SERVER, DEFAULT_SERVER_NO_ILO]), total=3),
+            dict(self.get_as_rest_collection([DEFAULT_SERVER]), total=3)]
+
+        icsphelper = ICspHelper(self.mock_connection)
+        icsphelper.index_servers(page_size=2)
+
+        assert self.mock_connection.get.call_args_list == [
+            mock.call('/rest/os-deployment-servers/?start=0&count=2'),
+            mock.call('/rest/os-deployment-servers/?start=2&count=2')]
+
+    def test_get_server_by_ilo_address_should_use_the_index(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([INDEXED_SERVER])]
+
+        icsphelper = ICspHelper(self.mock_connection)
+        icsphelper.index_servers()
+
+        assert icsphelper.get_server_by_ilo_address('16.124.135.240') == INDEXED_SERVER
+        assert icsphelper.get_server_by_ilo_address('16.124.135.240') == INDEXED_SERVER
+        self.mock_connection.get.assert_called_once_with('/rest/os-deployment-servers/?start=0&count=500')
+
+    def test_get_server_by_ilo_address_should_search_and_index_the_servers_missing_from_the_index(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([INDEXED_SERVER]),
+                                                self.get_as_rest_collection([DEFAULT_SERVER]), DEFAULT_SERVER]
+
+        icsphelper = ICspHelper(self.mock_connection)
+        icsphelper.index_servers()
+
+        assert icsphelper.get_server_by_ilo_address('16.124.135.239') == DEFAULT_SERVER
+        assert icsphelper.get_server_by_ilo_address('16.124.135.239') == DEFAULT_SERVER
+        assert self.mock_connection.get.call_count == 3
+
+    def test_get_server_by_serial_should_use_the_index(self):
+        self.mock_connection.get.side_effect = [self.get_as_rest_collection([INDEXED_SERVER])]
+
+        icsphelper = ICspHelper(self.mock_connection)
+        icsphelper.index_servers()
+        server = icsphelper.get_server_by_serial('VCGYZ33008')
+
+        assert server == {'uri': '/rest/os-deployment-servers/654321'}
+        self.mock_connection.get.assert_called_once_with('/rest/os-deployment-servers/?start=0&count=500')
+
     def test_get_server_by_serial_with_matching_result(self):
         self.mock_connection.get.side_effect = [self.get_as_rest_collection([DEFAULT_SERVER])]
 
@@ -171,5 +258,88 @@ class TestICspHelper():
         assert server is None
 
 
+class TestICspSessionCache():
+
+    @pytest.fixture
+    def cache_path(self, tmpdir):
+        return str(tmpdir.join('icsp-sessions.json'))
+
+    def test_should_login_and_save_the_session(self, cache_path):
+        connection = StandInICspConnection()
+
+        ICspSessionCache(cache_path).login(connection, CREDENTIAL)
+
+        assert connection.logins == 1
+        with open(cache_path) as cache_file:
+            sessions = json.load(cache_file)['sessions']
+        assert sessions['16.124.133.251|Administrator']['id'] == connection.get_session_id()
+
+    def test_should_reuse_the_cached_session(self, cache_path):
+        first = StandInICspConnection()
+        ICspSessionCache(cache_path).login(first, CREDENTIAL)
+
+        second = StandInICspConnection()
+        second.valid_sessions = first.valid_sessions
+        ICspSessionCache(cache_path).login(second, CREDENTIAL)
+
+        assert second.logins == 0
+        assert second.get_session_id() == first.get_session_id()
+
+    def test_should_not_reuse_the_session_of_another_user_or_host(self, cache_path):
+        ICspSessionCache(cache_path).login(StandInICspConnection(), CREDENTIAL)
+
+        other_host = StandInICspConnection(host='16.124.133.252')
+        ICspSessionCache(cache_path).login(other_host, CREDENTIAL)
+        other_user = StandInICspConnection()
+        ICspSessionCache(cache_path).login(other_user, dict(CREDENTIAL, userName='operator'))
+
+        assert other_host.logins == 1
+        assert other_user.logins == 1
+
+    def test_should_login_again_when_the_session_expired(self, cache_path):
+        ICspSessionCache(cache_path).login(StandInICspConnection(), CREDENTIAL)
+
+        connection = StandInICspConnection()
+        ICspSessionCache(cache_path, ttl=0).login(connection, CREDENTIAL)
+
+        assert connection.logins == 1
+
+    def test_should_login_again_and_retry_when_the_request_is_unauthorized(self, cache_path):
+        closed = StandInICspConnection()
+        ICspSessionCache(cache_path).login(closed, CREDENTIAL)
+
+        connection = StandInICspConnection()
+        ICspSessionCache(cache_path).login(connection, CREDENTIAL)
+        response, body = connection.get('/rest/os-deployment-servers/123456')
+
+        assert response.status == 200
+        assert connection.logins == 1
+        assert connection.requests == [('/rest/os-deployment-servers/123456', closed.get_session_id()),
+                                       ('/rest/os-deployment-servers/123456', connection.get_session_id())]
+        with open(cache_path) as cache_file:
+            sessions = json.load(cache_file)['sessions']
+        assert sessions['16.124.133.251|Administrator']['id'] == connection.get_session_id()
+
+    def test_should_keep_the_cache_in_memory_without_path(self, monkeypatch):
+        monkeypatch.delenv('ICSP_SESSION_CACHE', raising=False)
+        session_cache = ICspSessionCache()
+
+        session_cache.login(StandInICspConnection(), CREDENTIAL)
+
+        assert session_cache.path is None
+        assert '16.124.133.251|Administrator' in session_cache.data['sessions']
+
+    def test_get_build_plan_should_use_the_cached_uri(self, cache_path):
+        connection = mock.Mock()
+        connection.get_host.return_value = '16.124.133.251'
+        connection.get.side_effect = [{'members': [DEFAULT_BUILD_PLAN], 'count': 1}]
+
+        ICspHelper(connection, ICspSessionCache(cache_path)).get_build_plan('RHEL 7.2 x64')
+        plan = ICspHelper(connection, ICspSessionCache(cache_path)).get_build_plan('RHEL 7.2 x64')
+
+        assert plan == DEFAULT_BUILD_PLAN
+        assert connection.get.call_count == 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
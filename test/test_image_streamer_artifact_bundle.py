@@ -107,8 +107,24 @@ YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD = """
             destinationFilePath: "ab_backup"
         """
 
+YAML_ARTIFACT_BUNDLE_MULTIPLE_BACKUPS_DOWNLOAD = """
+        config: "{{ config }}"
+        state: multiple_backups_downloaded
+        data:
+            deploymentGroups:
+                - "DG1"
+                - "/rest/deployment-groups/2"
+            destinationDirectory: "/backups"
+        """
+
 DICT_DEFAULT_ARTIFACT_BUNDLE = yaml.load(YAML_ARTIFACT_BUNDLE)["data"]
 
+DEPLOYMENT_GROUPS = [dict(name='DG1', uri='/rest/deployment-groups/1'),
+                     dict(name='DG2', uri='/rest/deployment-groups/2')]
+
+BACKUPS = [dict(uri='/rest/artifact-bundles/backups/b2', deploymentGroupURI='/rest/deployment-groups/2'),
+           dict(uri='/rest/artifact-bundles/backups/b1', deploymentGroupURI='/rest/deployment-groups/1')]
+
 
 @pytest.mark.resource(TestArtifactBundleModule='artifact_bundles')
 class TestArtifactBundleModule(ImageStreamerBaseTest):
@@ -194,9 +210,29 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
             msg=ArtifactBundleModule.MSG_ALREADY_ABSENT,
         )
 
-    def test_should_download(self):
+    @mock.patch('image_streamer_artifact_bundle.download_file')
+    def test_should_download(self, mock_download_file):
+        self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.resource.DOWNLOAD_PATH = '/rest/artifact-bundles/download'
+        mock_download_file.return_value = (True, dict(path='ab_path'))
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
+
+        ArtifactBundleModule().run()
+
+        mock_download_file.assert_called_once_with(
+            self.mock_ov_client.connection,
+            '/rest/artifact-bundles/download/4671582d-1746-4122-9cf0-642a59543509',
+            'ab_path')
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ArtifactBundleModule.MSG_DOWNLOADED,
+            ansible_facts=dict()
+        )
+
+    @mock.patch('image_streamer_artifact_bundle.download_file')
+    def test_should_not_change_when_the_downloaded_file_is_up_to_date(self, mock_download_file):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
-        self.resource.download.return_value = True
+        mock_download_file.return_value = (False, dict(path='ab_path'))
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_DOWNLOAD)
 
         ArtifactBundleModule().run()
@@ -249,17 +285,23 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
             ansible_facts=dict(artifact_bundle_deployment_group=DICT_DEFAULT_ARTIFACT_BUNDLE)
         )
 
-    def test_should_download_backup(self):
+    @mock.patch('image_streamer_artifact_bundle.download_file')
+    def test_should_download_backup(self, mock_download_file):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.resource.BACKUP_ARCHIVE_PATH = '/rest/artifact-bundles/backups/archive'
         self.resource.get_all_backups.return_value = [DICT_DEFAULT_ARTIFACT_BUNDLE]
         self.resource.get_backup.return_value = self.resource
-        self.resource.download_archive.return_value = True
+        mock_download_file.return_value = (True, dict(path='ab_backup'))
         self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD)
 
         ArtifactBundleModule().run()
 
+        mock_download_file.assert_called_once_with(
+            self.mock_ov_client.connection,
+            '/rest/artifact-bundles/backups/archive/4671582d-1746-4122-9cf0-642a59543509',
+            'ab_backup')
         self.mock_ansible_module.exit_json.assert_called_once_with(
-            changed=False,
+            changed=True,
             msg=ArtifactBundleModule.MSG_ARCHIVE_DOWNLOADED,
             ansible_facts=dict()
         )
@@ -272,6 +314,79 @@ class TestArtifactBundleModule(ImageStreamerBaseTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=ArtifactBundleModule.MSG_BACKUP_REQUIRED)
 
+    def test_should_download_the_backup_of_the_deployment_group(self):
+        self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
+        self.resource.get_all_backups.return_value = BACKUPS
+        self.resource.get_backup.return_value = self.resource
+        params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD)
+        params['data']['deploymentGroupURI'] = '/rest/deployment-groups/1'
+        self.mock_ansible_module.params = params
+
+        with mock.patch('image_streamer_artifact_bundle.download_file') as mock_download_file:
+            mock_download_file.return_value = (True, dict(path='ab_backup'))
+            ArtifactBundleModule().run()
+
+        self.resource.get_backup.assert_called_once_with('/rest/artifact-bundles/backups/b1')
+
+    def test_should_fail_when_the_deployment_group_has_no_backup(self):
+        self.resource.get_all_backups.return_value = BACKUPS
+        params = yaml.load(YAML_ARTIFACT_BUNDLE_BACKUP_DOWNLOAD)
+        params['data']['deploymentGroupURI'] = '/rest/deployment-groups/3'
+        self.mock_ansible_module.params = params
+
+        ArtifactBundleModule().run()
+
+        self.resource.get_backup.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=ArtifactBundleModule.MSG_BACKUP_REQUIRED)
+
+    @mock.patch('image_streamer_artifact_bundle.FileChecksumCache')
+    @mock.patch('image_streamer_artifact_bundle.download_file')
+    def test_should_create_and_download_multiple_backups(self, mock_download_file, mock_checksum_cache):
+        self.mock_ov_client.deployment_groups.get_by_name.return_value = DEPLOYMENT_GROUPS[0]
+        self.mock_ov_client.deployment_groups.get.return_value = DEPLOYMENT_GROUPS[1]
+        self.resource.BACKUP_ARCHIVE_PATH = '/rest/artifact-bundles/backups/archive'
+        self.resource.get_all_backups.return_value = BACKUPS
+        mock_download_file.side_effect = lambda connection, uri, path, cache: (True, dict(path=path, size=1000))
+        calls = mock.Mock()
+        calls.attach_mock(self.resource.create_backup, 'create_backup')
+        calls.attach_mock(mock_download_file, 'download_file')
+        checksum_cache = mock_checksum_cache.return_value
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_MULTIPLE_BACKUPS_DOWNLOAD)
+
+        ArtifactBundleModule().run()
+
+        self.mock_ov_client.deployment_groups.get_by_name.assert_called_once_with('DG1')
+        self.mock_ov_client.deployment_groups.get.assert_called_once_with('/rest/deployment-groups/2')
+        assert calls.mock_calls == [
+            mock.call.create_backup(dict(deploymentGroupURI='/rest/deployment-groups/1')),
+            mock.call.download_file(self.mock_ov_client.connection, '/rest/artifact-bundles/backups/archive/b1',
+                                    '/backups/DG1-backup.zip', checksum_cache),
+            mock.call.create_backup(dict(deploymentGroupURI='/rest/deployment-groups/2')),
+            mock.call.download_file(self.mock_ov_client.connection, '/rest/artifact-bundles/backups/archive/b2',
+                                    '/backups/DG2-backup.zip', checksum_cache)]
+        checksum_cache.save.assert_called_once_with()
+
+        results = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['artifact_bundle_backups']
+        assert [result['backupURI'] for result in results] == ['/rest/artifact-bundles/backups/b1',
+                                                               '/rest/artifact-bundles/backups/b2']
+        assert [result['path'] for result in results] == ['/backups/DG1-backup.zip', '/backups/DG2-backup.zip']
+        assert all(result['bytesPerSecond'] > 0 for result in results)
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ArtifactBundleModule.MSG_MULTIPLE_BACKUPS_DOWNLOADED,
+            ansible_facts=mock.ANY
+        )
+
+    def test_should_fail_when_a_deployment_group_is_not_found(self):
+        self.mock_ov_client.deployment_groups.get_by_name.return_value = None
+        self.mock_ansible_module.params = yaml.load(YAML_ARTIFACT_BUNDLE_MULTIPLE_BACKUPS_DOWNLOAD)
+
+        ArtifactBundleModule().run()
+
+        self.resource.create_backup.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ArtifactBundleModule.MSG_DEPLOYMENT_GROUP_NOT_FOUND + 'DG1')
+
     def test_should_extract_backup(self):
         self.resource.data = DICT_DEFAULT_ARTIFACT_BUNDLE
         self.resource.get_all_backups.return_value = [DICT_DEFAULT_ARTIFACT_BUNDLE]
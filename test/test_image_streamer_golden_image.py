@@ -115,9 +115,11 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
             ansible_facts=dict(golden_image={"name": "name"})
         )
 
-    def test_upload_a_golden_image(self):
+    @mock.patch('image_streamer_golden_image.upload_file')
+    def test_upload_a_golden_image(self, mock_upload_file):
         self.resource.get_by.return_value = []
-        self.resource.upload.return_value = {"name": "name"}
+        self.resource.URI = '/rest/golden-images'
+        mock_upload_file.return_value = ({"name": "name"}, 'checksum')
 
         self.mock_ansible_module.params = self.GOLDEN_IMAGE_UPLOAD
 
@@ -125,9 +127,10 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
 
         GoldenImageModule().run()
 
-        self.resource.upload.assert_called_once_with(
-            file_path,
-            self.GOLDEN_IMAGE_UPLOAD['data'])
+        mock_upload_file.assert_called_once_with(
+            self.mock_ov_client.connection,
+            '/rest/golden-images?name=Demo%20Golden%20Image%20upload&description=Test',
+            file_path)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
@@ -149,7 +152,10 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
             ansible_facts=dict(golden_image={"name": "name"})
         )
 
-    def test_golden_image_download(self):
+    @mock.patch('image_streamer_golden_image.download_file')
+    def test_golden_image_download(self, mock_download_file):
+        mock_download_file.return_value = (True, dict(path='~/downloaded_image.zip'))
+        self.resource.URI = '/rest/golden-images'
         golden_image = self.GOLDEN_IMAGE_CREATE['data']
         golden_image['uri'] = '/rest/golden-images/1'
 
@@ -159,7 +165,9 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download.assert_called_once_with('/rest/golden-images/1', download_file)
+        mock_download_file.assert_called_once_with(self.mock_ov_client.connection,
+                                                   '/rest/golden-images/download/1',
+                                                   download_file)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
@@ -174,7 +182,10 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
 
         self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg=GoldenImageModule.MSG_WAS_NOT_FOUND,)
 
-    def test_golden_image_archive_download(self):
+    @mock.patch('image_streamer_golden_image.download_file')
+    def test_golden_image_archive_download(self, mock_download_file):
+        mock_download_file.return_value = (True, dict(path='~/archive.log'))
+        self.resource.URI = '/rest/golden-images'
         golden_image = self.GOLDEN_IMAGE_CREATE['data']
         golden_image['uri'] = '/rest/golden-images/1'
 
@@ -184,7 +195,9 @@ class TestGoldenImageModule(ImageStreamerBaseTest):
         GoldenImageModule().run()
 
         download_file = self.GOLDEN_IMAGE_ARCHIVE_DOWNLOAD['data']['destination_file_path']
-        self.resource.download_archive.assert_called_once_with('/rest/golden-images/1', download_file)
+        mock_download_file.assert_called_once_with(self.mock_ov_client.connection,
+                                                   '/rest/golden-images/archive/1',
+                                                   download_file)
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
@@ -16,10 +16,16 @@
 # limitations under the License.
 ###
 
+import hashlib
+import json
 import mock
 import logging
+import os
 import pytest
+import socket
 import sys
+import threading
+import time
 
 from module_utils import oneview
 
@@ -28,20 +34,36 @@ ONEVIEW_MODULE_UTILS_PATH = 'module_utils.oneview'
 sys.modules['ansible.module_utils.oneview'] = oneview
 
 from copy import deepcopy
+from six.moves import BaseHTTPServer, http_client
 from module_utils.oneview import (OneViewModuleBase,
                                   OneViewModule,
                                   OneViewClient,
+                                  compact_resource,
+                                  download_file,
+                                  FileChecksumCache,
+                                  OneViewMirror,
                                   OneViewModuleException,
+                                  OneViewSpan,
+                                  OneViewTracer,
                                   OneViewModuleValueError,
                                   OneViewModuleResourceNotFound,
                                   SPKeys,
+                                  ServerProfileDrift,
                                   ServerProfileMerger,
                                   ServerProfileReplaceNamesByUris,
                                   _str_sorted,
                                   merge_list_by_key,
                                   transform_list_to_dict,
                                   compare,
-                                  get_logger)
+                                  get_all_resources,
+                                  get_resources_by,
+                                  get_logger,
+                                  project_fields,
+                                  run_concurrently,
+                                  ScmbListener,
+                                  ScmbTaskListener,
+                                  upload_file,
+                                  write_json_lines)
 
 MSG_GENERIC_ERROR = 'Generic error message'
 MSG_GENERIC = "Generic message"
@@ -661,6 +683,33 @@ class TestOneViewModule():
                              msg=OneViewModule.MSG_ALREADY_PRESENT,
                              ansible_facts=dict(resource=ov_base.data))
 
+    def test_should_write_module_and_request_spans_when_tracing_enabled(self, tmpdir):
+        trace_file = str(tmpdir.join('trace.json'))
+        self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
+        response = mock.Mock(status=200)
+        self.mock_ov_client.connection.do_http.return_value = (response, self.RESOURCE_COMMON)
+
+        with mock.patch.dict('os.environ', {'ONEVIEW_TRACE_FILE': trace_file, 'ONEVIEW_TRACE_ID': 'play-1'}):
+            with mock.patch.object(oneview, 'TaskMonitor'):
+                base_mod = OneViewModule()
+
+        def execute_module():
+            base_mod.oneview_client.connection.do_http('GET', '/rest/resource/id?view=full', '')
+            return dict(changed=True)
+
+        base_mod.execute_module = execute_module
+        base_mod.run()
+
+        with open(trace_file) as f:
+            spans = json.loads(f.readline())['resourceSpans'][0]['scopeSpans'][0]['spans']
+
+        request_span, module_span = spans
+        assert module_span['name'] == 'OneViewModule'
+        assert module_span['traceId'] == OneViewTracer(trace_id='play-1').trace_id
+        assert request_span['parentSpanId'] == module_span['spanId']
+        assert {'key': 'oneview.resource_uri', 'value': {'stringValue': '/rest/resource/id'}} in request_span['attributes']
+        assert {'key': 'ansible.module.changed', 'value': {'boolValue': True}} in module_span['attributes']
+
     def test_get_by_name_when_resource_exists(self):
         self.mock_ansible_module.params = self.PARAMS_FOR_PRESENT
 
@@ -3403,5 +3452,1016 @@ class TestServerProfileMerger():
         mock_logging_config.not_been_called()
 
 
+class TestServerProfileDrift():
+    TEMPLATE = dict(
+        name='ProfileTemplate101',
+        uri='/rest/server-profile-templates/1',
+        serverHardwareTypeUri='/rest/server-hardware-types/1',
+        enclosureGroupUri='/rest/enclosure-groups/1',
+        macType='Virtual',
+        bios=dict(manageBios=True, complianceControl='Checked',
+                  overriddenSettings=[dict(id='WorkloadProfile', value='Virtualization-MaxPerformance')]),
+        boot=dict(manageBoot=False, order=[]),
+        firmware=dict(manageFirmware=True, complianceControl='Unchecked', firmwareBaselineUri='/rest/firmware-drivers/1'),
+        connectionSettings=dict(manageConnections=True, complianceControl='CheckedMinimum', connections=[
+            dict(id=1, name='mgmt', networkUri='/rest/ethernet-networks/1', requestedMbps='2500'),
+            dict(id=2, name='data', networkUri='/rest/ethernet-networks/2', requestedMbps='2500')])
+    )
+
+    PROFILE = dict(
+        name='profile-1',
+        uri='/rest/server-profiles/1',
+        serverHardwareTypeUri='/rest/server-hardware-types/1',
+        enclosureGroupUri='/rest/enclosure-groups/1',
+        macType='Virtual',
+        serialNumber='VCGGU8800W',
+        bios=dict(manageBios=True, overriddenSettings=[dict(id='WorkloadProfile', value='Virtualization-MaxPerformance')]),
+        boot=dict(manageBoot=True, order=['HardDisk']),
+        firmware=dict(manageFirmware=True, firmwareBaselineUri='/rest/firmware-drivers/2'),
+        connectionSettings=dict(manageConnections=True, connections=[
+            dict(id=1, name='mgmt', networkUri='/rest/ethernet-networks/1', requestedMbps=2500.0, mac='AA:BB'),
+            dict(id=2, name='data', networkUri='/rest/ethernet-networks/2', requestedMbps='2500', mac='CC:DD')])
+    )
+
+    def test_should_not_report_drift_when_the_profile_matches_the_template(self):
+        drift = ServerProfileDrift(self.TEMPLATE)
+
+        assert drift.drift(self.PROFILE) == []
+
+    def test_should_compare_only_the_managed_and_checked_sections(self):
+        drift = ServerProfileDrift(self.TEMPLATE)
+
+        assert drift.fields == ['serverHardwareTypeUri', 'enclosureGroupUri', 'macType', 'bios', 'connectionSettings']
+
+    def test_should_report_the_changed_fields_by_path(self):
+        profile = deepcopy(self.PROFILE)
+        profile['enclosureGroupUri'] = '/rest/enclosure-groups/2'
+        profile['bios']['overriddenSettings'][0]['value'] = 'GeneralPowerEfficientCompute'
+        profile['connectionSettings']['connections'][1]['networkUri'] = '/rest/ethernet-networks/3'
+
+        changes = ServerProfileDrift(self.TEMPLATE).drift(profile)
+
+        assert changes == [
+            dict(path='enclosureGroupUri', template='/rest/enclosure-groups/1', profile='/rest/enclosure-groups/2'),
+            dict(path='bios.overriddenSettings[id=WorkloadProfile].value', template='Virtualization-MaxPerformance',
+                 profile='GeneralPowerEfficientCompute'),
+            dict(path='connectionSettings.connections[id=2].networkUri', template='/rest/ethernet-networks/2',
+                 profile='/rest/ethernet-networks/3')]
+
+    def test_should_report_only_the_missing_connections_when_checked_minimum(self):
+        profile = deepcopy(self.PROFILE)
+        extra_connection = dict(id=3, name='backup', networkUri='/rest/ethernet-networks/4')
+        profile['connectionSettings']['connections'] = [profile['connectionSettings']['connections'][0], extra_connection]
+
+        changes = ServerProfileDrift(self.TEMPLATE).drift(profile)
+
+        assert changes == [
+            dict(path='connectionSettings.connections[id=2]', template=self.TEMPLATE['connectionSettings']['connections'][1],
+                 profile=None)]
+
+    def test_should_report_the_missing_and_extra_connections_when_checked(self):
+        template = deepcopy(self.TEMPLATE)
+        template['connectionSettings']['complianceControl'] = 'Checked'
+        profile = deepcopy(self.PROFILE)
+        extra_connection = dict(id=3, name='backup', networkUri='/rest/ethernet-networks/4')
+        profile['connectionSettings']['connections'] = [profile['connectionSettings']['connections'][0], extra_connection]
+
+        changes = ServerProfileDrift(template).drift(profile)
+
+        assert changes == [
+            dict(path='connectionSettings.connections[id=2]', template=template['connectionSettings']['connections'][1],
+                 profile=None),
+            dict(path='connectionSettings.connections[id=3]', template=None, profile=extra_connection)]
+
+    def test_should_not_report_the_values_resolved_by_each_profile(self):
+        template = deepcopy(self.TEMPLATE)
+        template['connectionSettings']['connections'][0]['portId'] = 'Auto'
+        template['localStorage'] = dict(complianceControl='Checked', controllers=[
+            dict(deviceSlot='Embedded', mode='RAID', initialize=True, logicalDrives=[dict(name='boot', raidLevel='RAID1')])])
+        profile = deepcopy(self.PROFILE)
+        profile['connectionSettings']['connections'][0]['portId'] = 'Mezz 3:1-a'
+        profile['localStorage'] = dict(controllers=[dict(deviceSlot='Embedded', mode='RAID', initialize=False,
+                                                         logicalDrives=[dict(name='boot', raidLevel='RAID1')])])
+
+        assert ServerProfileDrift(template).drift(profile) == []
+
+    def test_should_report_the_managed_section_missing_from_the_profile(self):
+        profile = deepcopy(self.PROFILE)
+        profile.pop('connectionSettings')
+
+        changes = ServerProfileDrift(self.TEMPLATE).drift(profile)
+
+        assert [change['path'] for change in changes] == ['connectionSettings']
+
+
+class TestOneViewTracer():
+    def test_should_be_disabled_when_trace_file_undefined(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            tracer = OneViewTracer()
+
+        with tracer.span('module') as span:
+            span.set_attribute('key', 'value')
+
+        assert not tracer.enabled
+        assert tracer.spans == []
+
+    def test_should_not_instrument_when_disabled(self):
+        oneview_client = mock.Mock()
+        do_http = oneview_client.connection.do_http
+
+        OneViewTracer(trace_file=None).instrument(oneview_client)
+
+        assert oneview_client.connection.do_http is do_http
+
+    def test_should_use_hex_trace_id_as_is(self):
+        trace_id = '0123456789abcdef0123456789abcdef'
+
+        assert OneViewTracer(trace_file='stderr', trace_id=trace_id).trace_id == trace_id
+
+    def test_should_derive_same_trace_id_from_play_id(self):
+        first = OneViewTracer(trace_file='stderr', trace_id='play-id')
+        second = OneViewTracer(trace_file='stderr', trace_id='play-id')
+
+        assert first.trace_id == second.trace_id
+        assert len(first.trace_id) == 32
+
+    def test_should_nest_spans(self):
+        tracer = OneViewTracer(trace_file='stderr')
+
+        with tracer.span('module') as module_span:
+            with tracer.span('request') as request_span:
+                pass
+
+        assert module_span.parent_span_id == ''
+        assert request_span.parent_span_id == module_span.span_id
+        assert tracer.spans == [request_span, module_span]
+
+    def test_should_set_error_status_when_exception_raised(self):
+        tracer = OneViewTracer(trace_file='stderr')
+
+        with pytest.raises(OneViewModuleException):
+            with tracer.span('module'):
+                raise OneViewModuleException('Failure')
+
+        otlp_span = tracer.spans[0].to_otlp(tracer.trace_id)
+        assert otlp_span['status'] == dict(code=OneViewSpan.STATUS_ERROR, message='Failure')
+
+    def test_should_record_request_spans_with_task_state(self):
+        tracer = OneViewTracer(trace_file='stderr')
+        oneview_client = mock.Mock()
+        task = {'uri': '/rest/tasks/1', 'taskState': 'Running'}
+        response = mock.Mock(status=202)
+        oneview_client.connection.do_http.return_value = (response, task)
+
+        with mock.patch.object(oneview, 'TaskMonitor'):
+            tracer.instrument(oneview_client)
+
+        result = oneview_client.connection.do_http(method='POST', path='/rest/enclosures', body='{}')
+
+        assert result == (response, task)
+        assert tracer.spans[0].name == 'HTTP POST'
+        assert tracer.spans[0].kind == OneViewSpan.KIND_CLIENT
+        assert tracer.spans[0].attributes['http.status_code'] == 202
+        assert tracer.spans[0].attributes['oneview.task_state'] == 'Running'
+
+    def test_should_record_task_wait_spans(self):
+        tracer = OneViewTracer(trace_file='stderr')
+        tracer._task_states['/rest/tasks/1'] = 'Completed'
+        task_monitor_class = mock.Mock(spec=['wait_for_task', 'get_completed_task'])
+        task_monitor_class.wait_for_task.return_value = {'uri': '/rest/enclosures/1'}
+
+        with mock.patch.object(oneview, 'TaskMonitor', task_monitor_class):
+            tracer.instrument(mock.Mock())
+            result = task_monitor_class.wait_for_task(mock.Mock(), {'uri': '/rest/tasks/1'})
+
+        assert result == {'uri': '/rest/enclosures/1'}
+        assert tracer.spans[0].name == 'task wait'
+        assert tracer.spans[0].attributes == {'oneview.task_uri': '/rest/tasks/1',
+                                              'oneview.task_state': 'Completed',
+                                              'oneview.resource_uri': '/rest/enclosures/1'}
+
+    def test_should_write_otlp_json_lines(self, tmpdir):
+        trace_file = str(tmpdir.join('trace.json'))
+        tracer = OneViewTracer(trace_file=trace_file)
+
+        for name in ['first', 'second']:
+            with tracer.span(name, **{'oneview.resource_uri': '/rest/resource/1'}):
+                pass
+            tracer.flush()
+
+        with open(trace_file) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert len(lines) == 2
+        resource_spans = lines[0]['resourceSpans'][0]
+        assert {'key': 'service.name', 'value': {'stringValue': 'oneview-ansible'}} in resource_spans['resource']['attributes']
+        span = resource_spans['scopeSpans'][0]['spans'][0]
+        assert span['name'] == 'first'
+        assert span['attributes'] == [{'key': 'oneview.resource_uri', 'value': {'stringValue': '/rest/resource/1'}}]
+        assert tracer.spans == []
+
+    def test_should_write_to_stderr(self):
+        tracer = OneViewTracer(trace_file='stderr')
+        with tracer.span('module'):
+            pass
+
+        with mock.patch.object(sys, 'stderr') as mock_stderr:
+            tracer.flush()
+
+        assert json.loads(mock_stderr.write.call_args[0][0])['resourceSpans']
+
+
+class StandInScmbBroker(object):
+    """
+    Stands in for the SCMB of OneView: an AMQP connection whose consumer receives the messages published to the
+    queues bound to the scmb exchange.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.bindings = []
+        self.callback = None
+        self.closed = False
+        self.error = None
+        self.condition = threading.Condition()
+
+    def channel(self):
+        return self
+
+    def queue_declare(self, exclusive=False, auto_delete=True):
+        return ('amq.gen-queue', 0, 0)
+
+    def queue_bind(self, queue, exchange, routing_key):
+        self.bindings.append((queue, exchange, routing_key))
+
+    def basic_consume(self, queue, callback, no_ack):
+        self.callback = callback
+
+    def publish(self, routing_key, change):
+        with self.condition:
+            if any(routing_key.startswith(key.rstrip('#')) for queue, exchange, key in self.bindings):
+                self.messages.append(mock.Mock(body=json.dumps(change).encode('utf-8')))
+            self.condition.notify_all()
+
+    def fail(self, error):
+        with self.condition:
+            self.error = error
+            self.condition.notify_all()
+
+    def drain_events(self, timeout):
+        with self.condition:
+            if not self.messages and not self.error:
+                self.condition.wait(timeout)
+            if self.error:
+                raise self.error
+            if not self.messages:
+                raise socket.timeout()
+            message = self.messages.pop(0)
+        self.callback(message)
+
+    def close(self):
+        self.closed = True
+
+
+def task_change(task_uri, task_state):
+    return dict(resourceUri=task_uri, changeType='Updated', resource=dict(uri=task_uri, taskState=task_state))
+
+
+class TestScmbTaskListener():
+    @pytest.fixture
+    def broker(self):
+        return StandInScmbBroker()
+
+    @pytest.fixture
+    def listener(self, broker):
+        listener = ScmbTaskListener(host='172.16.101.48', cert_dir='/etc/oneview/scmb',
+                                    connection_factory=lambda: broker)
+        yield listener
+        listener.stop()
+
+    def publish_later(self, broker, changes, delay=0.05):
+        timer = threading.Timer(delay, lambda: [broker.publish('scmb.tasks.Updated', change) for change in changes])
+        timer.start()
+        return timer
+
+    def test_should_be_disabled_when_cert_dir_undefined(self):
+        with mock.patch.dict('os.environ', {}, clear=True):
+            listener = ScmbTaskListener(host='172.16.101.48', connection_factory=mock.Mock())
+
+        assert not listener.enabled
+        assert not listener.wait('/rest/tasks/1', mock.Mock(return_value=True))
+
+    def test_should_bind_to_the_task_changes(self, listener, broker):
+        assert listener.start()
+
+        assert broker.bindings == [('amq.gen-queue', 'scmb', 'scmb.tasks.#')]
+
+    def test_should_wake_when_the_completion_message_arrives(self, listener, broker):
+        listener.FALLBACK_INTERVAL = 30
+        is_task_running = mock.Mock(return_value=True)
+        self.publish_later(broker, [task_change('/rest/tasks/2', 'Completed'),
+                                    task_change('/rest/tasks/1', 'Running'),
+                                    task_change('/rest/tasks/1', 'Completed')])
+
+        started = time.time()
+        assert listener.wait('/rest/tasks/1', is_task_running)
+
+        assert time.time() - started < 5
+        is_task_running.assert_called_once_with()
+
+    def test_should_not_wait_when_the_task_completed_before_subscribing(self, listener):
+        is_task_running = mock.Mock(return_value=False)
+
+        assert listener.wait('/rest/tasks/1', is_task_running)
+
+        is_task_running.assert_called_once_with()
+
+    def test_should_check_the_task_when_no_message_arrives(self, listener):
+        listener.FALLBACK_INTERVAL = 0.01
+        is_task_running = mock.Mock(side_effect=[True, True, False])
+
+        assert listener.wait('/rest/tasks/1', is_task_running)
+
+        assert is_task_running.call_count == 3
+
+    def test_should_stop_waiting_when_the_timeout_expires(self, listener):
+        listener.FALLBACK_INTERVAL = 30
+
+        started = time.time()
+        assert listener.wait('/rest/tasks/1', mock.Mock(return_value=True), timeout=0.05)
+
+        assert time.time() - started < 5
+
+    def test_should_fall_back_to_polling_when_unable_to_connect(self):
+        listener = ScmbTaskListener(host='172.16.101.48', cert_dir='/etc/oneview/scmb',
+                                    connection_factory=mock.Mock(side_effect=socket.error('Connection refused')))
+
+        assert not listener.wait('/rest/tasks/1', mock.Mock(return_value=True))
+        assert listener.failed
+
+    def test_should_fall_back_to_polling_when_the_connection_is_lost(self, listener, broker):
+        listener.FALLBACK_INTERVAL = 30
+        timer = threading.Timer(0.05, broker.fail, [socket.error('Connection reset')])
+        timer.start()
+
+        assert not listener.wait('/rest/tasks/1', mock.Mock(return_value=True))
+        assert listener.failed
+
+    def test_should_close_the_connection_when_stopped(self, listener, broker):
+        listener.start()
+        listener.stop()
+
+        assert broker.closed
+
+    def test_should_wait_for_the_completion_message_before_the_task_monitor(self, listener):
+        task_monitor_class = mock.Mock(spec=['wait_for_task', 'get_completed_task'])
+        wait_for_task = task_monitor_class.wait_for_task
+        wait_for_task.return_value = {'uri': '/rest/enclosures/1'}
+        task_monitor = mock.Mock()
+        task_monitor.is_task_running.return_value = False
+        task_monitor.get_current_seconds.return_value = 1000
+
+        with mock.patch.object(oneview, 'TaskMonitor', task_monitor_class):
+            listener.instrument(mock.Mock())
+            result = task_monitor_class.wait_for_task(task_monitor, {'uri': '/rest/tasks/1'}, 60)
+
+        assert result == {'uri': '/rest/enclosures/1'}
+        task_monitor.is_task_running.assert_called_once_with({'uri': '/rest/tasks/1'}, dict(last_success=1000))
+        wait_for_task.assert_called_once_with(task_monitor, {'uri': '/rest/tasks/1'}, mock.ANY)
+
+
+class TestScmbListener():
+    def test_should_call_on_change_with_the_changes_of_the_routing_keys(self):
+        broker = StandInScmbBroker()
+        changes = []
+        listener = ScmbListener(host='172.16.101.48', cert_dir='/etc/oneview/scmb', connection_factory=lambda: broker,
+                                routing_keys=['scmb.server-hardware.#', 'scmb.alerts.#'], on_change=changes.append)
+        assert listener.start()
+
+        broker.publish('scmb.enclosures.Updated', dict(resourceUri='/rest/enclosures/1'))
+        broker.publish('scmb.alerts.Created', dict(resourceUri='/rest/alerts/1'))
+        for _ in range(500):
+            if changes:
+                break
+            time.sleep(0.01)
+        listener.stop()
+
+        assert changes == [dict(resourceUri='/rest/alerts/1')]
+        assert [key for queue, exchange, key in broker.bindings] == ['scmb.server-hardware.#', 'scmb.alerts.#']
+
+
+class TestOneViewMirror():
+    SERVER_HARDWARE = [dict(uri='/rest/server-hardware/{0}'.format(index), name='server-{0}'.format(index),
+                            powerState='On' if index % 2 else 'Off', status=dict(memoryMb=index * 1024))
+                       for index in range(1, 6)]
+
+    @pytest.fixture
+    def mirror(self, tmpdir):
+        mirror = OneViewMirror(str(tmpdir.join('mirror.db')))
+        yield mirror
+        mirror.close()
+
+    @pytest.fixture
+    def resource_client(self):
+        resource_client = mock.Mock(URI='/rest/server-hardware')
+        resource_client.get_all.side_effect = lambda start, count: self.SERVER_HARDWARE[start:start + count]
+        return resource_client
+
+    def test_should_default_to_the_environment_var(self, tmpdir):
+        path = str(tmpdir.join('env.db'))
+        with mock.patch.dict('os.environ', {'ONEVIEW_MIRROR_DB': path}):
+            mirror = OneViewMirror()
+        mirror.close()
+
+        assert mirror.path == path
+
+    def test_should_default_to_a_private_file_in_the_cache_directory(self, tmpdir):
+        with mock.patch.dict('os.environ', {'XDG_CACHE_HOME': str(tmpdir)}):
+            os.environ.pop('ONEVIEW_MIRROR_DB', None)
+            mirror = OneViewMirror()
+        mirror.close()
+
+        assert mirror.path == str(tmpdir.join('oneview', 'mirror.db'))
+        assert os.stat(mirror.path).st_mode & 0o777 == 0o600
+        assert os.stat(str(tmpdir.join('oneview'))).st_mode & 0o777 == 0o700
+
+    def test_should_snapshot_the_collection_page_by_page(self, mirror, resource_client):
+        assert mirror.snapshot(resource_client, page_size=2) == 5
+
+        assert resource_client.get_all.call_args_list == [mock.call(start=0, count=2), mock.call(start=2, count=2),
+                                                          mock.call(start=4, count=2)]
+        assert mirror.get_all('/rest/server-hardware') == self.SERVER_HARDWARE
+        assert mirror.synced('/rest/server-hardware')
+
+    def test_should_replace_the_collection_on_snapshot(self, mirror, resource_client):
+        mirror.snapshot(resource_client)
+        resource_client.get_all.side_effect = lambda start, count: self.SERVER_HARDWARE[:1][start:start + count]
+
+        assert mirror.snapshot(resource_client) == 1
+        assert mirror.get_all('/rest/server-hardware') == self.SERVER_HARDWARE[:1]
+
+    def test_should_apply_the_changes(self, mirror, resource_client):
+        mirror.snapshot(resource_client)
+        updated = dict(self.SERVER_HARDWARE[0], powerState='Off')
+        created = dict(uri='/rest/server-hardware/6', name='server-6')
+
+        mirror.apply_change(dict(changeType='Updated', resourceUri=updated['uri'], resource=updated))
+        mirror.apply_change(dict(changeType='Created', resourceUri=created['uri'], resource=created))
+        mirror.apply_change(dict(changeType='Deleted', resourceUri='/rest/server-hardware/2'))
+
+        resources = mirror.get_all('/rest/server-hardware')
+        assert [resource['name'] for resource in resources] == ['server-1', 'server-3', 'server-4', 'server-5',
+                                                                'server-6']
+        assert resources[0]['powerState'] == 'Off'
+
+    def test_should_replay_the_changes_received_during_the_snapshot(self, mirror, resource_client):
+        updated = dict(self.SERVER_HARDWARE[0], powerState='Off')
+
+        def get_all(start, count):
+            if start == 0:
+                mirror.apply_change(dict(changeType='Updated', resourceUri=updated['uri'], resource=updated))
+                mirror.apply_change(dict(changeType='Deleted', resourceUri='/rest/server-hardware/5'))
+            return self.SERVER_HARDWARE[start:start + count]
+        resource_client.get_all.side_effect = get_all
+
+        mirror.snapshot(resource_client, page_size=2)
+
+        resources = mirror.get_all('/rest/server-hardware')
+        assert [resource['name'] for resource in resources] == ['server-1', 'server-2', 'server-3', 'server-4']
+        assert resources[0]['powerState'] == 'Off'
+
+    def test_should_replay_the_changes_buffered_before_the_first_snapshot(self, mirror, resource_client):
+        created = dict(uri='/rest/server-hardware/6', name='server-6')
+        mirror.buffer_changes('/rest/server-hardware')
+        mirror.apply_change(dict(changeType='Created', resourceUri=created['uri'], resource=created))
+
+        mirror.snapshot(resource_client)
+
+        assert mirror.get_all('/rest/server-hardware')[-1] == created
+
+    def test_should_ignore_the_changes_older_than_the_mirrored_resource(self, mirror, resource_client):
+        resource_client.get_all.side_effect = lambda start, count: [
+            dict(self.SERVER_HARDWARE[0], modified='2020-06-01T10:00:00.000Z')]
+        mirror.buffer_changes('/rest/server-hardware')
+        stale = dict(self.SERVER_HARDWARE[0], powerState='Off', modified='2020-06-01T09:00:00.000Z')
+        mirror.apply_change(dict(changeType='Updated', resourceUri=stale['uri'], resource=stale))
+
+        mirror.snapshot(resource_client)
+
+        assert mirror.get_all('/rest/server-hardware')[0]['powerState'] == 'On'
+
+    def test_should_ignore_the_changes_of_collections_not_mirrored(self, mirror):
+        mirror.apply_change(dict(changeType='Created', resourceUri='/rest/alerts/1', resource=dict(uri='/rest/alerts/1')))
+
+        assert mirror.synced('/rest/alerts') is None
+
+    def test_should_filter_sort_page_and_project(self, mirror, resource_client):
+        mirror.snapshot(resource_client)
+        params = dict(filter=["powerState='On'", "name<>'server-3'"], sort='status.memoryMb:descending',
+                      start=0, count=1)
+
+        assert mirror.get_all('/rest/server-hardware', params, ['name']) == [dict(name='server-5')]
+
+    def test_should_fail_when_the_collection_is_not_mirrored(self, mirror):
+        with pytest.raises(OneViewModuleResourceNotFound):
+            mirror.get_all('/rest/alerts')
+
+    def test_should_fail_when_the_filter_is_not_supported(self, mirror, resource_client):
+        mirror.snapshot(resource_client)
+
+        with pytest.raises(OneViewModuleValueError):
+            mirror.get_all('/rest/server-hardware', dict(filter="status.memoryMb > 2048"))
+
+    def test_should_fail_when_the_param_is_not_supported(self, mirror, resource_client):
+        mirror.snapshot(resource_client)
+
+        with pytest.raises(OneViewModuleValueError):
+            mirror.get_all('/rest/server-hardware', dict(query="name matches 'server'"))
+
+
+class TestRunConcurrently():
+    def test_should_return_results_in_order(self):
+        assert run_concurrently(lambda x: x * 2, [3, 1, 2], max_workers=3) == [6, 2, 4]
+
+    def test_should_run_sequentially_with_a_single_worker(self):
+        with mock.patch.object(oneview, 'ThreadPool') as mock_pool:
+            assert run_concurrently(lambda x: x, [1, 2], max_workers=1) == [1, 2]
+
+        mock_pool.assert_not_called()
+
+    def test_should_raise_the_exception_of_a_call(self):
+        def function(item):
+            if item == 2:
+                raise OneViewModuleException('Failure')
+            return item
+
+        with pytest.raises(OneViewModuleException):
+            run_concurrently(function, [1, 2, 3])
+
+
+class TestFieldsProjection():
+    RESOURCE = {'name': 'Encl1, bay 1', 'uri': '/rest/server-hardware/1', 'status': 'OK',
+                'processor': {'count': 2, 'type': 'Xeon'}, 'memoryMb': 262144}
+
+    def test_should_project_fields_of_a_resource(self):
+        assert project_fields(self.RESOURCE, ['name', 'processor.count', 'missing']) == {
+            'name': 'Encl1, bay 1', 'processor': {'count': 2}}
+
+    def test_should_project_fields_of_a_list(self):
+        assert project_fields([self.RESOURCE], ['uri', 'processor']) == [
+            {'uri': '/rest/server-hardware/1', 'processor': {'count': 2, 'type': 'Xeon'}}]
+
+    def test_should_get_all_without_projection_when_fields_undefined(self):
+        resource_client = mock.Mock()
+
+        get_all_resources(resource_client, {'count': 3})
+
+        resource_client.get_all.assert_called_once_with(count=3)
+
+    def test_should_get_the_resources_by_values_in_chunks(self):
+        resource_client = mock.Mock()
+        resource_client.get_all.side_effect = [[dict(name='a')], [dict(name='c')]]
+
+        result = get_resources_by(resource_client, 'name', ['a', 'b', 'c'], chunk_size=2)
+
+        assert result == [dict(name='a'), dict(name='c')]
+        assert resource_client.get_all.call_args_list == [mock.call(filter="name='a' OR name='b'"),
+                                                          mock.call(filter="name='c'")]
+
+    def test_should_keep_the_filter_of_the_params_in_each_chunk(self):
+        resource_client = mock.Mock()
+        resource_client.get_all.return_value = []
+
+        get_resources_by(resource_client, 'uri', ['/rest/1', '/rest/2'], dict(filter="status='OK'"), chunk_size=1)
+
+        assert resource_client.get_all.call_args_list == [mock.call(filter=["status='OK'", "uri='/rest/1'"]),
+                                                          mock.call(filter=["status='OK'", "uri='/rest/2'"])]
+
+    def test_should_request_fields_when_get_all_accepts_them(self):
+        class ResourceClient(object):
+            def get_all(self, start=0, count=-1, filter='', fields=''):
+                return [dict(fields=fields, count=count)]
+
+        result = get_all_resources(ResourceClient(), {'count': 3}, ['name', 'processor.count', 'processor.type'])
+
+        assert result == [dict(fields='name,processor', count=3)]
+
+    def test_should_request_fields_through_the_resource_helper(self):
+        class ResourceHelper(object):
+            def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields=''):
+                return [dict(filter=filter, fields=fields)]
+
+        class ResourceClient(object):
+            _helper = ResourceHelper()
+
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                return []
+
+        result = get_all_resources(ResourceClient(), {'filter': "status='OK'"}, ['name', 'uri'])
+
+        assert result == [dict(filter="status='OK'", fields='name,uri')]
+
+    def test_should_not_request_fields_when_not_supported(self):
+        calls = []
+
+        class ResourceClient(object):
+            def get_all(self, start=0, count=-1, filter='', sort=''):
+                calls.append(dict(count=count))
+                return []
+
+        get_all_resources(ResourceClient(), {'count': 3}, ['name'])
+
+        assert calls == [dict(count=3)]
+
+    @mock.patch.object(OneViewClient, 'from_json_file')
+    @mock.patch(OneViewModule.__module__ + '.AnsibleModule')
+    def test_should_project_resource_facts_when_fields_supported(self, mock_ansible_module_init, mock_from_json_file):
+        mock_ansible_module = mock.Mock()
+        mock_ansible_module_init.return_value = mock_ansible_module
+        mock_ansible_module.params = dict(config='config.json', fields=['name'])
+
+        base_mod = OneViewModule(additional_arg_spec=dict(params=dict(type='dict')), fields_support=['resources'])
+        facts = dict(resources=[self.RESOURCE], resource_urls={'url': 'value'}, resource_option=self.RESOURCE)
+        base_mod.execute_module = mock.Mock(return_value=dict(ansible_facts=facts))
+        base_mod.run()
+
+        assert mock_ansible_module_init.call_args[1]['argument_spec']['fields'] == dict(type='list')
+        mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(resources=[{'name': 'Encl1, bay 1'}], resource_urls={'url': 'value'},
+                               resource_option=self.RESOURCE))
+
+
+class TestResultFormat():
+    RESOURCE = {'name': 'Profile', 'uri': '/rest/server-profiles/1', 'description': None, 'connections': [],
+                'serverHardwareTypeUri': '/rest/server-hardware-types/1',
+                'firmware': {'firmwareBaselineUri': None, 'manageFirmware': False},
+                'enclosureGroup': {'uri': '/rest/enclosure-groups/1', 'name': None}}
+
+    def test_should_compact_resource(self):
+        assert compact_resource([self.RESOURCE]) == [{
+            'name': 'Profile', 'uri': '/rest/server-profiles/1',
+            'serverHardwareTypeUri': '/rest/server-hardware-types/1',
+            'firmware': {'manageFirmware': False},
+            'enclosureGroup': '/rest/enclosure-groups/1'}]
+
+    def test_should_not_collapse_the_resource_itself(self):
+        assert compact_resource({'uri': '/rest/server-profiles/1', 'name': None}) == {'uri': '/rest/server-profiles/1'}
+
+    def test_should_write_json_lines(self, tmpdir):
+        path = write_json_lines([{'name': 'first'}, {'name': 'second'}], str(tmpdir), 'server_profiles-')
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert path.startswith(str(tmpdir.join('server_profiles-')))
+        assert path.endswith('.jsonl')
+        assert lines == [{'name': 'first'}, {'name': 'second'}]
+
+    @pytest.fixture
+    def base_mod(self):
+        with mock.patch.object(OneViewClient, 'from_json_file'):
+            with mock.patch(OneViewModule.__module__ + '.AnsibleModule') as mock_ansible_module_init:
+                self.mock_ansible_module_init = mock_ansible_module_init
+                self.mock_ansible_module = mock.Mock()
+                mock_ansible_module_init.return_value = self.mock_ansible_module
+                yield
+
+    def test_should_compact_resource_facts(self, base_mod):
+        self.mock_ansible_module.params = dict(config='config.json', result_format='compact')
+
+        base_mod = OneViewModule(result_format_support=True)
+        base_mod.execute_module = mock.Mock(return_value=dict(ansible_facts=dict(resources=[self.RESOURCE], option=None)))
+        base_mod.run()
+
+        argument_spec = self.mock_ansible_module_init.call_args[1]['argument_spec']
+        assert argument_spec['result_format']['default'] == 'full'
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=compact_resource([self.RESOURCE]), option=None))
+
+    def test_should_write_resource_facts_to_file(self, base_mod, tmpdir):
+        self.mock_ansible_module.params = dict(config='config.json', result_format='file', result_dir=str(tmpdir))
+
+        base_mod = OneViewModule(result_format_support=True)
+        base_mod.execute_module = mock.Mock(return_value=dict(ansible_facts=dict(resources=[self.RESOURCE])))
+        base_mod.run()
+
+        path = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['resources']
+        with open(path) as f:
+            assert [json.loads(line) for line in f] == [self.RESOURCE]
+
+    def test_should_write_empty_resource_facts_to_file(self, base_mod, tmpdir):
+        self.mock_ansible_module.params = dict(config='config.json', result_format='file', result_dir=str(tmpdir))
+
+        base_mod = OneViewModule(fields_support=['resources'], result_format_support=True)
+        base_mod.execute_module = mock.Mock(return_value=dict(ansible_facts=dict(resources=[], option=self.RESOURCE)))
+        base_mod.run()
+
+        ansible_facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']
+        assert ansible_facts['option'] == self.RESOURCE
+        with open(ansible_facts['resources']) as f:
+            assert f.read() == ''
+
+    def test_should_keep_full_facts_when_not_supported(self, base_mod):
+        self.mock_ansible_module.params = dict(config='config.json', result_format='compact')
+
+        base_mod = OneViewModule()
+        base_mod.execute_module = mock.Mock(return_value=dict(ansible_facts=dict(resources=[self.RESOURCE])))
+        base_mod.run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, ansible_facts=dict(resources=[self.RESOURCE]))
+
+
+class StandInUploadHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if server.failures:
+            server.failures -= 1
+            self.close_connection = True
+            return
+        server.requests.append(dict(path=self.path, headers=dict(self.headers.items()), body=body))
+        self.send_response(server.status)
+        if server.location:
+            self.send_header('Location', server.location)
+        response = json.dumps(server.response).encode('utf-8')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInConnection(object):
+    def __init__(self, port):
+        self.port = port
+        self._headers = {'auth': 'session-id'}
+        self._apiVersion = 1200
+        self.get = mock.Mock(return_value={'category': 'tasks', 'uri': '/rest/tasks/1'})
+
+    def get_connection(self):
+        return http_client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+
+
+class TestUploadFile():
+    @pytest.fixture(autouse=True)
+    def stand_in_server(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), StandInUploadHandler)
+        self.server.requests = []
+        self.server.failures = 0
+        self.server.status = 200
+        self.server.location = None
+        self.server.response = {'name': 'firmware.iso', 'uri': '/rest/firmware-drivers/firmware'}
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.01,))
+        thread.daemon = True
+        thread.start()
+        self.connection = StandInConnection(self.server.server_address[1])
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.time.sleep'):
+            yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    @pytest.fixture
+    def upload_path(self, tmpdir):
+        upload_path = tmpdir.join('firmware.iso')
+        upload_path.write_binary(b'0123456789' * 1000)
+        return str(upload_path)
+
+    def test_should_stream_the_file_as_multipart_in_chunks(self, upload_path):
+        resource, checksum = upload_file(self.connection, '/rest/firmware-bundles', upload_path, chunk_size=1024)
+
+        request = self.server.requests[0]
+        assert resource == self.server.response
+        assert request['path'] == '/rest/firmware-bundles'
+        assert request['headers']['uploadfilename'] == 'firmware.iso'
+        assert request['headers']['auth'] == 'session-id'
+        assert request['headers']['X-API-Version'] == '1200'
+        assert b'filename="firmware.iso"' in request['body']
+        assert b'\r\n\r\n' + b'0123456789' * 1000 + b'\r\n--' in request['body']
+
+    def test_should_compute_the_sha256_checksum_while_uploading(self, upload_path):
+        checksum = upload_file(self.connection, '/rest/firmware-bundles', upload_path, chunk_size=333)[1]
+
+        assert checksum == hashlib.sha256(b'0123456789' * 1000).hexdigest()
+
+    def test_should_retry_when_the_connection_fails(self, upload_path):
+        self.server.failures = 2
+
+        resource, checksum = upload_file(self.connection, '/rest/firmware-bundles', upload_path)
+
+        assert resource == self.server.response
+        assert len(self.server.requests) == 1
+
+    def test_should_fail_when_the_retries_are_exhausted(self, upload_path):
+        self.server.failures = 3
+
+        with pytest.raises(OneViewModuleException) as exception:
+            upload_file(self.connection, '/rest/firmware-bundles', upload_path, retries=2)
+
+        assert 'Failed to upload ' + upload_path in exception.value.msg
+
+    def test_should_wait_for_the_upload_task(self, upload_path):
+        self.server.status = 202
+        self.server.location = '/rest/tasks/1'
+
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.TaskMonitor') as mock_task_monitor:
+            mock_task_monitor.return_value.wait_for_task.return_value = {'name': 'firmware.iso'}
+            resource, checksum = upload_file(self.connection, '/rest/firmware-bundles', upload_path)
+
+        self.connection.get.assert_called_once_with('/rest/tasks/1')
+        mock_task_monitor.return_value.wait_for_task.assert_called_once_with(
+            {'category': 'tasks', 'uri': '/rest/tasks/1'}, -1)
+        assert resource == {'name': 'firmware.iso'}
+
+    def test_should_raise_the_error_response(self, upload_path):
+        self.server.status = 400
+        self.server.response = {'message': 'Invalid bundle'}
+
+        with pytest.raises(OneViewModuleException) as exception:
+            upload_file(self.connection, '/rest/firmware-bundles', upload_path)
+
+        assert exception.value.msg == 'Invalid bundle'
+
+
+class StandInDownloadHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(path=self.path, headers=dict(self.headers.items())))
+        content = server.content
+        etag = server.etag
+        if server.redirect:
+            self.send_response(302)
+            self.send_header('Location', self.path)
+            self.end_headers()
+            return
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        if self.headers.get('Range') and self.headers.get('If-Range') in (None, etag):
+            start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {0}-{1}/{2}'.format(start, len(content) - 1, len(content)))
+        else:
+            self.send_response(200)
+        if etag:
+            self.send_header('ETag', etag)
+        for name, value in server.extra_headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content) - start))
+        self.end_headers()
+
+        if server.failures:
+            server.failures -= 1
+            self.wfile.write(content[start:start + server.sent_before_failure])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(content[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadFile():
+    CONTENT = b'artifact bundle content' * 100
+
+    @pytest.fixture(autouse=True)
+    def stand_in_server(self, tmpdir):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), StandInDownloadHandler)
+        self.server.requests = []
+        self.server.content = self.CONTENT
+        self.server.etag = '"v1"'
+        self.server.extra_headers = {}
+        self.server.failures = 0
+        self.server.sent_before_failure = 1000
+        self.server.redirect = False
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.01,))
+        thread.daemon = True
+        thread.start()
+        self.connection = StandInConnection(self.server.server_address[1])
+        self.destination = str(tmpdir.join('artifact_bundle.zip'))
+        self.checksum_cache = FileChecksumCache(str(tmpdir.join('checksums.json')))
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.time.sleep'):
+            yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def download(self, retries=3):
+        return download_file(self.connection, '/rest/artifact-bundles/download/1', self.destination,
+                             self.checksum_cache, chunk_size=256, retries=retries)
+
+    def test_should_download_to_the_destination(self, tmpdir):
+        changed, download = self.download()
+
+        assert changed
+        assert download == dict(path=self.destination, size=len(self.CONTENT), etag='"v1"',
+                                checksum=hashlib.sha256(self.CONTENT).hexdigest())
+        with open(self.destination, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+        assert self.server.requests[0]['headers']['auth'] == 'session-id'
+        assert tmpdir.listdir(lambda path: path.basename.endswith('.part')) == []
+
+    def test_should_leave_the_given_checksum_cache_to_be_saved_by_the_caller(self):
+        self.download()
+
+        assert not os.path.exists(self.checksum_cache.path)
+        assert self.checksum_cache.get_etag(self.destination) == '"v1"'
+
+    def test_should_not_download_when_the_etag_matches(self):
+        self.download()
+
+        changed, download = self.download()
+
+        assert not changed
+        assert self.server.requests[1]['headers']['If-None-Match'] == '"v1"'
+        assert download['checksum'] == hashlib.sha256(self.CONTENT).hexdigest()
+
+    def test_should_download_again_when_the_etag_changes(self):
+        self.download()
+        self.server.content = b'new content'
+        self.server.etag = '"v2"'
+
+        changed, download = self.download()
+
+        assert changed
+        with open(self.destination, 'rb') as downloaded_file:
+            assert downloaded_file.read() == b'new content'
+
+    def test_should_not_download_when_the_size_matches_without_etag(self):
+        self.server.etag = None
+        with open(self.destination, 'wb') as local_file:
+            local_file.write(b'x' * len(self.CONTENT))
+
+        changed, download = self.download()
+
+        assert not changed
+        assert download['size'] == len(self.CONTENT)
+
+    def test_should_resume_with_a_range_request_when_the_connection_fails(self):
+        self.server.failures = 1
+
+        changed, download = self.download()
+
+        assert changed
+        assert self.server.requests[1]['headers']['Range'] == 'bytes=1000-'
+        assert self.server.requests[1]['headers']['If-Range'] == '"v1"'
+        assert download['checksum'] == hashlib.sha256(self.CONTENT).hexdigest()
+        with open(self.destination, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+        assert not os.path.exists(self.destination + '.part.validator')
+
+    def test_should_restart_the_download_when_the_content_changed_before_resuming(self):
+        self.server.failures = 1
+        with pytest.raises(OneViewModuleException):
+            self.download(retries=0)
+        self.server.content = b'new content' * 200
+        self.server.etag = '"v2"'
+
+        changed, download = self.download()
+
+        assert changed
+        assert self.server.requests[1]['headers']['If-Range'] == '"v1"'
+        assert download['checksum'] == hashlib.sha256(b'new content' * 200).hexdigest()
+        with open(self.destination, 'rb') as downloaded_file:
+            assert downloaded_file.read() == b'new content' * 200
+
+    def test_should_not_resume_a_partial_file_without_validator(self):
+        with open(self.destination + '.part', 'wb') as partial_file:
+            partial_file.write(b'stale content')
+
+        changed, download = self.download()
+
+        assert changed
+        assert 'Range' not in self.server.requests[0]['headers']
+        with open(self.destination, 'rb') as downloaded_file:
+            assert downloaded_file.read() == self.CONTENT
+
+    def test_should_fail_after_too_many_redirects(self):
+        self.server.redirect = True
+
+        with pytest.raises(OneViewModuleException) as exception:
+            self.download()
+
+        assert 'Too many redirects' in exception.value.msg
+        assert len(self.server.requests) == 6
+
+    def test_should_fail_and_keep_the_destination_when_the_digest_does_not_match(self):
+        self.server.extra_headers = {'Digest': 'SHA-256=AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA='}
+        with open(self.destination, 'wb') as local_file:
+            local_file.write(b'previous')
+
+        with pytest.raises(OneViewModuleException) as exception:
+            self.download()
+
+        assert 'Digest mismatch' in exception.value.msg
+        with open(self.destination, 'rb') as local_file:
+            assert local_file.read() == b'previous'
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -17,10 +17,11 @@
 ###
 
 import copy
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
-from oneview_module_loader import AlertFactsModule
+from oneview_module_loader import AlertFactsModule, OneViewMirror
 
 ERROR_MSG = 'Fake message error'
 
@@ -75,6 +76,25 @@ class TestAlertFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(alerts=ALL_ALERTS)
         )
 
+    def test_get_all_from_the_mirror(self, tmpdir):
+        self.resource.URI = '/rest/alerts'
+        self.resource.get_all.side_effect = lambda start, count: ALL_ALERTS[start:start + count]
+        with mock.patch.dict('os.environ', {'ONEVIEW_MIRROR_DB': str(tmpdir.join('mirror.db'))}):
+            mirror = OneViewMirror()
+            mirror.snapshot(self.resource)
+            mirror.close()
+            self.resource.get_all.reset_mock()
+            self.mock_ansible_module.params = dict(config='config.json', source='mirror',
+                                                   params=dict(filter="severity='Warning'"))
+
+            AlertFactsModule().run()
+
+        self.resource.get_all.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(alerts=ALL_ALERTS)
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
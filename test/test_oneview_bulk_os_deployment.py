@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import BulkOsDeploymentModule
+
+DEPLOYMENT_PLAN = dict(name='ESXi Deployment Plan', uri='/rest/os-deployment-plans/1',
+                       additionalParameters=[dict(name='DomainName', value='default.com'),
+                                             dict(name='HostName', value=None),
+                                             dict(name='SSH', value='false')])
+
+SERVER_HARDWARE = [dict(name='Encl1, bay {0}'.format(bay), uri='/rest/server-hardware/{0}'.format(bay))
+                   for bay in range(1, 6)]
+
+PARAMS = dict(
+    config='config.json',
+    deployment_plan='ESXi Deployment Plan',
+    server_profile_template='ESXi Template',
+    data=dict(osCustomAttributes=[dict(name='DomainName', value='example.com'), dict(name='SSH', value=True)]),
+    targets=[dict(name='esxi-{0}'.format(bay), serverHardwareName='Encl1, bay {0}'.format(bay),
+                  osCustomAttributes=[dict(name='HostName', value='esxi-{0}'.format(bay))])
+             for bay in range(1, 6)],
+    wave_size=2,
+    power_off=True
+)
+
+
+@pytest.mark.resource(TestBulkOsDeploymentModule='server_profiles')
+class TestBulkOsDeploymentModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def resources(self, setUp, mock_ov_client):
+        self.resource.get_all.return_value = [dict(name='esxi-1')]
+        self.resource.create.side_effect = lambda payload: mock.Mock(data=payload)
+        mock_ov_client.os_deployment_plans.get_by_name.return_value = mock.Mock(data=DEPLOYMENT_PLAN)
+        self.template = mock.Mock(data=dict(uri='/rest/server-profile-templates/1'))
+        self.template.get_new_profile.return_value = dict(type='ServerProfileV12', connectionSettings=dict())
+        mock_ov_client.server_profile_templates.get_by_name.return_value = self.template
+        mock_ov_client.server_hardware.get_all.return_value = SERVER_HARDWARE
+        self.server_hardware = mock.Mock(data=dict(powerState='On'))
+        mock_ov_client.server_hardware.get_by_uri.return_value = self.server_hardware
+
+    def test_should_create_the_missing_profiles_in_waves(self):
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        self.mock_ov_client.os_deployment_plans.get_by_name.assert_called_once_with('ESXi Deployment Plan')
+        self.template.get_new_profile.assert_called_once_with()
+        self.resource.get_all.assert_called_once_with(
+            filter=' OR '.join("name='esxi-{0}'".format(bay) for bay in range(1, 6)))
+        self.mock_ov_client.server_hardware.get_all.assert_called_once_with(
+            filter=' OR '.join("name='Encl1, bay {0}'".format(bay) for bay in range(2, 6)))
+        assert self.resource.create.call_count == 4
+        assert self.server_hardware.update_power_state.call_count == 4
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=BulkOsDeploymentModule.MSG_DEPLOYED,
+            ansible_facts=dict(bulk_deployment=dict(created=['esxi-2', 'esxi-3', 'esxi-4', 'esxi-5'],
+                                                    existing=['esxi-1'],
+                                                    waves=2))
+        )
+
+    def test_should_build_the_profile_with_the_deployment_settings(self):
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        payload = [call[0][0] for call in self.resource.create.call_args_list if call[0][0]['name'] == 'esxi-3'][0]
+        assert payload == dict(
+            type='ServerProfileV12',
+            connectionSettings=dict(),
+            name='esxi-3',
+            serverHardwareUri='/rest/server-hardware/3',
+            serverProfileTemplateUri='/rest/server-profile-templates/1',
+            osDeploymentSettings=dict(
+                osDeploymentPlanUri='/rest/os-deployment-plans/1',
+                osCustomAttributes=[dict(name='DomainName', value='example.com'),
+                                    dict(name='SSH', value='true'),
+                                    dict(name='HostName', value='esxi-3')]))
+
+    def test_should_do_nothing_when_all_the_profiles_exist(self):
+        self.resource.get_all.return_value = [dict(name=target['name']) for target in PARAMS['targets']]
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        self.resource.create.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=BulkOsDeploymentModule.MSG_ALREADY_DEPLOYED,
+            ansible_facts=dict(bulk_deployment=dict(created=[], existing=[t['name'] for t in PARAMS['targets']],
+                                                    waves=0))
+        )
+
+    def test_should_stop_after_the_wave_with_failures(self):
+        def create(payload):
+            if payload['name'] == 'esxi-2':
+                raise Exception('OS volume creation failed')
+            return mock.Mock(data=payload)
+        self.resource.create.side_effect = create
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        assert self.resource.create.call_count == 2
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BulkOsDeploymentModule.MSG_DEPLOYMENT_FAILED.format('esxi-2', 'esxi-2: OS volume creation failed'),
+            changed=True,
+            ansible_facts=dict(bulk_deployment=dict(created=['esxi-3'], existing=['esxi-1'], failed=['esxi-2'], waves=1))
+        )
+
+    def test_should_fail_when_the_server_hardware_is_not_found(self):
+        self.mock_ov_client.server_hardware.get_all.return_value = SERVER_HARDWARE[:2]
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        self.resource.create.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BulkOsDeploymentModule.MSG_SERVER_HARDWARE_NOT_FOUND + 'Encl1, bay 3, Encl1, bay 4, Encl1, bay 5'
+        )
+
+    def test_should_fail_when_the_deployment_plan_is_not_found(self):
+        self.mock_ov_client.os_deployment_plans.get_by_name.return_value = None
+        self.mock_ansible_module.params = PARAMS
+
+        BulkOsDeploymentModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=BulkOsDeploymentModule.MSG_DEPLOYMENT_PLAN_NOT_FOUND + 'ESXi Deployment Plan'
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
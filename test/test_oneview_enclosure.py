@@ -252,12 +252,28 @@ PARAMS_FOR_INTERCONNECT_BAY_POWER_STATE_E_FUSE = """
       bayNumber: 2
 """
 
+PARAMS_FOR_DEVICE_BAYS_POWER_STATE_RESET = """
+    config: "{{ config_file_path }}"
+    state: device_bays_power_state_reset
+    data:
+      name: 'Test-Enclosure'
+      bayNumbers: [1, 2, 1]
+"""
+
+PARAMS_FOR_ALL_MANAGER_BAYS_UID_ON = """
+    config: "{{ config_file_path }}"
+    state: manager_bays_uid_on
+    data:
+      name: 'Test-Enclosure'
+      bays: all
+"""
+
 
 @pytest.mark.resource(TestEnclosureModule='enclosures')
 class TestEnclosureModule(OneViewBaseTest):
     def test_should_create_new_enclosure(self):
         self.resource.get_by_name.return_value = []
-        self.resource.get_by_hostname.return_value = []
+        self.resource.get_all.return_value = []
 
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
         self.resource.add.return_value = self.resource
@@ -275,7 +291,7 @@ class TestEnclosureModule(OneViewBaseTest):
 
     def test_should_fail_create_new_enclosure(self):
         self.resource.get_by_name.return_value = []
-        self.resource.get_by_hostname.return_value = []
+        self.resource.get_all.return_value = []
         self.resource.add.return_value = []
         self.mock_ansible_module.params = PARAMS_FOR_PRESENT
 
@@ -286,7 +302,8 @@ class TestEnclosureModule(OneViewBaseTest):
 
     def test_should_not_update_when_no_changes_by_primary_ip_key(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.get_by_hostname.return_value = self.resource
+        self.resource.get_all.return_value = [ENCLOSURE_FROM_ONEVIEW]
+        self.resource.new.return_value = self.resource
 
         self.mock_ansible_module.params = PARAMS_FOR_PRESENT
 
@@ -300,7 +317,8 @@ class TestEnclosureModule(OneViewBaseTest):
 
     def test_should_not_update_when_no_changes_by_standby_ip_key(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.get_by_hostname.return_value = self.resource
+        self.resource.get_all.return_value = [ENCLOSURE_FROM_ONEVIEW]
+        self.resource.new.return_value = self.resource
 
         params = deepcopy(PARAMS_FOR_PRESENT)
         params['data']['hostname'] = STANDBY_IP_ADDRESS
@@ -316,7 +334,8 @@ class TestEnclosureModule(OneViewBaseTest):
 
     def test_should_not_update_when_no_changes_by_name_key(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.get_by_hostname.return_value = self.resource
+        self.resource.get_all.return_value = [ENCLOSURE_FROM_ONEVIEW]
+        self.resource.new.return_value = self.resource
 
         self.mock_ansible_module.params = PARAMS_FOR_PRESENT_NO_HOSTNAME
 
@@ -333,11 +352,9 @@ class TestEnclosureModule(OneViewBaseTest):
         updated_data['name'] = 'Test-Enclosure-Renamed'
 
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.get_by_hostname.return_value = self.resource
-
-        updated_obj = self.resource.copy()
-        updated_obj.data = updated_data
-        self.resource.patch.return_value = updated_obj
+        self.resource.get_all.return_value = [ENCLOSURE_FROM_ONEVIEW]
+        self.resource.new.return_value = self.resource
+        self.resource.patch_request.return_value = updated_data
 
         self.mock_ansible_module.params = PARAMS_WITH_NEW_NAME
 
@@ -346,7 +363,7 @@ class TestEnclosureModule(OneViewBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=EnclosureModule.MSG_UPDATED,
-            ansible_facts=dict(enclosure=self.resource.data)
+            ansible_facts=dict(enclosure=updated_data)
         )
 
     def test_update_when_data_has_new_rack_name(self):
@@ -354,10 +371,7 @@ class TestEnclosureModule(OneViewBaseTest):
         updated_data['rackName'] = 'Another-Rack-Name'
 
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-
-        updated_obj = self.resource.copy()
-        updated_obj.data = updated_data
-        self.resource.patch.return_value = updated_obj
+        self.resource.patch_request.return_value = updated_data
 
         self.mock_ansible_module.params = PARAMS_WITH_NEW_RACK_NAME
 
@@ -366,46 +380,44 @@ class TestEnclosureModule(OneViewBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=EnclosureModule.MSG_UPDATED,
-            ansible_facts=dict(enclosure=self.resource.data)
+            ansible_facts=dict(enclosure=updated_data)
         )
 
     def test_replace_name_for_new_enclosure(self):
         self.resource.get_by_name.return_value = []
-        self.resource.get_by_hostname.return_value = []
         self.resource.get_all.return_value = []
 
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
         self.resource.add.return_value = self.resource
 
-        self.resource.patch.return_value = []
-
         params_ansible = deepcopy(PARAMS_FOR_PRESENT)
         params_ansible['data']['name'] = 'Encl1-Renamed'
         self.mock_ansible_module.params = params_ansible
 
         EnclosureModule().run()
 
-        self.resource.patch.assert_called_once_with("replace", "/name", "Encl1-Renamed")
+        self.resource.patch_request.assert_called_once_with(
+            '/a/path', body=[dict(op='replace', path='/name', value='Encl1-Renamed')])
 
     def test_replace_name_for_existent_enclosure(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.patch.return_value = []
 
         self.mock_ansible_module.params = PARAMS_WITH_NEW_NAME
 
         EnclosureModule().run()
 
-        self.resource.patch.assert_called_once_with("replace", "/name", "OneView-Enclosure")
+        self.resource.patch_request.assert_called_once_with(
+            '/a/path', body=[dict(op='replace', path='/name', value='OneView-Enclosure')])
 
     def test_replace_rack_name_for_new_enclosure(self):
         updated_data = ENCLOSURE_FROM_ONEVIEW.copy()
         updated_data['rackName'] = 'Another-Rack-Name'
 
         self.resource.get_by_name.return_value = []
-        self.resource.get_by_hostname.return_value = []
+        self.resource.get_all.return_value = []
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
         self.resource.add.return_value = self.resource
-        self.resource.patch.return_value = updated_data
+        self.resource.patch_request.return_value = updated_data
 
         params_ansible = deepcopy(PARAMS_FOR_PRESENT)
         params_ansible['data']['rackName'] = 'Another-Rack-Name'
@@ -413,19 +425,56 @@ class TestEnclosureModule(OneViewBaseTest):
 
         EnclosureModule().run()
 
-        self.resource.patch.assert_called_once_with(
-            "replace", "/rackName", "Another-Rack-Name")
+        self.resource.patch_request.assert_called_once_with(
+            '/a/path', body=[dict(op='replace', path='/rackName', value='Another-Rack-Name')])
 
     def test_replace_rack_name_for_existent_enclosure(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
-        self.resource.patch.return_value = []
 
         self.mock_ansible_module.params = PARAMS_WITH_NEW_RACK_NAME
 
         EnclosureModule().run()
 
-        self.resource.patch.assert_called_once_with(
-            "replace", "/rackName", "Another-Rack-Name")
+        self.resource.patch_request.assert_called_once_with(
+            '/a/path', body=[dict(op='replace', path='/rackName', value='Another-Rack-Name')])
+
+    def test_should_lookup_the_enclosure_by_hostname_with_a_filter(self):
+        self.resource.data = ENCLOSURE_FROM_ONEVIEW
+        self.resource.get_all.return_value = [ENCLOSURE_FROM_ONEVIEW]
+        self.resource.new.return_value = self.resource
+
+        self.mock_ansible_module.params = PARAMS_FOR_PRESENT
+
+        EnclosureModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter="activeOaPreferredIP='172.18.1.13' OR standbyOaPreferredIP='172.18.1.13'")
+        self.resource.get_by_hostname.assert_not_called()
+        self.resource.new.assert_called_once_with(self.mock_ov_client.connection, ENCLOSURE_FROM_ONEVIEW)
+
+    def test_should_update_all_the_attributes_with_a_single_patch(self):
+        self.resource.data = ENCLOSURE_FROM_ONEVIEW
+        updated_data = dict(ENCLOSURE_FROM_ONEVIEW, name='Encl1-Renamed', rackName='Another-Rack-Name',
+                            scopeUris=['/rest/scopes/1'])
+        self.resource.patch_request.return_value = updated_data
+
+        params = deepcopy(PARAMS_WITH_CALIBRATED_MAX_POWER)
+        params['data'].update(newName='Encl1-Renamed', rackName='Another-Rack-Name', scopeUris=['/rest/scopes/1'])
+        self.mock_ansible_module.params = params
+
+        EnclosureModule().run()
+
+        self.resource.patch.assert_not_called()
+        self.resource.patch_request.assert_called_once_with('/a/path', body=[
+            dict(op='replace', path='/name', value='Encl1-Renamed'),
+            dict(op='replace', path='/rackName', value='Another-Rack-Name'),
+            dict(op='replace', path='/scopeUris', value=['/rest/scopes/1'])])
+        self.resource.update_environmental_configuration.assert_called_once_with({"calibratedMaxPower": 1750})
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=EnclosureModule.MSG_UPDATED,
+            ansible_facts=dict(enclosure=updated_data)
+        )
 
     def test_update_calibrated_max_power_for_existent_enclosure(self):
         self.resource.data = ENCLOSURE_FROM_ONEVIEW
@@ -1171,15 +1220,12 @@ class TestEnclosureModule(OneViewBaseTest):
 
         patch_return = resource_data.copy()
         patch_return['scopeUris'] = ['test']
-        patch_return_obj = self.resource.copy()
-        patch_return_obj.data = patch_return
-        self.resource.patch.return_value = patch_return_obj
+        self.resource.patch_request.return_value = patch_return
 
         EnclosureModule().run()
 
-        self.resource.patch.assert_called_once_with(operation='replace',
-                                                    path='/scopeUris',
-                                                    value=['test'])
+        self.resource.patch_request.assert_called_once_with(
+            'rest/enclosures/fake', body=[dict(op='replace', path='/scopeUris', value=['test'])])
 
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
@@ -1243,6 +1289,78 @@ class TestEnclosureModule(OneViewBaseTest):
             msg=EnclosureModule.MSG_IMPORT_CERTIFICATE_REQUEST
         )
 
+    def test_should_reset_device_bays_in_a_single_request(self):
+        self.resource.data = ENCLOSURE_FROM_ONEVIEW
+        self.resource.patch_request.return_value = ENCLOSURE_FROM_ONEVIEW
+
+        self.mock_ansible_module.params = yaml.load(PARAMS_FOR_DEVICE_BAYS_POWER_STATE_RESET)
+
+        EnclosureModule().run()
+
+        self.resource.patch.assert_not_called()
+        self.resource.patch_request.assert_called_once_with('/a/path', body=[
+            dict(op='replace', path='/deviceBays/1/bayPowerState', value='Reset'),
+            dict(op='replace', path='/deviceBays/2/bayPowerState', value='Reset')])
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            ansible_facts=dict(enclosure=ENCLOSURE_FROM_ONEVIEW),
+            msg=EnclosureModule.MSG_DEVICE_BAY_POWER_STATE_RESET
+        )
+
+    def test_should_patch_only_the_bays_that_need_changes(self):
+        enclosure = deepcopy(ENCLOSURE_FROM_ONEVIEW)
+        enclosure['managerBays'].append(dict(bayNumber=3, uidState='Off', devicePresence='Absent'))
+        self.resource.data = enclosure
+        self.resource.patch_request.return_value = enclosure
+
+        self.mock_ansible_module.params = yaml.load(PARAMS_FOR_ALL_MANAGER_BAYS_UID_ON)
+
+        EnclosureModule().run()
+
+        self.resource.patch_request.assert_called_once_with('/a/path', body=[
+            dict(op='replace', path='/managerBays/2/uidState', value='On')])
+
+    def test_should_not_patch_when_all_the_bays_are_in_the_desired_state(self):
+        enclosure = deepcopy(ENCLOSURE_FROM_ONEVIEW)
+        enclosure['managerBays'][1]['uidState'] = 'On'
+        self.resource.data = enclosure
+
+        self.mock_ansible_module.params = yaml.load(PARAMS_FOR_ALL_MANAGER_BAYS_UID_ON)
+
+        EnclosureModule().run()
+
+        self.resource.patch_request.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(enclosure=enclosure),
+            msg=EnclosureModule.MSG_MANAGER_BAY_UID_ALREADY_ON
+        )
+
+    def test_should_fail_when_one_of_the_bays_is_not_found(self):
+        self.resource.data = ENCLOSURE_FROM_ONEVIEW
+
+        params = yaml.load(PARAMS_FOR_DEVICE_BAYS_POWER_STATE_RESET)
+        params['data']['bayNumbers'] = [1, 5]
+        self.mock_ansible_module.params = params
+
+        EnclosureModule().run()
+
+        self.resource.patch_request.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY,
+                                                                   msg=EnclosureModule.MSG_BAY_NOT_FOUND)
+
+    def test_should_fail_when_the_state_does_not_apply_to_bays(self):
+        self.resource.data = ENCLOSURE_FROM_ONEVIEW
+
+        params = yaml.load(PARAMS_FOR_UID_ON)
+        params['data']['bays'] = 'all'
+        self.mock_ansible_module.params = params
+
+        EnclosureModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=EnclosureModule.MSG_BAYS_NOT_SUPPORTED.format('uid_on'))
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
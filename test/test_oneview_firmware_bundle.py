@@ -16,13 +16,21 @@
 # limitations under the License.
 ###
 
+import hashlib
+import os
+import stat
+
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import FirmwareBundleModule
+from oneview_module_loader import FirmwareBundleModule, FileChecksumCache
 
 FAKE_MSG_ERROR = 'Fake message error'
 DEFAULT_FIRMWARE_FILE_PATH = '/path/to/file.rpm'
+DEFAULT_FIRMWARE_FILE_NAME = 'hp-firmware-hdd-a1b08f8a6b-HPGH-1.1.x86_64.rpm'
+FAKE_FILE_CONTENT = b'firmware content'
+FAKE_CHECKSUM = hashlib.sha256(FAKE_FILE_CONTENT).hexdigest()
 
 DEFAULT_FIRMWARE_TEMPLATE = dict(
     bundleSize='4837926',
@@ -35,6 +43,13 @@ DEFAULT_FIRMWARE_TEMPLATE = dict(
                        swKeyNameList=['hp-firmware-hdd-a1b08f8a6b'])]
 )
 
+UPLOADED_FIRMWARE = dict(
+    name='Service Pack for ProLiant',
+    isoFileName=DEFAULT_FIRMWARE_FILE_NAME,
+    bundleSize='1024',
+    uri='/rest/firmware-drivers/hp-firmware-hdd-a1b08f8a6b-HPGH-1_1_x86_64'
+)
+
 PARAMS_FOR_PRESENT = dict(
     config='config.json',
     state='present',
@@ -44,20 +59,141 @@ PARAMS_FOR_PRESENT = dict(
 
 @pytest.mark.resource(TestFirmwareBundleModule='firmware_bundles')
 class TestFirmwareBundleModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def upload_file(self, tmpdir):
+        self.file_path = tmpdir.join(DEFAULT_FIRMWARE_FILE_NAME)
+        self.file_path.write_binary(FAKE_FILE_CONTENT)
+        self.checksum_cache = str(tmpdir.join('checksums.json'))
+        self.params = dict(PARAMS_FOR_PRESENT, file_path=str(self.file_path), checksum_cache=self.checksum_cache)
+        with mock.patch('oneview_firmware_bundle.upload_file') as self.mock_upload_file:
+            yield
+
     def test_should_upload(self):
-        self.mock_ov_client.firmware_drivers.get_by_file_name.return_value = None
-        self.resource.upload.side_effect = [DEFAULT_FIRMWARE_TEMPLATE]
+        self.mock_ov_client.firmware_drivers.get_all.return_value = []
+        self.resource.URI = '/rest/firmware-bundles'
+        self.mock_upload_file.return_value = (DEFAULT_FIRMWARE_TEMPLATE, FAKE_CHECKSUM)
 
-        self.mock_ansible_module.params = PARAMS_FOR_PRESENT
+        self.mock_ansible_module.params = self.params
 
         FirmwareBundleModule().run()
 
+        self.mock_upload_file.assert_called_once_with(self.mock_ov_client.connection,
+                                                      '/rest/firmware-bundles',
+                                                      str(self.file_path))
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_UPLOADED,
+            checksum=FAKE_CHECKSUM,
             ansible_facts=dict(firmware_bundle=DEFAULT_FIRMWARE_TEMPLATE)
         )
 
+    def test_should_record_the_checksum_of_the_uploaded_bundle(self):
+        self.mock_ov_client.firmware_drivers.get_all.return_value = []
+        self.mock_upload_file.return_value = (UPLOADED_FIRMWARE, FAKE_CHECKSUM)
+
+        self.mock_ansible_module.params = self.params
+
+        FirmwareBundleModule().run()
+
+        cache = FileChecksumCache(self.checksum_cache)
+        assert cache.get_uploaded(UPLOADED_FIRMWARE['uri']) == FAKE_CHECKSUM
+        assert cache.checksum(str(self.file_path)) == FAKE_CHECKSUM
+
+    def test_should_not_upload_when_the_uploaded_checksum_matches(self):
+        cache = FileChecksumCache(self.checksum_cache)
+        cache.set_uploaded(UPLOADED_FIRMWARE['uri'], FAKE_CHECKSUM)
+        cache.save()
+        self.mock_ov_client.firmware_drivers.get_all.return_value = [UPLOADED_FIRMWARE]
+
+        self.mock_ansible_module.params = self.params
+
+        FirmwareBundleModule().run()
+
+        self.mock_upload_file.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+            checksum=FAKE_CHECKSUM,
+            ansible_facts=dict(firmware_bundle=UPLOADED_FIRMWARE)
+        )
+
+    def test_should_upload_when_the_uploaded_checksum_differs(self):
+        cache = FileChecksumCache(self.checksum_cache)
+        cache.set_uploaded(UPLOADED_FIRMWARE['uri'], 'another checksum')
+        cache.save()
+        self.mock_ov_client.firmware_drivers.get_all.return_value = [UPLOADED_FIRMWARE]
+        self.mock_upload_file.return_value = (UPLOADED_FIRMWARE, FAKE_CHECKSUM)
+
+        self.mock_ansible_module.params = self.params
+
+        FirmwareBundleModule().run()
+
+        self.mock_upload_file.assert_called_once_with(mock.ANY, mock.ANY, str(self.file_path))
+        assert FileChecksumCache(self.checksum_cache).get_uploaded(UPLOADED_FIRMWARE['uri']) == FAKE_CHECKSUM
+
+    def test_should_not_upload_when_the_file_name_and_size_match(self):
+        self.mock_ov_client.firmware_drivers.get_all.return_value = [
+            dict(UPLOADED_FIRMWARE, isoFileName='another.iso'),
+            dict(DEFAULT_FIRMWARE_TEMPLATE, bundleSize=str(len(FAKE_FILE_CONTENT)), uri='/rest/firmware-drivers/hotfix')]
+
+        self.mock_ansible_module.params = self.params
+
+        FirmwareBundleModule().run()
+
+        self.mock_upload_file.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=FirmwareBundleModule.MSG_FIRMWARE_BUNDLE_ALREADY_PRESENT,
+            checksum=FAKE_CHECKSUM,
+            ansible_facts=dict(firmware_bundle=dict(DEFAULT_FIRMWARE_TEMPLATE, bundleSize=str(len(FAKE_FILE_CONTENT)),
+                                                    uri='/rest/firmware-drivers/hotfix'))
+        )
+
+    def test_should_reuse_the_cached_checksum_of_an_unchanged_file(self):
+        cache = FileChecksumCache(self.checksum_cache)
+        cache.store(str(self.file_path), 'cached checksum')
+        cache.save()
+
+        with mock.patch('hashlib.sha256') as mock_sha256:
+            assert FileChecksumCache(self.checksum_cache).checksum(str(self.file_path)) == 'cached checksum'
+
+        mock_sha256.assert_not_called()
+
+    def test_should_hash_again_a_modified_file(self):
+        cache = FileChecksumCache(self.checksum_cache)
+        cache.store(str(self.file_path), 'cached checksum')
+        cache.save()
+        self.file_path.write_binary(FAKE_FILE_CONTENT + b'modified')
+
+        checksum = FileChecksumCache(self.checksum_cache).checksum(str(self.file_path))
+
+        assert checksum == hashlib.sha256(FAKE_FILE_CONTENT + b'modified').hexdigest()
+
+    def test_should_hash_again_a_replaced_file_with_the_same_size_and_modification_time(self, tmpdir):
+        cache = FileChecksumCache(self.checksum_cache)
+        cache.store(str(self.file_path), 'cached checksum')
+        cache.save()
+        replacement = tmpdir.join('replacement.iso')
+        replacement.write_binary(FAKE_FILE_CONTENT.swapcase())
+        file_stat = os.stat(str(self.file_path))
+        os.utime(str(replacement), (file_stat.st_atime, file_stat.st_mtime))
+        os.rename(str(replacement), str(self.file_path))
+
+        checksum = FileChecksumCache(self.checksum_cache).checksum(str(self.file_path))
+
+        assert checksum == hashlib.sha256(FAKE_FILE_CONTENT.swapcase()).hexdigest()
+
+    def test_should_keep_the_default_checksum_cache_private_in_the_cache_directory_of_the_user(self, tmpdir):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': str(tmpdir.join('cache'))}):
+            os.environ.pop('ONEVIEW_CHECKSUM_CACHE', None)
+            cache = FileChecksumCache()
+            cache.checksum(str(self.file_path))
+            cache.save()
+
+        assert cache.path == str(tmpdir.join('cache', 'oneview', 'checksums.json'))
+        assert stat.S_IMODE(os.stat(str(tmpdir.join('cache', 'oneview'))).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
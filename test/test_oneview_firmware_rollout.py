@@ -0,0 +1,210 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import json
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import FirmwareRolloutModule
+
+SPP_URI = '/rest/firmware-drivers/SPP-2020'
+
+PARAMS_ROLLOUT = dict(
+    config='config.json',
+    spp='SPP-2020',
+    logical_interconnects=[dict(name='LI-A1', redundancyDomain='A'), dict(name='LI-B1', redundancyDomain='B'),
+                           dict(name='LI-A2', redundancyDomain='A')],
+    logical_enclosures=None,
+    interconnect_firmware=dict(force=False),
+    enclosure_firmware=dict(firmwareUpdateOn='SharedInfrastructureOnly'),
+    max_per_domain=1,
+    max_workers=10,
+    state_file=None
+)
+
+LOGICAL_ENCLOSURES = [dict(name='LE-1', uri='/rest/logical-enclosures/1', enclosureGroupUri='/rest/enclosure-groups/1',
+                           logicalInterconnectUris=['/rest/logical-interconnects/LI-A1',
+                                                    '/rest/logical-interconnects/LI-B1',
+                                                    '/rest/logical-interconnects/LI-A2'],
+                           firmware=dict(firmwareBaselineUri='/rest/firmware-drivers/SPP-2019'))]
+
+
+@pytest.mark.resource(TestFirmwareRolloutModule='logical_interconnects')
+class TestFirmwareRolloutModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def resources(self, setUp, mock_ov_client):
+        self.logical_interconnects = {}
+        for name in ['LI-A1', 'LI-B1', 'LI-A2']:
+            logical_interconnect = mock.Mock(data=dict(name=name, uri='/rest/logical-interconnects/' + name))
+            logical_interconnect.get_firmware.return_value = dict(sppUri='/rest/firmware-drivers/SPP-2019',
+                                                                  state='Activated')
+            self.logical_interconnects[name] = logical_interconnect
+        self.logical_enclosure = mock.Mock(data=LOGICAL_ENCLOSURES[0])
+
+        self.resource.get_by_name.side_effect = lambda name: self.logical_interconnects.get(name)
+        self.mock_ov_client.logical_enclosures.get_all.return_value = LOGICAL_ENCLOSURES
+        self.mock_ov_client.logical_enclosures.get_by_name.side_effect = \
+            lambda name: self.logical_enclosure if name == 'LE-1' else None
+
+        self.activated = []
+        for logical_interconnect in self.logical_interconnects.values():
+            logical_interconnect.install_firmware.side_effect = self.install_firmware(logical_interconnect)
+
+    def install_firmware(self, logical_interconnect):
+        def install_firmware(options):
+            if options['command'] == 'Activate':
+                self.activated.append(logical_interconnect.data['name'])
+            return dict(sppUri=options['sppUri'])
+        return install_firmware
+
+    def test_should_stage_all_and_activate_in_waves_per_domain(self):
+        self.mock_ansible_module.params = PARAMS_ROLLOUT
+
+        FirmwareRolloutModule().run()
+
+        for logical_interconnect in self.logical_interconnects.values():
+            assert logical_interconnect.install_firmware.call_args_list == [
+                mock.call(dict(force=False, command='Stage', sppUri=SPP_URI)),
+                mock.call(dict(force=False, command='Activate', sppUri=SPP_URI))]
+        assert sorted(self.activated[:2]) == ['LI-A1', 'LI-B1']
+        assert self.activated[2] == 'LI-A2'
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=FirmwareRolloutModule.MSG_COMPLETED,
+            ansible_facts=dict(firmware_rollout=dict(
+                sppUri=SPP_URI,
+                waves=2,
+                targets=[dict(name='LI-A1', type='logical_interconnect', status='activated'),
+                         dict(name='LI-B1', type='logical_interconnect', status='activated'),
+                         dict(name='LI-A2', type='logical_interconnect', status='activated')]))
+        )
+
+    def test_should_update_the_logical_enclosures_in_the_activation_waves(self):
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, logical_interconnects=None, logical_enclosures=['LE-1'])
+
+        FirmwareRolloutModule().run()
+
+        self.mock_ov_client.logical_enclosures.get_all.assert_not_called()
+        self.logical_enclosure.patch.assert_called_once_with(
+            operation='replace', path='/firmware',
+            value=dict(firmwareUpdateOn='SharedInfrastructureOnly', firmwareBaselineUri=SPP_URI))
+
+    def test_should_skip_the_targets_already_with_the_firmware(self):
+        self.logical_interconnects['LI-A1'].get_firmware.return_value = dict(sppUri=SPP_URI, state='Activated')
+        self.logical_enclosure.data = dict(LOGICAL_ENCLOSURES[0], logicalInterconnectUris=[],
+                                           firmware=dict(firmwareBaselineUri=SPP_URI))
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, logical_interconnects=['LI-A1'],
+                                               logical_enclosures=['LE-1'])
+
+        FirmwareRolloutModule().run()
+
+        self.logical_interconnects['LI-A1'].install_firmware.assert_not_called()
+        self.logical_enclosure.patch.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=FirmwareRolloutModule.MSG_ALREADY_COMPLETED,
+            ansible_facts=dict(firmware_rollout=dict(
+                sppUri=SPP_URI,
+                waves=0,
+                targets=[dict(name='LI-A1', type='logical_interconnect', status='current'),
+                         dict(name='LE-1', type='logical_enclosure', status='current')]))
+        )
+
+    def test_should_stop_after_a_wave_with_failures_and_save_the_state(self, tmpdir):
+        state_file = str(tmpdir.join('rollout.json'))
+        self.logical_interconnects['LI-B1'].install_firmware.side_effect = \
+            lambda options: self.raise_on_activate(options)
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, state_file=state_file)
+
+        FirmwareRolloutModule().run()
+
+        assert 'LI-A2' not in self.activated
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FirmwareRolloutModule.MSG_ROLLOUT_FAILED.format(1, 'LI-B1: Activation failed'))
+        with open(state_file) as saved:
+            assert json.load(saved) == dict(sppUri=SPP_URI, targets={
+                'logical_interconnect/LI-A1': dict(status='activated'),
+                'logical_interconnect/LI-B1': dict(status='failed', error='Activation failed'),
+                'logical_interconnect/LI-A2': dict(status='staged')})
+
+    def raise_on_activate(self, options):
+        if options['command'] == 'Activate':
+            raise Exception('Activation failed')
+
+    def test_should_resume_the_rollout_from_the_state_file(self, tmpdir):
+        state_file = tmpdir.join('rollout.json')
+        state_file.write(json.dumps(dict(sppUri=SPP_URI, targets={
+            'logical_interconnect/LI-A1': dict(status='activated'),
+            'logical_interconnect/LI-B1': dict(status='failed', error='Activation failed'),
+            'logical_interconnect/LI-A2': dict(status='staged')})))
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, state_file=str(state_file))
+
+        FirmwareRolloutModule().run()
+
+        self.logical_interconnects['LI-A1'].install_firmware.assert_not_called()
+        self.logical_interconnects['LI-A1'].get_firmware.assert_not_called()
+        assert [call[0][0]['command'] for call in self.logical_interconnects['LI-B1'].install_firmware.call_args_list] \
+            == ['Stage', 'Activate']
+        assert [call[0][0]['command'] for call in self.logical_interconnects['LI-A2'].install_firmware.call_args_list] \
+            == ['Activate']
+        assert json.loads(state_file.read())['targets']['logical_interconnect/LI-B1'] == dict(status='activated')
+
+    def test_should_discard_the_state_of_another_firmware(self, tmpdir):
+        state_file = tmpdir.join('rollout.json')
+        state_file.write(json.dumps(dict(sppUri='/rest/firmware-drivers/SPP-2019', targets={
+            'logical_interconnect/LI-A1': dict(status='activated')})))
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, logical_interconnects=['LI-A1'],
+                                               state_file=str(state_file))
+
+        FirmwareRolloutModule().run()
+
+        assert self.activated == ['LI-A1']
+
+    def test_should_fail_when_the_stage_fails(self):
+        self.logical_interconnects['LI-A2'].install_firmware.side_effect = Exception('Stage failed')
+        self.mock_ansible_module.params = PARAMS_ROLLOUT
+
+        FirmwareRolloutModule().run()
+
+        assert sorted(self.activated) == ['LI-A1', 'LI-B1']
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FirmwareRolloutModule.MSG_STAGE_FAILED.format('LI-A2: Stage failed'))
+
+    def test_should_fail_when_the_logical_enclosure_contains_a_targeted_logical_interconnect(self):
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, logical_enclosures=['LE-1'])
+
+        FirmwareRolloutModule().run()
+
+        for logical_interconnect in self.logical_interconnects.values():
+            logical_interconnect.install_firmware.assert_not_called()
+        self.logical_enclosure.patch.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FirmwareRolloutModule.MSG_OVERLAPPING_TARGETS.format('LE-1', 'LI-A1, LI-B1, LI-A2'))
+
+    def test_should_fail_when_the_logical_interconnect_is_not_found(self):
+        self.mock_ansible_module.params = dict(PARAMS_ROLLOUT, logical_interconnects=['LI-C1'])
+
+        FirmwareRolloutModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=FirmwareRolloutModule.MSG_LOGICAL_INTERCONNECT_NOT_FOUND + 'LI-C1')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -186,6 +186,16 @@ PARAMS_FIRMWARE_WITH_SPP_URI = dict(
               firmware=dict(command='Update',
                             sppUri='/rest/firmware-drivers/filename-of-the-firmware-to-install')))
 
+PARAMS_CONFIGURED = dict(
+    config='config.json',
+    state='configured',
+    data=dict(name='Name of the Logical Interconnect',
+              ethernetSettings=dict(macRefreshInterval=10),
+              qosConfiguration=dict(activeQosConfig=dict(configType='Passthrough')),
+              snmpConfiguration=dict(enabled=False),
+              portMonitor=dict(enablePortMonitor=False))
+)
+
 
 @pytest.mark.resource(TestLogicalInterconnectModule='logical_interconnects')
 class TestLogicalInterconnectModule(OneViewBaseTest):
@@ -627,6 +637,123 @@ class TestLogicalInterconnectModule(OneViewBaseTest):
             msg=LogicalInterconnectModule.MSG_NO_CHANGES_PROVIDED
         )
 
+    def test_should_update_only_the_sections_that_differ(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.get_qos_aggregated_configuration.return_value = self.qos_config
+        self.resource.get_snmp_configuration.return_value = self.snmp_config
+        self.resource.get_port_monitor.return_value = self.monitor_config
+        self.resource.update_qos_aggregated_configuration.return_value = self.response
+        self.resource.update_port_monitor.return_value = {'enablePortMonitor': False}
+
+        self.mock_ansible_module.params = PARAMS_CONFIGURED
+
+        LogicalInterconnectModule().run()
+
+        self.resource.update_ethernet_settings.assert_not_called()
+        self.resource.update_snmp_configuration.assert_not_called()
+        self.resource.update_qos_aggregated_configuration.assert_called_once_with(
+            dict(self.qos_config, activeQosConfig=dict(configType='Passthrough')))
+        self.resource.update_port_monitor.assert_called_once_with({'enablePortMonitor': False})
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectModule.MSG_CONFIGURED.format('qosConfiguration, portMonitor'),
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT,
+                               qos_configuration=self.response,
+                               snmp_configuration=self.snmp_config,
+                               port_monitor={'enablePortMonitor': False},
+                               logical_interconnect_configured=['qosConfiguration', 'portMonitor'])
+        )
+
+    def test_should_do_nothing_when_no_section_differs(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.resource.get_snmp_configuration.return_value = self.snmp_config
+        self.resource.get_port_monitor.return_value = self.monitor_config
+
+        self.mock_ansible_module.params = dict(PARAMS_CONFIGURED, data=dict(
+            name='Name of the Logical Interconnect', ethernetSettings=dict(macRefreshInterval=10),
+            snmpConfiguration=dict(enabled=False), portMonitor=dict(enablePortMonitor=True)))
+
+        LogicalInterconnectModule().run()
+
+        self.resource.get_qos_aggregated_configuration.assert_not_called()
+        self.resource.update_snmp_configuration.assert_not_called()
+        self.resource.update_port_monitor.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=LogicalInterconnectModule.MSG_NO_CHANGES_PROVIDED,
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT,
+                               snmp_configuration=self.snmp_config,
+                               port_monitor=self.monitor_config,
+                               logical_interconnect_configured=[])
+        )
+
+    def test_should_configure_the_logical_interconnect_settings_telemetry_and_scopes(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        updated_li = dict(LOGICAL_INTERCONNECT, scopeUris=['/rest/scopes/1'])
+        self.resource.update_ethernet_settings.return_value = LOGICAL_INTERCONNECT
+        self.resource.patch.return_value = mock.Mock(data=updated_li)
+        self.resource.update_telemetry_configurations.return_value = LOGICAL_INTERCONNECT
+
+        self.mock_ansible_module.params = dict(PARAMS_CONFIGURED, data=dict(
+            name='Name of the Logical Interconnect', ethernetSettings=dict(macRefreshInterval=7),
+            telemetryConfiguration=dict(sampleCount=12), scopeUris=['/rest/scopes/1']))
+
+        LogicalInterconnectModule().run()
+
+        self.resource.update_ethernet_settings.assert_called_once_with(
+            dict(LOGICAL_INTERCONNECT['ethernetSettings'], macRefreshInterval=7))
+        self.resource.patch.assert_called_once_with(operation='replace', path='/scopeUris', value=['/rest/scopes/1'])
+        self.resource.update_telemetry_configurations.assert_called_once_with(
+            dict(LOGICAL_INTERCONNECT['telemetryConfiguration'], sampleCount=12))
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=LogicalInterconnectModule.MSG_CONFIGURED.format(
+                'ethernetSettings, telemetryConfiguration, scopeUris'),
+            ansible_facts=dict(logical_interconnect=updated_li,
+                               telemetry_configuration=LOGICAL_INTERCONNECT['telemetryConfiguration'],
+                               scope_uris=['/rest/scopes/1'],
+                               logical_interconnect_configured=['ethernetSettings', 'telemetryConfiguration',
+                                                                'scopeUris'])
+        )
+
+    def test_should_update_the_sections_in_sequence_and_report_the_updated_ones_on_failure(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        calls = []
+        self.resource.get_qos_aggregated_configuration.return_value = self.qos_config
+        self.resource.get_snmp_configuration.return_value = self.snmp_config
+        self.resource.get_port_monitor.return_value = self.monitor_config
+        self.resource.update_ethernet_settings.side_effect = lambda data: calls.append('ethernetSettings') or LOGICAL_INTERCONNECT
+        self.resource.update_qos_aggregated_configuration.side_effect = \
+            lambda data: calls.append('qosConfiguration') or self.response
+        self.resource.update_port_monitor.side_effect = Exception('Port monitor update failed')
+
+        self.mock_ansible_module.params = dict(PARAMS_CONFIGURED, data=dict(
+            PARAMS_CONFIGURED['data'], ethernetSettings=dict(macRefreshInterval=7)))
+
+        LogicalInterconnectModule().run()
+
+        assert calls == ['ethernetSettings', 'qosConfiguration']
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=LogicalInterconnectModule.MSG_CONFIGURE_FAILED.format(
+                'portMonitor', 'ethernetSettings, qosConfiguration', 'Port monitor update failed'),
+            changed=True,
+            ansible_facts=dict(logical_interconnect=LOGICAL_INTERCONNECT,
+                               qos_configuration=self.response,
+                               snmp_configuration=self.snmp_config,
+                               port_monitor=self.monitor_config,
+                               logical_interconnect_configured=['ethernetSettings', 'qosConfiguration'])
+        )
+
+    def test_should_fail_when_no_section_is_provided_to_configure(self):
+        self.resource.data = LOGICAL_INTERCONNECT
+        self.mock_ansible_module.params = dict(PARAMS_CONFIGURED, data=dict(name='Name of the Logical Interconnect'))
+
+        LogicalInterconnectModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=LogicalInterconnectModule.MSG_NO_OPTIONS_PROVIDED)
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
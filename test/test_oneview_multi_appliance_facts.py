@@ -0,0 +1,124 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import MultiApplianceFactsModule, OneViewClient, ONEVIEW_MODULE_UTILS_PATH
+
+PARAMS_GET_ALL = dict(
+    appliances=[dict(name='appliance-1', config='appliance-1.json'),
+                dict(config='appliance-2.json')],
+    resources=['server_hardware',
+               dict(name='alerts', params=dict(filter="severity='Critical'"))],
+    max_workers=4,
+    ignore_unreachable=False
+)
+
+
+@pytest.mark.resource(TestMultiApplianceFactsModule='server_hardware')
+class TestMultiApplianceFactsModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def appliance_clients(self, mock_ov_client):
+        self.first_client = mock.Mock()
+        self.first_client.server_hardware.get_all.return_value = [{'name': 'Encl1, bay 1'}]
+        self.first_client.alerts.get_all.return_value = [{'severity': 'Critical'}]
+        self.second_client = mock.Mock()
+        self.second_client.server_hardware.get_all.return_value = [{'name': 'Encl2, bay 1'}, {'name': 'Encl2, bay 2'}]
+        self.second_client.alerts.get_all.return_value = []
+        clients = {'appliance-1.json': self.first_client, 'appliance-2.json': self.second_client}
+
+        with mock.patch.object(OneViewClient, 'from_json_file') as self.mock_from_json_file:
+            self.mock_from_json_file.side_effect = lambda config: clients[config]
+            yield
+
+    def test_should_merge_facts_tagged_with_the_appliance(self):
+        self.mock_ansible_module.params = PARAMS_GET_ALL
+
+        MultiApplianceFactsModule().run()
+
+        self.first_client.alerts.get_all.assert_called_once_with(filter="severity='Critical'")
+        self.second_client.server_hardware.get_all.assert_called_once_with()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(multi_appliance_facts=dict(
+                server_hardware=[{'name': 'Encl1, bay 1', 'appliance': 'appliance-1'},
+                                 {'name': 'Encl2, bay 1', 'appliance': 'appliance-2.json'},
+                                 {'name': 'Encl2, bay 2', 'appliance': 'appliance-2.json'}],
+                alerts=[{'severity': 'Critical', 'appliance': 'appliance-1'}]))
+        )
+
+    def test_should_fail_when_an_appliance_fails(self):
+        self.second_client.alerts.get_all.side_effect = Exception('Connection refused')
+        self.mock_ansible_module.params = PARAMS_GET_ALL
+
+        MultiApplianceFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=MultiApplianceFactsModule.MSG_APPLIANCE_FAILED.format('appliance-2.json', 'Connection refused')
+        )
+
+    def test_should_report_unreachable_appliances_when_ignored(self):
+        self.mock_from_json_file.side_effect = [self.first_client, Exception('Login failed')]
+        params = dict(PARAMS_GET_ALL, ignore_unreachable=True, max_workers=1)
+        self.mock_ansible_module.params = params
+
+        MultiApplianceFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(
+                multi_appliance_facts=dict(server_hardware=[{'name': 'Encl1, bay 1', 'appliance': 'appliance-1'}],
+                                           alerts=[{'severity': 'Critical', 'appliance': 'appliance-1'}]),
+                multi_appliance_failures={'appliance-2.json': 'Login failed'})
+        )
+
+    def test_should_fail_when_appliance_connection_is_missing(self):
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, appliances=[dict(name='appliance-1')])
+
+        MultiApplianceFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=MultiApplianceFactsModule.MSG_APPLIANCE_CONNECTION_MISSING + 'appliance-1'
+        )
+
+    def test_should_fail_when_resource_is_not_supported(self):
+        self.first_client.invalid_resource = None
+        self.second_client.invalid_resource = None
+        self.mock_ansible_module.params = dict(PARAMS_GET_ALL, resources=['invalid_resource'])
+
+        MultiApplianceFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=MultiApplianceFactsModule.MSG_RESOURCE_NOT_SUPPORTED + 'invalid_resource'
+        )
+
+    def test_should_not_log_the_passwords_of_the_appliances(self):
+        with mock.patch(ONEVIEW_MODULE_UTILS_PATH + '.AnsibleModule') as mock_ansible_module_init:
+            MultiApplianceFactsModule()
+
+        argument_spec = mock_ansible_module_init.call_args[1]['argument_spec']
+        assert argument_spec['appliances']['options']['password']['no_log'] is True
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import csv
+import json
+
+import mock
+import pytest
+
+import oneview_resource_export
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import OneViewModuleException, ResourceExportModule
+
+SERVERS = [
+    dict(name='Encl1, bay 1', powerState='On', processorCount=2, memoryMb=262144,
+         mpFirmwareVersion='2.55', portMap=dict(deviceSlots=[dict(slotNumber=1)])),
+    dict(name='Encl1, bay 2', powerState='Off', processorCount=1, memoryMb=131072,
+         mpFirmwareVersion=None, portMap=dict(deviceSlots=[])),
+    dict(name='Encl1, bay 3', powerState='On', processorCount='unknown', memoryMb=65536),
+]
+
+
+class FakeResource(object):
+    def __init__(self, resources):
+        self.resources = resources
+        self.calls = []
+
+    def get_all(self, start=0, count=-1, filter='', sort=''):
+        self.calls.append(dict(start=start, count=count, filter=filter, sort=sort))
+        return self.resources[start:start + count]
+
+
+@pytest.mark.resource(TestResourceExportModule='server_hardware')
+class TestResourceExportModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def server_hardware(self, setUp, mock_ov_client):
+        self.fake_resource = FakeResource(SERVERS)
+        mock_ov_client.server_hardware = self.fake_resource
+
+    def test_should_export_to_csv_page_by_page(self, tmpdir):
+        dest = str(tmpdir.join('server_hardware.csv'))
+        self.mock_ansible_module.params = dict(config='config.json', resource='server_hardware', dest=dest,
+                                               format='csv', page_size=2,
+                                               columns=['name', 'processorCount', 'mpFirmwareVersion'],
+                                               params=dict(filter="powerState='On'"))
+
+        ResourceExportModule().run()
+
+        assert self.fake_resource.calls == [dict(start=0, count=2, filter="powerState='On'", sort=''),
+                                            dict(start=2, count=2, filter="powerState='On'", sort='')]
+        with open(dest) as csv_file:
+            assert list(csv.reader(csv_file)) == [['name', 'processorCount', 'mpFirmwareVersion'],
+                                                  ['Encl1, bay 1', '2', '2.55'],
+                                                  ['Encl1, bay 2', '1', ''],
+                                                  ['Encl1, bay 3', '', '']]
+        columns = [dict(name='name', type='string'),
+                   dict(name='processorCount', type='int'),
+                   dict(name='mpFirmwareVersion', type='string')]
+        with open(dest + '.schema.json') as schema_file:
+            assert json.load(schema_file) == columns
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ResourceExportModule.MSG_EXPORTED,
+            ansible_facts=dict(resource_export=dict(path=dest, format='csv', count=3, columns=columns))
+        )
+
+    def test_should_flatten_the_nested_fields_when_columns_are_not_provided(self, tmpdir):
+        dest = str(tmpdir.join('server_hardware.csv'))
+        self.mock_ansible_module.params = dict(config='config.json', resource='server_hardware', dest=dest,
+                                               format='csv', page_size=500, params=dict(count=2))
+
+        ResourceExportModule().run()
+
+        assert self.fake_resource.calls == [dict(start=0, count=2, filter='', sort='')]
+        with open(dest) as csv_file:
+            rows = list(csv.reader(csv_file))
+        assert rows[0] == ['memoryMb', 'mpFirmwareVersion', 'name', 'portMap.deviceSlots', 'powerState',
+                           'processorCount']
+        assert rows[1][3] == '[{"slotNumber": 1}]'
+        assert rows[2][3] == '[]'
+
+    def test_should_export_to_parquet(self, tmpdir):
+        pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+        dest = str(tmpdir.join('server_hardware.parquet'))
+        self.mock_ansible_module.params = dict(config='config.json', resource='server_hardware', dest=dest,
+                                               format='auto', page_size=2, columns=['name', 'memoryMb'])
+
+        ResourceExportModule().run()
+
+        parquet_file = pyarrow_parquet.ParquetFile(dest)
+        assert parquet_file.metadata.num_row_groups == 2
+        assert parquet_file.read().to_pydict() == dict(name=['Encl1, bay 1', 'Encl1, bay 2', 'Encl1, bay 3'],
+                                                       memoryMb=[262144, 131072, 65536])
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ResourceExportModule.MSG_EXPORTED,
+            ansible_facts=dict(resource_export=dict(path=dest, format='parquet', count=3,
+                                                    columns=[dict(name='name', type='string'),
+                                                             dict(name='memoryMb', type='int')]))
+        )
+
+    def test_should_keep_the_previous_export_when_the_export_fails(self, tmpdir):
+        dest = tmpdir.join('server_hardware.csv')
+        dest.write('name\nprevious\n')
+        self.fake_resource.get_all = mock.Mock(side_effect=[SERVERS[:2], OneViewModuleException('Connection lost')])
+        self.mock_ansible_module.params = dict(config='config.json', resource='server_hardware', dest=str(dest),
+                                               format='csv', page_size=2, columns=['name'])
+
+        ResourceExportModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(exception=mock.ANY, msg='Connection lost')
+        assert dest.read() == 'name\nprevious\n'
+        assert sorted(path.basename for path in tmpdir.listdir()) == ['server_hardware.csv']
+
+    def test_should_fail_when_parquet_is_requested_without_pyarrow(self, tmpdir):
+        self.mock_ansible_module.params = dict(config='config.json', resource='server_hardware',
+                                               dest=str(tmpdir.join('server_hardware.parquet')),
+                                               format='parquet', page_size=500)
+
+        with mock.patch.object(oneview_resource_export, 'HAS_PYARROW', False):
+            ResourceExportModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ResourceExportModule.MSG_PYARROW_REQUIRED
+        )
+
+    def test_should_fail_when_resource_is_not_supported(self, tmpdir):
+        self.mock_ansible_module.params = dict(config='config.json', resource='_connection',
+                                               dest=str(tmpdir.join('export.csv')), format='csv', page_size=500)
+
+        ResourceExportModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ResourceExportModule.MSG_RESOURCE_NOT_SUPPORTED + '_connection'
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import OneViewMirror, ResourceMirrorModule
+
+SERVER_HARDWARE = [dict(uri='/rest/server-hardware/1', name='server-1', powerState='On'),
+                   dict(uri='/rest/server-hardware/2', name='server-2', powerState='Off')]
+
+CHANGE = dict(changeType='Updated', resourceUri='/rest/server-hardware/2',
+              resource=dict(SERVER_HARDWARE[1], powerState='On'))
+
+
+class StandInClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StandInListener(object):
+    """
+    Stands in for the SCMB listener, publishing the changes when started.
+    """
+    instances = []
+
+    def __init__(self, host, routing_keys, on_change):
+        self.host = host
+        self.routing_keys = routing_keys
+        self.on_change = on_change
+        self.failed = False
+        self.stopped = False
+        StandInListener.instances.append(self)
+
+    def start(self):
+        self.on_change(CHANGE)
+        return True
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.mark.resource(TestResourceMirrorModule='server_hardware')
+class TestResourceMirrorModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def mirror_resources(self, setUp, mock_ov_client, tmpdir):
+        self.path = str(tmpdir.join('mirror.db'))
+        self.resource.URI = '/rest/server-hardware'
+        self.resource.get_all.side_effect = lambda start, count: SERVER_HARDWARE[start:start + count]
+        self.mock_ov_client.connection.get_host.return_value = '172.16.101.48'
+        self.params = dict(config='config.json', resources=['server_hardware'], mirror=self.path, page_size=500,
+                           follow=0, resync_interval=3600, max_reconnect_interval=300)
+
+        StandInListener.instances = []
+        self.clock = StandInClock()
+        patchers = [mock.patch('oneview_resource_mirror.ScmbListener', StandInListener),
+                    mock.patch('oneview_resource_mirror.time', self.clock)]
+        for patcher in patchers:
+            patcher.start()
+        yield
+        for patcher in patchers:
+            patcher.stop()
+
+    def mirrored_resources(self):
+        mirror = OneViewMirror(self.path)
+        try:
+            return mirror.get_all('/rest/server-hardware')
+        finally:
+            mirror.close()
+
+    def test_should_take_a_snapshot_of_the_resources(self):
+        self.mock_ansible_module.params = self.params
+
+        ResourceMirrorModule().run()
+
+        assert self.mirrored_resources() == SERVER_HARDWARE
+        assert StandInListener.instances == []
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ResourceMirrorModule.MSG_MIRRORED,
+            ansible_facts=dict(resource_mirror=dict(path=self.path, resources=dict(server_hardware=2),
+                                                    snapshots=1, changes=0))
+        )
+
+    def test_should_follow_the_changes_and_take_periodic_snapshots(self):
+        self.mock_ansible_module.params = dict(self.params, follow=10, resync_interval=4)
+        self.resource.get_all.side_effect = lambda start, count: [] if self.clock.now else SERVER_HARDWARE
+
+        ResourceMirrorModule().run()
+
+        listener = StandInListener.instances[0]
+        assert listener.host == '172.16.101.48'
+        assert listener.routing_keys == ['scmb.server-hardware.#']
+        assert listener.stopped
+        assert self.clock.now == 10
+        assert self.mirrored_resources() == []
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ResourceMirrorModule.MSG_MIRRORED,
+            ansible_facts=dict(resource_mirror=dict(path=self.path, resources=dict(server_hardware=0),
+                                                    snapshots=3, changes=1))
+        )
+
+    def test_should_apply_the_changes_received_during_the_first_snapshot(self):
+        self.mock_ansible_module.params = dict(self.params, follow=1)
+
+        ResourceMirrorModule().run()
+
+        assert self.mirrored_resources() == [SERVER_HARDWARE[0], CHANGE['resource']]
+
+    def test_should_renew_the_session_before_each_new_snapshot(self):
+        self.mock_ansible_module.params = dict(self.params, follow=10, resync_interval=4)
+
+        ResourceMirrorModule().run()
+
+        assert self.mock_ov_client.connection.logout.call_count == 2
+
+    def test_should_reconnect_and_take_a_snapshot_when_the_connection_is_lost(self):
+        self.mock_ansible_module.params = dict(self.params, follow=3)
+        clock_sleep = self.clock.sleep
+
+        def sleep(seconds):
+            clock_sleep(seconds)
+            if self.clock.now == 1:
+                StandInListener.instances[0].failed = True
+
+        with mock.patch.object(self.clock, 'sleep', side_effect=sleep):
+            ResourceMirrorModule().run()
+
+        assert len(StandInListener.instances) == 2
+        assert StandInListener.instances[0].stopped
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['resource_mirror']
+        assert facts['snapshots'] == 2
+        assert facts['changes'] == 2
+
+    def test_should_back_off_while_unable_to_reconnect(self):
+        self.mock_ansible_module.params = dict(self.params, follow=20, max_reconnect_interval=8)
+        clock_sleep = self.clock.sleep
+
+        def sleep(seconds):
+            clock_sleep(seconds)
+            if self.clock.now == 1:
+                StandInListener.instances[0].failed = True
+
+        def start(listener):
+            listener.on_change(CHANGE)
+            listener.failed = len(StandInListener.instances) > 1
+            return not listener.failed
+
+        with mock.patch.object(self.clock, 'sleep', side_effect=sleep), \
+                mock.patch.object(StandInListener, 'start', start):
+            ResourceMirrorModule().run()
+
+        # Reconnects at 1, 3, 7 and 15 seconds, and then every 8 seconds
+        assert len(StandInListener.instances) == 5
+
+    def test_should_keep_following_and_back_off_while_unable_to_take_a_snapshot(self):
+        self.mock_ansible_module.params = dict(self.params, follow=20, resync_interval=4)
+
+        def get_all(start, count):
+            if 4 <= self.clock.now < 10:
+                raise Exception('Service unavailable')
+            return SERVER_HARDWARE[start:start + count]
+
+        self.resource.get_all.side_effect = get_all
+
+        ResourceMirrorModule().run()
+
+        # Fails at 4 and 6 seconds, and then takes the snapshots at 10, 14 and 18 seconds
+        assert self.mock_ansible_module.log.call_count == 2
+        assert self.mirrored_resources() == SERVER_HARDWARE
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['resource_mirror']
+        assert facts['snapshots'] == 4
+
+    def test_should_fail_when_unable_to_follow_the_changes(self):
+        self.mock_ansible_module.params = dict(self.params, follow=-1)
+
+        with mock.patch.object(StandInListener, 'start', return_value=False):
+            ResourceMirrorModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ResourceMirrorModule.MSG_SCMB_UNAVAILABLE)
+
+    def test_should_fail_when_the_resource_is_not_supported(self):
+        self.mock_ansible_module.params = dict(self.params, resources=['_connection'])
+
+        ResourceMirrorModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ResourceMirrorModule.MSG_RESOURCE_NOT_SUPPORTED + '_connection')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -84,6 +84,11 @@ PARAMS_NO_RESOURCE_ASSIGNMENTS = dict(
 
 @pytest.mark.resource(TestScopeModule='scopes')
 class TestScopeModule(OneViewBaseTest):
+    def scope_members(self, member_uris):
+        def get_all(filter, fields):
+            return [dict(uri=uri) for uri in member_uris if "uri='{0}'".format(uri) in filter[1]]
+        self.mock_ov_client.index_resources.get_all.side_effect = get_all
+
     def test_should_create_new_scope_when_not_found(self):
         self.resource.get_by_name.return_value = None
         self.resource.create.return_value = self.resource
@@ -113,46 +118,75 @@ class TestScopeModule(OneViewBaseTest):
 
     def test_should_not_update_when_no_new_add_remove_resources(self):
         self.resource.get_by_name.return_value = self.resource
-        current_data = copy.deepcopy(PARAMS_WITH_CHANGES_HAVING_RESOURCES_1['data'])
-        self.resource.data = current_data
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES_HAVING_RESOURCES_1
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_WITH_CHANGES_HAVING_RESOURCES_1)
+        self.scope_members(['/rest/resource/id-1', '/rest/resource/id-2'])
 
         ScopeModule().run()
 
+        self.resource.update.assert_not_called()
+        self.resource.patch_request.assert_not_called()
         self.mock_ansible_module.exit_json.assert_called_once_with(
-            changed=True,
-            msg=ScopeModule.MSG_UPDATED,
-            ansible_facts=dict(scope=current_data)
+            changed=False,
+            msg=ScopeModule.MSG_ALREADY_PRESENT,
+            ansible_facts=dict(scope=RESOURCE)
         )
 
     def test_should_update_when_new_remove_resources(self):
         self.resource.get_by_name.return_value = self.resource
-        current_data = copy.deepcopy(PARAMS_WITH_CHANGES_HAVING_RESOURCES_2['data'])
-        self.resource.data = current_data
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES_HAVING_RESOURCES_2
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_WITH_CHANGES_HAVING_RESOURCES_2)
+        self.scope_members(['/rest/resource/id-1', '/rest/resource/id-2'])
 
         ScopeModule().run()
 
+        self.resource.patch_request.assert_called_once_with(
+            '/rest/scopes/id', body=[dict(op='replace', path='/removedResourceUris', value=['/rest/resource/id-2'])])
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ScopeModule.MSG_UPDATED,
-            ansible_facts=dict(scope=current_data)
+            ansible_facts=dict(scope=RESOURCE)
         )
 
     def test_should_update_when_new_add_resources(self):
         self.resource.get_by_name.return_value = self.resource
-        current_data = copy.deepcopy(RESOURCE_ASSIGNMENTS)
-        self.resource.data = current_data
-        self.mock_ansible_module.params = PARAMS_WITH_CHANGES_HAVING_RESOURCES_1
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_WITH_CHANGES_HAVING_RESOURCES_1)
+        self.scope_members(['/rest/resource/id-1'])
 
         ScopeModule().run()
 
+        self.mock_ov_client.index_resources.get_all.assert_any_call(
+            filter=["scopeUris='/rest/scopes/id'", "uri='/rest/resource/id-1' OR uri='/rest/resource/id-2'"],
+            fields='uri')
+        self.resource.update.assert_not_called()
+        self.resource.patch_request.assert_called_once_with(
+            '/rest/scopes/id', body=[dict(op='add', path='/addedResourceUris/-', value=['/rest/resource/id-2'])])
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ScopeModule.MSG_UPDATED,
-            ansible_facts=dict(scope=current_data)
+            ansible_facts=dict(scope=RESOURCE)
         )
 
+    def test_should_check_membership_and_assign_resources_in_chunks(self):
+        added_uris = ['/rest/resource/id-{0}'.format(index) for index in range(1, 6)]
+        self.resource.get_by_name.return_value = self.resource
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = dict(config='config.json', state='present', chunk_size=2,
+                                               membership_chunk_size=3,
+                                               data=dict(name='ScopeName', addedResourceUris=added_uris))
+        self.scope_members(['/rest/resource/id-3'])
+
+        ScopeModule().run()
+
+        assert self.mock_ov_client.index_resources.get_all.call_count == 2
+        assert self.resource.patch_request.call_args_list == [
+            mock.call('/rest/scopes/id', body=[dict(op='add', path='/addedResourceUris/-',
+                                                    value=['/rest/resource/id-1', '/rest/resource/id-2'])]),
+            mock.call('/rest/scopes/id', body=[dict(op='add', path='/addedResourceUris/-',
+                                                    value=['/rest/resource/id-4', '/rest/resource/id-5'])])]
+        self.resource.update_resource_assignments.assert_not_called()
+
     def test_should_update_when_data_has_changes(self):
         data_merged = PARAMS_FOR_PRESENT.copy()
         data_merged['name'] = 'ScopeNameRenamed'
@@ -303,6 +337,64 @@ class TestScopeModule(OneViewBaseTest):
             msg=ScopeModule.MSG_RESOURCE_ASSIGNMENTS_UPDATED
         )
 
+    def test_should_update_only_the_resource_assignments_that_changed(self):
+        self.mock_ov_client.api_version = 2200
+        self.resource.get_by_name.return_value = self.resource
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_RESOURCE_ASSIGNMENTS)
+        self.scope_members(['/rest/resource/id-1', '/rest/resource/id-3'])
+
+        ScopeModule().run()
+
+        self.resource.patch.assert_not_called()
+        self.resource.update_resource_assignments.assert_not_called()
+        self.resource.patch_request.assert_called_once_with(
+            '/rest/scopes/id', body=[dict(op='add', path='/addedResourceUris/-', value=['/rest/resource/id-2']),
+                                     dict(op='replace', path='/removedResourceUris', value=['/rest/resource/id-3'])])
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            ansible_facts=dict(scope=RESOURCE),
+            msg=ScopeModule.MSG_RESOURCE_ASSIGNMENTS_UPDATED
+        )
+
+    def test_should_return_the_scope_read_again_after_the_assignments(self):
+        self.mock_ov_client.api_version = 2200
+        self.resource.get_by_name.return_value = self.resource
+        self.resource.data = copy.deepcopy(RESOURCE)
+        refreshed = dict(RESOURCE, eTag='refreshed')
+
+        def refresh():
+            self.resource.data = refreshed
+        self.resource.refresh.side_effect = refresh
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_RESOURCE_ASSIGNMENTS)
+        self.scope_members(['/rest/resource/id-1', '/rest/resource/id-3'])
+
+        ScopeModule().run()
+
+        self.resource.refresh.assert_called_once_with()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            ansible_facts=dict(scope=refreshed),
+            msg=ScopeModule.MSG_RESOURCE_ASSIGNMENTS_UPDATED
+        )
+
+    def test_should_not_update_resource_assignments_already_applied(self):
+        self.mock_ov_client.api_version = 2200
+        self.resource.get_by_name.return_value = self.resource
+        self.resource.data = copy.deepcopy(RESOURCE)
+        self.mock_ansible_module.params = copy.deepcopy(PARAMS_RESOURCE_ASSIGNMENTS)
+        self.scope_members(['/rest/resource/id-1', '/rest/resource/id-2'])
+
+        ScopeModule().run()
+
+        self.resource.patch_request.assert_not_called()
+        self.resource.refresh.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(scope=RESOURCE),
+            msg=ScopeModule.MSG_RESOURCE_ASSIGNMENTS_NOT_UPDATED
+        )
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
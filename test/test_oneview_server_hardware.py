@@ -21,7 +21,7 @@ import pytest
 import yaml
 
 from hpe_test_utils import OneViewBaseTest
-from oneview_module_loader import ServerHardwareModule
+from oneview_module_loader import OneViewModuleException, ServerHardwareModule
 
 FAKE_MSG_ERROR = 'Fake message error'
 
@@ -155,6 +155,7 @@ class TestServerHardwareModule(OneViewBaseTest):
 
     def test_should_add_multiple_servers(self):
         self.resource.get_by_name.return_value = None
+        self.resource.get_all.return_value = []
         self.resource.data = {'name': 'name'}
 
         self.resource.add_multiple_servers.return_value = self.resource
@@ -166,7 +167,117 @@ class TestServerHardwareModule(OneViewBaseTest):
         self.mock_ansible_module.exit_json.assert_called_once_with(
             changed=True,
             msg=ServerHardwareModule.MSG_MULTIPLE_RACK_MOUNT_SERVERS_ADDED,
-            ansible_facts=dict(server_hardware={"name": "name"})
+            ansible_facts=dict(server_hardware={"name": "name"},
+                               server_hardware_added=[dict(host='172.18.6.15', status='added')])
+        )
+
+    def test_should_add_multiple_servers_in_chunks_skipping_the_managed_ones(self):
+        self.resource.get_all.return_value = [
+            dict(name='172.18.6.16', mpHostInfo=dict(mpIpAddresses=[dict(address='172.18.6.16')])),
+            dict(name='DL380-1', mpHostInfo=dict(mpIpAddresses=[dict(address='fe80::1'), dict(address='172.18.6.18')]))]
+        self.resource.add_multiple_servers.return_value = self.resource
+        self.resource.data = {'name': 'name'}
+
+        params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+        params['data']['mpHostsAndRanges'] = ['172.18.6.15-172.18.6.19', 'ilo-dl380-2.example.com', '172.18.6.15']
+        params.update(chunk_size=2, max_workers=2, retries=1)
+        self.mock_ansible_module.params = params
+
+        ServerHardwareModule().run()
+
+        assert self.resource.get_all.call_count == 1
+        added_hosts = [call[0][0]['mpHostsAndRanges'] for call in self.resource.add_multiple_servers.call_args_list]
+        assert sorted(added_hosts) == [['172.18.6.15', '172.18.6.17'], ['172.18.6.19', 'ilo-dl380-2.example.com']]
+        assert self.resource.add_multiple_servers.call_args[0][0]['username'] == 'dcs'
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']
+        assert facts['server_hardware_added'] == [dict(host='172.18.6.15', status='added'),
+                                                  dict(host='172.18.6.16', status='already_managed'),
+                                                  dict(host='172.18.6.17', status='added'),
+                                                  dict(host='172.18.6.18', status='already_managed'),
+                                                  dict(host='172.18.6.19', status='added'),
+                                                  dict(host='ilo-dl380-2.example.com', status='added')]
+
+    def test_should_retry_only_the_servers_that_failed_to_be_added(self):
+        self.resource.get_all.side_effect = [[], [dict(name='172.18.6.16')]]
+        self.resource.add_multiple_servers.side_effect = [OneViewModuleException('Discovery failed'), self.resource]
+        self.resource.data = {'name': 'name'}
+
+        params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+        params['data']['mpHostsAndRanges'] = ['172.18.6.15-172.18.6.16']
+        params.update(chunk_size=16, max_workers=4, retries=1)
+        self.mock_ansible_module.params = params
+
+        ServerHardwareModule().run()
+
+        assert self.resource.add_multiple_servers.call_args[0][0]['mpHostsAndRanges'] == ['172.18.6.15']
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']
+        assert facts['server_hardware_added'] == [dict(host='172.18.6.15', status='added'),
+                                                  dict(host='172.18.6.16', status='added')]
+
+    def test_should_fail_when_the_servers_are_not_added_after_the_retries(self):
+        self.resource.get_all.return_value = []
+        self.resource.add_multiple_servers.side_effect = OneViewModuleException('Discovery failed')
+
+        params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+        params.update(chunk_size=16, max_workers=4, retries=2)
+        self.mock_ansible_module.params = params
+
+        ServerHardwareModule().run()
+
+        assert self.resource.add_multiple_servers.call_count == 3
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerHardwareModule.MSG_MULTIPLE_RACK_MOUNT_SERVERS_FAILED.format('172.18.6.15: Discovery failed'),
+            changed=False,
+            ansible_facts=dict(server_hardware_added=[dict(host='172.18.6.15', status='failed',
+                                                           error='Discovery failed')]))
+
+    def test_should_report_the_servers_added_when_others_are_not_added_after_the_retries(self):
+        self.resource.get_all.return_value = []
+        self.resource.add_multiple_servers.side_effect = lambda data: self.resource if data['mpHostsAndRanges'] == [
+            '172.18.6.15'] else OneViewModuleException('Discovery failed')
+
+        params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+        params['data']['mpHostsAndRanges'] = ['172.18.6.15-172.18.6.16', '172.18.6.15']
+        params.update(chunk_size=1, max_workers=1, retries=1)
+        self.mock_ansible_module.params = params
+
+        ServerHardwareModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerHardwareModule.MSG_MULTIPLE_RACK_MOUNT_SERVERS_FAILED.format('172.18.6.16: Discovery failed'),
+            changed=True,
+            ansible_facts=dict(server_hardware_added=[dict(host='172.18.6.15', status='added'),
+                                                      dict(host='172.18.6.16', status='failed',
+                                                           error='Discovery failed')]))
+
+    @pytest.mark.parametrize('host_range', ['172.18.6.20-172.18.6.15', '172.18.6.15-20'])
+    def test_should_fail_when_the_range_of_hosts_is_invalid(self, host_range):
+        params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+        params['data']['mpHostsAndRanges'] = [host_range]
+        self.mock_ansible_module.params = params
+
+        ServerHardwareModule().run()
+
+        self.resource.add_multiple_servers.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerHardwareModule.MSG_INVALID_RANGE.format(host_range)
+        )
+
+    def test_should_not_add_the_servers_already_managed(self):
+        self.resource.get_all.return_value = [dict(name='172.18.6.15')]
+
+        self.mock_ansible_module.params = yaml.load(YAML_SERVER_HARDWARE_ADD_MULTIPLE_SERVERS)
+
+        ServerHardwareModule().run()
+
+        self.resource.add_multiple_servers.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerHardwareModule.MSG_MULTIPLE_RACK_MOUNT_SERVERS_ALREADY_PRESENT,
+            ansible_facts=dict(server_hardware_added=[dict(host='172.18.6.15', status='already_managed')])
         )
 
     def test_should_calibrate_max_power_server_hardware(self):
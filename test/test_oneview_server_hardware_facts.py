@@ -16,10 +16,12 @@
 # limitations under the License.
 ###
 
+import mock
 import pytest
 
 from hpe_test_utils import OneViewBaseFactsTest
-from oneview_module_loader import ServerHardwareFactsModule
+from hpeOneView.oneview_client import OneViewClient
+from oneview_module_loader import OneViewMirror, ServerHardwareFactsModule
 
 ERROR_MSG = 'Fake message error'
 
@@ -78,6 +80,17 @@ class TestServerHardwareFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(server_hardwares=({"name": "Server Hardware Name"}))
         )
 
+    def test_should_get_all_server_hardware_with_fields(self):
+        self.resource.get_all.return_value = [{"name": "Server Hardware Name", "uri": "resource_uri", "status": "OK"}]
+        self.mock_ansible_module.params = dict(config='config.json', name=None, fields=['name', 'status'])
+
+        ServerHardwareFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares=[{"name": "Server Hardware Name", "status": "OK"}])
+        )
+
     def test_should_get_server_hardware_by_name(self):
         self.resource.data = {"name": "Server Hardware Name"}
         self.mock_ansible_module.params = PARAMS_GET_BY_NAME
@@ -100,6 +113,33 @@ class TestServerHardwareFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(server_hardwares=({"name": "Server Hardware Name", "uri": "resource_uri"}))
         )
 
+    def test_should_get_server_hardware_by_name_from_the_mirror_without_logging_in(self, tmpdir):
+        server_hardware = [{"name": "Test Server Hardware", "uri": "/rest/server-hardware/1"},
+                           {"name": "Other Server Hardware", "uri": "/rest/server-hardware/2"}]
+        self.resource.URI = '/rest/server-hardware'
+        self.resource.get_all.side_effect = lambda start, count: server_hardware[start:start + count]
+        path = str(tmpdir.join('mirror.db'))
+        mirror = OneViewMirror(path)
+        mirror.snapshot(self.resource)
+        mirror.close()
+        self.mock_ansible_module.params = dict(PARAMS_GET_BY_NAME, source='mirror', mirror=path)
+
+        ServerHardwareFactsModule().run()
+
+        OneViewClient.from_json_file.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_hardwares=server_hardware[0])
+        )
+
+    def test_should_fail_when_the_options_are_read_from_the_mirror(self, tmpdir):
+        self.mock_ansible_module.params = dict(PARAMS_WITH_OPTIONS, source='mirror', mirror=str(tmpdir.join('mirror.db')))
+
+        ServerHardwareFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerHardwareFactsModule.MSG_MIRROR_OPTIONS_NOT_SUPPORTED)
+
     def test_should_get_server_hardware_by_name_with_options(self):
         self.resource.data = [{"name": "Server Hardware Name", "uri": "res_uri"}]
         self.resource.get_bios.return_value = {'subresource': 'value'}
@@ -0,0 +1,197 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import ServerHardwarePowerModule
+
+PARAMS_POWER_OFF = dict(
+    config='config.json',
+    server_hardware=None,
+    params=dict(filter="state='ProfileApplied'"),
+    power_state='Off',
+    power_control='MomentaryPress',
+    group_by='enclosure',
+    max_per_group=1,
+    max_workers=10,
+    timeout=60
+)
+
+SERVER_HARDWARE = [
+    dict(name='Enc1, bay 1', uri='/rest/server-hardware/1', powerState='On', locationUri='/rest/enclosures/1'),
+    dict(name='Enc1, bay 2', uri='/rest/server-hardware/2', powerState='On', locationUri='/rest/enclosures/1'),
+    dict(name='Enc1, bay 3', uri='/rest/server-hardware/3', powerState='Off', locationUri='/rest/enclosures/1'),
+    dict(name='Enc2, bay 1', uri='/rest/server-hardware/4', powerState='On', locationUri='/rest/enclosures/2'),
+    dict(name='172.18.6.15', uri='/rest/server-hardware/5', powerState='On', locationUri=None)
+]
+
+
+@pytest.mark.resource(TestServerHardwarePowerModule='server_hardware')
+class TestServerHardwarePowerModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def task_monitor(self, setUp, mock_ov_client):
+        patcher = mock.patch('oneview_server_hardware_power.TaskMonitor')
+        self.mock_task_monitor = patcher.start()
+        self.resource.get_all.return_value = SERVER_HARDWARE
+        self.mock_ov_client.connection.put.side_effect = lambda uri, body: ({'uri': '/rest/tasks' + uri}, None)
+        yield
+        patcher.stop()
+
+    def power_requests(self):
+        return [call[0][0] for call in self.mock_ov_client.connection.put.call_args_list]
+
+    def server_hardware_power(self, statuses):
+        return [dict(name=server['name'], uri=server['uri'], powerState=server['powerState'],
+                     status=statuses.get(server['uri'], 'unchanged')) for server in SERVER_HARDWARE]
+
+    def test_should_power_off_only_the_servers_that_are_on_in_waves_per_enclosure(self):
+        self.mock_ansible_module.params = PARAMS_POWER_OFF
+
+        ServerHardwarePowerModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="state='ProfileApplied'")
+        assert sorted(self.power_requests()) == ['/rest/server-hardware/{0}/powerState'.format(index)
+                                                 for index in [1, 2, 4, 5]]
+        self.mock_ov_client.connection.put.assert_any_call('/rest/server-hardware/1/powerState',
+                                                           dict(powerState='Off', powerControl='MomentaryPress'))
+        self.mock_task_monitor.return_value.wait_for_task.assert_any_call(
+            {'uri': '/rest/tasks/rest/server-hardware/1/powerState'}, 60)
+        statuses = dict(('/rest/server-hardware/{0}'.format(index), 'changed') for index in [1, 2, 4, 5])
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerHardwarePowerModule.MSG_POWER_STATE_UPDATED,
+            ansible_facts=dict(server_hardware_power=dict(server_hardware=self.server_hardware_power(statuses),
+                                                          waves=2))
+        )
+
+    def test_should_not_send_requests_when_the_servers_are_already_in_the_power_state(self):
+        self.resource.get_all.return_value = [SERVER_HARDWARE[2]]
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, server_hardware=['Enc1, bay 3'], params=None)
+
+        ServerHardwarePowerModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="name='Enc1, bay 3'")
+        self.mock_ov_client.connection.put.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerHardwarePowerModule.MSG_ALREADY_IN_POWER_STATE,
+            ansible_facts=dict(server_hardware_power=dict(
+                server_hardware=[dict(name='Enc1, bay 3', uri='/rest/server-hardware/3', powerState='Off',
+                                      status='unchanged')],
+                waves=0))
+        )
+
+    def test_should_group_the_servers_by_rack(self):
+        self.mock_ov_client.racks.get_all.return_value = [
+            dict(uri='/rest/racks/1', rackMounts=[dict(mountUri='/rest/enclosures/1'),
+                                                  dict(mountUri='/rest/enclosures/2'),
+                                                  dict(mountUri='/rest/server-hardware/5')])]
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, group_by='rack', max_per_group=2)
+
+        ServerHardwarePowerModule().run()
+
+        self.mock_ov_client.racks.get_all.assert_called_once_with()
+        assert self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['server_hardware_power']['waves'] == 2
+
+    def test_should_look_up_the_servers_by_name_and_uri_in_one_query(self):
+        self.resource.get_all.return_value = SERVER_HARDWARE[:2]
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, params=None,
+                                               server_hardware=['Enc1, bay 1', '/rest/server-hardware/2'])
+
+        ServerHardwarePowerModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter="name='Enc1, bay 1' OR uri='/rest/server-hardware/2'")
+
+    def test_should_look_up_the_servers_in_chunks_and_merge_them(self):
+        def get_all(filter):
+            return [server for server in SERVER_HARDWARE
+                    if "name='{0}'".format(server['name']) in filter or "uri='{0}'".format(server['uri']) in filter]
+        self.resource.get_all.side_effect = get_all
+        targets = [server['name'] for server in SERVER_HARDWARE] + ['/rest/server-hardware/1']
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, params=None, server_hardware=targets)
+
+        with mock.patch('oneview_server_hardware_power.FILTER_CHUNK_SIZE', 2):
+            ServerHardwarePowerModule().run()
+
+        assert self.resource.get_all.call_count == 3
+        self.resource.get_all.assert_any_call(filter="name='172.18.6.15' OR uri='/rest/server-hardware/1'")
+        facts = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['server_hardware_power']
+        assert [server['uri'] for server in facts['server_hardware']] == [server['uri'] for server in SERVER_HARDWARE]
+
+    def test_should_fail_when_a_server_is_not_found(self):
+        self.resource.get_all.return_value = SERVER_HARDWARE[:1]
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, params=None,
+                                               server_hardware=['Enc1, bay 1', 'Enc9, bay 1'])
+
+        ServerHardwarePowerModule().run()
+
+        self.mock_ov_client.connection.put.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerHardwarePowerModule.MSG_SERVER_HARDWARE_NOT_FOUND + 'Enc9, bay 1')
+
+    def test_should_fail_without_targets(self):
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, params=None)
+
+        ServerHardwarePowerModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerHardwarePowerModule.MSG_NO_TARGETS)
+
+    def test_should_run_all_the_waves_and_report_the_failed_servers(self):
+        def wait_for_task(task, timeout):
+            if task['uri'].endswith('/server-hardware/1/powerState'):
+                raise Exception('Power off timed out')
+        self.mock_task_monitor.return_value.wait_for_task.side_effect = wait_for_task
+        self.mock_ansible_module.params = PARAMS_POWER_OFF
+
+        ServerHardwarePowerModule().run()
+
+        assert len(self.power_requests()) == 4
+        statuses = dict(('/rest/server-hardware/{0}'.format(index), 'changed') for index in [2, 4, 5])
+        statuses['/rest/server-hardware/1'] = 'failed'
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerHardwarePowerModule.MSG_POWER_STATE_FAILED.format('Enc1, bay 1: Power off timed out'),
+            changed=True,
+            ansible_facts=dict(server_hardware_power=dict(server_hardware=self.server_hardware_power(statuses),
+                                                          waves=2)))
+
+    def test_should_fail_when_restarting_to_the_off_power_state(self):
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, power_control='ColdBoot')
+
+        ServerHardwarePowerModule().run()
+
+        self.mock_ov_client.connection.put.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerHardwarePowerModule.MSG_RESTART_REQUIRES_ON.format('ColdBoot'))
+
+    def test_should_restart_only_the_servers_that_are_on(self):
+        self.mock_ansible_module.params = dict(PARAMS_POWER_OFF, power_state='On', power_control='Reset')
+
+        ServerHardwarePowerModule().run()
+
+        assert sorted(self.power_requests()) == ['/rest/server-hardware/{0}/powerState'.format(index)
+                                                 for index in [1, 2, 4, 5]]
+        self.mock_ov_client.connection.put.assert_any_call('/rest/server-hardware/4/powerState',
+                                                           dict(powerState='On', powerControl='Reset'))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1663,6 +1663,48 @@ class TestServerProfileModule(OneViewBaseTest):
 
         self.mock_ov_client.server_hardware.update_power_state.not_been_called()
 
+    @mock.patch('oneview_server_profile.compare')
+    def test_should_not_gather_facts_that_are_not_listed(self, mock_resource_compare):
+        mock_resource_compare.return_value = True
+        mock_facts = gather_facts(self.mock_ov_client)
+        mock_facts['server_hardware'] = None
+        mock_facts['compliance_preview'] = None
+
+        self.resource.data = deepcopy(CREATED_BASIC_PROFILE)
+        self.mock_ov_client.api_version = 1200
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_FOR_PRESENT), gather_facts=[])
+
+        ServerProfileModule().run()
+
+        self.mock_ov_client.server_hardware.get_by_uri.assert_not_called()
+        self.resource.get_compliance_preview.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerProfileModule.MSG_ALREADY_PRESENT,
+            ansible_facts=mock_facts
+        )
+
+    @mock.patch('oneview_server_profile.compare')
+    def test_should_gather_only_the_listed_facts(self, mock_resource_compare):
+        mock_resource_compare.return_value = True
+        mock_facts = gather_facts(self.mock_ov_client)
+        mock_facts['compliance_preview'] = None
+
+        self.resource.data = deepcopy(CREATED_BASIC_PROFILE)
+        self.mock_ov_client.server_hardware.data = {}
+        self.mock_ov_client.server_hardware.get_by_uri.return_value = self.mock_ov_client.server_hardware
+        self.mock_ov_client.api_version = 1200
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_FOR_PRESENT), gather_facts=['server_hardware'])
+
+        ServerProfileModule().run()
+
+        self.resource.get_compliance_preview.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerProfileModule.MSG_ALREADY_PRESENT,
+            ansible_facts=mock_facts
+        )
+
     @mock.patch('oneview_server_profile.compare')
     def test_fail_when_informed_template_not_exist_for_update(self, mock_resource_compare):
         profile_data = deepcopy(CREATED_BASIC_PROFILE)
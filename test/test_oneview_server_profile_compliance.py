@@ -0,0 +1,214 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import ServerProfileComplianceModule
+
+TEMPLATE_URI = '/rest/server-profile-templates/1'
+
+PARAMS_REMEDIATE = dict(
+    config='config.json',
+    template='ProfileTemplate101',
+    server_profiles=None,
+    max_offline=2,
+    max_workers=10
+)
+
+SERVER_PROFILES = [
+    dict(name='profile-1', uri='/rest/server-profiles/1', serverHardwareUri='/rest/server-hardware/1',
+         templateCompliance='NonCompliant'),
+    dict(name='profile-2', uri='/rest/server-profiles/2', serverHardwareUri='/rest/server-hardware/2',
+         templateCompliance='NonCompliant'),
+    dict(name='profile-3', uri='/rest/server-profiles/3', serverHardwareUri='/rest/server-hardware/3',
+         templateCompliance='NonCompliant'),
+    dict(name='profile-4', uri='/rest/server-profiles/4', serverHardwareUri=None, templateCompliance='NonCompliant')
+]
+
+ONLINE_PROFILES = ['profile-1']
+
+
+@pytest.mark.resource(TestServerProfileComplianceModule='server_profiles')
+class TestServerProfileComplianceModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def resources(self, setUp, mock_ov_client):
+        self.calls = []
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = mock.Mock(data=dict(uri=TEMPLATE_URI))
+        self.resource.get_all.return_value = SERVER_PROFILES
+        self.resource.new.side_effect = self.new_profile
+        self.mock_ov_client.server_hardware.get_all.return_value = [
+            dict(uri='/rest/server-hardware/2', powerState='On'), dict(uri='/rest/server-hardware/3', powerState='Off')]
+        self.mock_ov_client.server_hardware.new.side_effect = self.new_server_hardware
+
+    def new_profile(self, connection, data):
+        profile = mock.Mock(data=data)
+        profile.get_compliance_preview.return_value = dict(isOnlineUpdate=data['name'] in ONLINE_PROFILES)
+        profile.patch.side_effect = lambda *args: self.calls.append(('patch', data['name']))
+        return profile
+
+    def new_server_hardware(self, connection, data):
+        server_hardware = mock.Mock(data=data)
+        server_hardware.update_power_state.side_effect = \
+            lambda configuration: self.calls.append((configuration['powerState'], data['uri']))
+        return server_hardware
+
+    def test_should_update_online_concurrently_and_offline_in_waves_with_power_handling(self):
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter=["serverProfileTemplateUri='{0}'".format(TEMPLATE_URI), "templateCompliance='NonCompliant'"])
+        self.mock_ov_client.server_hardware.get_all.assert_called_once_with(
+            filter="uri='/rest/server-hardware/2' OR uri='/rest/server-hardware/3'")
+        assert self.calls.index(('Off', '/rest/server-hardware/2')) < self.calls.index(('patch', 'profile-2')) < \
+            self.calls.index(('On', '/rest/server-hardware/2'))
+        assert self.calls.index(('patch', 'profile-3')) < self.calls.index(('patch', 'profile-4'))
+        assert ('Off', '/rest/server-hardware/3') not in self.calls
+        assert len(self.calls) == 6
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=True,
+            msg=ServerProfileComplianceModule.MSG_REMEDIATED_COMPLIANCE,
+            ansible_facts=dict(server_profile_compliance=dict(server_profiles=[
+                dict(name='profile-1', uri='/rest/server-profiles/1', update='online', status='remediated'),
+                dict(name='profile-2', uri='/rest/server-profiles/2', update='offline', status='remediated'),
+                dict(name='profile-3', uri='/rest/server-profiles/3', update='offline', status='remediated'),
+                dict(name='profile-4', uri='/rest/server-profiles/4', update='offline', status='remediated')],
+                waves=2))
+        )
+
+    def test_should_do_nothing_when_the_profiles_are_compliant(self):
+        self.resource.get_all.return_value = []
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=ServerProfileComplianceModule.MSG_ALREADY_COMPLIANT,
+            ansible_facts=dict(server_profile_compliance=dict(server_profiles=[], waves=0))
+        )
+
+    def test_should_filter_the_profiles_by_name(self):
+        self.resource.get_all.return_value = SERVER_PROFILES[:1]
+        self.mock_ansible_module.params = dict(PARAMS_REMEDIATE, server_profiles=['profile-1', 'profile-9'])
+
+        ServerProfileComplianceModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter=["serverProfileTemplateUri='{0}'".format(TEMPLATE_URI), "templateCompliance='NonCompliant'",
+                    "name='profile-1' OR name='profile-9'"])
+        self.mock_ov_client.server_hardware.get_all.assert_not_called()
+        assert self.calls == [('patch', 'profile-1')]
+
+    def test_should_filter_the_profiles_by_name_in_chunks(self):
+        self.resource.get_all.return_value = []
+        names = ['profile-{0}'.format(index) for index in range(60)]
+        self.mock_ansible_module.params = dict(PARAMS_REMEDIATE, server_profiles=names)
+
+        ServerProfileComplianceModule().run()
+
+        base_filter = ["serverProfileTemplateUri='{0}'".format(TEMPLATE_URI), "templateCompliance='NonCompliant'"]
+        assert self.resource.get_all.call_args_list == [
+            mock.call(filter=base_filter + [' OR '.join("name='{0}'".format(name) for name in names[:50])]),
+            mock.call(filter=base_filter + [' OR '.join("name='{0}'".format(name) for name in names[50:])])]
+
+    def test_should_fail_when_the_template_is_not_found(self):
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = None
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerProfileComplianceModule.MSG_TEMPLATE_NOT_FOUND + 'ProfileTemplate101')
+
+    def test_should_stop_after_an_offline_wave_with_failures(self):
+        def update_power_state(configuration):
+            raise Exception('Power off failed')
+        server_hardware = mock.Mock()
+        server_hardware.update_power_state.side_effect = update_power_state
+        self.mock_ov_client.server_hardware.new.side_effect = None
+        self.mock_ov_client.server_hardware.new.return_value = server_hardware
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        assert ('patch', 'profile-2') not in self.calls
+        assert ('patch', 'profile-4') not in self.calls
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerProfileComplianceModule.MSG_OFFLINE_FAILED.format(1, 'profile-2: Power off failed'),
+            changed=True,
+            ansible_facts=dict(server_profile_compliance=dict(server_profiles=[
+                dict(name='profile-1', uri='/rest/server-profiles/1', update='online', status='remediated'),
+                dict(name='profile-2', uri='/rest/server-profiles/2', update='offline', status='failed'),
+                dict(name='profile-3', uri='/rest/server-profiles/3', update='offline', status='remediated'),
+                dict(name='profile-4', uri='/rest/server-profiles/4', update='offline', status='pending')],
+                waves=1))
+        )
+
+    def test_should_not_start_the_offline_waves_when_an_online_update_fails(self):
+        def patch(*args):
+            raise Exception('Update failed')
+        self.resource.new.side_effect = None
+        profile = mock.Mock(data=SERVER_PROFILES[0])
+        profile.get_compliance_preview.return_value = dict(isOnlineUpdate=True)
+        profile.patch.side_effect = patch
+        offline_profile = self.new_profile(None, SERVER_PROFILES[1])
+        self.resource.new.side_effect = [profile, offline_profile]
+        self.resource.get_all.return_value = SERVER_PROFILES[:2]
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        assert self.calls == []
+        self.mock_ov_client.server_hardware.get_all.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerProfileComplianceModule.MSG_ONLINE_FAILED.format('profile-1: Update failed'),
+            changed=False,
+            ansible_facts=dict(server_profile_compliance=dict(server_profiles=[
+                dict(name='profile-1', uri='/rest/server-profiles/1', update='online', status='failed'),
+                dict(name='profile-2', uri='/rest/server-profiles/2', update='offline', status='pending')],
+                waves=0))
+        )
+
+    def test_should_fail_when_a_compliance_preview_fails(self):
+        self.resource.new.side_effect = None
+        profile = mock.Mock(data=SERVER_PROFILES[0])
+        profile.get_compliance_preview.side_effect = Exception('Preview failed')
+        self.resource.new.return_value = profile
+        self.resource.get_all.return_value = SERVER_PROFILES[:1]
+        self.mock_ansible_module.params = PARAMS_REMEDIATE
+
+        ServerProfileComplianceModule().run()
+
+        profile.patch.assert_not_called()
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY,
+            msg=ServerProfileComplianceModule.MSG_PREVIEW_FAILED.format('profile-1: Preview failed'),
+            changed=False,
+            ansible_facts=dict(server_profile_compliance=dict(server_profiles=[
+                dict(name='profile-1', uri='/rest/server-profiles/1', update=None, status='failed')], waves=0))
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
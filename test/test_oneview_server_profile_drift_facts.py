@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import ServerProfileDriftFactsModule
+
+TEMPLATE = dict(
+    name='ProfileTemplate101',
+    uri='/rest/server-profile-templates/1',
+    enclosureGroupUri='/rest/enclosure-groups/1',
+    bios=dict(manageBios=True, overriddenSettings=[dict(id='WorkloadProfile', value='Virtualization-MaxPerformance')])
+)
+
+SERVER_PROFILES = [
+    dict(name='profile-1', uri='/rest/server-profiles/1', templateCompliance='Compliant',
+         enclosureGroupUri='/rest/enclosure-groups/1',
+         bios=dict(manageBios=True, overriddenSettings=[dict(id='WorkloadProfile', value='Virtualization-MaxPerformance')])),
+    dict(name='profile-2', uri='/rest/server-profiles/2', templateCompliance='NonCompliant',
+         enclosureGroupUri='/rest/enclosure-groups/2',
+         bios=dict(manageBios=True, overriddenSettings=[dict(id='WorkloadProfile', value='Virtualization-MaxPerformance')]))
+]
+
+PARAMS_DRIFT = dict(
+    config='config.json',
+    template='ProfileTemplate101',
+    server_profiles=None,
+    compliance_preview=False,
+    max_workers=10
+)
+
+
+@pytest.mark.resource(TestServerProfileDriftFactsModule='server_profiles')
+class TestServerProfileDriftFactsModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def resources(self, setUp, mock_ov_client):
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = mock.Mock(data=TEMPLATE)
+        self.resource.get_all.return_value = SERVER_PROFILES
+
+    def test_should_compute_the_drift_locally_without_compliance_previews(self):
+        self.mock_ansible_module.params = PARAMS_DRIFT
+
+        ServerProfileDriftFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(filter=["serverProfileTemplateUri='/rest/server-profile-templates/1'"])
+        self.resource.new.assert_not_called()
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_profile_drift=dict(template='ProfileTemplate101', drifted=1, server_profiles=[
+                dict(name='profile-1', uri='/rest/server-profiles/1', templateCompliance='Compliant', drifted=False,
+                     changes=[]),
+                dict(name='profile-2', uri='/rest/server-profiles/2', templateCompliance='NonCompliant', drifted=True,
+                     changes=[dict(path='enclosureGroupUri', template='/rest/enclosure-groups/1',
+                                   profile='/rest/enclosure-groups/2')])]))
+        )
+
+    def test_should_get_the_compliance_preview_of_the_drifted_profiles_only(self):
+        self.resource.new.return_value.get_compliance_preview.return_value = dict(isOnlineUpdate=True)
+        self.mock_ansible_module.params = dict(PARAMS_DRIFT, compliance_preview=True)
+
+        ServerProfileDriftFactsModule().run()
+
+        self.resource.new.assert_called_once_with(self.mock_ov_client.connection, dict(uri='/rest/server-profiles/2'))
+        server_profiles = self.mock_ansible_module.exit_json.call_args[1]['ansible_facts']['server_profile_drift'][
+            'server_profiles']
+        assert 'compliance_preview' not in server_profiles[0]
+        assert server_profiles[1]['compliance_preview'] == dict(isOnlineUpdate=True)
+
+    def test_should_filter_the_profiles_by_name(self):
+        self.mock_ansible_module.params = dict(PARAMS_DRIFT, server_profiles=['profile-1'])
+
+        ServerProfileDriftFactsModule().run()
+
+        self.resource.get_all.assert_called_once_with(
+            filter=["serverProfileTemplateUri='/rest/server-profile-templates/1'", "name='profile-1'"])
+
+    def test_should_filter_the_profiles_by_name_in_chunks(self):
+        self.resource.get_all.return_value = []
+        names = ['profile-{0}'.format(index) for index in range(60)]
+        self.mock_ansible_module.params = dict(PARAMS_DRIFT, server_profiles=names)
+
+        ServerProfileDriftFactsModule().run()
+
+        base_filter = ["serverProfileTemplateUri='/rest/server-profile-templates/1'"]
+        assert self.resource.get_all.call_args_list == [
+            mock.call(filter=base_filter + [' OR '.join("name='{0}'".format(name) for name in names[:50])]),
+            mock.call(filter=base_filter + [' OR '.join("name='{0}'".format(name) for name in names[50:])])]
+
+    def test_should_fail_when_the_template_is_not_found(self):
+        self.mock_ov_client.server_profile_templates.get_by_name.return_value = None
+        self.mock_ansible_module.params = PARAMS_DRIFT
+
+        ServerProfileDriftFactsModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=ServerProfileDriftFactsModule.MSG_TEMPLATE_NOT_FOUND + 'ProfileTemplate101')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -123,6 +123,42 @@ class TestServerProfileFactsModule(OneViewBaseFactsTest):
             ansible_facts=dict(server_profiles=server_profiles)
         )
 
+    def test_should_get_all_servers_compact(self):
+        server_profiles = [
+            {"name": "Server Profile Name 1", "uri": "/rest/server-profiles/1", "description": None,
+             "connectionSettings": {"connections": []}, "enclosureGroup": {"uri": "/rest/enclosure-groups/1"}}
+        ]
+        self.mock_ov_client.server_profiles.get_all.return_value = server_profiles
+
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_GET_ALL), result_format='compact')
+
+        ServerProfileFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_profiles=[{"name": "Server Profile Name 1", "uri": "/rest/server-profiles/1",
+                                                 "enclosureGroup": "/rest/enclosure-groups/1"}])
+        )
+
+    def test_should_project_only_the_server_profiles_with_fields(self):
+        server_profile = {"name": "Server Profile Name", "uri": PROFILE_URI, "status": "OK"}
+        new_profile_template = {"name": "New Template", "uri": None, "description": "From profile"}
+        obj = mock.Mock()
+        obj.data = server_profile
+        obj.get_new_profile_template.return_value = new_profile_template
+        self.mock_ov_client.server_profiles.get_by_name.return_value = obj
+
+        self.mock_ansible_module.params = dict(deepcopy(PARAMS_GET_BY_NAME), options=['newProfileTemplate'],
+                                               fields=['name'])
+
+        ServerProfileFactsModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            ansible_facts=dict(server_profiles=[{"name": "Server Profile Name"}],
+                               server_profile_new_profile_template=new_profile_template)
+        )
+
     def test_should_get_by_name(self):
         servers = {"name": "Server Profile Name", 'uri': '/rest/test/123'}
         obj = mock.Mock()
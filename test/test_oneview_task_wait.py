@@ -0,0 +1,98 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+###
+# Copyright (2020) Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# You may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+###
+
+import mock
+import pytest
+
+from hpe_test_utils import OneViewBaseTest
+from oneview_module_loader import TaskWaitModule
+
+TASK_URIS = ['/rest/tasks/1', '/rest/tasks/2']
+
+PARAMS_WAIT = dict(
+    config='config.json',
+    task_uris=TASK_URIS,
+    timeout=60,
+    max_workers=10,
+    fail_on_error=True
+)
+
+COMPLETED_TASKS = {
+    '/rest/tasks/1': {'uri': '/rest/tasks/1', 'taskState': 'Completed'},
+    '/rest/tasks/2': {'uri': '/rest/tasks/2', 'taskState': 'Warning'}
+}
+
+
+@pytest.mark.resource(TestTaskWaitModule='tasks')
+class TestTaskWaitModule(OneViewBaseTest):
+    @pytest.fixture(autouse=True)
+    def task_monitor(self, setUp, mock_ov_client):
+        patcher = mock.patch('oneview_task_wait.TaskMonitor')
+        self.mock_task_monitor = patcher.start()
+        yield
+        patcher.stop()
+
+    def test_should_wait_for_all_the_tasks(self):
+        self.mock_task_monitor.return_value.get_completed_task.side_effect = \
+            lambda task, timeout: COMPLETED_TASKS[task['uri']]
+        self.mock_ansible_module.params = PARAMS_WAIT
+
+        TaskWaitModule().run()
+
+        self.mock_task_monitor.assert_called_with(self.mock_ov_client.connection)
+        self.mock_task_monitor.return_value.get_completed_task.assert_has_calls(
+            [mock.call({'uri': '/rest/tasks/1'}, 60), mock.call({'uri': '/rest/tasks/2'}, 60)], any_order=True)
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False,
+            msg=TaskWaitModule.MSG_COMPLETED,
+            ansible_facts=dict(tasks=[COMPLETED_TASKS['/rest/tasks/1'], COMPLETED_TASKS['/rest/tasks/2']])
+        )
+
+    def test_should_fail_when_a_task_ends_with_error(self):
+        failed_task = {'uri': '/rest/tasks/2', 'taskState': 'Error'}
+        self.mock_task_monitor.return_value.get_completed_task.side_effect = \
+            lambda task, timeout: failed_task if task['uri'] == '/rest/tasks/2' else COMPLETED_TASKS[task['uri']]
+        self.mock_ansible_module.params = PARAMS_WAIT
+
+        TaskWaitModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg=TaskWaitModule.MSG_TASKS_FAILED.format('/rest/tasks/2'))
+
+    def test_should_return_the_failed_tasks_when_fail_on_error_is_false(self):
+        failed_task = {'uri': '/rest/tasks/1', 'taskState': 'Killed'}
+        self.mock_task_monitor.return_value.get_completed_task.return_value = failed_task
+        self.mock_ansible_module.params = dict(PARAMS_WAIT, task_uris=['/rest/tasks/1'], fail_on_error=False)
+
+        TaskWaitModule().run()
+
+        self.mock_ansible_module.exit_json.assert_called_once_with(
+            changed=False, msg=TaskWaitModule.MSG_COMPLETED, ansible_facts=dict(tasks=[failed_task]))
+
+    def test_should_fail_when_the_wait_times_out(self):
+        self.mock_task_monitor.return_value.get_completed_task.side_effect = Exception('Waited 60 seconds')
+        self.mock_ansible_module.params = dict(PARAMS_WAIT, task_uris=['/rest/tasks/1'])
+
+        TaskWaitModule().run()
+
+        self.mock_ansible_module.fail_json.assert_called_once_with(
+            exception=mock.ANY, msg='/rest/tasks/1: Waited 60 seconds')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])